@@ -55,6 +55,10 @@ class NestBotPanel:
         # Initialize ticket database
         self.ticket_db = self.initialize_ticket_database()
         
+        # Drop cached copies of tickets changed anywhere in the app
+        from nest.utils.ticket_events import get_ticket_event_bus
+        get_ticket_event_bus().subscribe(self._on_ticket_mutation)
+        
         # Initialize intelligent analysis engine
         try:
             from nest.ai.intelligent_analysis import IntelligentAnalysisEngine
@@ -95,6 +99,18 @@ class NestBotPanel:
         # Start periodic job analysis for proactive insights
         self.start_job_analysis_thread()
     
+    def _on_ticket_mutation(self, mutation):
+        """Evict a changed ticket from the ticket database caches and recent tickets."""
+        if not self.ticket_db:
+            return
+        caches = (self.ticket_db.get('cache'), self.ticket_db.get('comment_cache'),
+                  self.recent_tickets)
+        for cache in caches:
+            if cache is None:
+                continue
+            for key in [key for key in list(cache) if mutation.matches(key)]:
+                cache.pop(key, None)
+    
     def initialize_ticket_database(self):
         """
         Initialize the connection to the ticket database and set up access methods.
@@ -103,10 +119,12 @@ class NestBotPanel:
             dict: Object with methods to access ticket data
         """
         try:
-            # Create ticket database wrapper with enhanced functionality
+            # Create ticket database wrapper with enhanced functionality. The caches
+            # count towards the global cache memory budget.
+            from nest.utils.cache_manager import ManagedCache
             ticket_db = {
-                'cache': {},
-                'comment_cache': {},
+                'cache': ManagedCache('nestbot.tickets'),
+                'comment_cache': ManagedCache('nestbot.comments'),
                 'last_sync': None,
                 'sync_in_progress': False
             }
@@ -114,9 +132,10 @@ class NestBotPanel:
             def get_ticket(ticket_id):
                 """Get full ticket details with enhanced information"""
                 # Check cache first
-                if ticket_id in ticket_db['cache'] and ticket_db['cache'][ticket_id].get('full_data'):
+                cached_ticket = ticket_db['cache'].get(ticket_id)
+                if cached_ticket and cached_ticket.get('full_data'):
                     logging.info(f"Using cached data for ticket {ticket_id}")
-                    return ticket_db['cache'][ticket_id]
+                    return cached_ticket
                 
                 try:
                     # Load ticket data directly from RepairDesk API
@@ -148,9 +167,10 @@ class NestBotPanel:
             def get_comments(ticket_id):
                 """Get all comments for a ticket with sentiment analysis"""
                 # Check cache first
-                if ticket_id in ticket_db['comment_cache']:
+                cached_comments = ticket_db['comment_cache'].get(ticket_id)
+                if cached_comments is not None:
                     logging.info(f"Using cached comments for ticket {ticket_id}")
-                    return ticket_db['comment_cache'][ticket_id]
+                    return cached_comments
                 
                 try:
                     # Import comment utility only when needed
@@ -183,11 +203,10 @@ class NestBotPanel:
                         logging.warning("No user name available for ticket lookup")
                         return []
                     
-                    # Use the technician-based filtering method
-                    tickets = self._get_tickets_for_technician(current_user_name)
-                    
-                    # Apply limit
-                    limited_tickets = tickets[:limit] if limit else tickets
+                    # Use the technician-based filtering method; only the first
+                    # `limit` tickets are read from the store
+                    limited_tickets = self._get_tickets_for_technician(current_user_name,
+                                                                       limit=limit)
                     
                     # Cache the tickets for quick reference
                     for ticket in limited_tickets:
@@ -203,31 +222,28 @@ class NestBotPanel:
             def get_store_tickets(status=None, limit=20):
                 """Get tickets for the entire store, optionally filtered by status"""
                 try:
-                    # Load all tickets directly from RepairDesk API/cache
+                    # Load tickets lazily so only the pages we read are hydrated
                     from nest.ai.ticket_utils import load_ticket_data
-                    all_tickets = load_ticket_data(include_specific_ticket=False)
+                    all_tickets = load_ticket_data(include_specific_ticket=False, lazy=True)
                     
                     if not all_tickets:
                         return []
                     
-                    # Normalize all tickets to consistent structure
-                    normalized_tickets = []
+                    # Normalize tickets to consistent structure, applying the status
+                    # filter as we go and stopping once the limit is reached
+                    limited_tickets = []
                     for ticket in all_tickets:
                         normalized = self._normalize_ticket_data(ticket)
-                        if normalized:
-                            normalized_tickets.append(normalized)
-                    
-                    # Apply status filter if specified
-                    if status:
-                        filtered_tickets = []
-                        for ticket in normalized_tickets:
-                            ticket_status = ticket.get('status', '').lower()
-                            if status.lower() in ticket_status or ticket_status in status.lower():
-                                filtered_tickets.append(ticket)
-                        normalized_tickets = filtered_tickets
-                    
-                    # Apply limit
-                    limited_tickets = normalized_tickets[:limit] if limit else normalized_tickets
+                        if not normalized:
+                            continue
+                        if status:
+                            ticket_status = normalized.get('status', '').lower()
+                            wanted = status.lower()
+                            if not (wanted in ticket_status or ticket_status in wanted):
+                                continue
+                        limited_tickets.append(normalized)
+                        if limit and len(limited_tickets) >= limit:
+                            break
                     
                     # Cache the tickets for quick reference
                     for ticket in limited_tickets:
@@ -2763,9 +2779,15 @@ Need more help? Just ask!
             dict: Ticket data dictionary or None if not found
         """
         try:
-            # First try to load from ticket cache
-            from nest.ai.ticket_utils import load_ticket_data
-            cached_tickets = load_ticket_data(include_specific_ticket=False)
+            # First try the indexed local store, which avoids loading every cached ticket
+            from nest.ai.ticket_utils import find_cached_ticket, load_ticket_data
+            found, cached_ticket = find_cached_ticket(ticket_id)
+            if cached_ticket:
+                normalized_ticket = self._normalize_ticket_data(cached_ticket)
+                return self._enhance_ticket_with_details(normalized_ticket, ticket_id)
+            
+            # Fall back to scanning the JSON ticket cache if the store is not populated yet
+            cached_tickets = [] if found else load_ticket_data(include_specific_ticket=False)
             
             if cached_tickets:
                 # Look for the ticket in cache by ID
@@ -2783,10 +2805,18 @@ Need more help? Just ask!
             # If not found in cache, try to load from API directly
             try:
                 from nest.utils.repairdesk_api import RepairDeskAPI
+                from nest.utils.ticket_index import get_ticket_id_index
                 api = RepairDeskAPI()
                 
-                # Try to get ticket by ID
-                api_ticket = api.get_ticket(ticket_id)
+                # Indexed ticket numbers map to their internal ID, bare numbers are taken
+                # as internal IDs, and unindexed T- numbers are looked up through the API
+                internal_id = get_ticket_id_index().resolve(ticket_id)
+                if internal_id is None:
+                    internal_id = api.get_numeric_ticket_id(ticket_id)
+                if internal_id is None:
+                    logging.warning(f"Could not resolve ticket {ticket_id} to an internal ID")
+                    return None
+                api_ticket = api.get_ticket(internal_id)
                 if api_ticket:
                     normalized_ticket = self._normalize_ticket_data(api_ticket)
                     enhanced_ticket = self._enhance_ticket_with_details(normalized_ticket, ticket_id)
@@ -2808,108 +2838,91 @@ Need more help? Just ask!
             raw_ticket: Raw ticket data from API or cache
             
         Returns:
-            dict: Normalized ticket data
+            dict: Normalized ticket data, or None if it cannot be normalized
         """
+        if not isinstance(raw_ticket, dict):
+            return None
         try:
-            # Handle different ticket data structures
-            if isinstance(raw_ticket, dict):
-                summary = raw_ticket.get('summary', {})
-                devices = raw_ticket.get('devices', [])
-                
-                # Extract basic information
-                ticket_data = {
-                    'id': summary.get('id') or summary.get('order_id', '').replace('T-', ''),
-                    'order_id': summary.get('order_id', ''),
-                    'status': 'Unknown',
-                    'customer': {'name': 'Unknown Customer'},
-                    'device': 'Unknown Device',
-                    'assigned_to': {'name': 'Unassigned'},
-                    'total_amount': 0,
-                    'created_at': summary.get('created_date', ''),
-                    'updated_at': summary.get('updated_date', ''),
-                    'description': '',
-                    'issue': ''
-                }
-                
-                # Extract customer information
-                customer = summary.get('customer', {})
-                if customer:
-                    ticket_data['customer'] = {
-                        'name': customer.get('fullName', 'Unknown Customer'),
-                        'email': customer.get('email', ''),
-                        'phone': customer.get('mobile', '')
-                    }
-                
-                # Extract device and status information
-                if devices and len(devices) > 0:
-                    device = devices[0]
-                    device_info = device.get('device', {})
-                    status_info = device.get('status', {})
-                    assigned_info = device.get('assigned_to', {})
-                    
-                    ticket_data['device'] = device_info.get('name', 'Unknown Device')
-                    ticket_data['status'] = status_info.get('name', 'Unknown')
-                    ticket_data['assigned_to'] = {
-                        'name': assigned_info.get('fullname', 'Unassigned'),
-                        'id': assigned_info.get('id', '')
-                    }
-                    
-                    # Extract repair items as description
-                    repair_items = device.get('repair_items', [])
-                    if repair_items:
-                        descriptions = [item.get('name', '') for item in repair_items if item.get('name')]
-                        ticket_data['description'] = ', '.join(descriptions)
-                        ticket_data['issue'] = ticket_data['description']
-                
-                # Extract total amount
-                ticket_data['total_amount'] = float(summary.get('total_amount', 0) or 0)
-            
-            # Extract comments and notes
-            comments_list = []
-            
-            # Get notes from the ticket
-            notes = raw_ticket.get('notes', [])
-            if notes:
-                for note in notes:
-                    if isinstance(note, dict):
-                        comment_text = note.get('msg_text', '')
+            from nest.utils.ticket_record import normalize_record
+            # The view is memoized per ticket content; each call gets its own copy
+            return normalize_record(raw_ticket).view("nestbot", self._build_ticket_view)
+        except Exception as e:
+            logging.error(f"Error normalizing ticket data: {str(e)}")
+            return None
+    
+    @staticmethod
+    def _build_ticket_view(record):
+        """Build NestBot's ticket fields from a normalized ticket record."""
+        raw_ticket = record.raw
+        ticket_data = {
+            'id': record.api_id or str(record.order_id or '').replace('T-', ''),
+            'order_id': record.order_id or '',
+            'status': record.device_status or 'Unknown',
+            'customer': {'name': 'Unknown Customer'},
+            'device': record.device or 'Unknown Device',
+            'assigned_to': {'name': 'Unassigned'},
+            'total_amount': float(record.total_amount or 0),
+            'created_at': record.created.isoformat() if record.created else '',
+            'updated_at': record.updated.isoformat() if record.updated else '',
+            'description': ', '.join(record.repair_items),
+            'issue': ', '.join(record.repair_items),
+        }
+        
+        # Extract customer information
+        if record.customer_name or record.customer_email or record.customer_mobile:
+            ticket_data['customer'] = {
+                'name': record.customer_name or 'Unknown Customer',
+                'email': record.customer_email or '',
+                'phone': record.customer_mobile or ''
+            }
+        
+        if record.technician or record.technician_id:
+            ticket_data['assigned_to'] = {
+                'name': record.technician or 'Unassigned',
+                'id': record.technician_id or ''
+            }
+        
+        # Extract comments and notes
+        comments_list = []
+        
+        # Get notes from the ticket
+        notes = raw_ticket.get('notes', [])
+        if notes:
+            for note in notes:
+                if isinstance(note, dict):
+                    comment_text = note.get('msg_text', '')
+                    if comment_text:
+                        comments_list.append({
+                            'id': note.get('id', ''),
+                            'text': comment_text,
+                            'user': note.get('user', 'Unknown'),
+                            'type': note.get('tittle', 'Note'),
+                            'created_on': note.get('created_on', ''),
+                            'device': note.get('devicename', '')
+                        })
+        
+        # Get comments from other possible fields
+        for field_name in ['comments', 'activity', 'ticket_notes']:
+            field_data = raw_ticket.get(field_name, [])
+            if field_data:
+                for item in field_data:
+                    if isinstance(item, dict):
+                        comment_text = (item.get('msg_text') or item.get('text')
+                                        or item.get('message') or item.get('content'))
                         if comment_text:
                             comments_list.append({
-                                'id': note.get('id', ''),
+                                'id': item.get('id', ''),
                                 'text': comment_text,
-                                'user': note.get('user', 'Unknown'),
-                                'type': note.get('tittle', 'Note'),
-                                'created_on': note.get('created_on', ''),
-                                'device': note.get('devicename', '')
+                                'user': item.get('user', 'Unknown'),
+                                'type': item.get('tittle') or item.get('type', field_name.title()),
+                                'created_on': item.get('created_on', ''),
+                                'device': item.get('devicename', '')
                             })
-            
-            # Get comments from other possible fields
-            for field_name in ['comments', 'activity', 'ticket_notes']:
-                field_data = raw_ticket.get(field_name, [])
-                if field_data:
-                    for item in field_data:
-                        if isinstance(item, dict):
-                            comment_text = item.get('msg_text') or item.get('text') or item.get('message') or item.get('content')
-                            if comment_text:
-                                comments_list.append({
-                                    'id': item.get('id', ''),
-                                    'text': comment_text,
-                                    'user': item.get('user', 'Unknown'),
-                                    'type': item.get('tittle') or item.get('type', field_name.title()),
-                                    'created_on': item.get('created_on', ''),
-                                    'device': item.get('devicename', '')
-                                })
-            
-            ticket_data['comments'] = comments_list
-            ticket_data['comment_count'] = len(comments_list)
-            
-            return ticket_data
-            
-            return None
-            
-        except Exception as e:
-            logging.error(f"Error normalizing ticket data: {str(e)}")
-            return None
+        
+        ticket_data['comments'] = comments_list
+        ticket_data['comment_count'] = len(comments_list)
+        
+        return ticket_data
     
     def _generate_ticket_summary_safe(self, ticket_data):
         """Generate a safe ticket summary without complex analysis.
@@ -3044,18 +3057,38 @@ Need more help? Just ask!
             logging.error(f"Error getting current user name: {str(e)}")
             return "Codey O'Connor"  # Fallback for demo
     
-    def _get_tickets_for_technician(self, technician_name):
+    def _get_tickets_for_technician(self, technician_name, limit=None):
         """Get all tickets assigned to a specific technician.
         
         Args:
             technician_name: Full name of the technician (e.g., 'Codey O'Connor')
+            limit: Maximum number of tickets to return, newest first (None for all)
             
         Returns:
             list: List of ticket dictionaries assigned to the technician
         """
         try:
+            # Query only this technician's tickets from the indexed local store
+            from nest.ai.ticket_utils import (
+                load_ticket_data,
+                page_cached_tickets,
+                query_cached_tickets,
+            )
+            if limit:
+                # Only the first pages of ticket bodies are read for a limited listing
+                store_tickets = page_cached_tickets(assigned_to=technician_name)
+                if store_tickets is not None:
+                    store_tickets = store_tickets[:limit]
+            else:
+                store_tickets = query_cached_tickets(assigned_to=technician_name)
+            if store_tickets is not None:
+                technician_tickets = [
+                    t for t in map(self._normalize_ticket_data, store_tickets) if t]
+                logging.info(
+                    f"Found {len(technician_tickets)} tickets assigned to {technician_name}")
+                return technician_tickets
+            
             # Load all tickets from cache/API
-            from nest.ai.ticket_utils import load_ticket_data
             all_tickets = load_ticket_data(include_specific_ticket=False)
             
             if not all_tickets:
@@ -3092,6 +3125,8 @@ Need more help? Just ask!
                     normalized_ticket = self._normalize_ticket_data(ticket)
                     if normalized_ticket:
                         technician_tickets.append(normalized_ticket)
+                        if limit and len(technician_tickets) >= limit:
+                            break
             
             logging.info(f"Found {len(technician_tickets)} tickets assigned to {technician_name}")
             return technician_tickets
@@ -3151,9 +3186,9 @@ Need more help? Just ask!
         try:
             if ticket_id:
                 # Get comments for specific ticket
-                from nest.ai.ticket_utils import load_ticket_data
-                tickets = load_ticket_data()
-                target_ticket = None
+                from nest.ai.ticket_utils import find_cached_ticket, load_ticket_data
+                found, target_ticket = find_cached_ticket(ticket_id)
+                tickets = [] if found else load_ticket_data()
                 
                 for ticket in tickets:
                     if isinstance(ticket, dict):
@@ -3216,20 +3251,38 @@ Need more help? Just ask!
             # Determine scope based on query
             query_lower = query.lower()
             
+            # Tickets whose number, customer, device, issue or notes match the query, best first
+            from nest.ai.ticket_utils import search_cached_tickets
+            matching = search_cached_tickets(query, limit=50) or []
+            
             if any(word in query_lower for word in ['my', 'assigned to me', 'i have']):
                 # User's tickets
                 current_user_name = self._get_current_user_name()
                 tickets = self._get_tickets_for_technician(current_user_name)
             elif any(word in query_lower for word in ['all', 'store', 'everyone', 'total']):
                 # All store tickets
+                # At most 20 tickets are used below, so only hydrate and normalize that many
                 from nest.ai.ticket_utils import load_ticket_data
-                all_tickets = load_ticket_data()
-                tickets = [self._normalize_ticket_data(t) for t in all_tickets if self._normalize_ticket_data(t)]
+                tickets = []
+                for ticket in load_ticket_data(lazy=True):
+                    normalized = self._normalize_ticket_data(ticket)
+                    if normalized:
+                        tickets.append(normalized)
+                        if len(tickets) >= 20:
+                            break
             else:
                 # Default to user's tickets for personalized analysis
                 current_user_name = self._get_current_user_name()
                 tickets = self._get_tickets_for_technician(current_user_name)
             
+            if matching:
+                # Prefer the matches within the scope, ranked by relevance
+                in_scope = {str(ticket.get('order_id')) for ticket in tickets}
+                matched = [t for t in map(self._normalize_ticket_data, matching) if t]
+                scoped = [ticket for ticket in matched if str(ticket.get('order_id')) in in_scope]
+                if scoped or 'all' in query_lower or 'store' in query_lower:
+                    return (scoped or matched)[:20]
+            
             # Filter by query keywords if specific terms are mentioned
             if any(word in query_lower for word in ['urgent', 'priority', 'asap']):
                 # Focus on high-priority tickets
@@ -7,7 +7,7 @@ for use with the NestBot AI assistant.
 """
 
 import os
-import json
+import re
 import logging
 import tkinter as tk
 from tkinter import messagebox
@@ -158,6 +158,17 @@ def load_ticket(ticket_number: str, display_callback: Optional[Callable] = None)
         return False
 
 
+# Different patterns to match ticket numbers, compiled once
+_TICKET_NUMBER_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE) for pattern in (
+        r'T-\d+',                 # Match T-12345 format
+        r'[Tt]\d+',               # Match T12345 or t12345 format
+        r'ticket\s+(?:no\.?\s*)?\d+',  # Match "ticket 12345" or "ticket no. 12345" 
+        r'ticket\s+(?:no\.?\s*)?[Tt]-?\d+'  # Match "ticket T-12345" or "ticket no. T12345"
+    )
+]
+
+
 def extract_ticket_numbers(message_text):
     """
     Extract ticket numbers from a message text.
@@ -168,20 +179,10 @@ def extract_ticket_numbers(message_text):
     Returns:
         list: List of extracted ticket numbers
     """
-    import re
-    
-    # Different patterns to match ticket numbers
-    patterns = [
-        r'T-\d+',                 # Match T-12345 format
-        r'[Tt]\d+',               # Match T12345 or t12345 format
-        r'ticket\s+(?:no\.?\s*)?\d+',  # Match "ticket 12345" or "ticket no. 12345" 
-        r'ticket\s+(?:no\.?\s*)?[Tt]-?\d+'  # Match "ticket T-12345" or "ticket no. T12345"
-    ]
-    
     ticket_numbers = []
     
-    for pattern in patterns:
-        matches = re.findall(pattern, message_text, re.IGNORECASE)
+    for pattern in _TICKET_NUMBER_PATTERNS:
+        matches = pattern.findall(message_text)
         for match in matches:
             # Extract just the numeric part or the T-numeric part
             if match.upper().startswith('T') and not match.startswith('ticket'):
@@ -204,40 +205,53 @@ def extract_ticket_numbers(message_text):
                     ticket_numbers.append(num.upper())
     
     # Deduplicate and clean up
-    unique_tickets = []
+    unique_tickets = {}
     for ticket in ticket_numbers:
         # Standardize format to T-XXXXX
         if ticket.upper().startswith('T') and not '-' in ticket:
             ticket = f"T-{ticket[1:]}"
-        ticket = ticket.upper()
-        if ticket not in unique_tickets:
-            unique_tickets.append(ticket)
+        unique_tickets.setdefault(ticket.upper(), None)
     
-    return unique_tickets
+    return list(unique_tickets)
 
-def load_ticket_data(include_specific_ticket=True):
+def load_ticket_data(include_specific_ticket=True, lazy=False):
     """
     Load tickets from the ticket_cache.json file and optionally include specific ticket data
     
     Args:
         include_specific_ticket: If True, also look for a specific ticket file to include
+        lazy: If True and the local store is populated, return a LazyTicketList that
+            only loads full ticket bodies as they are accessed
             
     Returns:
-        list: List of ticket data dictionaries
+        list: List of ticket data dictionaries (or a read-only LazyTicketList)
     """
     try:
         from nest.utils.platform_paths import PlatformPaths
         platform_paths = PlatformPaths()
         cache_dir = platform_paths.ensure_dir_exists(platform_paths.get_cache_dir())
         cache_path = cache_dir / 'ticket_cache.json'
+        specific_ticket_path = cache_dir / 'specific_ticket.json'
+        
+        if lazy:
+            store = _get_populated_store()
+            if store is not None:
+                from nest.utils.cache_io import read_cache_file
+                from nest.utils.ticket_cache_reader import LazyTicketList
+                pinned = []
+                if include_specific_ticket and specific_ticket_path.exists():
+                    specific_ticket = read_cache_file(specific_ticket_path)
+                    if specific_ticket and specific_ticket.get('id'):
+                        pinned.append(specific_ticket)
+                return LazyTicketList.from_store(store, pinned=pinned)
         
         # Check if the cache file exists
         if not os.path.exists(cache_path):
             return []
             
         # Load the cache
-        with open(cache_path, 'r', encoding='utf-8') as f:
-            cache_data = json.load(f)
+        from nest.utils.cache_io import read_cache_file
+        cache_data = read_cache_file(cache_path)
             
         # Extract the tickets from the cache structure
         if isinstance(cache_data, dict) and 'items' in cache_data:
@@ -250,13 +264,11 @@ def load_ticket_data(include_specific_ticket=True):
             
         # If we don't need to include a specific ticket, or if there's no specific ticket file,
         # just return the regular cache
-        specific_ticket_path = cache_dir / 'specific_ticket.json'
         if not include_specific_ticket or not specific_ticket_path.exists():
             return tickets
             
         # Load the specific ticket data
-        with open(specific_ticket_path, 'r', encoding='utf-8') as f:
-            specific_ticket = json.load(f)
+        specific_ticket = read_cache_file(specific_ticket_path)
             
         # Add the specific ticket to the beginning of the list if it's not already there
         if specific_ticket and specific_ticket.get('id'):
@@ -272,6 +284,99 @@ def load_ticket_data(include_specific_ticket=True):
         return []
 
 
+def _get_populated_store():
+    """Get the local ticket store, or None if it has never been synced."""
+    try:
+        from nest.utils.cache_utils import get_local_store
+        store = get_local_store()
+        return store if store.last_synced('tickets') is not None else None
+    except Exception as e:
+        logging.warning(f"Local ticket store unavailable: {e}")
+        return None
+
+
+def find_cached_ticket(ticket_id) -> tuple:
+    """
+    Look up one cached ticket by ticket number or internal ID without loading the whole cache
+    
+    Args:
+        ticket_id: Ticket number (T-12345 or 12345) or internal RepairDesk ID
+        
+    Returns:
+        tuple: (searched, ticket) where searched is False if the local store is not
+            populated yet and the caller should fall back to load_ticket_data()
+    """
+    store = _get_populated_store()
+    if store is None:
+        return False, None
+    
+    ticket_str = str(ticket_id).strip()
+    numeric_part = ticket_str[2:] if ticket_str.upper().startswith('T-') else ticket_str
+    ticket = store.get_ticket(order_id=f"T-{numeric_part}")
+    if ticket is None and numeric_part.isdigit():
+        ticket = store.get_ticket(ticket_id=numeric_part)
+    return True, ticket
+
+
+def query_cached_tickets(**filters) -> Optional[List[Dict]]:
+    """
+    Query a slice of cached tickets from the local store
+    
+    Args:
+        **filters: Filters accepted by LocalStore.query_tickets (status, assigned_to, ...)
+        
+    Returns:
+        list: Matching raw tickets, or None if the local store is not populated yet
+    """
+    store = _get_populated_store()
+    if store is None:
+        return None
+    return store.query_tickets(**filters)
+
+
+def page_cached_tickets(**filters):
+    """
+    Open a lazy view of matching cached tickets that loads their bodies page by page
+    
+    Args:
+        **filters: Filters accepted by LocalStore.ticket_summaries (status, assigned_to, ...)
+        
+    Returns:
+        LazyTicketList: Matching raw tickets, newest first, or None if the local
+            store is not populated yet
+    """
+    store = _get_populated_store()
+    if store is None:
+        return None
+    from nest.utils.ticket_cache_reader import LazyTicketList
+    return LazyTicketList.from_store(store, **filters)
+
+
+def search_cached_tickets(query: str, limit: int = 20) -> Optional[List[Dict]]:
+    """
+    Find cached tickets matching a free-text query through the ticket search index
+    
+    Args:
+        query: Words to look for in ticket numbers, customers, devices, issues,
+            technicians and notes
+        limit: Maximum number of tickets to return
+        
+    Returns:
+        list: Matching raw tickets, best match first, or None if the local store
+            is not populated yet
+    """
+    store = _get_populated_store()
+    if store is None:
+        return None
+    from nest.utils.ticket_search import get_ticket_search_index
+    index = get_ticket_search_index()
+    results = index.search(query, limit=limit, match_all=False)
+    ticket_ids = [index.ticket_id(order_id) for order_id, _ in results]
+    tickets = store.get_tickets_by_id([int(ticket_id) for ticket_id in ticket_ids if ticket_id])
+    return [tickets[int(ticket_id)] for ticket_id in ticket_ids
+            if ticket_id and int(ticket_id) in tickets]
+
+
 def get_user_tickets(user_id: str, status: str = 'open', limit: int = 50) -> List[Dict[str, Any]]:
     """
     Get tickets assigned to a specific user.
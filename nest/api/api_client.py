@@ -1,6 +1,10 @@
-import requests
 from nest.utils.logger import log_message
 from nest.utils.config import get_repairdesk_key
+from nest.utils.detail_store import get_detail_store
+from nest.utils.ticket_search import get_ticket_search_index
+from nest.utils.http_transport import get_transport
+from nest.utils.rate_limiter import send_with_retries
+from nest.utils.ticket_events import TICKET_NOTE_ADDED, publish_ticket_mutation
 
 
 class RepairDeskClient:
@@ -19,7 +23,7 @@ class RepairDeskClient:
         url = f"{self.base_url}/tickets?api_key={self.api_key}&page={page}"
         log_message(f"Fetching tickets from URL: {url}")
         try:
-            response = requests.get(url)
+            response = send_with_retries(lambda: get_transport().get(url), "list")
             response.raise_for_status()
             data = response.json()
             log_message(f"API response received successfully (data not shown)")
@@ -28,7 +32,16 @@ class RepairDeskClient:
             log_message(f"Error fetching tickets: {e}")
             return {}
 
-    def get_all_tickets(self, force_refresh=False):
+    def get_all_tickets(self, force_refresh=False, page_callback=None):
+        """Fetch every page of tickets, newest first.
+        
+        Args:
+            force_refresh: Bypass cached responses
+            page_callback: Optional callback fired as each page arrives with
+                (page_tickets, is_complete, total_tickets_so_far, pagination_info);
+                pagination_info holds current_page, total_pages and total_items
+                (the last two are None if the API does not report them)
+        """
         page = 1
         tickets = []
         while True:
@@ -36,12 +49,22 @@ class RepairDeskClient:
             if data:
                 tickets_page = data.get("data", {}).get("ticketData", [])
                 tickets.extend(tickets_page)
-                pagination = data.get("data", {}).get("pagination", {})
-                if pagination.get("next_page_exist"):
+                pagination = data.get("data", {}).get("pagination", {}) or {}
+                has_next = bool(pagination.get("next_page_exist"))
+                if page_callback:
+                    page_callback(tickets_page, not has_next, len(tickets), {
+                        "current_page": page,
+                        "total_pages": pagination.get("total_pages"),
+                        "total_items": pagination.get("total_records") or pagination.get("total"),
+                    })
+                if has_next:
                     page = pagination.get("next_page")
                 else:
                     break
             else:
+                if page_callback:
+                    page_callback([], True, len(tickets),
+                                  {"current_page": page, "total_pages": None, "total_items": None})
                 break
             
         # After getting all tickets, create ticket detail files
@@ -53,18 +76,16 @@ class RepairDeskClient:
         return tickets
     
     def _create_ticket_detail_files(self, tickets):
-        """Create individual ticket detail JSON files using efficient batch processing.
+        """Store ticket details using efficient batch processing.
         
         This function uses the main tickets API with batch fetching (1000 at a time) to get
-        detailed ticket information and saves it to individual files named ticket_detail_T-XXXXX.json.
+        detailed ticket information and saves it to the detail store under its T-XXXXX number.
         This is much more efficient than making individual API calls for each ticket.
         
         Args:
             tickets: List of tickets to create detail files for
         """
         # Import necessary modules at the beginning of the function
-        import os
-        import json
         import time
         from datetime import datetime
         
@@ -76,9 +97,7 @@ class RepairDeskClient:
             log_message("ERROR: API key is missing, cannot create ticket detail files")
             return
         
-        # Create ticket data directory if it doesn't exist
-        from nest.utils.cache_utils import get_ticket_detail_directory
-        cache_dir = get_ticket_detail_directory()
+        store = get_detail_store()
         
         log_message(f"🚀 BATCH PROCESSING: Creating ticket detail files for {len(tickets)} tickets using efficient batch method")
         
@@ -86,7 +105,7 @@ class RepairDeskClient:
         error_count = 0
         
         # Process tickets in batches - the tickets already contain detailed information from batch API calls
-        # We just need to save them to individual files for compatibility
+        # We just need to save them to the detail store for compatibility
         for ticket in tickets:
             try:
                 # Extract the ticket ID and order ID
@@ -102,11 +121,11 @@ class RepairDeskClient:
                 # Format the ticket ID for file name (ensure it starts with T-)
                 formatted_id = f"T-{order_id}" if not str(order_id).startswith("T-") else str(order_id)
                 
-                # Check if the detail file was updated in the last 1 hour (reduced from 24 hours for better freshness)
-                file_path = os.path.join(cache_dir, f"ticket_detail_{formatted_id}.json")
-                if os.path.exists(file_path):
-                    file_stat = os.stat(file_path)
-                    file_age_hours = (time.time() - file_stat.st_mtime) / 3600
+                # Check if the details were stored in the last 1 hour
+                # (reduced from 24 hours for better freshness)
+                written_at = store.written_at(formatted_id)
+                if written_at is not None:
+                    file_age_hours = (time.time() - written_at) / 3600
                     
                     if file_age_hours < 1:
                         log_message(f"DEBUG: Skipping recent ticket detail file: {order_id} (age: {file_age_hours:.1f} hours)")
@@ -121,12 +140,11 @@ class RepairDeskClient:
                     'processed_at': datetime.now().isoformat()
                 }
                 
-                # Save the detailed information to a file
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(detailed_data, f, indent=2)
+                # Save the detailed information to the detail store
+                store.put(formatted_id, detailed_data)
                 
                 success_count += 1
-                log_message(f"DEBUG: Successfully saved ticket detail file: {file_path}")
+                log_message(f"DEBUG: Successfully stored ticket details: {formatted_id}")
                 
             except Exception as e:
                 log_message(f"ERROR: Unexpected error creating ticket detail file for {ticket_id}: {e}")
@@ -139,10 +157,11 @@ class RepairDeskClient:
         payload = {"id": ticket_id, "note": note, "type": note_type, "is_flag": is_flag}
         log_message(f"Sending note to URL: {url} with payload: {payload}")
         try:
-            response = requests.post(url, json=payload)
+            response = get_transport().post(url, json=payload)
             response.raise_for_status()
             data = response.json()
             log_message(f"Note added response: {data}")
+            publish_ticket_mutation(TICKET_NOTE_ADDED, ticket_id=ticket_id)
             return data
         except Exception as e:
             log_message(f"Error adding note to ticket: {e}")
@@ -173,7 +192,7 @@ class RepairDeskClient:
         log_message(f"DEBUG: API request - Ticket ID: {ticket_id}, API ID: {api_id}, Using actual_api_id: {True if actual_api_id else False}")
         log_message(f"Fetching ticket details from URL: {url}")
         try:
-            response = requests.get(url)
+            response = send_with_retries(lambda: get_transport().get(url), "detail")
             response.raise_for_status()
             data = response.json()
             
@@ -184,30 +203,17 @@ class RepairDeskClient:
                 
             log_message(f"Ticket details fetched successfully for ID: {ticket_id}")
             
-            # Save the raw API response to a JSON file in the cache directory
+            # Save the raw API response to the detail store
             try:
-                import os
-                import json
-                from datetime import datetime
-                
-                # Create ticket data directory if it doesn't exist
-                from nest.utils.cache_utils import get_ticket_detail_directory
-                cache_dir = get_ticket_detail_directory()
-                
-                # Create filename using only the ticket_id (without timestamp)
+                # Key the record by ticket number so it replaces the previous one
                 display_id = ticket_id
                 if isinstance(display_id, str) and not display_id.startswith("T-"):
                     display_id = f"T-{display_id}"
                     
-                # Use consistent filename without timestamp so it gets overwritten
-                filename = f"ticket_detail_{display_id}.json"
-                filepath = os.path.join(cache_dir, filename)
-                
-                # Save the data to a file with pretty formatting
-                with open(filepath, "w") as f:
-                    json.dump(data, f, indent=2)
+                get_detail_store().put(str(display_id), data)
+                get_ticket_search_index().update_details(str(display_id), data)
                     
-                log_message(f"Saved raw API response to {filepath}")
+                log_message(f"Saved raw API response for ticket {display_id}")
             except Exception as e:
                 log_message(f"Error saving API response to file: {e}", level="error")
             
@@ -21,6 +21,7 @@ except ImportError:
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
+import re
 import subprocess
 import logging
 import platform
@@ -85,6 +86,358 @@ class FixedHeaderTreeview(ttk.Treeview):
         # Override _create_heading to ensure our style is used
         return ttk.Label(self, style="Custom.Treeview.Heading", **kw)
 
+
+def _natural_sort_key(value) -> tuple:
+    """Sort key that orders embedded numbers numerically (T-99 before T-100)."""
+    parts = re.split(r'(\d+)', str(value).lower())
+    return tuple(int(part) if index % 2 else part for index, part in enumerate(parts))
+
+
+class VirtualTreeview(FixedHeaderTreeview):
+    """Treeview that only materializes the visible rows of a large data model.
+
+    Rows are kept in a plain Python list and rendered into a small pool of
+    Treeview items sized to the visible area plus a buffer. Scrolling rewrites
+    the values of the pooled items instead of inserting or deleting any, and
+    items whose row did not change are not touched at all, so the cost of a
+    refresh does not depend on the number of rows. Sorting and
+    selection live on the data model, so they survive scrolling and refreshes.
+
+    Item IDs returned by selection() and identify_row() belong to the pool,
+    and item(iid, "values") returns the row currently shown in that item, so
+    selection handlers written for a plain Treeview keep working. Use
+    row_for_item() or selected_rows() to get the underlying row.
+
+    Scrolling moves a selected row to another pooled item, which makes the
+    widget emit <<TreeviewSelect>>. The event only reaches handlers bound on
+    the widget when the selected row keys actually changed.
+    """
+
+    def __init__(self, master=None, row_values: Optional[Callable[[Any], tuple]] = None,
+                 row_key: Optional[Callable[[Any], Any]] = None,
+                 row_tags: Optional[Callable[[Any], tuple]] = None,
+                 buffer_rows: int = 5, **kw):
+        """Initialize the view.
+
+        Args:
+            master: Parent widget
+            row_values: Returns the column values for a row (defaults to the row itself)
+            row_key: Returns a row's identity, used to keep selection across
+                refreshes (defaults to the first column value)
+            row_tags: Returns the tags for a row
+            buffer_rows: Extra pooled items kept below the visible rows
+            **kw: Treeview options
+        """
+        self._row_values = row_values or tuple
+        self._row_key = row_key or (lambda row: self._row_values(row)[0])
+        self._row_tags = row_tags or (lambda row: ())
+        self.buffer_rows = max(0, buffer_rows)
+
+        self._rows: List[Any] = []
+        self._first = 0
+        self._pool: List[str] = []
+        self._shown: Dict[str, int] = {}  # pooled item -> index of the row it shows
+        self._written: Dict[str, tuple] = {}  # pooled item -> (values, tags) last written
+        self._selected_keys = set()
+        self._reported_keys = set()  # Selected keys last passed on to <<TreeviewSelect>> handlers
+        self._cursor: Optional[int] = None
+        self._sort: Optional[Tuple[Callable, bool]] = None
+        self._sort_column: Optional[Tuple[str, bool]] = None
+        self._placeholder: Optional[Tuple[tuple, tuple]] = None
+        self._yscrollcommand = kw.pop('yscrollcommand', None)
+        self._render_pending = False
+
+        super().__init__(master, **kw)
+
+        # Bind on a private tag so later bind() calls on the widget cannot replace these
+        tag = f"VirtualTreeview{id(self)}"
+        self.bindtags((tag,) + self.bindtags())
+        self.bind_class(tag, '<Configure>', lambda e: self._schedule_render())
+        self.bind_class(tag, '<<TreeviewSelect>>', lambda e: self._on_select())
+        self.bind_class(tag, '<MouseWheel>', self._on_mousewheel)
+        self.bind_class(tag, '<Button-4>', lambda e: self._scroll_units(-3))
+        self.bind_class(tag, '<Button-5>', lambda e: self._scroll_units(3))
+        for sequence, step in (('<Up>', -1), ('<Down>', 1), ('<Prior>', 'page-'),
+                               ('<Next>', 'page+'), ('<Home>', 'home'), ('<End>', 'end')):
+            self.bind_class(tag, sequence, lambda e, s=step: self._move_cursor(s))
+
+    # Data model
+
+    @property
+    def rows(self) -> List[Any]:
+        """The rows in display order. Treat as read-only; use the methods below to change it."""
+        return self._rows
+
+    def set_rows(self, rows) -> None:
+        """Replace the rows, keeping the current sort, selection and scroll position."""
+        self._rows = list(rows)
+        self._placeholder = None
+        if self._sort:
+            self._rows.sort(key=self._sort[0], reverse=self._sort[1])
+        self._cursor = None
+        self._render()
+
+    def append_rows(self, rows) -> None:
+        """Add rows, re-sorting if a sort is active."""
+        self._placeholder = None
+        self._rows.extend(rows)
+        if self._sort:
+            self._rows.sort(key=self._sort[0], reverse=self._sort[1])
+        self._render()
+
+    def show_placeholder(self, values: tuple, tags: tuple = ()) -> None:
+        """Clear the rows and show a single non-selectable row, e.g. 'Loading...'."""
+        self._rows = []
+        self._placeholder = (values, tags)
+        self._render()
+
+    def update_row(self, key, row) -> bool:
+        """Replace the row with the given key.
+
+        Returns:
+            True if the row was found
+        """
+        for index, existing in enumerate(self._rows):
+            if self._row_key(existing) == key:
+                self._rows[index] = row
+                self._render()
+                return True
+        return False
+
+    def remove_row(self, key) -> bool:
+        """Remove the row with the given key.
+
+        Returns:
+            True if the row was found
+        """
+        for index, existing in enumerate(self._rows):
+            if self._row_key(existing) == key:
+                del self._rows[index]
+                self._selected_keys.discard(key)
+                self._render()
+                return True
+        return False
+
+    def sort_rows(self, key: Callable[[Any], Any], reverse: bool = False) -> None:
+        """Sort the rows; the sort is kept when rows are replaced."""
+        self._sort = (key, reverse)
+        self._sort_column = None
+        self._rows.sort(key=key, reverse=reverse)
+        self._render()
+
+    def sort_by_column(self, column: str, reverse: Optional[bool] = None) -> None:
+        """Sort by a column's displayed value, toggling direction on repeated calls.
+
+        Args:
+            column: Column identifier
+            reverse: Sort direction; None toggles when the column is already sorted
+        """
+        index = list(self['columns']).index(column)
+        if reverse is None:
+            reverse = bool(self._sort_column and self._sort_column == (column, False))
+        self.sort_rows(lambda row: _natural_sort_key(self._row_values(row)[index]), reverse)
+        self._sort_column = (column, reverse)
+
+    def row_for_item(self, iid: str) -> Optional[Any]:
+        """Get the row shown in a pooled item."""
+        index = self._shown.get(iid)
+        return self._rows[index] if index is not None else None
+
+    def selected_rows(self) -> List[Any]:
+        """Get the selected rows, including rows scrolled out of view."""
+        return [row for row in self._rows if self._row_key(row) in self._selected_keys]
+
+    def select_key(self, key, see: bool = True) -> None:
+        """Select the row with the given key and optionally scroll it into view."""
+        self._selected_keys = {key}
+        for index, row in enumerate(self._rows):
+            if self._row_key(row) == key:
+                self._cursor = index
+                if see:
+                    self._scroll_into_view(index)
+                break
+        self._render()
+
+    def see_index(self, index: int) -> None:
+        """Scroll so the row at the given index is visible."""
+        self._scroll_into_view(index)
+        self._render()
+
+    def _scroll_into_view(self, index: int) -> None:
+        visible = self._visible_count()
+        if index < self._first:
+            self._first = index
+        elif index >= self._first + visible:
+            self._first = index - visible + 1
+
+    # Scrolling
+
+    def configure(self, cnf=None, **kw):
+        if isinstance(cnf, str):
+            return super().configure(cnf)
+        options = dict(cnf or {}, **kw)
+        # Scroll commands are driven by the virtual position, not the pooled items
+        for name in [name for name in options if name.startswith('yscroll')]:
+            self._yscrollcommand = options.pop(name)
+            self._update_scrollbar()
+        if options or cnf is None and not kw:
+            return super().configure(**options)
+
+    config = configure
+
+    def yview(self, *args):
+        if not args:
+            return self._fractions()
+        total = len(self._rows)
+        if args[0] == 'moveto':
+            self._first = int(float(args[1]) * total)
+        elif args[0] == 'scroll':
+            amount = int(args[1])
+            if len(args) > 2 and args[2].startswith('page'):
+                amount *= max(1, self._visible_count() - 1)
+            self._first += amount
+        self._render()
+
+    def yview_moveto(self, fraction):
+        self.yview('moveto', fraction)
+
+    def yview_scroll(self, number, what):
+        self.yview('scroll', number, what)
+
+    def _scroll_units(self, amount: int) -> str:
+        self.yview('scroll', amount, 'units')
+        return "break"
+
+    def _on_mousewheel(self, event) -> str:
+        # Windows reports multiples of 120 per notch, macOS small deltas
+        steps = -event.delta // 120 if abs(event.delta) >= 120 else -event.delta
+        return self._scroll_units(steps * 3)
+
+    def _move_cursor(self, step) -> str:
+        if not self._rows:
+            return "break"
+        visible = self._visible_count()
+        current = self._cursor if self._cursor is not None else self._first - 1
+        if step == 'home':
+            index = 0
+        elif step == 'end':
+            index = len(self._rows) - 1
+        elif step in ('page-', 'page+'):
+            index = current + (visible - 1) * (1 if step == 'page+' else -1)
+        else:
+            index = current + step
+        index = max(0, min(len(self._rows) - 1, index))
+        self.select_key(self._row_key(self._rows[index]))
+        return "break"
+
+    def _fractions(self) -> Tuple[float, float]:
+        total = len(self._rows)
+        if not total:
+            return 0.0, 1.0
+        return self._first / total, min(1.0, (self._first + self._visible_count()) / total)
+
+    def _update_scrollbar(self) -> None:
+        if self._yscrollcommand:
+            try:
+                self._yscrollcommand(*self._fractions())
+            except tk.TclError:
+                pass
+
+    # Rendering
+
+    def _visible_count(self) -> int:
+        """Get the number of rows that fit in the widget."""
+        try:
+            rowheight = int(ttk.Style().lookup(self.cget('style') or 'Treeview', 'rowheight') or 20)
+        except (tk.TclError, ValueError):
+            rowheight = 20
+        height = self.winfo_height()
+        if height <= 1:
+            # Not mapped yet; fall back to the configured height in rows
+            return max(1, int(self.cget('height') or 10))
+        header = 0
+        if self._pool:
+            bbox = self.bbox(self._pool[0])
+            header = bbox[1] if bbox else 0
+        return max(1, (height - header) // rowheight)
+
+    def _schedule_render(self) -> None:
+        if not self._render_pending:
+            self._render_pending = True
+            self.after_idle(self._render)
+
+    def _render(self) -> None:
+        """Show the rows from the current scroll position in the pooled items."""
+        self._render_pending = False
+        try:
+            if not self.winfo_exists():
+                return
+        except tk.TclError:
+            return
+
+        visible = self._visible_count()
+        self._first = max(0, min(self._first, len(self._rows) - visible))
+        window = self._rows[self._first:self._first + visible + self.buffer_rows]
+        needed = len(window) or (1 if self._placeholder else 0)
+
+        # Grow or shrink the pool; existing items are reused, never recreated
+        while len(self._pool) < needed:
+            self._pool.append(super().insert('', 'end'))
+        while len(self._pool) > needed:
+            iid = self._pool.pop()
+            self._written.pop(iid, None)
+            super().delete(iid)
+
+        self._shown = {}
+        selected = []
+        if window:
+            for offset, (iid, row) in enumerate(zip(self._pool, window)):
+                self._write_item(iid, tuple(self._row_values(row)), tuple(self._row_tags(row)))
+                self._shown[iid] = self._first + offset
+                if self._row_key(row) in self._selected_keys:
+                    selected.append(iid)
+        elif self._placeholder:
+            self._write_item(self._pool[0], tuple(self._placeholder[0]),
+                             tuple(self._placeholder[1]))
+
+        if tuple(selected) != tuple(super().selection()):
+            super().selection_set(selected)
+        if self._cursor is not None and self._first <= self._cursor < self._first + len(window):
+            self.focus(self._pool[self._cursor - self._first])
+
+        # Keep the pooled items' own scroll position pinned to the top
+        super().yview('moveto', 0)
+        self._update_scrollbar()
+
+    def _write_item(self, iid: str, values: tuple, tags: tuple) -> None:
+        """Update a pooled item, skipping the widget call if it already shows these values."""
+        if self._written.get(iid) != (values, tags):
+            self.item(iid, values=values, tags=tags)
+            self._written[iid] = (values, tags)
+
+    def _on_select(self) -> Optional[str]:
+        """Update the model from the widget, hiding events that did not change the selection."""
+        self._sync_selection()
+        if self._selected_keys == self._reported_keys:
+            # Only the pooled items moved, e.g. while scrolling; the same rows are selected
+            return "break"
+        self._reported_keys = set(self._selected_keys)
+        return None
+
+    def _sync_selection(self) -> None:
+        """Mirror a selection made in the widget into the data model."""
+        shown_keys = {self._row_key(self._rows[index]) for index in self._shown.values()}
+        picked = {self._row_key(self._rows[self._shown[iid]])
+                  for iid in super().selection() if iid in self._shown}
+        if self.cget('selectmode') == 'browse' and picked:
+            self._selected_keys = picked
+        else:
+            # Rows scrolled out of view stay selected
+            self._selected_keys = (self._selected_keys - shown_keys) | picked
+        for iid in super().selection():
+            if iid in self._shown:
+                self._cursor = self._shown[iid]
+
 # Fix module import issues when running directly
 if __name__ == '__main__':
     # Add the parent directory to the Python path so 'nest' can be found
@@ -1113,16 +1466,8 @@ Your session was locked due to inactivity""",
         except Exception as e:
             logging.error(f"Error during logout cleanup: {e}")
             
-        # Clean up any open modules
-        for module_name, module_instance in list(self.modules.items()):
-            try:
-                if hasattr(module_instance, 'destroy'):
-                    module_instance.destroy()
-                    logging.info(f"Properly destroying module: {module_name}")
-            except Exception as e:
-                logging.error(f"Error destroying module {module_name}: {e}")
-        
-        self.modules.clear()
+        # Clean up any open modules, including hidden and preloaded ones
+        self._get_module_manager().clear()
         self.active_module = None
         
         # Return to login screen
@@ -1758,31 +2103,101 @@ Your session was locked due to inactivity""",
         widget.bind("<Enter>", enter)
         widget.bind("<Leave>", leave)
 
-    def show_module(self, module_name: str, **kwargs):
-        """Load and display a specific module."""
-        # First properly clean up any existing modules
-        if hasattr(self, 'modules') and self.active_module in self.modules:
+    def _get_module_manager(self):
+        """Get the manager that keeps module frames alive between navigations."""
+        if getattr(self, '_module_manager', None) is None:
+            from nest.utils.module_lifecycle import (
+                ModuleLifecycleManager, DEFAULT_KEEP_ALIVE, DEFAULT_PRELOAD_DELAY_MS,
+                DEFAULT_PRELOADABLE
+            )
             try:
-                # Try to properly destroy the module if it exists
-                old_module = self.modules.get(self.active_module)
-                if old_module and hasattr(old_module, 'destroy'):
-                    logging.info(f"Properly destroying module: {self.active_module}")
-                    old_module.destroy()
-                    # Allow time for proper cleanup
-                    self.root.update_idletasks()
-            except Exception as e:
-                logging.error(f"Error cleaning up module {self.active_module}: {e}")
-                
-        # Now clear any remaining content to be safe
-        for widget in self.content_frame.winfo_children():
+                from nest.utils.config_util import load_config
+                settings = load_config().get("modules", {}) or {}
+            except Exception:
+                settings = {}
+            self._module_manager = ModuleLifecycleManager(
+                self.root,
+                self._create_module,
+                modules=self.modules,
+                keep_alive=settings.get("keep_alive", DEFAULT_KEEP_ALIVE),
+                memory_limit_mb=settings.get("memory_limit_mb"),
+                preload=settings.get("preload", True),
+                preload_delay_ms=settings.get("preload_delay_ms", DEFAULT_PRELOAD_DELAY_MS),
+                preloadable=settings.get("preloadable", DEFAULT_PRELOADABLE),
+                on_first_show=self._on_module_first_shown,
+            )
+        return self._module_manager
+
+    def _create_module(self, module_name: str, kwargs):
+        """Build a module instance inside the content frame without packing it."""
+        # Use dynamic import to load module class
+        if module_name == "dashboard":
+            from nest.ui.dashboard import DashboardModule
+
+            module = DashboardModule(self.content_frame, current_user=self.current_user, app=self)
+        elif module_name == "tickets":
+            from nest.ui.tickets import TicketsModule
+
+            action = kwargs.get("action", None)
+            module = TicketsModule(
+                self.content_frame, current_user=self.current_user, action=action, app=self
+            )
+        elif module_name == "customers":
+            from nest.ui.customers import CustomersModule
+
+            # Pass current_user but don't pass action to CustomersModule
+            module = CustomersModule(self.content_frame, current_user=self.current_user, app=self)
+        elif module_name == "inventory":
+            from nest.ui.inventory import InventoryModule
+
+            module = InventoryModule(self.content_frame, app=self)
+        elif module_name == "appointments":
+            from nest.ui.appointments import AppointmentsModule
+
+            module = AppointmentsModule(self.content_frame, app=self)
+        elif module_name == "pc_tools":
+            from nest.ui.pc_tools import PCToolsModule
+
             try:
-                widget.destroy()
-            except Exception as e:
-                logging.error(f"Error destroying widget: {e}")
-                
-        # Allow destroyed widgets to be fully processed
-        self.root.update_idletasks()
+                module = PCToolsModule(self.content_frame, current_user=self.current_user, app=self)
+            except TypeError:
+                module = PCToolsModule(self.content_frame, current_user=self.current_user)
+        elif module_name == "ios_tools":
+            from nest.ui.ios_tools import IOSToolsModule
+
+            module = IOSToolsModule(self.content_frame, app=self)
+        elif module_name == "android_tools":
+            from nest.ui.android_tools import AndroidToolsModule
+
+            module = AndroidToolsModule(self.content_frame, app=self)
+        elif module_name == "reports":
+            from nest.ui.reports import ReportsModule
+
+            report_type = kwargs.get("report_type", None)
+            module = ReportsModule(self.content_frame, report_type=report_type, app=self)
+        else:
+            # Generic placeholder for unknown modules
+            module = self.create_placeholder_module(f"{module_name.title()} Module")
+
+        return module
+
+    def _on_module_first_shown(self, module_name, module):
+        """Apply global styling once a newly built module is shown."""
+        # Enforce consistent fonts after module is loaded
+        try:
+            from nest.utils.font_manager import enforce_global_fonts
+            enforce_global_fonts(self.root)
+            logging.info(f"Enforced consistent fonts for {module_name} module")
+        except Exception as font_error:
+            logging.warning(f"Failed to enforce global fonts: {font_error}")
 
+    def show_module(self, module_name: str, reload: bool = False, **kwargs):
+        """Display a module, reusing its live instance if it was shown before.
+        
+        The current module is hidden rather than destroyed, so switching back
+        to it is a frame swap. Navigation arguments (such as a ticket action)
+        and reload=True rebuild the target module.
+        """
         # Update active module
         self.active_module = module_name
 
@@ -1797,74 +2212,12 @@ Your session was locked due to inactivity""",
                 btn.configure(style="Nav.TButton")
 
         try:
-            # Use dynamic import to load module class
-            if module_name == "dashboard":
-                from nest.ui.dashboard import DashboardModule
-
-                module = DashboardModule(self.content_frame, current_user=self.current_user, app=self)
-            elif module_name == "tickets":
-                from nest.ui.tickets import TicketsModule
-
-                action = kwargs.get("action", None)
-                module = TicketsModule(
-                    self.content_frame, current_user=self.current_user, action=action, app=self
-                )
-            elif module_name == "customers":
-                from nest.ui.customers import CustomersModule
-
-                # Pass current_user but don't pass action to CustomersModule
-                module = CustomersModule(self.content_frame, current_user=self.current_user, app=self)
-            elif module_name == "inventory":
-                from nest.ui.inventory import InventoryModule
-
-                module = InventoryModule(self.content_frame, app=self)
-            elif module_name == "appointments":
-                from nest.ui.appointments import AppointmentsModule
-
-                module = AppointmentsModule(self.content_frame, app=self)
-            elif module_name == "pc_tools":
-                from nest.ui.pc_tools import PCToolsModule
-
-                try:
-                    module = PCToolsModule(self.content_frame, current_user=self.current_user, app=self)
-                except TypeError:
-                    module = PCToolsModule(self.content_frame, current_user=self.current_user)
-            elif module_name == "ios_tools":
-                from nest.ui.ios_tools import IOSToolsModule
-
-                module = IOSToolsModule(self.content_frame, app=self)
-            elif module_name == "android_tools":
-                from nest.ui.android_tools import AndroidToolsModule
-
-                module = AndroidToolsModule(self.content_frame, app=self)
-            elif module_name == "reports":
-                from nest.ui.reports import ReportsModule
-
-                report_type = kwargs.get("report_type", None)
-                module = ReportsModule(self.content_frame, report_type=report_type, app=self)
-            else:
-                # Generic placeholder for unknown modules
-                module = self.create_placeholder_module(f"{module_name.title()} Module")
-
-            # Store module instance
-            self.modules[module_name] = module
-
-            # Display the module
-            if hasattr(module, "pack"):
-                module.pack(expand=True, fill="both")
+            module = self._get_module_manager().show(module_name, kwargs, reload=reload)
                 
             # Update status
             self.status_var.set(f"{module_name.title()} module loaded")
-
-            # Enforce consistent fonts after module is loaded
-            try:
-                from nest.utils.font_manager import enforce_global_fonts
-                enforce_global_fonts(self.root)
-                logging.info(f"Enforced consistent fonts for {module_name} module")
-            except Exception as font_error:
-                logging.warning(f"Failed to enforce global fonts: {font_error}")
                 
-            logging.info(f"Loaded module: {module_name}")
+            logging.info(f"Showing module: {module_name}")
             return module
             
         except ImportError as e:
@@ -2125,14 +2478,9 @@ Your session was locked due to inactivity""",
             # Hide the main UI
             self.main_container.pack_forget()
             
-            # Clear any loaded modules
-            if hasattr(self, 'modules'):
-                for module_name, module in self.modules.items():
-                    if module and hasattr(module, 'destroy'):
-                        try:
-                            module.destroy()
-                        except Exception as e:
-                            logging.error(f"Error destroying {module_name}: {e}")
+            # Clear any loaded modules, including hidden and preloaded ones
+            self._get_module_manager().clear()
+            self.active_module = None
                             
             # Show the login UI again
             from nest.ui.login import LoginFrame
@@ -2283,7 +2631,7 @@ Your session was locked due to inactivity""",
     def refresh_current_view(self):
         """Refresh the current active module."""
         if self.active_module:
-            self.show_module(self.active_module)
+            self.show_module(self.active_module, reload=True)
             self.show_notification("View refreshed", "info")
 
     def toggle_compact_view(self):
@@ -3508,19 +3508,22 @@ class AndroidToolsModule(ttk.Frame):
                         tag = "FATAL"
                 
                 # Append the line to the text widget - use a thread-safe queue approach
-                # Instead of trying to access the widget directly from a thread
+                # Instead of trying to access the widget directly from a thread.
+                # Lines are batched and inserted once per frame, however fast logcat writes
                 if hasattr(window, 'winfo_exists') and window.winfo_exists():
-                    # Use the after method of the window instead of self
-                    window.after(0, lambda l=line, t=tag: self._append_logcat_line(log_text, l, t))
+                    self._queue_logcat_line(window, log_text, line, tag)
             
             # Process completed
             if process.poll() is not None:
                 # Process ended, add message to log
                 status = process.poll()
                 if hasattr(window, 'winfo_exists') and window.winfo_exists():
-                    window.after(0, lambda: self._append_logcat_line(
-                        log_text, f"\nLogcat process ended (status {status}). Please close and reopen the viewer.\n", "ERROR"
-                    ))
+                    self._queue_logcat_line(
+                        window, log_text,
+                        f"\nLogcat process ended (status {status}). "
+                        "Please close and reopen the viewer.\n",
+                        "ERROR"
+                    )
                 
         except Exception as e:
             # Log the error
@@ -3528,9 +3531,7 @@ class AndroidToolsModule(ttk.Frame):
             
             # Add error message to log_text if it still exists
             if hasattr(window, 'winfo_exists') and window.winfo_exists():
-                window.after(0, lambda: self._append_logcat_line(
-                    log_text, f"\nError: {str(e)}\n", "ERROR"
-                ))
+                self._queue_logcat_line(window, log_text, f"\nError: {str(e)}\n", "ERROR")
             
         finally:
             # Ensure process is terminated
@@ -3540,8 +3541,15 @@ class AndroidToolsModule(ttk.Frame):
                 except:  # Deliberately broad exception handler
                     pass
     
-    def _append_logcat_line(self, log_text, line, tag):
-        """Append a line to the logcat text widget"""
+    def _queue_logcat_line(self, window, log_text, line, tag):
+        """Queue a line for the logcat text widget from the logcat thread"""
+        ThreadSafeUIUpdater.batched_update(
+            window, "logcat", (line, tag),
+            lambda lines: self._append_logcat_lines(log_text, lines)
+        )
+    
+    def _append_logcat_lines(self, log_text, lines):
+        """Append (line, tag) pairs to the logcat text widget in one update"""
         try:
             # Skip if the text widget is destroyed or no longer valid
             if not log_text.winfo_exists():
@@ -3550,8 +3558,11 @@ class AndroidToolsModule(ttk.Frame):
             # Enable editing
             log_text.config(state="normal")
             
-            # Insert the text with the appropriate tag
-            log_text.insert(tk.END, line, tag)
+            # Insert the text with the appropriate tags; one insert call takes them all
+            chunks = []
+            for line, tag in lines:
+                chunks.extend((line, tag))
+            log_text.insert(tk.END, *chunks)
             
             # Auto-scroll to the end
             log_text.see(tk.END)
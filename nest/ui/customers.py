@@ -8,29 +8,29 @@ from nest.utils.config_util import load_config
 import logging
 from nest.utils.repairdesk_api import RepairDeskAPI
 from nest.utils.ui_threading import ThreadSafeUIUpdater
-from nest.main import FixedHeaderTreeview
+from nest.main import VirtualTreeview
+from nest.utils.customer_search import CustomerSearchIndex, SearchWorker
+from nest.utils.module_lifecycle import RESUME_REVALIDATE_SECONDS
 
 # Cache configuration
-from ..utils.cache_utils import get_cache_directory
+from ..utils.cache_utils import get_cache_directory, get_local_store
 
-# Use centralized cache directory for customer cache
+# Legacy JSON cache, migrated into the local SQLite store on first load
 CACHE_FILE = os.path.join(get_cache_directory(), "customers.cache")
 CACHE_EXPIRY_HOURS = 24  # Cache expiry time in hours
 
 
 
 
-def save_cache(data):
-    """Save customer data to unencrypted JSON cache with timestamp."""
+def save_cache(data, replace=False):
+    """Upsert customer data into the local store.
+    
+    Args:
+        data: Customers to insert or update (only new ones need to be passed)
+        replace: Drop all other cached customers
+    """
     try:
-        cache_data = {
-            'data': data,
-            'timestamp': time.time(),
-            'count': len(data)
-        }
-        
-        with open(CACHE_FILE, 'w') as f:
-            json.dump(cache_data, f, indent=2)
+        get_local_store().upsert_customers(data, replace=replace)
         
         logging.debug(f"Saved {len(data)} customers to cache")
         logging.info("Customer data cache saved successfully")
@@ -41,25 +41,41 @@ def save_cache(data):
         return False
 
 
-def load_cache():
-    """Load customer data from JSON cache if not expired."""
+def _migrate_json_cache(store):
+    """Move customers from the legacy customers.cache JSON file into the store."""
+    if not os.path.exists(CACHE_FILE):
+        return
     try:
-        if not os.path.exists(CACHE_FILE):
-            logging.debug("No cache file found")
-            return []
-        
         with open(CACHE_FILE, 'r') as f:
             cache_data = json.load(f)
+        store.upsert_customers(cache_data.get('data', []), replace=True)
+        os.remove(CACHE_FILE)
+        logging.info("Migrated customer cache into local store")
+    except Exception as e:
+        logging.warning(f"Could not migrate legacy customer cache: {e}")
+
+
+def load_cache():
+    """Load customer data from the local store if not expired."""
+    try:
+        store = get_local_store()
+        synced_at = store.last_synced('customers')
+        if synced_at is None:
+            _migrate_json_cache(store)
+            synced_at = store.last_synced('customers')
+        if synced_at is None:
+            logging.debug("No customer cache found")
+            return []
         
         # Check if cache is expired (24 hours)
-        cache_age = time.time() - cache_data.get('timestamp', 0)
+        cache_age = time.time() - synced_at
         max_age = CACHE_EXPIRY_HOURS * 3600  # Convert hours to seconds
         
         if cache_age > max_age:
             logging.debug(f"Cache expired ({cache_age/3600:.1f} hours old)")
             return []
         
-        data = cache_data.get('data', [])
+        data = store.query_customers()
         logging.debug(f"Loaded {len(data)} customers from cache")
         logging.info("Customer data loaded from cache")
         return data
@@ -133,22 +149,41 @@ class CustomersModule(ttk.Frame):
         self.filtered_data = []
         self._lock = threading.Lock()
         self._is_destroyed = False  # Add a flag to track if module is destroyed
+        # Built by the background fetch and queried off the main thread
+        self._search_index = CustomerSearchIndex()
+        self._searcher = SearchWorker(self._search_index.search, name="customer-search")
         self.create_widgets()
         # Load cache first
         cached = load_cache()
         if cached:
             self.customer_data = cached
+            # Searches typed before the background fetch catches up use the cached customers
+            self._search_index.build(cached)
             self.refresh_tree()
         # Start background fetch
-        threading.Thread(target=self._fetch_background, daemon=True).start()
+        self._start_fetch()
         
         self.setup_nestbot_integration()
 
+    def _start_fetch(self):
+        """Fetch customers on a background thread unless a fetch is already running."""
+        if getattr(self, '_fetch_thread', None) and self._fetch_thread.is_alive():
+            return
+        self._fetched_at = time.time()
+        self._fetch_thread = threading.Thread(target=self._fetch_background, daemon=True)
+        self._fetch_thread.start()
+
+    def resume(self):
+        """Revalidate the customers when the module is shown again with stale data."""
+        if time.time() - self._fetched_at >= RESUME_REVALIDATE_SECONDS:
+            self._start_fetch()
+
     # Add a proper destroy method to safely clean up resources
     def destroy(self):
         """Clean up resources when widget is destroyed."""
         # Set the destroyed flag first to prevent new operations from starting
         self._is_destroyed = True
+        self._searcher.stop()
         
         try:
             logging.info("Properly destroying module: customers")
@@ -190,6 +225,8 @@ class CustomersModule(ttk.Frame):
         )
         entry.pack(side="left", fill="x", expand=True, padx=(0, 10))
         entry.bind("<Return>", lambda e: self.search())
+        # Search as you type; superseded keystrokes are dropped by the search worker
+        self.search_var.trace_add("write", lambda *args: self.search())
         
         # Use the application's color scheme for consistency
         # Define colors directly to avoid dependency issues
@@ -247,8 +284,10 @@ class CustomersModule(ttk.Frame):
         # Tree + scrollbars
         container = ttk.Frame(self)
         container.pack(fill="both", expand=True)
-        self.tree = FixedHeaderTreeview(
+        self.tree = VirtualTreeview(
             container,
+            row_values=self._customer_values,
+            row_key=lambda cust: cust.get("cid"),
             columns=("ID", "Name", "Phone", "Email", "Address", "Created"),
             show="headings",
             style="Custom.Treeview"
@@ -265,7 +304,7 @@ class CustomersModule(ttk.Frame):
         
         # Apply column settings
         for col in self.tree["columns"]:
-            self.tree.heading(col, text=col)
+            self.tree.heading(col, text=col, command=lambda c=col: self.tree.sort_by_column(c))
             self.tree.column(col, width=column_widths[col], anchor="w", minwidth=75)
         vsb = ttk.Scrollbar(container, orient="vertical", command=self.tree.yview)
         hsb = ttk.Scrollbar(container, orient="horizontal", command=self.tree.xview)
@@ -286,9 +325,24 @@ class CustomersModule(ttk.Frame):
             self.tree.bind('<<TreeviewSelect>>', handler)
             logging.debug(f"NestBot integration enabled for {self.__class__.__name__}")
 
+    @staticmethod
+    def _customer_values(cust):
+        """Get the tree view column values for a customer."""
+        return (
+            cust.get("cid"),
+            cust.get("fullName"),
+            cust.get("mobile"),
+            cust.get("email"),
+            cust.get("address1"),
+            cust.get("created_on"),
+        )
+
     def refresh_tree(self, data=None):
         """
         Refresh the data displayed in the tree view.
+        
+        Only the visible rows are materialized, so this is cheap even for
+        tens of thousands of customers.
         """
         with self._lock:
             display = data if data is not None else self.customer_data
@@ -301,20 +355,7 @@ class CustomersModule(ttk.Frame):
                 print("[DEBUG] Tree widget no longer exists, skipping refresh")
                 return
                 
-            self.tree.delete(*self.tree.get_children())
-            for cust in display:
-                self.tree.insert(
-                    "",
-                    "end",
-                    values=(
-                        cust.get("cid"),
-                        cust.get("fullName"),
-                        cust.get("mobile"),
-                        cust.get("email"),
-                        cust.get("address1"),
-                        cust.get("created_on"),
-                    ),
-                )
+            self.tree.set_rows(display)
         except (tk.TclError, RuntimeError, AttributeError) as e:
             print(f"[DEBUG] Error refreshing tree: {e}")
             return
@@ -322,21 +363,39 @@ class CustomersModule(ttk.Frame):
     def search(self):
         """
         Filter customers based on a search query.
+        
+        The query runs against the search index on a worker thread; results
+        for a query superseded by a later keystroke are discarded.
         """
-        q = self.search_var.get().lower()
+        q = self.search_var.get().strip()
         if not q:
+            self._searcher.cancel()
+            with self._lock:
+                self.filtered_data = []
             self.refresh_tree()
             return
+        self._searcher.submit(q, lambda generation, results: ThreadSafeUIUpdater.safe_update(
+            self, lambda: self._show_search_results(generation, results)
+        ))
+
+    def _show_search_results(self, generation, results):
+        """Show search results on the main thread if they are still for the latest query."""
+        if self._is_destroyed or not self._searcher.is_current(generation):
+            return
         with self._lock:
-            self.filtered_data = [
-                c
-                for c in self.customer_data
-                if q in c.get("fullName", "").lower()
-                or q in c.get("email", "").lower()
-                or q in c.get("mobile", "")
-            ]
-        self.refresh_tree(self.filtered_data)
-        self.status.config(text=f"Found {len(self.filtered_data)} matches")
+            self.filtered_data = results
+        self.refresh_tree(results)
+        try:
+            self.status.config(text=f"Found {len(results)} matches")
+        except (tk.TclError, RuntimeError) as e:
+            logging.debug(f"Error updating status label: {e}")
+
+    def _refresh_view(self):
+        """Redraw the list, re-running the active search against the updated index."""
+        if self.search_var.get().strip():
+            self.search()
+        else:
+            self.refresh_tree()
 
     def _fetch_background(self):
         """
@@ -358,7 +417,8 @@ class CustomersModule(ttk.Frame):
             cached_data = load_cache()
             if cached_data:
                 self.customer_data = cached_data
-                ThreadSafeUIUpdater.safe_update(self, self.refresh_tree)
+                self._search_index.build(self.customer_data)
+                ThreadSafeUIUpdater.safe_update(self, self._refresh_view)
                 ThreadSafeUIUpdater.safe_update(self, lambda: self.status.config(
                     text=f"Loaded {len(self.customer_data)} cached customers"
                 ))
@@ -373,11 +433,13 @@ class CustomersModule(ttk.Frame):
             page = 1
             cache_updates = 0
             customer_count_at_last_save = len(self.customer_data)
+            completed = False
             
             while True:
                 rows = fetch_customers_page(page)
                 if not rows:  # Stop fetching when no more data is returned
                     logging.info(f"No more customer data after page {page}")
+                    completed = True
                     break
                     
                 new_customers_in_page = 0
@@ -398,6 +460,8 @@ class CustomersModule(ttk.Frame):
                         )
                         new_customers_in_page += 1
                         
+                if new_customers_in_page:
+                    self._search_index.add(self.customer_data[-new_customers_in_page:])
                 logging.debug(f"Added {new_customers_in_page} new customers from page {page}")
                 logging.debug(f"Total customers: {len(self.customer_data)}")
                 
@@ -407,7 +471,7 @@ class CustomersModule(ttk.Frame):
                     break  # Exit the fetch loop if module has been destroyed
                     
                 # Update UI with progress
-                ThreadSafeUIUpdater.safe_update(self, self.refresh_tree)
+                ThreadSafeUIUpdater.safe_update(self, self._refresh_view)
                 
                 # Add safe status update with error handling
                 def safe_status_update(p):
@@ -427,17 +491,21 @@ class CustomersModule(ttk.Frame):
                 # Incremental cache update - save every 5 pages or 100+ new customers
                 new_customers = len(self.customer_data) - customer_count_at_last_save
                 if page % 5 == 0 or new_customers >= 100:
-                    # Save incremental progress to cache
-                    if save_cache(self.customer_data):
+                    # Save incremental progress to cache; only the new rows are upserted
+                    if save_cache(self.customer_data[customer_count_at_last_save:]):
                         cache_updates += 1
                         customer_count_at_last_save = len(self.customer_data)
                         logging.info(f"Incremental cache update #{cache_updates}: Saved {len(self.customer_data)} customers")
                     
                 page += 1
             
-            # Final cache save to ensure we have the most recent data
-            if len(self.customer_data) > customer_count_at_last_save:
-                if save_cache(self.customer_data):
+            # Final cache save to ensure we have the most recent data. A completed
+            # fetch is a full refresh, so the store is replaced with exactly this list
+            if completed:
+                if save_cache(self.customer_data, replace=True):
+                    logging.info(f"Final cache update: Saved {len(self.customer_data)} customers")
+            elif len(self.customer_data) > customer_count_at_last_save:
+                if save_cache(self.customer_data[customer_count_at_last_save:]):
                     logging.info(f"Final cache update: Saved {len(self.customer_data)} customers")
             
             # Update status with completion message, but check if destroyed first
@@ -1,10 +1,11 @@
 import tkinter as tk
 from tkinter import ttk, messagebox
-from datetime import datetime
+from datetime import date, datetime
 import os
 import json
 import logging
 import threading
+import time
 import queue
 from typing import Dict, List, Optional, Any, Tuple, Callable
 from tkinter import font as tkfont
@@ -12,7 +13,16 @@ from tkinter import font as tkfont
 # Local imports
 from ..utils.config import get_config, get_repairdesk_key
 from ..api.api_client import RepairDeskClient
+from ..utils.repairdesk_api import RepairDeskAPI
+from ..utils.local_store import technician_key
 from ..utils.ui_threading import ThreadSafeUIUpdater
+from ..utils.stale_while_revalidate import (
+    CircuitOpenError, StaleWhileRevalidate, diff_items, format_age, get_circuit_breaker
+)
+from ..utils.module_lifecycle import RESUME_REVALIDATE_SECONDS
+from ..utils.ticket_events import get_ticket_event_bus
+from ..utils.ticket_record import TicketRecord, normalize_record
+from ..utils.tree_reconcile import TreeReconciler
 
 
 
@@ -29,15 +39,13 @@ CONFIG = get_config()
 logger = logging.getLogger(__name__)
 
 # Define file paths
-# Import cache utilities for centralized cache management
-from nest.utils.cache_utils import get_ticket_cache_path
-
-# Use the central cache utility to get the ticket cache path
-CACHE_FILE_PATH = get_ticket_cache_path()
 from nest.utils.platform_paths import PlatformPaths
 _platform_paths = PlatformPaths()
 LAST_LOGIN_FILE_PATH = str(_platform_paths.ensure_dir_exists(_platform_paths.get_user_data_dir()) / "last_login.json")
 
+# Tree items changed per main-thread pass; larger refreshes continue on the next pass
+TREE_ROW_CHUNK = 200
+
 def log_message(message):
     """Log a message to the console and to the log file."""
     logging.info(message)
@@ -51,27 +59,6 @@ TEXT_COLOR = "#333333"
 BORDER_COLOR = "#dddddd"
 
 
-def save_to_cache(data):
-    try:
-        with open(CACHE_FILE_PATH, "w") as file:
-            json.dump(data, file)
-        log_message("Tickets data cached successfully.")
-    except Exception as e:
-        log_message(f"Error saving cache: {e}")
-
-
-def load_from_cache():
-    try:
-        if os.path.exists(CACHE_FILE_PATH):
-            with open(CACHE_FILE_PATH, "r") as file:
-                log_message("Loaded tickets from cache.")
-                return json.load(file)
-        log_message("No cached tickets found.")
-    except Exception as e:
-        log_message(f"Error loading cache: {e}")
-    return None
-
-
 def save_last_login():
     try:
         with open(LAST_LOGIN_FILE_PATH, "w") as file:
@@ -93,20 +80,6 @@ def load_last_login():
     return None
 
 
-def format_date(timestamp: float) -> str:
-    dt = datetime.fromtimestamp(timestamp)
-    return dt.strftime("%B %d, %Y")
-
-
-def format_timestamp(ts) -> str:
-    if ts is None:
-        return "N/A"
-    try:
-        return format_date(float(ts))
-    except Exception:
-        return "N/A"
-
-
 def map_job_status(raw_status: str) -> str:
     mapping = {
         "Open": "Open",
@@ -184,40 +157,28 @@ def normalize_ticket(ticket) -> dict:
             "days_open": "-"
         }
         
-    summary = ticket.get("summary", {})
-    devices = ticket.get("devices", [])
-    order_id = summary.get("order_id", "N/A")
-    customer_name = summary.get("customer", {}).get("fullName", "N/A")
-    customer_mobile = summary.get("customer", {}).get("mobile", "N/A")
-    device_type = devices[0].get("device", {}).get("name", "N/A") if devices else "N/A"
-    repair_type = (
-        devices[0].get("repairProdItems", [{}])[0].get("name", "N/A") if devices else "N/A"
-    )
-    job_status = (
-        map_job_status(devices[0].get("status", {}).get("name", "Open")) if devices else "Open"
-    )
-    assigned_to = devices[0].get("assigned_to", {}).get("fullname", "N/A") if devices else "N/A"
-    quoted_price = summary.get("total", "N/A")
-    due_date = format_timestamp(devices[0].get("due_on")) if devices else "N/A"
-    try:
-        created_ts = float(summary.get("created_date", 0))
-        booked_in = format_timestamp(created_ts)
-        days_open = (datetime.now() - datetime.fromtimestamp(created_ts)).days
-    except Exception:
-        booked_in = "N/A"
-        days_open = "N/A"
+    # Memoized per ticket content; days_open is recomputed once a day
+    return normalize_record(ticket).view("dashboard", _dashboard_view, stamp=date.today())
+
+
+def _dashboard_view(record: TicketRecord) -> dict:
+    """Build the dashboard's display fields from a normalized ticket record."""
+    days_open = record.days_open()
     return {
-        "ticket_id": order_id,
-        "customer_name": customer_name,
-        "customer_mobile": customer_mobile,
-        "device_type": device_type,
-        "repair_type": repair_type,
-        "job_status": job_status,
-        "assigned_to": assigned_to,
-        "quoted_price": quoted_price,
-        "booked_in": booked_in,
-        "due_date": due_date,
-        "days_open": days_open,
+        "ticket_id": record.order_id if record.order_id is not None else "N/A",
+        "customer_name": record.customer_name or "N/A",
+        "customer_mobile": record.customer_mobile or "N/A",
+        "device_type": record.device or "N/A",
+        "repair_type": record.repair_type or "N/A",
+        "job_status": map_job_status(record.device_status or "Open"),
+        "assigned_to": record.technician or "N/A",
+        "quoted_price": record.total if record.total is not None else "N/A",
+        "booked_in": record.created.strftime("%B %d, %Y") if record.created else "N/A",
+        "due_date": record.due.strftime("%B %d, %Y") if record.due else "N/A",
+        "days_open": days_open if days_open is not None else "N/A",
+        # Parsed dates, so rows never re-parse the display strings
+        "created_on": record.created,
+        "due_on": record.due,
     }
 
 
@@ -238,6 +199,7 @@ class DashboardModule(ttk.Frame):
         # Set up API access
         self.api_key = get_repairdesk_key()
         self.client = RepairDeskClient(api_key=self.api_key)
+        self.sync_api = RepairDeskAPI(api_key=self.api_key or None)
         
         # Initialize config
         self.config = get_config()
@@ -245,6 +207,10 @@ class DashboardModule(ttk.Frame):
         # Initialize data storage
         self.all_tickets = []
         self.tech_tickets = []
+        # Display rows and status counts, built off the main thread with tech_tickets
+        self._tech_rows = []
+        self._status_counts = {}
+        self._tree_update_id = None
         self.last_login = load_last_login()
         self.loading = False
         
@@ -253,6 +219,9 @@ class DashboardModule(ttk.Frame):
         self._load_data_async()
         save_last_login()
         
+        # Patch single tickets when they are changed anywhere in the app
+        self._mutation_token = get_ticket_event_bus().subscribe(self._on_ticket_mutation)
+        
         self.setup_nestbot_integration()
 
     def _setup_styles(self):
@@ -363,6 +332,16 @@ class DashboardModule(ttk.Frame):
         )
         self.refresh_btn.pack(side="right", padx=5)
         
+        # Shows the age of cached data while it is being revalidated
+        self.freshness_label = tk.Label(
+            title_frame,
+            text="",
+            font=("Segoe UI", 8),
+            fg="#757575",
+            bg=BG_COLOR
+        )
+        self.freshness_label.pack(side="right", padx=5)
+        
         # Add dashboard summary section with key metrics
         self.summary_frame = ttk.LabelFrame(
             self,
@@ -439,6 +418,14 @@ class DashboardModule(ttk.Frame):
             height=10  # Set a fixed number of visible rows
         )
         self.tree.pack(fill="both", expand=True)
+        # Rows are (ticket_id, values, tags) tuples prepared by the loader thread
+        self._tree_reconciler = TreeReconciler(
+            self.tree,
+            key=lambda row: row[0],
+            values=lambda row: row[1],
+            tags=lambda row: row[2],
+        )
+        self._tree_sort = None
         
         # Connect scrollbar to the treeview
         scrollbar.config(command=self.tree.yview)
@@ -593,11 +580,8 @@ class DashboardModule(ttk.Frame):
         """Update statistics display"""
         stats = [f"Tickets Assigned: {len(self.tech_tickets)}"]
         
-        # Add status breakdown
-        status_counts = {}
-        for ticket in self.tech_tickets:
-            status = ticket.get("job_status", "Unknown")
-            status_counts[status] = status_counts.get(status, 0) + 1
+        # Status breakdown, counted by the loader thread
+        status_counts = self._status_counts
             
         # Update the metric cards in the summary section
         if hasattr(self, 'metric_counts'):
@@ -629,17 +613,22 @@ class DashboardModule(ttk.Frame):
             
         log_message(f"Dashboard stats: {stats}")
 
-    def sort_by_column(self, col, reverse):
-        """Sort treeview by a specific column"""
-        data_list = [(self.tree.set(child, col), child) for child in self.tree.get_children("")]
+    @staticmethod
+    def _sort_value(val):
+        """Sort key for a displayed value.
 
-        def try_convert(val):
-            try:
-                return float(val.replace("$", "").replace(",", ""))
-            except:
-                return val.lower()
+        Prices and numbers sort numerically, text case-insensitively.
+        """
+        try:
+            return (0, float(str(val).replace("$", "").replace(",", "")), "")
+        except ValueError:
+            return (1, 0.0, str(val).lower())
 
-        data_list.sort(key=lambda t: try_convert(t[0]), reverse=reverse)
+    def sort_by_column(self, col, reverse):
+        """Sort treeview by a specific column; the order is kept across refreshes"""
+        self._tree_sort = (col, reverse)
+        data_list = [(self.tree.set(child, col), child) for child in self.tree.get_children("")]
+        data_list.sort(key=lambda t: self._sort_value(t[0]), reverse=reverse)
         for idx, (_, child) in enumerate(data_list):
             self.tree.move(child, "", idx)
         self.tree.heading(col, command=lambda: self.sort_by_column(col, not reverse))
@@ -698,13 +687,16 @@ class DashboardModule(ttk.Frame):
                     )
                     return
                     
-                # Update local data after successful API call
-                ticket["job_status"] = status
+                # Update local data after successful API call (on the main thread,
+                # which owns the ticket lists)
+                def apply_status():
+                    ticket["job_status"] = status
+                    self._apply_index(self._index_tickets(self.all_tickets))
                 
                 # Use the safer method to update UI from background thread
                 self._safe_update_ui(
                     lambda: messagebox.showinfo("Success", f"Ticket {ticket_id} marked as {status}."),
-                    self._update_tree,
+                    apply_status,
                     lambda: self.status_message(f"Ticket {ticket_id} updated successfully.", "success")
                 )
             except Exception as e:
@@ -875,13 +867,14 @@ class DashboardModule(ttk.Frame):
             return
             
         self.loading = True
+        self._loaded_at = time.time()
         
-        # Clear the tree
-        for item in self.tree.get_children():
-            self.tree.delete(item)
-            
-        # Show loading message
-        self.tree.insert("", "end", values=("Loading tickets...",) + ("",) * 9)
+        # Keep showing the current tickets while they are revalidated; only an
+        # empty dashboard gets a loading placeholder
+        if not self.all_tickets:
+            for item in self.tree.get_children():
+                self.tree.delete(item)
+            self.tree.insert("", "end", values=("Loading tickets...",) + ("",) * 9)
         
         # Disable refresh button during load
         if hasattr(self, 'refresh_btn'):
@@ -890,66 +883,155 @@ class DashboardModule(ttk.Frame):
         # Start a thread to fetch the data
         threading.Thread(target=lambda: self._fetch_tickets_data(force_refresh), daemon=True).start()
     
-    def _fetch_tickets_data(self, force_refresh=False):
-        """Fetch ticket data from API or cache"""
+    def _set_tickets(self, tickets):
+        """Normalize raw tickets and schedule them for display if they changed.
+        
+        Runs on loader threads; the new index is installed on the main thread.
+        
+        Returns:
+            bool: Whether the displayed tickets changed
+        """
+        all_tickets = [normalize_ticket(t) for t in tickets]
+        diff = diff_items(self.all_tickets, all_tickets, key=lambda t: t["ticket_id"])
+        if not diff and self.all_tickets:
+            return False
+        
+        log_message(f"Ticket changes: {len(diff.added)} added, {len(diff.changed)} changed, "
+                    f"{len(diff.removed)} removed")
+        index = self._index_tickets(all_tickets)
+        ThreadSafeUIUpdater.safe_update(self, lambda: self._apply_index(index))
+        return True
+    
+    def _index_tickets(self, all_tickets):
+        """Select the user's tickets and prepare their display rows and status counts.
+        
+        Does not touch the widget's state, so it can run on loader threads and
+        the main thread only has to apply ready rows with _apply_index.
+        
+        Returns:
+            tuple: (all_tickets, tech_tickets, rows, status_counts)
+        """
+        # Match names the way the local store's technician filter does
+        uname = technician_key(self.current_user.get("fullname", ""))
+        tech_tickets = [t for t in all_tickets if technician_key(t["assigned_to"]) == uname]
+        rows = [
+            (t.get("ticket_id", ""), self._ticket_row_values(t), self._ticket_row_tags(t))
+            for t in tech_tickets
+        ]
+        status_counts = {}
+        for ticket in tech_tickets:
+            status = ticket.get("job_status", "Unknown")
+            status_counts[status] = status_counts.get(status, 0) + 1
+        
+        return all_tickets, tech_tickets, rows, status_counts
+    
+    def _apply_index(self, index):
+        """Install a ticket index built by _index_tickets and redraw the tree (main thread)."""
+        self.all_tickets, self.tech_tickets, self._tech_rows, self._status_counts = index
+        self._update_tree()
+    
+    def _on_ticket_mutation(self, mutation):
+        """Normalize a ticket changed elsewhere (called on the publishing thread)."""
+        if mutation.ticket is None:
+            return
+        updated = normalize_ticket(mutation.ticket)
+        ThreadSafeUIUpdater.safe_update(
+            self, lambda: self._apply_ticket_mutation(mutation, updated))
+    
+    def _apply_ticket_mutation(self, mutation, updated):
+        """Patch the mutated ticket into the dashboard on the main thread.
+        
+        Args:
+            mutation: The ticket mutation event
+            updated: The mutated ticket, already normalized
+        """
+        if not self.winfo_exists():
+            return
+        if not any(mutation.matches(t["ticket_id"]) for t in self.all_tickets):
+            return
+        all_tickets = [updated if mutation.matches(t["ticket_id"]) else t for t in self.all_tickets]
+        self._apply_index(self._index_tickets(all_tickets))
+    
+    def resume(self):
+        """Revalidate the tickets when the dashboard is shown again with stale data."""
+        if time.time() - getattr(self, '_loaded_at', 0) >= RESUME_REVALIDATE_SECONDS:
+            self._load_data_async()
+    
+    def destroy(self):
+        """Stop receiving ticket mutation events before the widget is destroyed."""
+        if hasattr(self, '_mutation_token'):
+            get_ticket_event_bus().unsubscribe(self._mutation_token)
+        super().destroy()
+    
+    def _set_freshness(self, text, color="#757575"):
+        """Show how fresh the displayed data is (call on the main thread)."""
         try:
-            log_message("Loading tickets from API...")
-            
-            # If force_refresh is True, always get tickets from API
-            # Otherwise try to load from cache first
+            if hasattr(self, 'freshness_label') and self.freshness_label.winfo_exists():
+                self.freshness_label.config(text=text, fg=color)
+        except (tk.TclError, RuntimeError) as e:
+            logging.debug(f"Widget access error (normal during module switching): {e}")
+    
+    def _fetch_tickets_data(self, force_refresh=False):
+        """Show cached tickets immediately, then revalidate them against the API"""
+        def read_cached():
+            # Only the user's tickets are shown, so only their bodies are read from the store
+            return self.sync_api.load_ticket_cache_snapshot(
+                lazy=True, assigned_to=self.current_user.get("fullname", "").strip())
+        
+        def fetch():
+            log_message("Fetching tickets from RepairDesk API...")
             if force_refresh:
-                tickets = []
-            else:
-                tickets = load_from_cache() or []
-                
-            # If no tickets in cache or force_refresh is True, fetch from API
-            if not tickets:
-                try:
-                    log_message("Fetching tickets from RepairDesk API...")
-                    
-                    # Use our updated RepairDeskClient to get all tickets with force_refresh
-                    try:
-                        # The updated client handles pagination and error handling internally
-                        tickets = self.client.get_all_tickets(force_refresh=force_refresh)
-                        log_message(f"Successfully retrieved {len(tickets)} tickets from API")
-                    except Exception as e:
-                        log_message(f"Error fetching tickets from API: {e}")
-                        error_message = str(e)  # Capture the error message
-                        ThreadSafeUIUpdater.safe_update(self, lambda error=error_message: messagebox.showerror(
-                            "API Error", 
-                            f"Could not fetch tickets: {error}"
-                        ))
-                        # Fall back to cache if available and we're not forcing refresh
-                        if not force_refresh:
-                            tickets = load_from_cache() or []
-                            if tickets:
-                                log_message("Falling back to cached tickets")
-                        else:
-                            tickets = []
-                    
-                    # Save fetched tickets to cache
-                    if tickets:
-                        save_to_cache(tickets)
-                        log_message(f"Cached {len(tickets)} tickets successfully")
-                        
-                except Exception as e:
-                    log_message(f"Critical error loading tickets: {e}")
-                    error_msg = str(e)
-                    ThreadSafeUIUpdater.safe_update(self, lambda: messagebox.showerror(
-                        "Error", 
-                        f"Failed to load tickets: {error_msg}"
-                    ))
-            
-            # Process tickets for display
-            self.all_tickets = [normalize_ticket(t) for t in tickets]
-            uname = self.current_user.get("fullname", "").strip().lower()
-            self.tech_tickets = [
-                t for t in self.all_tickets if t["assigned_to"].strip().lower() == uname
-            ]
-            
-            # Update UI on the main thread
-            ThreadSafeUIUpdater.safe_update(self, self._update_tree)
-            
+                # Delta sync only downloads tickets changed since the last sync
+                # and merges them into the shared ticket cache
+                return self.sync_api.sync_tickets()
+            # The updated client handles pagination and error handling internally
+            tickets = self.client.get_all_tickets(force_refresh=force_refresh)
+            if tickets:
+                # The shared writer keeps the cache format, indexes and local store in sync
+                self.sync_api.save_ticket_cache(tickets)
+            return tickets
+        
+        def on_stale(tickets, age):
+            log_message(f"Showing {len(tickets)} cached tickets ({format_age(age)}) "
+                        f"while refreshing")
+            self._set_tickets(tickets)
+            ThreadSafeUIUpdater.safe_update(
+                self, lambda: self._set_freshness(f"Cached {format_age(age)} – refreshing…"))
+        
+        def on_fresh(tickets):
+            log_message(f"Successfully retrieved {len(tickets)} tickets from API")
+            self._set_tickets(tickets)
+            ThreadSafeUIUpdater.safe_update(
+                self, lambda: self._set_freshness(f"Updated {datetime.now().strftime('%H:%M')}"))
+        
+        def on_error(error, served_stale):
+            log_message(f"Error fetching tickets from API: {error}")
+            if served_stale:
+                # Cached tickets are already on screen; just flag them as stale
+                status = ("RepairDesk unavailable" if isinstance(error, CircuitOpenError)
+                          else "Refresh failed")
+                ThreadSafeUIUpdater.safe_update(
+                    self,
+                    lambda: self._set_freshness(f"{status} – showing cached tickets", "#ff9800"))
+                return
+            error_message = str(error)
+            ThreadSafeUIUpdater.safe_update(self, lambda error=error_message: messagebox.showerror(
+                "API Error", 
+                f"Could not fetch tickets: {error}"
+            ))
+            index = self._index_tickets([])
+            ThreadSafeUIUpdater.safe_update(self, lambda: self._apply_index(index))
+        
+        try:
+            loader = StaleWhileRevalidate(get_circuit_breaker("repairdesk"))
+            loader.run(read_cached, fetch, on_stale, on_fresh, on_error)
+        except Exception as e:
+            log_message(f"Critical error loading tickets: {e}")
+            error_msg = str(e)
+            ThreadSafeUIUpdater.safe_update(self, lambda: messagebox.showerror(
+                "Error", 
+                f"Failed to load tickets: {error_msg}"
+            ))
         finally:
             # Always re-enable the refresh button with error handling for widget destruction
             def safe_enable_button():
@@ -964,6 +1046,51 @@ class DashboardModule(ttk.Frame):
             ThreadSafeUIUpdater.safe_update(self, safe_enable_button)
             self.loading = False
 
+    def _ticket_row_values(self, ticket):
+        """Get the tree column values for a normalized ticket."""
+        return (
+            ticket.get("ticket_id", ""),
+            ticket.get("customer_name", ""),
+            ticket.get("contact_mobile", ""),
+            ticket.get("device_type", ""),
+            ticket.get("repair_type", ""),
+            ticket.get("job_status", ""),
+            f"${float(ticket.get('price', 0)):.2f}" if ticket.get('price') else "$0.00",
+            self._display_date(ticket.get("created_on")),
+            self._display_date(ticket.get("due_on")),
+            ticket.get("days_open", 0),
+        )
+    
+    @staticmethod
+    def _display_date(value):
+        """Format a parsed ticket date for the tree."""
+        return value.strftime('%b %d, %Y') if value else ""
+    
+    def _ticket_row_tags(self, ticket):
+        """Get the tree tags for a ticket's status, priority and due date."""
+        tags = []
+        status_lower = (ticket.get("job_status") or "").lower()
+        
+        # Add status tag
+        if "pending" in status_lower:
+            tags.append("pending")
+        elif "complete" in status_lower or "repaired" in status_lower:
+            tags.append("completed")
+        elif "waiting" in status_lower:
+            tags.append("waiting")
+        elif "progress" in status_lower:
+            tags.append("in_progress")
+        
+        # Check for priority flag
+        if ticket.get("priority", "0") == "1":
+            tags.append("priority")
+            
+        # Check for overdue
+        due_on = ticket.get("due_on")
+        if due_on and due_on.date() < date.today():
+            tags.append("overdue")
+        return tuple(tags)
+    
     def _update_tree(self):
         """Update the treeview with current ticket data and apply styling"""
         # Ensure we're on the main thread by checking if the widget exists
@@ -980,84 +1107,40 @@ class DashboardModule(ttk.Frame):
             # Update user stats
             self.load_stats()
             
-            # Clear the tree
-            for item in self.tree.get_children():
-                self.tree.delete(item)
-            
-            # If no tickets, show message
-            if not self.tech_tickets:
-                self.tree.insert("", "end", values=("No tickets found",) + ("",) * 9)
-                return
+            rows = list(self._tech_rows)
+            if self._tree_sort:
+                column, reverse = self._tree_sort
+                index = self.tree["columns"].index(column)
+                rows.sort(key=lambda row: self._sort_value(row[1][index]), reverse=reverse)
             
-            # Process each ticket
-            for ticket in self.tech_tickets:
-                # Extract values with safe defaults
-                ticket_id = ticket.get("ticket_id", "")
-                customer_name = ticket.get("customer_name", "")
-                customer_mobile = ticket.get("contact_mobile", "")
-                device_type = ticket.get("device_type", "")
-                repair_type = ticket.get("repair_type", "")
-                job_status = ticket.get("job_status", "")
-                quoted_price = f"${float(ticket.get('price', 0)):.2f}" if ticket.get('price') else "$0.00"
-                
-                # Format dates
-                booked_in = self._format_date(ticket.get("created_at"))
-                due_date = self._format_date(ticket.get("due_date"))
-                
-                # Calculate days open
-                days_open = self._calculate_days_open(ticket.get("created_at"))
-                
-                # Determine tags based on status
-                tags = []
-                status_lower = job_status.lower() if job_status else ""
-                
-                # Add status tag
-                if "pending" in status_lower:
-                    tags.append("pending")
-                elif "complete" in status_lower or "repaired" in status_lower:
-                    tags.append("completed")
-                elif "waiting" in status_lower:
-                    tags.append("waiting")
-                elif "progress" in status_lower:
-                    tags.append("in_progress")
-                
-                # Check for priority flag
-                if ticket.get("priority", "0") == "1":
-                    tags.append("priority")
-                    
-                # Check for overdue
-                if due_date and self._is_overdue(due_date):
-                    tags.append("overdue")
-                
-                # Insert row with all values
-                item_id = self.tree.insert("", "end", values=(
-                    ticket_id,
-                    customer_name,
-                    customer_mobile,
-                    device_type,
-                    repair_type,
-                    job_status,
-                    quoted_price,
-                    booked_in,
-                    due_date,
-                    days_open
-                ), tags=tags)
+            if self._tree_update_id is not None:
+                self.after_cancel(self._tree_update_id)
+                self._tree_update_id = None
+            self._reconcile_rows(rows)
             
-            # Re-enable the refresh button with robust error handling
-            try:
-                if hasattr(self, 'refresh_btn') and self.refresh_btn.winfo_exists():
-                    self.refresh_btn.config(state="normal")
-            except (tk.TclError, RuntimeError, AttributeError) as e:
-                # Silently handle widget destruction errors
-                logging.debug(f"Widget access error (normal during module switching): {e}")
-                
-            # Mark loading complete
-            self.loading = False
+            # The loader re-enables the refresh button once revalidation has finished
         except Exception as e:
             logging.error(f"Error updating dashboard: {e}")
-            if hasattr(self, 'refresh_btn'):
-                self.refresh_btn.config(state="normal")
-            self.loading = False
+    
+    def _reconcile_rows(self, rows):
+        """Apply prepared rows to the tree, at most TREE_ROW_CHUNK items per pass."""
+        self._tree_update_id = None
+        if not self.winfo_exists():
+            return
+        
+        # Only rows that were added, changed, moved or removed touch the widget,
+        # so scroll position and selection survive the refresh
+        result = self._tree_reconciler.reconcile(rows, max_calls=TREE_ROW_CHUNK)
+        if result:
+            logging.debug(f"Dashboard tree refresh: {result}")
+        if result.pending:
+            # Let Tk handle input and redraw before applying the next chunk
+            self._tree_update_id = self.after(1, lambda: self._reconcile_rows(rows))
+            return
+        
+        # If no tickets, show message
+        if not rows:
+            self.tree.insert("", "end", values=("No tickets found",) + ("",) * 9)
                 
     def _on_row_click(self, ticket_id):
         """Handle clicking on a row in our custom table"""
@@ -1087,88 +1170,6 @@ class DashboardModule(ttk.Frame):
         # Kept for compatibility with old code, but not used anymore
         pass
         
-    def _format_date(self, date_str):
-        """Format a date string for display"""
-        if not date_str:
-            return ""
-        
-        try:
-            # Handle different date formats
-            if "T" in date_str:
-                # ISO format (e.g., 2025-05-14T10:30:00)
-                date_obj = datetime.strptime(date_str.split('T')[0], '%Y-%m-%d')
-            elif "-" in date_str:
-                # YYYY-MM-DD format
-                date_obj = datetime.strptime(date_str, '%Y-%m-%d')
-            elif any(month in date_str for month in ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']):
-                # Month name format (e.g., May 17, 2025)
-                try:
-                    date_obj = datetime.strptime(date_str, '%b %d, %Y')
-                except ValueError:
-                    date_obj = datetime.strptime(date_str, '%B %d, %Y')
-            else:
-                # Attempt to parse as timestamp
-                date_obj = datetime.fromtimestamp(float(date_str))
-                
-            # Format as MMM DD, YYYY
-            return date_obj.strftime('%b %d, %Y')
-        except Exception as e:
-            logging.warning(f"Error formatting date {date_str}: {e}")
-            return date_str
-    
-    def _calculate_days_open(self, created_date):
-        """Calculate number of days a ticket has been open"""
-        if not created_date:
-            return 0
-            
-        try:
-            # Parse the creation date
-            if "T" in created_date:
-                # ISO format
-                date_obj = datetime.strptime(created_date.split('T')[0], '%Y-%m-%d')
-            elif "-" in created_date:
-                # YYYY-MM-DD format
-                date_obj = datetime.strptime(created_date, '%Y-%m-%d')
-            else:
-                # Attempt to parse as timestamp
-                date_obj = datetime.fromtimestamp(float(created_date))
-                
-            # Calculate days difference
-            delta = datetime.now() - date_obj
-            return delta.days
-        except Exception as e:
-            logging.warning(f"Error calculating days open: {e}")
-            return 0
-            
-    def _is_overdue(self, due_date):
-        """Check if a ticket is overdue"""
-        if not due_date:
-            return False
-            
-        try:
-            # Parse the due date
-            if "T" in due_date:
-                # ISO format
-                date_obj = datetime.strptime(due_date.split('T')[0], '%Y-%m-%d')
-            elif "-" in due_date:
-                # YYYY-MM-DD format
-                date_obj = datetime.strptime(due_date, '%Y-%m-%d')
-            elif any(month in due_date for month in ['Jan', 'Feb', 'Mar', 'Apr', 'May', 'Jun', 'Jul', 'Aug', 'Sep', 'Oct', 'Nov', 'Dec']):
-                # Month name format (e.g., May 17, 2025)
-                try:
-                    date_obj = datetime.strptime(due_date, '%b %d, %Y')
-                except ValueError:
-                    date_obj = datetime.strptime(due_date, '%B %d, %Y')
-            else:
-                # Attempt to parse as timestamp
-                date_obj = datetime.fromtimestamp(float(due_date))
-                
-            # Check if due date is in the past
-            return date_obj.date() < datetime.now().date()
-        except Exception as e:
-            logging.warning(f"Error checking if overdue: {e}")
-            return False
-
     def _get_status_id_from_name(self, status_name):
         """Convert a status name to a status ID for the RepairDesk API
         
@@ -8,8 +8,12 @@ from typing import Dict, List, Optional, Any
 
 # Import the RepairDesk API client
 from ..utils.repairdesk_api import RepairDeskAPI
+from ..utils.module_lifecycle import RESUME_REVALIDATE_SECONDS
 from ..utils.ui_threading import ThreadSafeUIUpdater
-from nest.main import FixedHeaderTreeview
+from ..utils.inventory_columns import (
+    STATUS_IN_STOCK, STATUS_LOW_STOCK, STATUS_OUT_OF_STOCK, InventoryColumns
+)
+from nest.main import VirtualTreeview
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +33,9 @@ class InventoryModule(ttk.Frame):
         # Inventory data storage
         self.inventory_items = []
         self.filtered_items = []
+        # Columnar copy of inventory_items used for filtering and sorting
+        self._columns = InventoryColumns(self.inventory_items)
+        self._active_filters = {}
         self.current_page = 1
         self.items_per_page = 20
         self.total_pages = 1
@@ -219,8 +226,11 @@ class InventoryModule(ttk.Frame):
         
         # Configure columns
         columns = ("id", "name", "quantity", "price", "category")
-        self.inventory_tree = FixedHeaderTreeview(
+        self.inventory_tree = VirtualTreeview(
             table_frame, 
+            row_values=self._item_values,
+            row_key=lambda item: str(item.get("id", "")),
+            row_tags=self._item_tags,
             columns=columns,
             yscrollcommand=tree_scroll_y.set,
             xscrollcommand=tree_scroll_x.set,
@@ -430,15 +440,14 @@ class InventoryModule(ttk.Frame):
         """
         self.status_var.set("Loading inventory data...")
         
-        # Clear current data
-        self.inventory_tree.delete(*self.inventory_tree.get_children())
-        
         # Reset inventory and filter state
         self.inventory_items = []
         self.filtered_items = []
+        self._load_columns()
+        self.last_refresh_time = None
         
         # Show loading indicator in the tree view
-        self.inventory_tree.insert('', 'end', values=('Loading...', '', '', '', ''), tags=('loading',))
+        self.inventory_tree.show_placeholder(('Loading...', '', '', '', ''), tags=('loading',))
         
         # Check if cache should be used based on toggle setting
         use_cache = self.use_cache_var.get()
@@ -448,10 +457,20 @@ class InventoryModule(ttk.Frame):
         thread.daemon = True
         thread.start()
     
+    def resume(self):
+        """Reload the inventory when the module is shown again with stale data.
+        
+        The reload uses the inventory cache when it is enabled and still fresh.
+        """
+        if self.last_refresh_time is None:
+            return  # Still loading
+        if (datetime.now() - self.last_refresh_time).total_seconds() >= RESUME_REVALIDATE_SECONDS:
+            self.load_inventory()
+    
     def refresh_inventory(self):
         """Refresh inventory data from API, bypassing cache."""
         self.status_var.set("Refreshing inventory data...")
-        self.inventory_tree.delete(*self.inventory_tree.get_children())
+        self.inventory_tree.set_rows([])
         
         # Explicitly clear the cache before refreshing
         if hasattr(self.api_client, '_clear_cache'):
@@ -485,10 +504,13 @@ class InventoryModule(ttk.Frame):
             
             # Define the callback function for incremental updates
             def page_callback(page_items, is_complete, total_items, pagination_info):
-                # Schedule UI update on the main thread using thread-safe updater
-                ThreadSafeUIUpdater.safe_update(self, lambda: self._process_inventory_page(
-                    page_items, is_complete, total_items, pagination_info, is_cached=not force_refresh
-                ))
+                # Schedule UI update on the main thread using thread-safe updater;
+                # pages arriving faster than frames are drawn are merged into one update
+                ThreadSafeUIUpdater.batched_update(
+                    self, "inventory_pages",
+                    (page_items, is_complete, total_items, pagination_info),
+                    lambda pages: self._process_inventory_pages(pages, is_cached=not force_refresh)
+                )
                 
             # Get inventory data from API, with option to bypass cache and page_callback for live updates
             inventory_data = self.api_client.get_all_inventory(
@@ -511,13 +533,8 @@ class InventoryModule(ttk.Frame):
             data: The inventory data to process
             is_cached: Whether data came from cache. None = unknown
         """
-        # Clear loading placeholder if it exists
-        for item in self.inventory_tree.get_children():
-            if self.inventory_tree.item(item, 'values')[0] == 'Loading...':
-                self.inventory_tree.delete(item)
-        
         self.inventory_items = data
-        self.filtered_items = self.inventory_items.copy()
+        self._load_columns()
         
         # Sort items (don't apply filters yet to avoid recursion)
         self.sort_items()
@@ -578,6 +595,19 @@ class InventoryModule(ttk.Frame):
         # Populate category filter
         self._update_category_filter()
         
+    def _process_inventory_pages(self, pages, is_cached=None):
+        """Process pages of inventory data that arrived since the last update as one page.
+        
+        Args:
+            pages: (page_items, is_complete, total_items_so_far, pagination_info) tuples,
+                oldest first
+            is_cached: Whether data came from cache
+        """
+        page_items = [item for items, _, _, _ in pages for item in items]
+        _, is_complete, total_items_so_far, pagination_info = pages[-1]
+        self._process_inventory_page(page_items, is_complete, total_items_so_far, pagination_info,
+                                     is_cached=is_cached)
+    
     def _process_inventory_page(self, page_items, is_complete, total_items_so_far, pagination_info, is_cached=None):
         """Process each page of inventory data as it arrives and update the UI incrementally.
         
@@ -588,23 +618,22 @@ class InventoryModule(ttk.Frame):
             pagination_info: Information about pagination state
             is_cached: Whether data came from cache
         """
-        # Clear loading placeholder on first page
-        if pagination_info.get('current_page', 1) == 1:
-            for item in self.inventory_tree.get_children():
-                if self.inventory_tree.item(item, 'values')[0] == 'Loading...':
-                    self.inventory_tree.delete(item)
-        
-        # Add new items to our inventory list
-        self.inventory_items.extend(page_items)
+        # Add new items to our inventory list and its columns, so filtering and
+        # sorting during the load see every item loaded so far
+        self._columns.extend(page_items)
         
         # Update the progress indicator
         current_page = pagination_info.get('current_page', 1)
         total_pages = pagination_info.get('total_pages', 1)
         self.progress_var.set(f"Loading page {current_page} of {total_pages}...")
         
-        # Process just the new items and add them to the tree
-        for item in page_items:
-            self._add_item_to_tree(item)
+        if self._filters_active():
+            # Re-run the active filters so unmatched items are not shown
+            self.sort_items()
+            self.filter_and_display_items()
+        else:
+            # Add just the new items to the tree; this also clears the loading placeholder
+            self.inventory_tree.append_rows(page_items)
         
         # Update the status bar with count of items so far
         self.count_var.set(f"{total_items_so_far} items{'...' if not is_complete else ''}")
@@ -615,10 +644,7 @@ class InventoryModule(ttk.Frame):
             self.last_refresh_time = datetime.now()
             now = self.last_refresh_time.strftime("%H:%M:%S")
             
-            # Complete the loading process
-            self.filtered_items = self.inventory_items.copy()
-            
-            # Sort and filter all loaded items
+            # Sort and filter all loaded items; the columns are already complete
             self.sort_items()
             self.filter_and_display_items()
             
@@ -671,15 +697,8 @@ class InventoryModule(ttk.Frame):
         """Update category filter dropdown with available categories."""
         categories = ["All Categories"]
         
-        # Extract unique categories
-        category_set = set()
-        for item in self.inventory_items:
-            category = item.get("category", {}).get("name", "")
-            if category and category not in category_set:
-                category_set.add(category)
-        
         # Add sorted categories to the list
-        categories.extend(sorted(category_set))
+        categories.extend(self._columns.category_names())
         
         # Update the combobox values
         category_combo = None
@@ -712,9 +731,6 @@ class InventoryModule(ttk.Frame):
     
     def filter_and_display_items(self):
         """Display the filtered items with pagination."""
-        # Clear current displayed items
-        self.inventory_tree.delete(*self.inventory_tree.get_children())
-        
         # Calculate pagination
         self.items_per_page = int(self.items_per_page_var.get())
         self.total_pages = max(1, (len(self.filtered_items) + self.items_per_page - 1) // self.items_per_page)
@@ -728,15 +744,15 @@ class InventoryModule(ttk.Frame):
         end_idx = start_idx + self.items_per_page
         page_items = self.filtered_items[start_idx:end_idx]
         
-        # Add items to treeview
-        for item in page_items:
-            self._add_item_to_tree(item)
+        # Show the page; only the visible rows are materialized
+        self.inventory_tree.set_rows(page_items)
             
         # Update count
         self.count_var.set(f"{len(self.filtered_items)} items")
     
-    def _add_item_to_tree(self, item):
-        """Add an inventory item to the treeview."""
+    @staticmethod
+    def _item_values(item):
+        """Get the treeview column values for an inventory item."""
         item_id = item.get("id", "")
         name = item.get("name", "")
         # Handle potential empty string or invalid values for price
@@ -756,27 +772,23 @@ class InventoryModule(ttk.Frame):
         else:
             category = item.get("category_name", "")
         
+        return (item_id, name, quantity, price, category)
+    
+    @staticmethod
+    def _item_tags(item):
+        """Get the treeview tags for an inventory item's stock status."""
         # Determine status based on quantity and threshold
         threshold = int(item.get("low_stock_threshold", 5))
         try:
-            qty = int(quantity)
+            qty = int(item.get("quantity", 0))
         except (ValueError, TypeError):
             qty = 0
             
         if qty <= 0:
-            tag = "out_of_stock"
+            return ("out_of_stock",)
         elif qty <= threshold:
-            tag = "low_stock"
-        else:
-            tag = "in_stock"
-        
-        # Insert into treeview with appropriate tag
-        self.inventory_tree.insert(
-            "", 
-            "end", 
-            values=(item_id, name, quantity, price, category),
-            tags=(tag,)
-        )
+            return ("low_stock",)
+        return ("in_stock",)
     
     def _show_load_error(self, error_msg):
         """Show error message when loading fails."""
@@ -786,6 +798,18 @@ class InventoryModule(ttk.Frame):
             f"Failed to load inventory data: {error_msg}"
         )
         
+    def _load_columns(self):
+        """Parse the loaded items into columns once and clear the filters."""
+        self._columns = InventoryColumns(self.inventory_items)
+        self._active_filters = {}
+    
+    def _filters_active(self):
+        """Check whether any filter narrows down the items."""
+        filters = self._active_filters
+        narrowing_statuses = (STATUS_IN_STOCK, STATUS_LOW_STOCK, STATUS_OUT_OF_STOCK)
+        return bool(filters.get('search') or filters.get('category') or filters.get('type_id')
+                    or filters.get('status') in narrowing_statuses)
+    
     def apply_filters(self, event=None):
         """Apply filters to the inventory items."""
         search_term = self.search_var.get().lower()
@@ -793,39 +817,13 @@ class InventoryModule(ttk.Frame):
         status = self.status_var.get()
         item_type = self.type_var.get()
         
-        # Filter items based on criteria
-        self.filtered_items = []
-        for item in self.inventory_items:
-            # Skip items that don't match search term
-            if search_term and not any(
-                search_term in str(item.get(field, '')).lower() 
-                for field in ['name', 'sku', 'barcode', 'notes']
-            ):
-                continue
-            
-            # Filter by category
-            if category != 'All Categories' and item.get('category', {}).get('name', '') != category:
-                continue
-            
-            # Filter by type
-            if item_type == 'Product' and item.get('type_id', '') != '1':
-                continue
-            if item_type == 'Service' and item.get('type_id', '') != '2':
-                continue
-            
-            # Filter by stock status
-            quantity = int(item.get('quantity', 0))
-            threshold = int(item.get('low_stock_threshold', 5))
-            
-            if status == 'In Stock' and (quantity <= threshold or quantity <= 0):
-                continue
-            if status == 'Low Stock' and (quantity > threshold or quantity <= 0):
-                continue
-            if status == 'Out of Stock' and quantity > 0:
-                continue
-            
-            # Item passed all filters
-            self.filtered_items.append(item)
+        # Filter items based on criteria; matching runs on the prebuilt columns
+        self._active_filters = {
+            'search': search_term,
+            'category': None if category == 'All Categories' else category,
+            'type_id': {'Product': '1', 'Service': '2'}.get(item_type),
+            'status': status,
+        }
         
         # Sort items
         self.sort_items()
@@ -846,19 +844,10 @@ class InventoryModule(ttk.Frame):
         sort_by = self.sort_by_var.get()
         field, direction = sort_by.split('_')
         
-        # Define key function based on field
-        if field == 'price':
-            key_func = lambda x: float(x.get('price', 0))
-        elif field == 'cost':
-            key_func = lambda x: float(x.get('cost_price', 0))
-        elif field == 'quantity':
-            key_func = lambda x: int(x.get('quantity', 0))
-        else:
-            key_func = lambda x: str(x.get(field, '')).lower()
-        
-        # Sort the filtered items
-        reverse = direction == 'desc'
-        self.filtered_items.sort(key=key_func, reverse=reverse)
+        # Sorting reuses the cached sort order for the field
+        self.filtered_items = self._columns.query(
+            sort_field=field, descending=direction == 'desc', **self._active_filters
+        )
     
     def sort_column(self, column):
         """Sort by the selected column."""
@@ -507,7 +507,8 @@ class SystemInfoTab(ttk.Frame):
                 return
             
             # Update status while loading fresh data
-            ThreadSafeUIUpdater.safe_update(self, lambda: self.update_status("Loading system information..."))
+            ThreadSafeUIUpdater.coalesced_update(
+                self, "status", lambda: self.update_status("Loading system information..."))
             
             # Register callback for progressive updates
             register_info_callback(self._on_system_info_update)
@@ -521,7 +522,8 @@ class SystemInfoTab(ttk.Frame):
             self.system_info = system_info
             
             # Do an initial UI update with what we have now
-            ThreadSafeUIUpdater.safe_update(self, lambda: self._update_system_info_ui(system_info))
+            ThreadSafeUIUpdater.coalesced_update(
+                self, "system_info_ui", lambda: self._update_system_info_ui(system_info))
             
             # Update data source indicator
             ThreadSafeUIUpdater.safe_update(self, lambda: self.data_source_var.set("Data Source: Local System"))
@@ -536,7 +538,8 @@ class SystemInfoTab(ttk.Frame):
             
             # Log success
             logging.info("System information loading started")
-            ThreadSafeUIUpdater.safe_update(self, lambda: self.update_status("Loading system components..."))
+            ThreadSafeUIUpdater.coalesced_update(
+                self, "status", lambda: self.update_status("Loading system components..."))
             
         except Exception as e:
             logging.error(f"Error loading system info: {e}")
@@ -559,39 +562,66 @@ class SystemInfoTab(ttk.Frame):
             value: The new value
         """
         try:
-            # Only handle specific completion events to avoid too many UI updates
-            if key in ["basic_info_loaded", "hardware_info_loaded", "drives_scan_complete", "network_info_loaded", "health_metrics_loaded"]:
+            # Only handle specific completion events to avoid too many UI updates;
+            # the loader threads report concurrently, so updates of the same
+            # target are coalesced and only the latest one is drawn
+            if key in ["basic_info_loaded", "hardware_info_loaded", "drives_scan_complete",
+                       "network_info_loaded", "health_metrics_loaded"]:
                 # Update our copy with the latest data
                 system_info = self.system_info
                 
                 # Update UI based on completion stage
                 if key == "basic_info_loaded":
-                    self.after(0, lambda: self.update_status("Basic system information loaded, getting hardware details..."))
-                    self.after(0, lambda: self._update_system_info_ui(system_info))
+                    ThreadSafeUIUpdater.coalesced_update(
+                        self, "status",
+                        lambda: self.update_status(
+                            "Basic system information loaded, getting hardware details..."))
+                    ThreadSafeUIUpdater.coalesced_update(
+                        self, "system_info_ui", lambda: self._update_system_info_ui(system_info))
                     
                 elif key == "hardware_info_loaded":
-                    self.after(0, lambda: self.update_status("Hardware information loaded, scanning drives..."))
-                    self.after(0, lambda: self._update_system_info_ui(system_info))
+                    ThreadSafeUIUpdater.coalesced_update(
+                        self, "status",
+                        lambda: self.update_status(
+                            "Hardware information loaded, scanning drives..."))
+                    ThreadSafeUIUpdater.coalesced_update(
+                        self, "system_info_ui", lambda: self._update_system_info_ui(system_info))
                     
                 elif key == "drives_scan_complete" and "drives" in system_info:
-                    self.after(0, lambda: self.update_status("Drive information loaded, checking network..."))
-                    self.after(0, lambda: self._update_drives_list(system_info["drives"]))
+                    ThreadSafeUIUpdater.coalesced_update(
+                        self, "status",
+                        lambda: self.update_status("Drive information loaded, checking network..."))
+                    ThreadSafeUIUpdater.coalesced_update(
+                        self, "drives", lambda: self._update_drives_list(system_info["drives"]))
                     
                 elif key == "network_info_loaded":
-                    self.after(0, lambda: self.update_status("Network information loaded, checking system health..."))
+                    ThreadSafeUIUpdater.coalesced_update(
+                        self, "status",
+                        lambda: self.update_status(
+                            "Network information loaded, checking system health..."))
                     
                 elif key == "health_metrics_loaded" and "health" in system_info:
-                    self.after(0, lambda: self.update_status("System information loaded successfully"))
-                    self.after(0, lambda: self._update_health_indicators(system_info["health"]))
+                    ThreadSafeUIUpdater.coalesced_update(
+                        self, "status",
+                        lambda: self.update_status("System information loaded successfully"))
+                    ThreadSafeUIUpdater.coalesced_update(
+                        self, "health",
+                        lambda: self._update_health_indicators(system_info["health"]))
                     
                 # Share updates with the rest of the application
                 self.shared_state["system_info"] = system_info
                 if hasattr(self.parent, "master") and hasattr(self.parent.master, "update_shared_state"):
-                    self.after(0, lambda: self.parent.master.update_shared_state("system_info", system_info))
+                    ThreadSafeUIUpdater.coalesced_update(
+                        self, "shared_state",
+                        lambda: self.parent.master.update_shared_state("system_info", system_info))
                     
                 # If all information is loaded, unregister the callback
-                if all(system_info.get(k, False) for k in ["basic_info_loaded", "hardware_info_loaded", "drives_scan_complete", "network_info_loaded", "health_metrics_loaded"]):
-                    self.after(0, lambda: self.update_status("All system information loaded successfully"))
+                if all(system_info.get(k, False) for k in [
+                        "basic_info_loaded", "hardware_info_loaded", "drives_scan_complete",
+                        "network_info_loaded", "health_metrics_loaded"]):
+                    ThreadSafeUIUpdater.coalesced_update(
+                        self, "status",
+                        lambda: self.update_status("All system information loaded successfully"))
                     if self.callback_registered:
                         unregister_info_callback(self._on_system_info_update)
                         self.callback_registered = False
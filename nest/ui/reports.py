@@ -4,7 +4,6 @@ import matplotlib
 matplotlib.use('TkAgg')  # Set backend explicitly
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import json
 import os
 import logging
 from datetime import datetime, timedelta
@@ -13,7 +12,6 @@ import time
 import random  # For mock data generation
 import math
 import numpy as np  # For data arrays and numerical operations
-import copy
 
 # Import RepairDesk API client
 from ..utils.repairdesk_api import RepairDeskAPI
@@ -534,8 +532,8 @@ Expires after {self.cache_expiration} minutes"""
                     
                     if os.path.exists(inventory_cache_path):
                         logging.info(f"Loading inventory data from main cache: {inventory_cache_path}")
-                        with open(inventory_cache_path, 'r') as f:
-                            inventory_cache = json.load(f)
+                        from nest.utils.cache_io import read_cache_file
+                        inventory_cache = read_cache_file(inventory_cache_path)
                             
                         # Calculate total inventory value from the complete inventory data
                         total_value = 0
@@ -681,70 +679,55 @@ Expires after {self.cache_expiration} minutes"""
 
     
     def get_cached_data(self, report_type, start_date, end_date):
-        """Get cached report data from JSON file."""
-        from nest.utils.cache_utils import get_cache_directory
-        cache_dir = get_cache_directory()
-            
-        # Generate cache filename based on report type and date range
-        start_str = start_date.strftime('%Y%m%d')
-        end_str = end_date.strftime('%Y%m%d')
-        cache_file = os.path.join(cache_dir, f"{report_type}_report_{start_str}_{end_str}.json")
-        
-        if not os.path.exists(cache_file):
-            return None
+        """Get cached report data from the local store."""
+        from nest.utils.cache_utils import get_local_store
             
         try:
-            # Get file modification time to check cache age
-            mod_time = os.path.getmtime(cache_file)
-            cache_age = (time.time() - mod_time) / 60  # Age in minutes
-            
-            # Check if cache is too old (over 15 minutes)
-            if cache_age > self.cache_expiration:
-                logging.info(f"Cache for {report_type} report is too old ({cache_age:.1f} minutes)")
+            # Reports are cached per type and date range; entries older than
+            # the cache expiration (15 minutes) are ignored
+            cached = get_local_store().load_report(
+                report_type,
+                start_date.strftime('%Y-%m-%d'),
+                end_date.strftime('%Y-%m-%d'),
+                max_age_seconds=self.cache_expiration * 60
+            )
+            if cached is None:
                 return None
-                
-            # Read and parse the cache file
-            with open(cache_file, 'r') as f:
-                cache_data = json.load(f)
+            
+            cache_data, age_seconds = cached
+            cache_age = age_seconds / 60  # Age in minutes
                 
             # Return the cached data with metadata
             logging.info(f"Using cached data for {report_type} report ({cache_age:.1f} minutes old)")
             cache_data['_cache_age'] = cache_age
-            cache_data['_cache_path'] = cache_file
             return cache_data
             
         except Exception as e:
-            logging.warning(f"Error reading cache file: {e}")
+            logging.warning(f"Error reading report cache: {e}")
             return None
             
     def cache_data(self, report_type, data, start_date, end_date):
-        """Cache report data to JSON file."""
+        """Cache report data in the local store."""
         if not data:
             return False
             
-        from nest.utils.cache_utils import get_cache_directory
-        cache_dir = get_cache_directory()
-            
-        # Generate cache filename based on report type and date range
-        start_str = start_date.strftime('%Y%m%d')
-        end_str = end_date.strftime('%Y%m%d')
-        cache_file = os.path.join(cache_dir, f"{report_type}_report_{start_str}_{end_str}.json")
+        from nest.utils.cache_utils import get_local_store
+        start_str = start_date.strftime('%Y-%m-%d')
+        end_str = end_date.strftime('%Y-%m-%d')
         
         try:
             # Add cache metadata
-            data_to_cache = copy.deepcopy(data)
+            data_to_cache = dict(data)
             data_to_cache['_cached_at'] = time.time()
             data_to_cache['_report_type'] = report_type
             data_to_cache['_date_range'] = {
-                'start': start_date.strftime('%Y-%m-%d'),
-                'end': end_date.strftime('%Y-%m-%d')
+                'start': start_str,
+                'end': end_str
             }
             
-            # Write to cache file
-            with open(cache_file, 'w') as f:
-                json.dump(data_to_cache, f, indent=2)
+            get_local_store().save_report(report_type, start_str, end_str, data_to_cache)
                 
-            logging.info(f"Cached {report_type} report data successfully to {cache_file}")
+            logging.info(f"Cached {report_type} report data successfully")
             return True
             
         except Exception as e:
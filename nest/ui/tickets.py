@@ -7,9 +7,7 @@ Handles ticket creation, viewing, and management for repair services.
 import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
 from datetime import datetime, timedelta
-import json
 import logging
-import os
 import webbrowser
 import threading
 import queue
@@ -19,7 +17,13 @@ from typing import Dict, List, Optional, Any, Tuple, Callable
 # Local imports
 from ..utils.config import get_config, load_config
 from ..api.api_client import RepairDeskClient
-from ..utils.cache_utils import get_ticket_cache_path
+from ..utils.repairdesk_api import RepairDeskAPI
+from ..utils.stale_while_revalidate import (
+    CircuitOpenError, StaleWhileRevalidate, diff_items, format_age, get_circuit_breaker
+)
+from ..utils.ticket_events import get_ticket_event_bus
+from ..utils.ticket_record import TicketRecord, normalize_record
+from ..utils.ticket_search import get_ticket_search_index, tokenize
 from ..utils.ui_threading import ThreadSafeUIUpdater
 
 
@@ -27,7 +31,7 @@ from ..ui.widgets import HoverButton, ScrollableFrame, ToolTip
 from .styles import get_style
 
 # Import our custom Treeview
-from ..main import FixedHeaderTreeview
+from ..main import VirtualTreeview
 
 # Load config
 CONFIG = get_config()
@@ -41,67 +45,45 @@ def log_message(message):
 
 def normalize_ticket(ticket: dict) -> dict:
     """Convert API ticket format to a consistent display format."""
-    summary = ticket.get("summary", {})
-    devices = ticket.get("devices", [])
-
-    ticket_id = summary.get("order_id", "N/A")
-    if ticket_id != "N/A" and not str(ticket_id).startswith("T-"):
-        ticket_id = f"T-{ticket_id}"
-
-    customer_name = summary.get("customer", {}).get("fullName", "N/A")
-    customer_phone = summary.get("customer", {}).get("mobile", "N/A")
-
-    device_name = "N/A"
-    repair_type = "N/A"
-    if devices and isinstance(devices, list) and len(devices) > 0:
-        device_name = devices[0].get("device", {}).get("name", "N/A")
-        if "repairProdItems" in devices[0] and len(devices[0]["repairProdItems"]) > 0:
-            repair_type = devices[0]["repairProdItems"][0].get("name", "N/A")
-
-    status = "Open"
-    if devices and isinstance(devices, list) and len(devices) > 0:
-        status = devices[0].get("status", {}).get("name", "Open")
-
-    assigned_to = "Unassigned"
-    if devices and isinstance(devices, list) and len(devices) > 0:
-        assigned_to = devices[0].get("assigned_to", {}).get("fullname", "Unassigned")
-        if assigned_to == "":
-            assigned_to = "Unassigned"
-
-    created_date = "N/A"
-    try:
-        ts = float(summary.get("created_date", 0))
-        created_date = datetime.fromtimestamp(ts).strftime("%Y-%m-%d")
-    except Exception as e:
-        log_message(f"Error formatting created_date: {e}")
-
-    last_updated = created_date  # Default to same as created date
-    try:
-        # Try to get last updated date from ticket
-        update_ts = summary.get("updated_at")
-        if update_ts:
-            last_updated = datetime.fromtimestamp(float(update_ts)).strftime("%Y-%m-%d")
-    except Exception:
-        pass
+    return normalize_record(ticket).view("tickets", _ticket_view)
 
+
+def _ticket_view(record: TicketRecord) -> dict:
+    """Build the tickets view's display fields from a normalized ticket record."""
+    created_date = record.created.strftime("%Y-%m-%d") if record.created else "N/A"
     return {
-        "id": ticket_id,
-        "customer": customer_name,
-        "phone": customer_phone,
-        "device": device_name,
-        "issue": repair_type,
-        "status": status,
-        "technician": assigned_to,
+        "id": record.ticket_id or "N/A",
+        "customer": record.customer_name or "N/A",
+        "phone": record.customer_mobile or "N/A",
+        "device": record.device or "N/A",
+        "issue": record.repair_type or "N/A",
+        "status": record.device_status or "Open",
+        "technician": record.technician or "Unassigned",
         "date_created": created_date,
-        "date_updated": last_updated,
-        "raw_data": ticket,  # Store the original data for reference
+        "date_updated": record.updated.strftime("%Y-%m-%d") if record.updated else created_date,
+        "raw_data": record.raw,  # The original data, shared by reference (read-only)
     }
 
 
+def normalize_tickets(tickets) -> list:
+    """Normalize a list of API tickets, skipping any that cannot be processed.
+    
+    Called on loader threads so the UI thread only receives display-ready rows.
+    """
+    rows = []
+    for ticket in tickets or []:
+        try:
+            rows.append(normalize_ticket(ticket))
+        except Exception as e:
+            logging.error(f"Error processing ticket: {e}")
+    return rows
+
+
 class TicketsModule(ttk.Frame):
     """Module for managing repair tickets."""
 
     REFRESH_INTERVAL = 30000  # Refresh interval in milliseconds (30 seconds)
+    PAGE_SIZE = 50  # Tickets handed to the UI thread per queue message
     LOADING_TEXT = "Loading ticket details..."
 
     def __del__(self):
@@ -148,11 +130,16 @@ class TicketsModule(ttk.Frame):
         config = load_config()
         self.api_key = config.get("repairdesk", {}).get("api_key", "")
         self.client = RepairDeskClient(api_key=self.api_key)
+        self.sync_api = RepairDeskAPI(api_key=self.api_key or None)
 
         # Set up the UI based on the action
         self.setup_ui()
+        get_ticket_search_index().load_async()
         self.load_tickets()
         
+        # Patch single tickets when they are changed anywhere in the app
+        self._mutation_token = get_ticket_event_bus().subscribe(self._on_ticket_mutation)
+        
         self.setup_nestbot_integration()
 
     def setup_ui(self):
@@ -293,8 +280,10 @@ class TicketsModule(ttk.Frame):
             "date_created",
             "date_updated",
         )
-        self.tickets_table = FixedHeaderTreeview(
+        self.tickets_table = VirtualTreeview(
             table_container,
+            row_values=self._ticket_row_values,
+            row_key=lambda ticket: str(ticket.get("id", "")),
             columns=columns,
             show="headings",
             height=12,  # Better height for more ticket visibility
@@ -317,34 +306,34 @@ class TicketsModule(ttk.Frame):
 
         # Configure headers
         self.tickets_table.heading(
-            "id", text="Ticket #", command=lambda: self.sort_by_column("id", False)
+            "id", text="Ticket #", command=lambda: self.sort_by_column("id")
         )
         self.tickets_table.heading(
-            "customer", text="Customer", command=lambda: self.sort_by_column("customer", False)
+            "customer", text="Customer", command=lambda: self.sort_by_column("customer")
         )
         self.tickets_table.heading(
-            "device", text="Device", command=lambda: self.sort_by_column("device", False)
+            "device", text="Device", command=lambda: self.sort_by_column("device")
         )
         self.tickets_table.heading(
-            "issue", text="Issue", command=lambda: self.sort_by_column("issue", False)
+            "issue", text="Issue", command=lambda: self.sort_by_column("issue")
         )
         self.tickets_table.heading(
-            "status", text="Status", command=lambda: self.sort_by_column("status", False)
+            "status", text="Status", command=lambda: self.sort_by_column("status")
         )
         self.tickets_table.heading(
             "technician",
             text="Technician",
-            command=lambda: self.sort_by_column("technician", False),
+            command=lambda: self.sort_by_column("technician"),
         )
         self.tickets_table.heading(
             "date_created",
             text="Created",
-            command=lambda: self.sort_by_column("date_created", False),
+            command=lambda: self.sort_by_column("date_created"),
         )
         self.tickets_table.heading(
             "date_updated",
             text="Updated",
-            command=lambda: self.sort_by_column("date_updated", False),
+            command=lambda: self.sort_by_column("date_updated"),
         )
 
         self.tickets_table.pack(fill="both", expand=True)
@@ -563,6 +552,10 @@ class TicketsModule(ttk.Frame):
                 except Exception:
                     pass
             
+            # Stop receiving ticket mutation events
+            if hasattr(self, '_mutation_token'):
+                get_ticket_event_bus().unsubscribe(self._mutation_token)
+            
             # Clear any queues
             if hasattr(self, 'ticket_queue'):
                 while not self.ticket_queue.empty():
@@ -595,11 +588,12 @@ class TicketsModule(ttk.Frame):
             
         super().pack_forget()
             
-    def load_tickets(self, force_refresh=False):
+    def load_tickets(self, force_refresh=False, delta_sync=False):
         """Initiate loading tickets from the API.
         
         Args:
             force_refresh (bool): Whether to force refresh from API instead of using cache
+            delta_sync (bool): Whether to only download tickets changed since the last sync
         """
         if hasattr(self, 'loading_tickets') and self.loading_tickets:
             # Already loading, don't start another operation
@@ -613,7 +607,8 @@ class TicketsModule(ttk.Frame):
         
         # Start a background thread for API calls
         self.loader_thread = threading.Thread(
-            target=lambda: self._load_tickets_thread(force_refresh=force_refresh), 
+            target=lambda: self._load_tickets_thread(force_refresh=force_refresh,
+                                                     delta_sync=delta_sync),
             daemon=True
         )
         self.loader_thread.start()
@@ -624,139 +619,201 @@ class TicketsModule(ttk.Frame):
         # Start the periodic refresh timer
         self._schedule_ticket_refresh()
     
-    def _load_tickets_thread(self, force_refresh=False, is_refresh=False):
-        """Background thread to load tickets.
+    def _load_tickets_thread(self, force_refresh=False, is_refresh=False, delta_sync=False):
+        """Background thread that serves cached tickets, then revalidates them against the API.
+        
+        Results are passed to the UI thread through the ticket queue: a "stale"
+        message with the first page of cached tickets, their total and age first,
+        then the fresh tickets, or "stale_error"/"error" if the API failed. An
+        empty API result counts as a failure while tickets are shown. The
+        cached tickets are read lazily from the local store's summary index, so
+        only the first page of ticket bodies is parsed before the fresh tickets
+        replace them; if the API fails, the remaining cached pages are sent as
+        "page" messages before "stale_error". Fresh tickets are sent in bounded
+        chunks too: "replace" with the first PAGE_SIZE rows, "page" for the rest,
+        then "success" or "synced" with the ticket count. If they match what is
+        shown, only the final message is sent. Tickets are normalized and the
+        cache is written here, so the UI thread only swaps in ready rows.
+        
+        When nothing is on screen yet, tickets are streamed instead: each page
+        is normalized here and sent as a "page" message as soon as it arrives,
+        followed by "streamed" with the ticket count once all pages are in.
         
         Args:
-            force_refresh (bool): Whether to bypass cache and get fresh data from API
+            force_refresh (bool): Whether to bypass cache and force fresh data from API
             is_refresh (bool): Whether this is a periodic refresh or initial load
+            delta_sync (bool): Whether to only download tickets changed since the last sync
         """
-        try:
-            # Get tickets from the API
-            if is_refresh:
-                log_message("Refreshing tickets from API...")
-            else:
-                log_message("Fetching tickets from API...")
-            
-            # Try to get tickets from the API first
-            raw_tickets = []
-            try:
-                # Pass the force_refresh parameter to the RepairDeskClient
-                raw_tickets = self.client.get_all_tickets(force_refresh=force_refresh)
-                if force_refresh:
-                    log_message(f"Force-refreshed {len(raw_tickets)} tickets from API")
-                else:
-                    log_message(f"Loaded {len(raw_tickets)} tickets from API")
-            except Exception as e:
-                log_message(f"Error loading tickets from API: {e}")
-                
-                # Try to load from cache as fallback
-                try:
-                    # Use the centralized cache path
-                    cache_path = get_ticket_cache_path()
-                    if os.path.exists(cache_path):
-                        with open(cache_path, "r") as f:
-                            raw_tickets = json.load(f)
-                            log_message(f"Loaded {len(raw_tickets)} tickets from cache")
-                except Exception as cache_err:
-                    log_message(f"Error loading tickets from cache: {cache_err}")
-            
-            # Clear existing tickets if this is a refresh
-            if is_refresh:
-                self.ticket_data = []
-                
-            # Process tickets
-            for ticket in raw_tickets:
-                try:
-                    # Convert to consistent format
-                    normalized = normalize_ticket(ticket)
-                    self.ticket_data.append(normalized)
-                except Exception as e:
-                    log_message(f"Error processing ticket: {e}")
-                    
-            # Update the UI on the main thread
-            ThreadSafeUIUpdater.safe_update(self, lambda: self.update_ticket_table())
+        # Stream pages into the view only if it would otherwise stay empty
+        stream = {"enabled": not self.ticket_data, "pages": 0}
+        cached = {"tickets": None}
+        page_size = self.PAGE_SIZE
+        
+        def read_cached():
+            # Periodic refreshes already show tickets; only the first load needs the cache
+            if self.ticket_data:
+                return None
+            return self.sync_api.load_ticket_cache_snapshot(lazy=True)
+        
+        def on_stale(tickets, age):
+            stream["enabled"] = False
+            cached["tickets"] = tickets
+            rows = normalize_tickets(tickets[:page_size])
+            self.ticket_queue.put(("stale", (rows, len(tickets), age)))
+        
+        def send_cached_pages():
+            # The fresh tickets never came, so page in the rest of the cache
+            tickets = cached["tickets"]
+            total = len(tickets)
+            for start in range(page_size, total, page_size):
+                rows = normalize_tickets(tickets[start:start + page_size])
+                self.ticket_queue.put(("page", (rows, min(start + page_size, total), total)))
+        
+        def send_fresh(result):
+            status, rows = result
+            if status == "streamed":
+                # Every page is already on screen
+                self.ticket_queue.put(result)
+                return
+            total = len(rows)
+            shown = list(self.ticket_data)
+            if shown and not diff_items(shown, rows, key=lambda t: t.get("id")):
+                log_message("Ticket refresh: no changes")
+                self.ticket_queue.put((status, total))
+                return
+            # Swap in the fresh tickets a page at a time so no UI update handles them all
+            self.ticket_queue.put(("replace", (rows[:page_size], total)))
+            for start in range(page_size, total, page_size):
+                self.ticket_queue.put(
+                    ("page", (rows[start:start + page_size], min(start + page_size, total), total)))
+            self.ticket_queue.put((status, total))
+        
+        def on_page(page_tickets, is_complete, loaded, pagination_info):
+            rows = normalize_tickets(page_tickets)
+            stream["pages"] += 1
+            self.ticket_queue.put(("page", (rows, loaded, pagination_info.get("total_items"))))
+        
+        def fetch():
+            if delta_sync:
+                # Only changed tickets are downloaded; the merged list is already cached
+                return ("synced", normalize_tickets(self.sync_api.sync_tickets()))
+            # Pass the force_refresh parameter to get fresh data when needed
+            tickets = self.client.get_all_tickets(
+                force_refresh=force_refresh, page_callback=on_page if stream["enabled"] else None
+            )
+            if not tickets:
+                if self.ticket_data:
+                    # Clients report API errors as empty results; keep the shown tickets
+                    raise ValueError("API returned no tickets")
+                return ("success", [])
+            # Save cache for offline access; this also indexes the tickets for search
+            # on this thread, so searching never tokenizes tickets on the UI thread
+            self.sync_api.save_ticket_cache(tickets)
             
-            # Schedule the next refresh if this is a periodic refresh
-            if is_refresh:
-                self._schedule_ticket_refresh()
-                
-        except Exception as e:
-            log_message(f"Error loading tickets: {e}")
-            error_msg = str(e)
-            ThreadSafeUIUpdater.safe_update(self, lambda: self.status_label.config(text=f"Error loading tickets: {error_msg}"))
+            if stream["pages"]:
+                # Every page is already on screen
+                return ("streamed", len(tickets))
+            return ("success", normalize_tickets(tickets))
+        
+        def on_error(error, served_stale):
+            logging.error(f"Error loading tickets from API: {error}")
+            if served_stale or self.ticket_data:
+                if served_stale:
+                    send_cached_pages()
+                status = ("RepairDesk unavailable" if isinstance(error, CircuitOpenError)
+                          else "Refresh failed")
+                self.ticket_queue.put(("stale_error", f"{status} – showing cached tickets"))
+            else:
+                self.ticket_queue.put(("error", f"Error: {str(error)}. No cache available."))
+        
+        try:
+            # Log operation type
+            if force_refresh:
+                log_message("Force refreshing ticket data from API...")
+            log_message("Refreshing tickets from API..." if is_refresh
+                        else "Loading tickets from API...")
             
-            # Even if we fail, schedule another refresh
-            if is_refresh:
-                self._schedule_ticket_refresh()
-
+            loader = StaleWhileRevalidate(get_circuit_breaker("repairdesk"))
+            loader.run(
+                read_cached,
+                fetch,
+                on_stale=on_stale,
+                on_fresh=send_fresh,
+                on_error=on_error,
+                is_valid=lambda result: bool(result[1]),
+            )
         except Exception as e:
-            log_message(f"Error loading tickets: {e}")
-            error_msg = str(e)
-            ThreadSafeUIUpdater.safe_update(self, lambda: self.status_label.config(text=f"Error loading tickets: {error_msg}"))
-
-            # Even if we fail, schedule another refresh
-            return
-            
-        self.loading_tickets = True
-        self.status_label.config(text="Loading tickets...")
+            logging.exception(f"Unhandled exception in ticket loading: {e}")
+            self.ticket_queue.put(("error", f"Unhandled error: {str(e)}"))
+    
+    def _apply_ticket_data(self, ticket_data):
+        """Show normalized tickets, redrawing the table only if anything changed.
         
-        # Create a queue to safely pass data between threads
-        self.ticket_queue = queue.Queue()
+        Returns:
+            int: Number of tickets shown
+        """
+        diff = diff_items(self.ticket_data, ticket_data, key=lambda t: t.get("id"))
+        if diff or not self.ticket_data:
+            log_message(f"Ticket changes: {len(diff.added)} added, {len(diff.changed)} changed, "
+                        f"{len(diff.removed)} removed")
+            self.ticket_data = ticket_data
+            self.update_ticket_table()
+        return len(ticket_data)
+    
+    def _append_ticket_page(self, rows, loaded, total):
+        """Add a page of normalized tickets to the list while the rest is loading.
         
-        # Start a background thread for API calls
-        self.loader_thread = threading.Thread(target=self._background_ticket_loader, daemon=True)
-        self.loader_thread.start()
+        Args:
+            rows: Normalized tickets of the page
+            loaded: Number of tickets loaded so far
+            total: Total number of tickets, or None if unknown
+        """
+        self.ticket_data.extend(rows)
         
-        # Schedule a check for results from the queue
-        self.after(100, self._check_ticket_queue)
+        status = self.status_var.get()
+        search_term = self.search_var.get().strip().lower()
+        if status == "All" and not search_term:
+            # The table keeps its sort order as rows are appended
+            self.filtered_tickets.extend(rows)
+            self.tickets_table.append_rows(rows)
+        else:
+            self.filter_tickets(status, search_term)
         
-    def _load_tickets_thread(self, force_refresh=False, is_refresh=False):
-        """Background thread that loads tickets from the API.
+        progress = f"{loaded} of {total}" if total else f"{loaded}"
+        self.status_label.config(text=f"Loaded {progress} tickets – loading more…")
+    
+    def _on_ticket_mutation(self, mutation):
+        """Patch a ticket changed elsewhere into the list (called on the publishing thread)."""
+        if mutation.ticket is None:
+            return
+        if not any(mutation.matches(t.get("id")) for t in self.ticket_data):
+            return
+        updated = normalize_ticket(mutation.ticket)
+        ThreadSafeUIUpdater.safe_update(
+            self, lambda: self._apply_ticket_mutation(mutation, updated))
+    
+    def _apply_ticket_mutation(self, mutation, updated):
+        """Replace the mutated ticket's row and details on the main thread.
         
         Args:
-            force_refresh (bool): Whether to bypass cache and force fresh data from API
-            is_refresh (bool): Whether this is a periodic refresh or initial load
+            mutation: The ticket mutation event
+            updated: The mutated ticket, already normalized
         """
-        try:
-            # Log whether we're force refreshing
-            if force_refresh:
-                log_message("Force refreshing ticket data from API...")
-                
-            # Log operation type
-            if is_refresh:
-                log_message("Refreshing tickets from API...")
-            else:
-                log_message("Loading tickets from API...")
-                
-            # Load tickets from API
-            raw_tickets = []
-            try:
-                # Pass the force_refresh parameter to get fresh data when needed
-                raw_tickets = self.client.get_all_tickets(force_refresh=force_refresh)
-                self.ticket_queue.put(("success", raw_tickets))
-            except Exception as e:
-                logging.error(f"Error loading tickets from API: {e}")
-                
-                # Try to load from cache as fallback
-                try:
-                    # Use the centralized cache path
-                    cache_path = get_ticket_cache_path()
-                    if os.path.exists(cache_path):
-                        with open(cache_path, "r") as f:
-                            raw_tickets = json.load(f)
-                            self.ticket_queue.put(("cache", raw_tickets))
-                    else:
-                        self.ticket_queue.put(("error", f"Error: {str(e)}. No cache available."))
-                except Exception as cache_err:
-                    logging.error(f"Error loading tickets from cache: {cache_err}")
-                    self.ticket_queue.put(("error", f"API Error: {str(e)}\nCache Error: {str(cache_err)}"))
-        except Exception as e:
-            logging.exception(f"Unhandled exception in ticket loading: {e}")
-            self.ticket_queue.put(("error", f"Unhandled error: {str(e)}"))
+        if getattr(self, '_is_destroyed', False) or not hasattr(self, 'tickets_table'):
+            return
+        
+        self.ticket_data = [updated if mutation.matches(t.get("id")) else t
+                            for t in self.ticket_data]
+        self.filter_tickets(self.status_var.get(), self.search_var.get().strip().lower())
+        
+        if self.current_ticket and mutation.matches(self.current_ticket.get("id")):
+            self.current_ticket = updated
+            self.update_details_panel(updated)
+        log_message(f"Applied {mutation.kind} for ticket {updated.get('id')}")
     
     def _check_ticket_queue(self):
         """Check for tickets in the queue and update the UI safely."""
+        finished = True
         try:
             # Check if we've been destroyed
             if hasattr(self, '_is_destroyed') and self._is_destroyed:
@@ -766,69 +823,68 @@ class TicketsModule(ttk.Frame):
             # Initialize pending updates if not already created
             if not hasattr(self, '_pending_updates'):
                 self._pending_updates = []
-                
+            
+            thread_alive = hasattr(self, 'loader_thread') and self.loader_thread.is_alive()
             if not hasattr(self, 'ticket_queue') or self.ticket_queue.empty():
                 # Keep checking if thread is still running
-                if hasattr(self, 'loader_thread') and self.loader_thread.is_alive():
+                if thread_alive:
+                    finished = False
                     # Store the after ID so we can cancel it if needed
                     after_id = self.after(100, self._check_ticket_queue)
                     self._pending_updates.append(after_id)
-                    return
                 else:
                     # Thread finished but no data in queue - likely an error
-                    self.loading_tickets = False
                     try:
                         self.status_label.config(text="Error: No tickets loaded")
                     except (tk.TclError, RuntimeError):
                         # Widget might be destroyed
                         logging.debug("Failed to update status label - widget likely destroyed")
-                    return
+                return
                     
             # Get data from the queue
             status, data = self.ticket_queue.get()
             
-            if status == "success":
-                # Process tickets on the main thread
-                self.ticket_data = []
-                processed = 0
+            if status == "stale":
+                # Show the first page of cached tickets right away; fresh data follows
+                tickets, total, age = data
+                processed = self._apply_ticket_data(tickets)
+                shown = f"{processed} of {total}" if processed < total else f"{processed}"
+                self.status_label.config(
+                    text=f"Showing {shown} cached tickets ({format_age(age)}) – refreshing…")
                 
-                for ticket in data:
-                    try:
-                        processed += 1
-                        normalized = normalize_ticket(ticket)
-                        self.ticket_data.append(normalized)
-                    except Exception as e:
-                        logging.error(f"Error processing ticket: {e}")
+                # Keep polling for the revalidation result
+                finished = False
+                after_id = self.after(100, self._check_ticket_queue)
+                self._pending_updates.append(after_id)
                 
-                # Update the UI
-                self.update_ticket_table()
-                self.status_label.config(text=f"Loaded {processed} tickets from API")
+            elif status == "replace":
+                # Fresh tickets replace the list; the rest follow as pages
+                rows, total = data
+                processed = self._apply_ticket_data(rows)
+                if processed < total:
+                    self.status_label.config(
+                        text=f"Loaded {processed} of {total} tickets – loading more…")
                 
-                # Save cache for offline access
-                try:
-                    # Use the centralized cache path
-                    cache_path = get_ticket_cache_path()
-                    with open(cache_path, "w") as f:
-                        json.dump(data, f)
-                except Exception as e:
-                    logging.error(f"Failed to save ticket cache: {e}")
-                    
-            elif status == "cache":
-                # Process cached tickets
-                self.ticket_data = []
-                processed = 0
+                finished = False
+                after_id = self.after(1, self._check_ticket_queue)
+                self._pending_updates.append(after_id)
                 
-                for ticket in data:
-                    try:
-                        processed += 1
-                        normalized = normalize_ticket(ticket)
-                        self.ticket_data.append(normalized)
-                    except Exception as e:
-                        logging.error(f"Error processing cached ticket: {e}")
+            elif status == "page":
+                # Show this page right away; more pages follow
+                self._append_ticket_page(*data)
                 
-                # Update the UI
-                self.update_ticket_table()
-                self.status_label.config(text=f"Loaded {processed} tickets from cache")
+                # The next page may already be waiting
+                finished = False
+                after_id = self.after(1, self._check_ticket_queue)
+                self._pending_updates.append(after_id)
+                
+            elif status in ("success", "synced", "streamed"):
+                # Every page is already on screen; data is the ticket count
+                self.status_label.config(text=f"Loaded {data} tickets from API")
+                    
+            elif status == "stale_error":
+                # Cached tickets stay on screen
+                self.status_label.config(text=data)
                 
             elif status == "error":
                 # Show error in UI
@@ -838,11 +894,12 @@ class TicketsModule(ttk.Frame):
             logging.exception(f"Error in _check_ticket_queue: {e}")
             self.status_label.config(text=f"Error: {str(e)}")
         finally:
-            self.loading_tickets = False
-            
-            # Schedule the next auto-refresh if this was successful
-            if hasattr(self, '_schedule_ticket_refresh'):
-                self._schedule_ticket_refresh()
+            if finished:
+                self.loading_tickets = False
+                
+                # Schedule the next auto-refresh if this was successful
+                if hasattr(self, '_schedule_ticket_refresh'):
+                    self._schedule_ticket_refresh()
                 
     def _schedule_ticket_refresh(self):
         """Schedule the next ticket refresh."""
@@ -851,9 +908,30 @@ class TicketsModule(ttk.Frame):
             self.after_cancel(self.refresh_timer_id)
             self.refresh_timer_id = None
         
+        # A hidden module refreshes when it is shown again
+        if getattr(self, '_suspended_at', None) is not None:
+            return
+        
         # Schedule a new refresh
         self.refresh_timer_id = self.after(self.REFRESH_INTERVAL, self._refresh_tickets)
         
+    def suspend(self):
+        """Stop periodic refreshes while the module is hidden."""
+        if hasattr(self, 'refresh_timer_id') and self.refresh_timer_id:
+            self.after_cancel(self.refresh_timer_id)
+            self.refresh_timer_id = None
+        self._suspended_at = time.time()
+        
+    def resume(self):
+        """Restart periodic refreshes when the module is shown again."""
+        suspended_at = getattr(self, '_suspended_at', None)
+        self._suspended_at = None
+        if (suspended_at is not None
+                and (time.time() - suspended_at) * 1000 >= self.REFRESH_INTERVAL):
+            # Hidden for longer than a refresh interval; catch up right away
+            self._refresh_tickets()
+        self._schedule_ticket_refresh()
+        
     def _refresh_tickets(self):
         """Refresh tickets from the API."""
         # Don't refresh if we're already loading or if we're destroyed
@@ -863,8 +941,8 @@ class TicketsModule(ttk.Frame):
         if hasattr(self, '_is_destroyed') and self._is_destroyed:
             return
             
-        # Force refresh using the force_refresh parameter
-        self.load_tickets(force_refresh=True)
+        # Periodic refreshes only pull tickets changed since the last sync
+        self.load_tickets(force_refresh=True, delta_sync=True)
         
     def _fetch_detailed_ticket_info(self, ticket_id):
         """Fetch detailed ticket information from the API using the /tickets/{Ticket-Id} endpoint.
@@ -975,72 +1053,33 @@ class TicketsModule(ttk.Frame):
             log_message("Module destroyed, ignoring manual refresh")
             return
             
-        try:
-            # Update UI first
-            self.status_label.config(text="Refreshing tickets...")
-            self.loading_tickets = True
-            
-            # First update the UI
-            self.update_idletasks()
-            
-            # Force refresh directly
-            log_message("Manual refresh: Fetching tickets directly")
-            setattr(self.client, '_force_refresh', True)
-            
-            # Get tickets directly - more reliable for manual refresh
-            raw_tickets = self.client.get_all_tickets()
-            log_message(f"Manual refresh: Loaded {len(raw_tickets)} tickets")
-            
-            # Process tickets
-            self.ticket_data = []
-            for ticket in raw_tickets:
-                try:
-                    normalized = normalize_ticket(ticket)
-                    self.ticket_data.append(normalized)
-                except Exception as e:
-                    log_message(f"Error processing ticket: {e}")
-            
-            # Update UI
-            self.update_ticket_table()
-            self.status_label.config(text=f"Loaded {len(self.ticket_data)} tickets")
-            
-            # Schedule next refresh
-            self._schedule_ticket_refresh()
-            
-        except (tk.TclError, RuntimeError) as e:
-            # Widget might be destroyed
-            log_message(f"Error during manual refresh (UI): {e}")
-        except Exception as e:
-            # Handle general errors
-            log_message(f"Error during manual refresh: {e}")
-            try:
-                self.status_label.config(text=f"Error refreshing tickets: {str(e)}")
-            except:
-                pass
-        finally:
-            self.loading_tickets = False
+        # Fetch and normalize on the loader thread so the UI stays responsive
+        log_message("Manual refresh: Fetching tickets")
+        self.load_tickets(force_refresh=True)
         
+    @staticmethod
+    def _ticket_row_values(ticket):
+        """Get the table column values for a normalized ticket."""
+        return (
+            ticket.get("id", ""),
+            ticket.get("customer", ""),
+            ticket.get("device", ""),
+            ticket.get("issue", ""),
+            ticket.get("status", ""),
+            ticket.get("technician", ""),
+            ticket.get("date_created", ""),
+            ticket.get("date_updated", ""),
+        )
+    
+    def sort_by_column(self, column):
+        """Sort the table by a column; clicking the same heading again reverses the order."""
+        self.tickets_table.sort_by_column(column)
+    
     def update_ticket_table(self):
         """Update the ticket table with current data."""
-        self.tickets_table.delete(*self.tickets_table.get_children())
-        
         # Add tickets to the table
         self.filtered_tickets = self.ticket_data.copy()
-        for ticket in self.filtered_tickets:
-            self.tickets_table.insert(
-                "",
-                "end",
-                values=(
-                    ticket.get("id", ""),
-                    ticket.get("customer", ""),
-                    ticket.get("device", ""),
-                    ticket.get("issue", ""),
-                    ticket.get("status", ""),
-                    ticket.get("technician", ""),
-                    ticket.get("date_created", ""),
-                    ticket.get("date_updated", ""),
-                ),
-            )
+        self.tickets_table.set_rows(self.filtered_tickets)
 
         # Update status
         self.status_label.config(text=f"{len(self.filtered_tickets)} tickets loaded")
@@ -1077,50 +1116,23 @@ class TicketsModule(ttk.Frame):
                 logging.debug("Skipping ticket filtering - widget destroyed")
                 return
                 
-            # Clear existing items
-            for item in self.tickets_table.get_children():
-                try:
-                    self.tickets_table.delete(item)
-                except (tk.TclError, RuntimeError) as e:
-                    logging.debug(f"Error clearing table row: {e}")
-                    # Widget might be destroyed, stop further processing
-                    return
-                    
+            # Search the full-text index; matches come back best first
+            tickets = self.ticket_data
+            if search_term:
+                tickets = self._search_tickets(search_term)
+            
             # Filter tickets
-            self.filtered_tickets = []
-            for ticket in self.ticket_data:
-                # Status filter
-                if status != "All" and ticket.get("status") != status:
-                    continue
-                    
-                # Search filter
-                if search_term and not (
-                    search_term in str(ticket.get("id", "")).lower()
-                    or search_term in str(ticket.get("customer", "")).lower()
-                    or search_term in str(ticket.get("device", "")).lower()
-                    or search_term in str(ticket.get("issue", "")).lower()
-                    or search_term in str(ticket.get("technician", "")).lower()
-                ):
-                    continue
-                    
-                self.filtered_tickets.append(ticket)
+            self.filtered_tickets = [
+                ticket for ticket in tickets
+                if status == "All" or ticket.get("status") == status
+            ]
                 
-            # Display filtered tickets
-            for ticket in self.filtered_tickets:
-                try:
-                    values = [
-                        ticket.get("id", ""),
-                        ticket.get("customer", ""),
-                        ticket.get("device", ""),
-                        ticket.get("issue", ""),
-                        ticket.get("status", ""),
-                        ticket.get("technician", ""),
-                        ticket.get("date_created", ""),
-                    ]
-                    self.tickets_table.insert("", "end", values=values)
-                except (tk.TclError, RuntimeError) as e:
-                    logging.debug(f"Error inserting row: {e}")
-                    break
+            # Display filtered tickets; only the visible rows are materialized
+            try:
+                self.tickets_table.set_rows(self.filtered_tickets)
+            except (tk.TclError, RuntimeError) as e:
+                logging.debug(f"Error displaying tickets: {e}")
+                return
                     
             # Display filtered count in status bar
             try:
@@ -1147,6 +1159,25 @@ class TicketsModule(ttk.Frame):
             except:
                 pass
             
+    def _search_tickets(self, search_term):
+        """Get the loaded tickets matching a search term, best match first."""
+        # The index is loaded in the background; never block the UI thread on it
+        index = get_ticket_search_index()
+        if index.loaded and tokenize(search_term):
+            by_id = {ticket.get("id"): ticket for ticket in self.ticket_data}
+            matches = [by_id[order_id] for order_id, _ in index.search(search_term, limit=None)
+                       if order_id in by_id]
+            if matches:
+                return matches
+        
+        # Short queries like "T-1", substrings such as "phone" in "iPhone", or an index
+        # that is still loading: match the visible fields like the plain filter does
+        return [
+            ticket for ticket in self.ticket_data
+            if any(search_term in str(ticket.get(field, "")).lower()
+                   for field in ("id", "customer", "device", "issue", "technician"))
+        ]
+            
     def on_ticket_select(self, event):
         """Handle ticket selection in the table."""
         selection = self.tickets_table.selection()
@@ -1795,15 +1826,8 @@ class TicketsModule(ttk.Frame):
                 self.assigned_label.config(text=technician)
 
                 # Update the table
-                for item_id in self.tickets_table.get_children():
-                    item = self.tickets_table.item(item_id)
-                    if str(item["values"][0]) == str(ticket_id):
-                        values = list(item["values"])
-                        values[4] = status  # Status column
-                        values[5] = technician  # Technician column
-                        values[7] = datetime.now().strftime("%Y-%m-%d")  # Updated date
-                        self.tickets_table.item(item_id, values=tuple(values))
-                        break
+                self.current_ticket["date_updated"] = datetime.now().strftime("%Y-%m-%d")
+                self.tickets_table.update_row(str(ticket_id), self.current_ticket)
 
                 # Update notes if provided
                 if note.strip():
@@ -1857,14 +1881,8 @@ class TicketsModule(ttk.Frame):
                 self.status_label.config(text="Completed")
                 
                 # Update the table
-                for item_id in self.tickets_table.get_children():
-                    item = self.tickets_table.item(item_id)
-                    if str(item["values"][0]) == str(ticket_id):
-                        values = list(item["values"])
-                        values[4] = "Completed"  # Status column
-                        values[7] = datetime.now().strftime("%Y-%m-%d")  # Updated date
-                        self.tickets_table.item(item_id, values=tuple(values))
-                        break
+                self.current_ticket["date_updated"] = datetime.now().strftime("%Y-%m-%d")
+                self.tickets_table.update_row(str(ticket_id), self.current_ticket)
                         
             self.show_notification(f"Ticket {ticket_id} marked as complete", "success")
             
@@ -1952,14 +1970,8 @@ class TicketsModule(ttk.Frame):
             self.status_label.config(text="Cancelled")
             
             # Update the table
-            for item_id in self.tickets_table.get_children():
-                item = self.tickets_table.item(item_id)
-                if str(item["values"][0]) == str(ticket_id):
-                    values = list(item["values"])
-                    values[4] = "Cancelled"  # Status column
-                    values[7] = datetime.now().strftime("%Y-%m-%d")  # Updated date
-                    self.tickets_table.item(item_id, values=tuple(values))
-                    break
+            self.current_ticket["date_updated"] = datetime.now().strftime("%Y-%m-%d")
+            self.tickets_table.update_row(str(ticket_id), self.current_ticket)
                     
         # Show notification with customer notification status
         notification_msg = f"Ticket {ticket_id} has been cancelled"
@@ -1,49 +1,74 @@
 import requests
 import logging
+import random
 import time
 import os
 import json
-from datetime import datetime, timedelta
+from datetime import datetime
 from functools import wraps
 from nest.utils.config_util import load_config, ConfigManager
+from nest.utils.cache_io import read_cache_file, write_cache_file
+from nest.utils.http_transport import get_transport
+from nest.utils.rate_limiter import (RETRY_POLICIES, RETRYABLE_STATUS_CODES, on_main_thread,
+                                     parse_retry_after, send_with_retries)
+from nest.utils.response_cache import (EMPLOYEE_TTL, TICKET_DETAIL_TTL, TICKET_LIST_TTL,
+                                       get_response_cache)
 
-# Unified cache system with consistent expiry times
-RESPONSE_CACHE = {}
-DEFAULT_CACHE_EXPIRY = 180  # 3 minutes - balanced between freshness and performance
-EMPLOYEE_CACHE_EXPIRY = 1800  # 30 minutes for employees (reduced from 1 hour)
-TICKET_CACHE_EXPIRY = 90  # 1.5 minutes for tickets (reduced from 2 minutes)
+# Unified cache system shared with RepairDeskAPI: bounded LRU with per-endpoint expiry times
+RESPONSE_CACHE = get_response_cache()
+DEFAULT_CACHE_EXPIRY = TICKET_DETAIL_TTL  # 3 minutes - balanced between freshness and performance
+EMPLOYEE_CACHE_EXPIRY = EMPLOYEE_TTL  # 1 hour for employees
+TICKET_CACHE_EXPIRY = TICKET_LIST_TTL  # 1.5 minutes for tickets
 
 # Retry configuration - optimized for better performance
 MAX_RETRIES = 2  # Reduced from 3 to 2 for faster failures
 RETRY_DELAY = 0.5  # Reduced from 1 second to 0.5 seconds
 
-# Helper function for retrying API calls with optimized backoff
-def retry_with_backoff(max_retries=MAX_RETRIES, initial_delay=RETRY_DELAY):
+def _is_transient_error(e):
+    """Check whether a request error is worth retrying (network failure or throttling)."""
+    if isinstance(e, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)):
+        return True
+    response = getattr(e, "response", None)
+    return response is not None and response.status_code in RETRYABLE_STATUS_CODES
+
+
+# Helper function for retrying API calls with jittered backoff and a shared retry budget.
+# The main (UI) thread never sleeps between attempts; it gets the first failure instead.
+def retry_with_backoff(max_retries=MAX_RETRIES, initial_delay=RETRY_DELAY, endpoint_class="list"):
     def decorator(func):
         @wraps(func)
         def wrapper(*args, **kwargs):
+            policy = RETRY_POLICIES[endpoint_class]
+            can_retry = not on_main_thread()
             retries = 0
-            delay = initial_delay
             last_exception = None
             
             while retries < max_retries:
                 try:
-                    return func(*args, **kwargs)
+                    result = func(*args, **kwargs)
+                    policy.record_request()
+                    return result
                 except requests.RequestException as e:
                     last_exception = e
                     logging.warning(f"API call failed (attempt {retries+1}/{max_retries}): {str(e)}")
                     
-                    if retries < max_retries - 1:
-                        if isinstance(e, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)):
-                            time.sleep(delay)
-                            retries += 1
-                            delay *= 1.2  # Further reduced multiplier for faster retries
-                        else:
-                            break
+                    # Only retry transient failures, and only while the retry budget allows
+                    if (can_retry and retries < max_retries - 1 and _is_transient_error(e)
+                            and policy.try_spend()):
+                        response = getattr(e, "response", None)
+                        retry_after = None
+                        if response is not None:
+                            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+                        if retry_after is None:
+                            # Full jitter so parallel callers don't retry in lockstep
+                            retry_after = random.uniform(0, initial_delay * (2 ** retries))
+                        time.sleep(retry_after)
+                        retries += 1
                     else:
                         break
             
             # If we get here, all retries failed
+            policy.record_request()
             logging.error(f"All {max_retries} API call attempts failed. Last error: {str(last_exception)}")
             if last_exception:
                 raise last_exception
@@ -113,7 +138,7 @@ class RepairDeskClient:
             params = {"api_key": self.api_key, "limit": 1}  # Just get one ticket
             
             logging.info("[RepairDeskClient] Validating API key...")
-            response = requests.get(url, params=params, timeout=10)
+            response = get_transport().get(url, params=params, timeout=10)
             
             if response.status_code == 200:
                 logging.info("[RepairDeskClient] API key validation successful")
@@ -143,17 +168,13 @@ class RepairDeskClient:
     def get_employees(self):
         """Get all employees from RepairDesk"""
         # Create a cache key based on the method name
-        cache_key = 'employees'
-        
-        # Use a cache time of 1 hour for employees since they rarely change
-        EMPLOYEE_CACHE_EXPIRY = 3600  # 1 hour
+        cache_key = 'client:employees'
         
         # Check if we have a valid cached response
-        if cache_key in RESPONSE_CACHE:
-            cache_time, cache_data = RESPONSE_CACHE[cache_key]
-            if datetime.now() - cache_time < timedelta(seconds=EMPLOYEE_CACHE_EXPIRY):
-                logging.info("[RepairDeskClient] Returning cached employees list")
-                return cache_data
+        cache_hit, cache_data = RESPONSE_CACHE.get(cache_key)
+        if cache_hit:
+            logging.info("[RepairDeskClient] Returning cached employees list")
+            return cache_data
         
         # Attempt to fetch fresh data - avoid excessive retries that could hang the app
         return self._fetch_employees_with_timeout()
@@ -168,14 +189,16 @@ class RepairDeskClient:
             params = {"api_key": self.api_key}
             
             logging.info(f"[RepairDeskClient] Fetching employees from: {url}")
-            response = requests.get(url, params=params, timeout=8)  # 8-second timeout
+            response = send_with_retries(
+                # 8-second timeout
+                lambda: get_transport().get(url, params=params, timeout=8), "detail")
             
             if response.status_code == 200:
                 self.last_successful_call = datetime.now()
                 employees_data = response.json()
                 
                 # Cache the successful response
-                RESPONSE_CACHE['employees'] = (datetime.now(), employees_data)
+                RESPONSE_CACHE.set('client:employees', employees_data, endpoint="employees")
                 return employees_data
             else:
                 self.failed_calls += 1
@@ -213,13 +236,13 @@ class RepairDeskClient:
             dict: The API response containing tickets data
         """
         # Create a cache key based on the parameters
-        cache_key = f'tickets_status={status}_page={page}_limit={limit}'
+        cache_key = f'client:tickets_status={status}_page={page}_limit={limit}'
         
         # Check if we have a valid cached response with ticket-specific expiry time
         # Skip cache if force_refresh is True
-        if not force_refresh and cache_key in RESPONSE_CACHE:
-            cache_time, cache_data = RESPONSE_CACHE[cache_key]
-            if datetime.now() - cache_time < timedelta(seconds=TICKET_CACHE_EXPIRY):
+        if not force_refresh:
+            cache_hit, cache_data = RESPONSE_CACHE.get(cache_key)
+            if cache_hit:
                 logging.debug(f"[RepairDeskClient] Using cached tickets data for {cache_key}")
                 return cache_data
                 
@@ -245,14 +268,15 @@ class RepairDeskClient:
         
         try:
             logging.info(f"[RepairDeskClient] GET {url}")
-            response = requests.get(url, params=params, timeout=15)
+            response = send_with_retries(
+                lambda: get_transport().get(url, params=params, timeout=15), "list")
             
             if response.status_code == 200:
                 self.last_successful_call = datetime.now()
                 tickets_data = response.json()
                 
                 # Cache the successful response
-                RESPONSE_CACHE[cache_key] = (datetime.now(), tickets_data)
+                RESPONSE_CACHE.set(cache_key, tickets_data, endpoint="tickets")
                 return tickets_data
             else:
                 self.failed_calls += 1
@@ -375,7 +399,7 @@ class RepairDeskClient:
         
         # API key is passed as a query parameter
         params = {"api_key": self.api_key}
-        response = requests.post(url, json=payload, params=params, timeout=15)
+        response = get_transport().post(url, json=payload, params=params, timeout=15)
         
         try:
             response_json = response.json()
@@ -406,14 +430,13 @@ class RepairDeskClient:
             dict: The ticket details
         """
         # Create a cache key based on ticket ID
-        cache_key = f'ticket_details_{ticket_id}'
+        cache_key = f'client:ticket_details_{ticket_id}'
         
         # Check if we have a valid cached response
-        if cache_key in RESPONSE_CACHE:
-            cache_time, cache_data = RESPONSE_CACHE[cache_key]
-            if datetime.now() - cache_time < timedelta(seconds=DEFAULT_CACHE_EXPIRY):
-                logging.info(f"[RepairDeskClient] Returning cached ticket details for {ticket_id}")
-                return cache_data
+        cache_hit, cache_data = RESPONSE_CACHE.get(cache_key)
+        if cache_hit:
+            logging.info(f"[RepairDeskClient] Returning cached ticket details for {ticket_id}")
+            return cache_data
                 
         self.total_calls += 1
         url = f"{self.base_url}/tickets/{ticket_id}"
@@ -422,14 +445,15 @@ class RepairDeskClient:
         logging.info(f"[RepairDeskClient] GET {url}")
         
         try:
-            response = requests.get(url, params=params, timeout=15)
+            response = send_with_retries(
+                lambda: get_transport().get(url, params=params, timeout=15), "detail")
             
             if response.status_code == 200:
                 self.last_successful_call = datetime.now()
                 ticket_data = response.json()
                 
                 # Cache the successful response
-                RESPONSE_CACHE[cache_key] = (datetime.now(), ticket_data)
+                RESPONSE_CACHE.set(cache_key, ticket_data, endpoint=f"tickets/{ticket_id}")
                 return ticket_data
             else:
                 self.failed_calls += 1
@@ -498,7 +522,7 @@ class RepairDeskClient:
         
         try:
             # First make the status update request
-            response = requests.put(url, json=data, params=params, timeout=15)
+            response = get_transport().put(url, json=data, params=params, timeout=15)
             
             if response.status_code in [200, 201, 202]:
                 self.last_successful_call = datetime.now()
@@ -573,7 +597,7 @@ def add_note_to_ticket(self, ticket_id, note, note_type=1, is_flag=0):
     
     # API key is passed as a query parameter
     params = {"api_key": self.api_key}
-    response = requests.post(url, json=payload, params=params, timeout=15)
+    response = get_transport().post(url, json=payload, params=params, timeout=15)
     
     try:
         response_json = response.json()
@@ -627,7 +651,8 @@ def add_note_to_ticket(self, ticket_id, note, note_type=1, is_flag=0):
             
             try:
                 # Direct request like dashboard uses
-                response = requests.get(url, headers={"Content-Type": "application/json"}, timeout=10)
+                response = get_transport().get(url, headers={"Content-Type": "application/json"},
+                                               timeout=10)
                 response.raise_for_status()
                 data = response.json()
                 
@@ -692,7 +717,7 @@ def add_note_to_ticket(self, ticket_id, note, note_type=1, is_flag=0):
             logging.info(f"[RepairDeskClient] Fetching ticket details for ID: {ticket_id}")
             
             # Make the API call
-            response = requests.get(url, headers=self.headers, timeout=10)
+            response = get_transport().get(url, headers=self.headers, timeout=10)
             response.raise_for_status()
             data = response.json()
             
@@ -718,8 +743,7 @@ def add_note_to_ticket(self, ticket_id, note, note_type=1, is_flag=0):
         """Save ticket data to the cache file."""
         try:
             cache_path = os.path.join(os.path.dirname(__file__), "..", "ticket_cache.json")
-            with open(cache_path, "w") as file:
-                json.dump(data, file)
+            write_cache_file(cache_path, data)
             logging.info("[RepairDeskClient] Tickets data cached successfully.")
         except Exception as e:
             logging.error(f"[RepairDeskClient] Failed to cache tickets: {e}")
@@ -729,9 +753,8 @@ def add_note_to_ticket(self, ticket_id, note, note_type=1, is_flag=0):
         try:
             cache_path = os.path.join(os.path.dirname(__file__), "..", "ticket_cache.json")
             if os.path.exists(cache_path):
-                with open(cache_path, "r") as file:
-                    logging.info("[RepairDeskClient] Loading tickets from cache.")
-                    return json.load(file)
+                logging.info("[RepairDeskClient] Loading tickets from cache.")
+                return read_cache_file(cache_path)
         except Exception as e:
             logging.error(f"[RepairDeskClient] Failed to load cached tickets: {e}")
         return None
@@ -15,11 +15,18 @@ from io import BytesIO
 import tkinter as tk
 from typing import Optional, Tuple
 
+from nest.utils.cache_manager import ManagedCache
+
 # Configure logging
 logger = logging.getLogger(__name__)
 
-# Avatar cache to avoid reloading the same image multiple times
-_avatar_cache = {}
+def _image_size(image: Image.Image) -> int:
+    """Approximate the memory held by a decoded image in bytes."""
+    return image.width * image.height * len(image.getbands())
+
+# Avatar cache to avoid reloading the same image multiple times; counts towards
+# the global cache memory budget
+_avatar_cache = ManagedCache('avatars', sizer=_image_size)
 
 def get_avatar_url(user_data: dict, size: str = 'small') -> Optional[str]:
     """
@@ -105,8 +112,9 @@ def load_avatar_image(url: str, size: Tuple[int, int] = (100, 100)) -> Optional[
         PIL.Image: Resized image or None if loading fails
     """
     cache_key = f"{url}_{size[0]}x{size[1]}"
-    if cache_key in _avatar_cache:
-        return _avatar_cache[cache_key]
+    cached = _avatar_cache.get(cache_key)
+    if cached is not None:
+        return cached
     
     try:
         # Handle local file paths
@@ -0,0 +1,223 @@
+"""
+Cache file serialization for Nest.
+
+Every cache file is written through write_cache_file(), which writes to a
+temporary file in the same directory and renames it over the target, so a
+crash mid-write leaves the previous cache intact instead of a truncated one.
+Files start with a short header line naming the format version, codec and
+compression:
+
+    NESTCACHE/1 codec=json compression=none
+
+followed by the encoded payload. Payloads are encoded compactly (no
+indentation). MessagePack is used when the ``msgpack`` package is installed,
+orjson speeds up JSON when present, and zlib compression can be enabled in
+the "cache_format" section of config.json. read_cache_file() also reads the
+plain JSON files written by older versions. File names keep their
+historical ``.json`` extension.
+"""
+
+import json
+import logging
+import os
+import tempfile
+import zlib
+from typing import Any, Dict, Optional
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+logger = logging.getLogger(__name__)
+
+CACHE_FORMAT_VERSION = 1
+CACHE_MAGIC = b"NESTCACHE/"
+
+CODEC_JSON = "json"
+CODEC_MSGPACK = "msgpack"
+CODEC_AUTO = "auto"
+
+COMPRESSION_NONE = "none"
+COMPRESSION_ZLIB = "zlib"
+ZLIB_LEVEL = 1  # Favour speed; cache payloads compress well even at level 1
+
+
+class CacheFormatError(ValueError):
+    """Raised when a cache file is corrupt or uses an unsupported format."""
+
+
+def _resolve_codec(codec: Optional[str]) -> str:
+    if codec in (None, CODEC_AUTO):
+        return CODEC_MSGPACK if msgpack is not None else CODEC_JSON
+    if codec == CODEC_MSGPACK and msgpack is None:
+        logger.debug("msgpack not installed, falling back to JSON cache codec")
+        return CODEC_JSON
+    return codec
+
+
+def _encode(data: Any, codec: str) -> bytes:
+    if codec == CODEC_MSGPACK:
+        return msgpack.packb(data, use_bin_type=True, default=str)
+    if orjson is not None:
+        try:
+            return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS)
+        except TypeError:
+            pass  # e.g. integers too large for orjson; use the stdlib encoder
+    return json.dumps(data, separators=(',', ':'), default=str).encode('utf-8')
+
+
+def _decode(payload: bytes, codec: str) -> Any:
+    if codec == CODEC_MSGPACK:
+        if msgpack is None:
+            raise CacheFormatError("Cache file needs msgpack, which is not installed")
+        return msgpack.unpackb(payload, raw=False, strict_map_key=False)
+    if codec == CODEC_JSON:
+        return orjson.loads(payload) if orjson is not None else json.loads(payload)
+    raise CacheFormatError(f"Unknown cache codec: {codec}")
+
+
+_settings: Optional[Dict] = None
+
+
+def get_cache_format_settings() -> Dict:
+    """Read codec and compression settings from the "cache_format" section of config.json."""
+    global _settings
+    if _settings is None:
+        try:
+            from nest.utils.config_util import load_config
+            settings = load_config().get("cache_format", {}) or {}
+        except Exception:
+            settings = {}
+        _settings = {
+            'codec': settings.get('codec', CODEC_AUTO),
+            'compression': settings.get('compression', COMPRESSION_NONE),
+        }
+    return _settings
+
+
+def encode_cache_data(data: Any, codec: Optional[str] = None,
+                      compression: Optional[str] = None) -> bytes:
+    """Encode data with a versioned cache header.
+
+    Args:
+        data: Data to encode
+        codec: 'json', 'msgpack' or 'auto' (defaults to config)
+        compression: 'none' or 'zlib' (defaults to config)
+
+    Returns:
+        Header plus encoded payload
+    """
+    settings = get_cache_format_settings()
+    codec = _resolve_codec(codec or settings['codec'])
+    compression = compression or settings['compression']
+
+    payload = _encode(data, codec)
+    if compression == COMPRESSION_ZLIB:
+        payload = zlib.compress(payload, ZLIB_LEVEL)
+    elif compression != COMPRESSION_NONE:
+        raise ValueError(f"Unknown cache compression: {compression}")
+
+    header = (f"{CACHE_MAGIC.decode()}{CACHE_FORMAT_VERSION} "
+              f"codec={codec} compression={compression}\n")
+    return header.encode('ascii') + payload
+
+
+def decode_cache_data(raw: bytes) -> Any:
+    """Decode bytes produced by encode_cache_data() or a legacy plain JSON file.
+
+    Raises:
+        CacheFormatError: If the data is corrupt or uses an unsupported version
+    """
+    if not raw.startswith(CACHE_MAGIC):
+        # Plain JSON written before the cache header existed
+        try:
+            return json.loads(raw.decode('utf-8'))
+        except (UnicodeDecodeError, ValueError) as e:
+            raise CacheFormatError(f"Invalid legacy cache file: {e}") from e
+
+    header_end = raw.find(b"\n")
+    if header_end < 0:
+        raise CacheFormatError("Truncated cache header")
+
+    try:
+        fields = raw[len(CACHE_MAGIC):header_end].decode('ascii').split()
+        version = int(fields[0])
+        options = dict(field.split('=', 1) for field in fields[1:])
+    except (UnicodeDecodeError, ValueError, IndexError) as e:
+        raise CacheFormatError(f"Invalid cache header: {e}") from e
+
+    if version > CACHE_FORMAT_VERSION:
+        raise CacheFormatError(f"Cache format version {version} is newer than supported")
+
+    payload = raw[header_end + 1:]
+    compression = options.get('compression', COMPRESSION_NONE)
+    try:
+        if compression == COMPRESSION_ZLIB:
+            payload = zlib.decompress(payload)
+        elif compression != COMPRESSION_NONE:
+            raise CacheFormatError(f"Unknown cache compression: {compression}")
+        return _decode(payload, options.get('codec', CODEC_JSON))
+    except CacheFormatError:
+        raise
+    except Exception as e:
+        raise CacheFormatError(f"Corrupt cache payload: {e}") from e
+
+
+def write_cache_file(path: str, data: Any, codec: Optional[str] = None,
+                     compression: Optional[str] = None) -> None:
+    """Atomically write data to a cache file.
+
+    The data is written to a temporary file in the same directory, flushed to
+    disk and renamed over ``path``, so readers see either the old or the new
+    file, never a partial one.
+
+    Args:
+        path: Target file path
+        data: Data to write
+        codec: 'json', 'msgpack' or 'auto' (defaults to config)
+        compression: 'none' or 'zlib' (defaults to config)
+    """
+    encoded = encode_cache_data(data, codec=codec, compression=compression)
+
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=".tmp-", suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(encoded)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+def read_cache_file(path: str, default: Any = None) -> Any:
+    """Read a cache file written by write_cache_file() or a legacy JSON cache.
+
+    Args:
+        path: Cache file path
+        default: Value returned if the file does not exist
+
+    Returns:
+        The decoded data
+
+    Raises:
+        CacheFormatError: If the file is corrupt or uses an unsupported format
+    """
+    try:
+        with open(path, 'rb') as f:
+            raw = f.read()
+    except FileNotFoundError:
+        return default
+    return decode_cache_data(raw)
@@ -0,0 +1,289 @@
+"""
+Central accounting and memory budget for in-process caches.
+
+Every in-memory cache (API responses, NestBot's ticket and comment caches,
+avatar images) registers with the process-wide CacheManager. Caches record an
+approximate size for each entry once, when it is stored, so the total held
+in memory is known without walking the caches. When the total exceeds the
+global budget, the manager evicts the least recently used entries across all
+caches, so a burst in one cache displaces stale entries in the others
+instead of growing memory.
+
+A registered cache implements the small protocol used by the manager:
+``name``, ``size_bytes()``, ``oldest_access()``, ``evict_oldest()`` and
+``stats()``. ManagedCache is a ready-made LRU mapping that implements it.
+"""
+
+import itertools
+import logging
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from collections.abc import MutableMapping
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MEMORY_BUDGET = 96 * 1024 * 1024  # 96 MB across all registered caches
+
+# Global access clock shared by all caches, so recency can be compared across them
+_access_clock = itertools.count(1)
+
+
+def next_access_tick() -> int:
+    """Get a monotonically increasing access tick."""
+    return next(_access_clock)
+
+
+class ManagedCache(MutableMapping):
+    """Thread-safe LRU mapping with per-entry size accounting and hit/miss counters."""
+
+    def __init__(self, name: str, sizer: Optional[Callable[[Any], int]] = None,
+                 ttl: Optional[float] = None, manager: Optional["CacheManager"] = None):
+        """Initialize the cache and register it with the cache manager.
+
+        Args:
+            name: Name shown in cache statistics
+            sizer: Function estimating an entry's size in bytes (defaults to
+                response_cache.estimate_size)
+            ttl: Optional time to live in seconds for entries
+            manager: Cache manager to register with (defaults to the global one)
+        """
+        if sizer is None:
+            from nest.utils.response_cache import estimate_size
+            sizer = estimate_size
+        self.name = name
+        self.sizer = sizer
+        self.ttl = ttl
+
+        # key -> (last access tick, stored_at, size, value), least recently used first
+        self._entries: "OrderedDict[Any, Tuple[int, float, int, Any]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.RLock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+        self._manager = manager or get_cache_manager()
+        self._manager.register(self)
+
+    def _expired(self, stored_at: float) -> bool:
+        return self.ttl is not None and time.time() - stored_at >= self.ttl
+
+    def _remove(self, key) -> None:
+        """Drop an entry; the caller holds the lock."""
+        _, _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def __getitem__(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or self._expired(entry[1]):
+                if entry is not None:
+                    self._remove(key)
+                self.misses += 1
+                raise KeyError(key)
+            _, stored_at, size, value = entry
+            self._entries[key] = (next_access_tick(), stored_at, size, value)
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def __setitem__(self, key, value) -> None:
+        size = self.sizer(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (next_access_tick(), time.time(), size, value)
+            self._bytes += size
+        self._manager.enforce_budget()
+
+    def __delitem__(self, key) -> None:
+        with self._lock:
+            self._remove(key)
+
+    def __contains__(self, key) -> bool:
+        # Membership tests do not count as hits or refresh recency
+        with self._lock:
+            entry = self._entries.get(key)
+            return entry is not None and not self._expired(entry[1])
+
+    def __iter__(self) -> Iterator:
+        with self._lock:
+            return iter(list(self._entries))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def purge_expired(self) -> int:
+        """Evict expired entries and return how many were removed."""
+        if self.ttl is None:
+            return 0
+        with self._lock:
+            expired = [k for k, (_, stored_at, _, _) in self._entries.items()
+                       if self._expired(stored_at)]
+            for key in expired:
+                self._remove(key)
+        return len(expired)
+
+    # Cache manager protocol
+
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def oldest_access(self) -> Optional[int]:
+        """Get the access tick of the least recently used entry, or None if empty."""
+        with self._lock:
+            if not self._entries:
+                return None
+            return next(iter(self._entries.values()))[0]
+
+    def evict_oldest(self) -> int:
+        """Evict the least recently used entry and return the bytes freed."""
+        with self._lock:
+            if not self._entries:
+                return 0
+            key = next(iter(self._entries))
+            size = self._entries[key][2]
+            self._remove(key)
+            self.evictions += 1
+            return size
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+            }
+
+
+class CacheManager:
+    """Registry of in-process caches that enforces a shared memory budget."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MEMORY_BUDGET):
+        """Initialize the manager.
+
+        Args:
+            max_bytes: Approximate upper bound for the size of all registered caches
+        """
+        self.max_bytes = max_bytes
+        self._caches: List[weakref.ref] = []
+        self._lock = threading.Lock()
+        self._evict_lock = threading.Lock()
+        self.evictions = 0
+
+    def register(self, cache) -> None:
+        """Register a cache implementing the cache manager protocol.
+
+        Only a weak reference is kept, so caches owned by discarded objects
+        drop out of the registry when they are garbage collected.
+        """
+        with self._lock:
+            if all(ref() is not cache for ref in self._caches):
+                self._caches.append(weakref.ref(cache))
+        logger.debug(f"Registered cache: {cache.name}")
+
+    def unregister(self, cache) -> None:
+        """Stop tracking a cache."""
+        with self._lock:
+            self._caches = [ref for ref in self._caches if ref() is not cache]
+
+    def caches(self) -> List[Any]:
+        """Get the registered caches that are still alive."""
+        with self._lock:
+            caches = [ref() for ref in self._caches]
+            if None in caches:
+                self._caches = [ref for ref in self._caches if ref() is not None]
+            return [cache for cache in caches if cache is not None]
+
+    def total_bytes(self) -> int:
+        """Get the approximate size of all registered caches."""
+        return sum(cache.size_bytes() for cache in self.caches())
+
+    def enforce_budget(self) -> int:
+        """Evict the least recently used entries across caches until under budget.
+
+        Returns:
+            Number of entries evicted
+        """
+        caches = self.caches()
+        total = sum(cache.size_bytes() for cache in caches)
+        if total <= self.max_bytes:
+            return 0
+
+        evicted = 0
+        # Only one thread evicts at a time; others skip rather than queue up
+        if not self._evict_lock.acquire(blocking=False):
+            return 0
+        try:
+            while total > self.max_bytes:
+                candidates = [(tick, cache) for cache in caches
+                              for tick in (cache.oldest_access(),) if tick is not None]
+                if not candidates:
+                    break
+                _, victim = min(candidates, key=lambda candidate: candidate[0])
+                freed = victim.evict_oldest()
+                total -= freed
+                evicted += 1
+            self.evictions += evicted
+        finally:
+            self._evict_lock.release()
+
+        if evicted:
+            logger.debug(f"Evicted {evicted} cache entries to stay within the memory budget")
+        return evicted
+
+    def purge_expired(self) -> int:
+        """Evict expired entries from every cache that supports it."""
+        return sum(cache.purge_expired() for cache in self.caches()
+                   if hasattr(cache, 'purge_expired'))
+
+    def stats(self) -> Dict[str, Any]:
+        """Get per-cache statistics plus global totals."""
+        per_cache = {cache.name: cache.stats() for cache in self.caches()}
+        hits = sum(s.get('hits', 0) for s in per_cache.values())
+        misses = sum(s.get('misses', 0) for s in per_cache.values())
+        total = sum(s.get('bytes', 0) for s in per_cache.values())
+        return {
+            'caches': per_cache,
+            'total_bytes': total,
+            'max_bytes': self.max_bytes,
+            'hit_rate': hits / (hits + misses) if hits + misses else 0.0,
+            'budget_evictions': self.evictions,
+        }
+
+
+_cache_manager: Optional[CacheManager] = None
+_cache_manager_lock = threading.Lock()
+
+
+def get_cache_manager() -> CacheManager:
+    """Get the process-wide cache manager, creating it on first use.
+
+    The budget can be set in the "cache_manager" section of config.json,
+    e.g. {"max_bytes": 67108864}.
+    """
+    global _cache_manager
+    if _cache_manager is None:
+        with _cache_manager_lock:
+            if _cache_manager is None:
+                try:
+                    from nest.utils.config_util import load_config
+                    settings = load_config().get("cache_manager", {}) or {}
+                except Exception:
+                    settings = {}
+                max_bytes = settings.get("max_bytes", DEFAULT_MEMORY_BUDGET)
+                _cache_manager = CacheManager(max_bytes=max_bytes)
+    return _cache_manager
@@ -2,6 +2,7 @@ import os
 import json
 import time
 import logging
+import threading
 from pathlib import Path
 from typing import Dict, Any, Optional
 from .platform_paths import PlatformPaths
@@ -24,6 +25,10 @@ CACHE_DIR = str(_platform_paths.ensure_dir_exists(_platform_paths.get_cache_dir(
 INVENTORY_CACHE_PATH = os.path.join(CACHE_DIR, 'inventory_cache.json')
 TICKET_CACHE_PATH = os.path.join(CACHE_DIR, 'ticket_cache.json')
 CUSTOMER_CACHE_PATH = os.path.join(CACHE_DIR, 'customer_cache.json')
+LOCAL_STORE_PATH = os.path.join(CACHE_DIR, 'nest_cache.db')
+
+_local_store = None
+_local_store_lock = threading.Lock()
 
 def get_cache_directory():
     """Get or create the cache directory if it doesn't exist."""
@@ -68,25 +73,58 @@ def get_customer_cache_path():
     get_cache_directory()
     return CUSTOMER_CACHE_PATH
 
-def register_cache(cache_name: str, cache_data: Dict[str, Any]) -> None:
-    """Register a cache in the global cache registry for centralized management."""
-    _cache_registry[cache_name] = cache_data
+def get_local_store():
+    """Get the shared SQLite store for tickets, inventory, customers and reports."""
+    global _local_store
+    if _local_store is None:
+        with _local_store_lock:
+            if _local_store is None:
+                from .local_store import LocalStore
+                get_cache_directory()
+                _local_store = LocalStore(LOCAL_STORE_PATH)
+    return _local_store
+
+def register_cache(cache_name: str, cache_data) -> None:
+    """Register a cache in the global cache registry for centralized management.
+
+    Caches implementing the cache manager protocol (such as ManagedCache) are
+    handed to the cache manager and count towards the global memory budget.
+    Plain dictionaries are only tracked for statistics and TTL cleanup.
+    """
+    from .cache_manager import get_cache_manager
+    if hasattr(cache_data, 'evict_oldest'):
+        get_cache_manager().register(cache_data)
+    else:
+        _cache_registry[cache_name] = cache_data
     logging.debug(f"Registered cache: {cache_name}")
 
 def get_cache_stats() -> Dict[str, Dict[str, Any]]:
-    """Get statistics for all registered caches."""
-    stats = {}
+    """Get statistics for all registered caches.
+
+    Sizes come from the estimates recorded when entries were stored, so this
+    is cheap regardless of how much is cached. Plain dictionaries registered
+    with register_cache() report entry counts only.
+    """
+    from .cache_manager import get_cache_manager
+    manager_stats = get_cache_manager().stats()
+    stats = dict(manager_stats['caches'])
     for cache_name, cache_data in _cache_registry.items():
         stats[cache_name] = {
             'entries': len(cache_data),
-            'size_bytes': sum(len(str(v)) for v in cache_data.values()),
             'last_accessed': cache_data.get('_last_accessed', 'Never')
         }
+    stats['_total'] = {
+        'bytes': manager_stats['total_bytes'],
+        'max_bytes': manager_stats['max_bytes'],
+        'hit_rate': manager_stats['hit_rate'],
+        'budget_evictions': manager_stats['budget_evictions'],
+    }
     return stats
 
 def clear_expired_caches(ttl: int = DEFAULT_CACHE_TTL) -> int:
     """Clear expired entries from all registered caches."""
-    cleared_count = 0
+    from .cache_manager import get_cache_manager
+    cleared_count = get_cache_manager().purge_expired()
     current_time = time.time()
     
     for cache_name, cache_data in _cache_registry.items():
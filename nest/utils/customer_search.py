@@ -0,0 +1,308 @@
+"""
+In-memory customer search index.
+
+Searching customers used to lowercase and substring-scan every customer's
+name, email and phone on each keystroke. CustomerSearchIndex is built once
+when customers load and updated as pages arrive. It combines three
+structures:
+
+- a normalized-phone index (digits only) for exact phone number lookups,
+- a sorted token list of name words, email parts and phone digits, used like
+  a prefix trie: a prefix query is one binary search plus a slice,
+- trigram postings over names, emails and phone digits. A query of three or
+  more characters intersects the postings of its trigrams and only verifies
+  the few candidates left. When nothing matches exactly, the customers that
+  share most of the query's trigrams are returned as fuzzy matches.
+
+Results come back in the order the customers were loaded, like the
+unfiltered list.
+
+SearchWorker runs queries on a background thread and drops results for
+queries that were superseded by a newer keystroke. Its owner calls stop()
+when it is destroyed so the thread exits.
+"""
+
+import bisect
+import logging
+import re
+import threading
+from collections import Counter
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+logger = logging.getLogger(__name__)
+
+MIN_TRIGRAM_QUERY = 3
+FUZZY_MIN_QUERY = 4
+FUZZY_MIN_SHARE = 0.6  # Share of the query's trigrams a fuzzy match must contain
+FUZZY_MAX_RESULTS = 200
+MIN_PHONE_DIGITS = 3
+
+_TOKEN_SPLIT = re.compile(r"[\s@._\-+,]+")
+_PHONE_QUERY = re.compile(r"^[\d\s+\-().]+$")
+
+
+def normalize_phone(value: Any) -> str:
+    """Strip everything but digits from a phone number."""
+    return re.sub(r"\D", "", str(value or ""))
+
+
+def _trigrams(text: str) -> Set[str]:
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+class CustomerSearchIndex:
+    """Thread-safe search index over customer name, email and phone."""
+
+    def __init__(self, key: Callable[[Dict], Any] = lambda customer: customer.get("cid")):
+        """Initialize an empty index.
+
+        Args:
+            key: Returns a customer's unique ID
+        """
+        self.key = key
+        self._lock = threading.RLock()
+        self._reset()
+
+    def _reset(self) -> None:
+        # Documents are addressed by an integer doc ID; an updated customer gets a
+        # new doc ID and its old one is dropped from the live set
+        self._docs: List[Optional[Dict]] = []
+        self._fields: List[Tuple[str, str, str, str]] = []  # name, email, raw phone, phone digits
+        self._doc_of: Dict[Any, int] = {}
+        self._order: Dict[Any, int] = {}  # customer ID -> load position, kept across updates
+        self._rank: List[int] = []  # doc ID -> load position of its customer
+        self._dead = 0
+
+        self._phones: Dict[str, Set[int]] = {}
+        self._tokens: List[Tuple[str, int]] = []
+        self._postings: Dict[str, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self._doc_of)
+
+    def build(self, customers: Iterable[Dict]) -> None:
+        """Replace the index contents with the given customers."""
+        with self._lock:
+            self._reset()
+            self._add(customers)
+        logger.debug(f"Built customer search index with {len(self)} customers")
+
+    def add(self, customers: Iterable[Dict]) -> None:
+        """Add new customers or update existing ones."""
+        with self._lock:
+            self._add(customers)
+            # Rebuild once superseded documents make up a quarter of the index
+            if self._dead > 1000 and self._dead * 4 > len(self._docs):
+                live = [doc for doc in self._docs if doc is not None]
+                order = self._order
+                self._reset()
+                self._add(sorted(live, key=lambda c: order.get(self.key(c), 0)))
+
+    def remove(self, customer_id: Any) -> bool:
+        """Remove a customer.
+
+        Returns:
+            True if the customer was indexed
+        """
+        with self._lock:
+            doc = self._doc_of.pop(customer_id, None)
+            if doc is None:
+                return False
+            self._docs[doc] = None
+            self._dead += 1
+            return True
+
+    def _add(self, customers: Iterable[Dict]) -> None:
+        """Index customers; the caller holds the lock."""
+        new_tokens = []
+        for customer in customers:
+            customer_id = self.key(customer)
+            if customer_id in (None, ''):
+                continue
+            previous = self._doc_of.get(customer_id)
+            if previous is not None:
+                self._docs[previous] = None
+                self._dead += 1
+
+            doc = len(self._docs)
+            name = str(customer.get("fullName") or "").lower()
+            email = str(customer.get("email") or "").lower()
+            phone = str(customer.get("mobile") or "")
+            digits = normalize_phone(phone)
+            self._docs.append(customer)
+            self._fields.append((name, email, phone, digits))
+            self._doc_of[customer_id] = doc
+            self._rank.append(self._order.setdefault(customer_id, len(self._order)))
+
+            if digits:
+                self._phones.setdefault(digits, set()).add(doc)
+            tokens = {token for token in _TOKEN_SPLIT.split(f"{name} {email}") if token}
+            tokens.update(t for t in (name, email, digits) if t)
+            new_tokens.extend((token, doc) for token in tokens)
+            for gram in _trigrams(name) | _trigrams(email) | _trigrams(digits):
+                self._postings.setdefault(gram, []).append(doc)
+
+        if new_tokens:
+            # Sorting an already sorted list with an appended run is a linear merge
+            self._tokens.extend(new_tokens)
+            self._tokens.sort()
+
+    def search(self, query: str) -> List[Dict]:
+        """Find customers whose name, email or phone contains the query.
+
+        Queries shorter than three characters match the start of a name word,
+        email part or phone number instead.
+
+        Returns:
+            Matching customers in load order, or fuzzy matches by similarity
+            if nothing contains the query
+        """
+        text = query.strip().lower()
+        if not text:
+            return []
+        digits = normalize_phone(text) if _PHONE_QUERY.match(text) else ""
+        if len(digits) < MIN_PHONE_DIGITS:
+            digits = ""
+
+        with self._lock:
+            if len(text) < MIN_TRIGRAM_QUERY and not digits:
+                docs = self._prefix_docs(text)
+            else:
+                docs = self._substring_docs(text, digits)
+                if not docs and len(text) >= FUZZY_MIN_QUERY:
+                    return [self._docs[doc] for doc in self._fuzzy_docs(text)]
+            return self._ordered(docs)
+
+    def _prefix_docs(self, prefix: str) -> Set[int]:
+        start = bisect.bisect_left(self._tokens, (prefix,))
+        end = bisect.bisect_left(self._tokens, (prefix + "\uffff",))
+        return {doc for _, doc in self._tokens[start:end]}
+
+    def _substring_docs(self, text: str, digits: str) -> Set[int]:
+        docs = set(self._phones.get(digits, ())) if digits else set()
+
+        for probe in {text, digits} - {""}:
+            grams = _trigrams(probe)
+            if not grams:
+                continue
+            postings = sorted((self._postings.get(gram, []) for gram in grams), key=len)
+            candidates = set(postings[0])
+            for posting in postings[1:]:
+                if not candidates:
+                    break
+                candidates.intersection_update(posting)
+            if len(probe) == MIN_TRIGRAM_QUERY:
+                # A single trigram's postings are exactly the docs containing it
+                docs.update(candidates)
+                continue
+            for doc in candidates:
+                name, email, phone, phone_digits = self._fields[doc]
+                if (text in name or text in email or text in phone
+                        or (probe is digits and digits in phone_digits)):
+                    docs.add(doc)
+        return docs
+
+    def _fuzzy_docs(self, text: str) -> List[int]:
+        grams = _trigrams(text)
+        hits = Counter()
+        for gram in grams:
+            hits.update(self._postings.get(gram, ()))
+        needed = max(1, int(len(grams) * FUZZY_MIN_SHARE + 0.5))
+        matches = [(count, doc) for doc, count in hits.items()
+                   if count >= needed and self._docs[doc] is not None]
+        matches.sort(key=lambda match: (-match[0], self._rank[match[1]]))
+        return [doc for _, doc in matches[:FUZZY_MAX_RESULTS]]
+
+    def _ordered(self, docs: Set[int]) -> List[Dict]:
+        live = [doc for doc in docs if self._docs[doc] is not None]
+        live.sort(key=self._rank.__getitem__)
+        return [self._docs[doc] for doc in live]
+
+
+class SearchWorker:
+    """Runs searches on one background thread, keeping only the latest query.
+
+    A query submitted while another is waiting replaces it, and results of a
+    query that was superseded before it finished are discarded, so fast typing
+    never queues up stale searches.
+    """
+
+    def __init__(self, search: Callable[[str], Any], name: str = "search-worker"):
+        """Initialize the worker.
+
+        Args:
+            search: Function run for each query on the worker thread
+            name: Thread name
+        """
+        self.search = search
+        self.name = name
+        self._generation = 0
+        self._pending: Optional[Tuple[int, str, Callable]] = None
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._stopped = False
+
+    def submit(self, query: str, callback: Callable[[int, Any], None]) -> int:
+        """Queue a query, superseding any earlier one.
+
+        Args:
+            query: Search query
+            callback: Called on the worker thread with (generation, results)
+                if the query is still the latest when it finishes
+
+        Returns:
+            Generation number of the query, for is_current()
+        """
+        with self._condition:
+            self._generation += 1
+            if self._stopped:
+                return self._generation
+            self._pending = (self._generation, query, callback)
+            if self._thread is None or not self._thread.is_alive():
+                self._thread = threading.Thread(target=self._run, daemon=True, name=self.name)
+                self._thread.start()
+            self._condition.notify()
+            return self._generation
+
+    def cancel(self) -> None:
+        """Discard the waiting query and the result of the running one."""
+        with self._condition:
+            self._generation += 1
+            self._pending = None
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Discard pending work and end the worker thread.
+
+        Args:
+            timeout: Seconds to wait for the thread to exit; by default a
+                running search is left to finish on its own
+        """
+        with self._condition:
+            self._generation += 1
+            self._pending = None
+            self._stopped = True
+            self._condition.notify()
+            thread = self._thread
+        if timeout is not None and thread is not None and thread is not threading.current_thread():
+            thread.join(timeout)
+
+    def is_current(self, generation: int) -> bool:
+        return generation == self._generation
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while self._pending is None and not self._stopped:
+                    self._condition.wait()
+                if self._stopped:
+                    return
+                generation, query, callback = self._pending
+                self._pending = None
+
+            try:
+                results = self.search(query)
+            except Exception as e:
+                logger.error(f"Search for {query!r} failed: {e}")
+                continue
+            if self.is_current(generation):
+                callback(generation, results)
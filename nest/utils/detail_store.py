@@ -0,0 +1,319 @@
+"""
+Append-only packed store for per-ticket detail records.
+
+Ticket details used to be written as one ticket_detail_T-XXXX.json file per
+ticket, and freshness checks stat-ed each file, so the cache directory grew
+to thousands of small files. DetailStore keeps all details in a single
+segment file instead. Every write appends a record and an in-memory index
+maps each ticket number to the offset of its latest record, so reads are a
+single seek. Records carry a CRC32 checksum that is verified on read.
+
+Overwritten and deleted records stay in the segment as garbage until
+compaction, which runs automatically once garbage makes up most of the
+file. Compaction copies the live records into a new segment and atomically
+swaps it in.
+
+Record layout (big-endian):
+
+    magic "NDR1" | flags u8 | key length u16 | payload length u32 |
+    crc32 u32 | written_at f64 | key (UTF-8) | payload
+
+Payloads are encoded with nest.utils.cache_io, so they follow the
+configured codec and compression.
+"""
+
+import glob
+import logging
+import os
+import struct
+import threading
+import time
+import zlib
+from typing import Any, Dict, List, Optional, Tuple
+
+from nest.utils.cache_io import decode_cache_data, encode_cache_data, read_cache_file
+
+logger = logging.getLogger(__name__)
+
+SEGMENT_FILE = 'ticket_details.seg'
+RECORD_MAGIC = b'NDR1'
+_HEADER = struct.Struct('>4sBHIId')
+
+FLAG_PUT = 0
+FLAG_DELETE = 1
+
+# Compact once garbage exceeds this share of a segment of at least COMPACT_MIN_BYTES
+COMPACT_GARBAGE_RATIO = 0.5
+COMPACT_MIN_BYTES = 4 * 1024 * 1024
+
+
+class DetailStore:
+    """Thread-safe append-only key/value store for ticket details."""
+
+    def __init__(self, path: str, compact_ratio: float = COMPACT_GARBAGE_RATIO,
+                 compact_min_bytes: int = COMPACT_MIN_BYTES):
+        """Open the store, creating the segment file if needed.
+
+        Args:
+            path: Path of the segment file
+            compact_ratio: Share of garbage bytes that triggers compaction
+            compact_min_bytes: Minimum segment size before compaction is considered
+        """
+        self.path = path
+        self.compact_ratio = compact_ratio
+        self.compact_min_bytes = compact_min_bytes
+
+        # key -> (record offset, record length, written_at)
+        self._index: Dict[str, Tuple[int, int, float]] = {}
+        self._live_bytes = 0
+        self._lock = threading.RLock()
+
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        self._file = open(path, 'a+b')
+        self._load_index()
+
+    def _load_index(self) -> None:
+        """Build the index by scanning record headers.
+
+        A partial record at the end of the segment (a torn append) is
+        truncated. Corrupt records in the middle are skipped up to the next
+        record that passes its checksum, and the segment is then compacted so
+        the damaged bytes are dropped without losing the records after them.
+        """
+        self._index.clear()
+        self._live_bytes = 0
+        size = os.fstat(self._file.fileno()).st_size
+        offset = 0
+        skipped = 0
+        while offset + _HEADER.size <= size:
+            self._file.seek(offset)
+            header = self._file.read(_HEADER.size)
+            magic, flags, key_len, payload_len, _, written_at = _HEADER.unpack(header)
+            length = _HEADER.size + key_len + payload_len
+            if magic != RECORD_MAGIC or offset + length > size:
+                next_offset = self._find_next_record(offset + 1, size)
+                if next_offset is None:
+                    break
+                logger.warning(f"Skipping {next_offset - offset} bytes of corrupt records "
+                               f"at offset {offset} in {self.path}")
+                skipped += next_offset - offset
+                offset = next_offset
+                continue
+            key = self._file.read(key_len).decode('utf-8', errors='replace')
+
+            previous = self._index.pop(key, None)
+            if previous:
+                self._live_bytes -= previous[1]
+            if flags == FLAG_PUT:
+                self._index[key] = (offset, length, written_at)
+                self._live_bytes += length
+            offset += length
+
+        if offset < size:
+            # A crash mid-append leaves a partial record; drop it so appends stay aligned
+            logger.warning(f"Truncating {size - offset} bytes of incomplete records "
+                           f"from {self.path}")
+            self._file.truncate(offset)
+
+        if skipped:
+            self.compact()
+
+    def _find_next_record(self, start: int, size: int) -> Optional[int]:
+        """Get the offset of the first intact record at or after start, if any."""
+        chunk_size = 64 * 1024
+        position = start
+        while position < size:
+            self._file.seek(position)
+            # Overlap chunks so a magic split across a chunk boundary is still found
+            chunk = self._file.read(chunk_size + len(RECORD_MAGIC) - 1)
+            index = chunk.find(RECORD_MAGIC)
+            while index != -1:
+                if self._is_intact_record(position + index, size):
+                    return position + index
+                index = chunk.find(RECORD_MAGIC, index + 1)
+            position += chunk_size
+        return None
+
+    def _is_intact_record(self, offset: int, size: int) -> bool:
+        """Check that a complete record with a valid checksum starts at offset."""
+        if offset + _HEADER.size > size:
+            return False
+        self._file.seek(offset)
+        magic, _, key_len, payload_len, crc, _ = _HEADER.unpack(self._file.read(_HEADER.size))
+        if magic != RECORD_MAGIC or offset + _HEADER.size + key_len + payload_len > size:
+            return False
+        return zlib.crc32(self._file.read(key_len + payload_len)) == crc
+
+    def _append(self, key: str, payload: bytes, flags: int) -> Tuple[int, int, float]:
+        """Append a record; the caller holds the lock."""
+        key_bytes = key.encode('utf-8')
+        written_at = time.time()
+        crc = zlib.crc32(key_bytes + payload)
+        record = _HEADER.pack(RECORD_MAGIC, flags, len(key_bytes), len(payload), crc, written_at)
+        record += key_bytes + payload
+
+        self._file.seek(0, os.SEEK_END)
+        offset = self._file.tell()
+        self._file.write(record)
+        self._file.flush()
+        return offset, len(record), written_at
+
+    def put(self, key: str, data: Any) -> None:
+        """Store the details for a ticket number, replacing any previous record."""
+        payload = encode_cache_data(data)
+        with self._lock:
+            entry = self._append(key, payload, FLAG_PUT)
+            previous = self._index.get(key)
+            if previous:
+                self._live_bytes -= previous[1]
+            self._index[key] = entry
+            self._live_bytes += entry[1]
+            self._maybe_compact()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Get the details stored for a ticket number.
+
+        Returns:
+            The stored data, or None if missing or the record fails its checksum
+        """
+        with self._lock:
+            entry = self._index.get(key)
+            if entry is None:
+                return None
+            offset, length, _ = entry
+            self._file.seek(offset)
+            record = self._file.read(length)
+
+        magic, _, key_len, payload_len, crc, _ = _HEADER.unpack_from(record)
+        body = record[_HEADER.size:]
+        if magic != RECORD_MAGIC or len(body) != key_len + payload_len or zlib.crc32(body) != crc:
+            logger.error(f"Corrupt detail record for {key}, dropping it")
+            self.delete(key)
+            return None
+        try:
+            return decode_cache_data(body[key_len:])
+        except Exception as e:
+            logger.error(f"Could not decode detail record for {key}: {e}")
+            return None
+
+    def written_at(self, key: str) -> Optional[float]:
+        """Get the time a ticket's details were stored, as a Unix timestamp."""
+        with self._lock:
+            entry = self._index.get(key)
+        return entry[2] if entry else None
+
+    def delete(self, key: str) -> bool:
+        """Drop the details for a ticket number.
+
+        Returns:
+            True if a record was dropped
+        """
+        with self._lock:
+            previous = self._index.pop(key, None)
+            if previous is None:
+                return False
+            self._live_bytes -= previous[1]
+            self._append(key, b'', FLAG_DELETE)
+            self._maybe_compact()
+            return True
+
+    def keys(self) -> List[str]:
+        with self._lock:
+            return list(self._index)
+
+    def __contains__(self, key: str) -> bool:
+        with self._lock:
+            return key in self._index
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._index)
+
+    def size_bytes(self) -> int:
+        """Get the size of the segment file."""
+        with self._lock:
+            return os.fstat(self._file.fileno()).st_size
+
+    def _maybe_compact(self) -> None:
+        """Compact if garbage dominates the segment; the caller holds the lock."""
+        size = os.fstat(self._file.fileno()).st_size
+        if size >= self.compact_min_bytes and size - self._live_bytes > size * self.compact_ratio:
+            self.compact()
+
+    def compact(self) -> None:
+        """Rewrite the segment with only the live records and swap it in atomically."""
+        with self._lock:
+            before = os.fstat(self._file.fileno()).st_size
+            tmp_path = self.path + '.compact'
+            index: Dict[str, Tuple[int, int, float]] = {}
+            with open(tmp_path, 'wb') as out:
+                # Copy records in file order so reads stay roughly sequential
+                entries = sorted(self._index.items(), key=lambda e: e[1][0])
+                for key, (offset, length, written_at) in entries:
+                    self._file.seek(offset)
+                    index[key] = (out.tell(), length, written_at)
+                    out.write(self._file.read(length))
+                out.flush()
+                os.fsync(out.fileno())
+
+            self._file.close()
+            os.replace(tmp_path, self.path)
+            self._file = open(self.path, 'a+b')
+            self._index = index
+            self._live_bytes = sum(length for _, length, _ in index.values())
+            logger.info(f"Compacted detail store from {before} to {self._live_bytes} bytes")
+
+    def import_files(self, directory: str, pattern: str = 'ticket_detail_*.json') -> int:
+        """Move legacy per-ticket detail files into the store.
+
+        Returns:
+            Number of files imported
+        """
+        imported = 0
+        for file_path in glob.glob(os.path.join(directory, pattern)):
+            key = os.path.basename(file_path)[len('ticket_detail_'):-len('.json')]
+            try:
+                if key not in self:
+                    self.put(key, read_cache_file(file_path))
+                    imported += 1
+                os.remove(file_path)
+            except Exception as e:
+                logger.warning(f"Could not import detail file {file_path}: {e}")
+        if imported:
+            logger.info(f"Imported {imported} ticket detail files into {self.path}")
+        return imported
+
+    def close(self) -> None:
+        with self._lock:
+            self._file.close()
+
+
+_detail_store: Optional[DetailStore] = None
+_detail_store_lock = threading.Lock()
+
+
+def get_detail_store() -> DetailStore:
+    """Get the shared ticket detail store, importing legacy detail files on first use.
+
+    Compaction can be tuned in the "detail_store" section of config.json,
+    e.g. {"compact_ratio": 0.6, "compact_min_bytes": 8388608}.
+    """
+    global _detail_store
+    if _detail_store is None:
+        with _detail_store_lock:
+            if _detail_store is None:
+                try:
+                    from nest.utils.config_util import load_config
+                    settings = load_config().get("detail_store", {}) or {}
+                except Exception:
+                    settings = {}
+                from nest.utils.cache_utils import get_ticket_detail_directory
+                directory = get_ticket_detail_directory()
+                store = DetailStore(
+                    os.path.join(directory, SEGMENT_FILE),
+                    compact_ratio=settings.get("compact_ratio", COMPACT_GARBAGE_RATIO),
+                    compact_min_bytes=settings.get("compact_min_bytes", COMPACT_MIN_BYTES),
+                )
+                store.import_files(directory)
+                _detail_store = store
+    return _detail_store
@@ -151,8 +151,22 @@ def get_numeric_ticket_id(ticket_number):
         internal_num = None
         logging.info(f"Normalized internal ticket: '{internal_str}' (not a number)")
 
+    # Resolve from the persistent ticket ID index before paging through the API
+    index = None
+    try:
+        from nest.utils.ticket_index import get_ticket_id_index
+        index = get_ticket_id_index()
+        ticket_id = index.lookup(internal_str)
+        if ticket_id:
+            logging.info(f"Found ticket ID {ticket_id} for '{internal_str}' in index")
+            return ticket_id
+    except Exception as e:
+        logging.warning(f"Ticket ID index unavailable: {e}")
+
     # Get all tickets from RepairDesk
     tickets = get_all_tickets()
+    if tickets and index is not None:
+        index.update(t for t in tickets if isinstance(t, dict))
     if not tickets:
         logging.error("No tickets retrieved from API.")
 
@@ -0,0 +1,188 @@
+"""
+Shared HTTP transport for Nest API clients.
+
+All RepairDesk clients route their calls through a single process-wide
+requests.Session so that sequential page and detail fetches reuse pooled
+keep-alive connections instead of paying a new TCP+TLS handshake each time.
+Every request also passes through the shared per-host rate limiter.
+"""
+
+import logging
+import threading
+from typing import Dict, Optional, Tuple, Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from nest.utils.rate_limiter import get_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+# Connection pool defaults
+DEFAULT_POOL_CONNECTIONS = 4  # Number of distinct hosts to keep pools for
+DEFAULT_POOL_MAXSIZE = 16  # Keep-alive connections kept per host
+
+# Timeout defaults in seconds (connect, read)
+DEFAULT_CONNECT_TIMEOUT = 5
+DEFAULT_READ_TIMEOUT = 30
+
+# Per-host pool sizes; RepairDesk gets the largest pool since every sync hits it
+DEFAULT_HOST_POOL_SIZES = {
+    "https://api.repairdesk.co/": 16,
+}
+
+TimeoutType = Union[float, Tuple[float, float], None]
+
+
+class HTTPTransport:
+    """Pooled keep-alive HTTP transport shared by all API clients."""
+
+    def __init__(self, pool_connections: int = DEFAULT_POOL_CONNECTIONS,
+                 pool_maxsize: int = DEFAULT_POOL_MAXSIZE,
+                 connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout: float = DEFAULT_READ_TIMEOUT,
+                 host_pool_sizes: Optional[Dict[str, int]] = None):
+        """Initialize the transport.
+
+        Args:
+            pool_connections: Number of per-host connection pools to cache
+            pool_maxsize: Maximum keep-alive connections kept per host
+            connect_timeout: Default connect timeout in seconds
+            read_timeout: Default read timeout in seconds
+            host_pool_sizes: Optional mapping of URL prefix to pool size
+        """
+        self.pool_connections = pool_connections
+        self.pool_maxsize = pool_maxsize
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.host_pool_sizes = dict(DEFAULT_HOST_POOL_SIZES)
+        if host_pool_sizes:
+            self.host_pool_sizes.update(host_pool_sizes)
+
+        self._session = None
+        self._lock = threading.Lock()
+
+    @property
+    def session(self) -> requests.Session:
+        """Get the pooled session, creating it on first use."""
+        if self._session is None:
+            with self._lock:
+                if self._session is None:
+                    self._session = self._create_session()
+        return self._session
+
+    def _create_session(self) -> requests.Session:
+        """Build a session with pooled adapters mounted for each host prefix."""
+        session = requests.Session()
+
+        # Retries are handled by the callers, never silently by the adapter
+        default_adapter = HTTPAdapter(pool_connections=self.pool_connections,
+                                      pool_maxsize=self.pool_maxsize,
+                                      max_retries=0)
+        session.mount("https://", default_adapter)
+        session.mount("http://", default_adapter)
+
+        # Longer prefixes take precedence in requests, so these override the defaults
+        for prefix, maxsize in self.host_pool_sizes.items():
+            session.mount(prefix, HTTPAdapter(pool_connections=1,
+                                              pool_maxsize=maxsize,
+                                              max_retries=0))
+
+        logger.debug(f"Created pooled HTTP session (pool_maxsize={self.pool_maxsize}, "
+                     f"hosts={list(self.host_pool_sizes)})")
+        return session
+
+    def default_timeout(self) -> Tuple[float, float]:
+        """Get the default (connect, read) timeout tuple."""
+        return (self.connect_timeout, self.read_timeout)
+
+    def request(self, method: str, url: str, timeout: TimeoutType = None,
+                **kwargs) -> requests.Response:
+        """Send a request over the pooled session, subject to the host's rate limiter.
+
+        Args:
+            method: HTTP method (GET, POST, PUT, DELETE)
+            url: Full request URL
+            timeout: Optional timeout override; defaults to (connect, read)
+            **kwargs: Any other arguments accepted by requests.Session.request
+
+        Returns:
+            The requests.Response object
+        """
+        if timeout is None:
+            timeout = self.default_timeout()
+
+        limiter = get_rate_limiter(url)
+        limiter.acquire()
+        response = self.session.request(method=method, url=url, timeout=timeout, **kwargs)
+        limiter.observe(response)
+        return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """Send a GET request over the pooled session."""
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        """Send a POST request over the pooled session."""
+        return self.request("POST", url, **kwargs)
+
+    def put(self, url: str, **kwargs) -> requests.Response:
+        """Send a PUT request over the pooled session."""
+        return self.request("PUT", url, **kwargs)
+
+    def delete(self, url: str, **kwargs) -> requests.Response:
+        """Send a DELETE request over the pooled session."""
+        return self.request("DELETE", url, **kwargs)
+
+    def close(self) -> None:
+        """Close the session and release all pooled connections."""
+        with self._lock:
+            if self._session is not None:
+                self._session.close()
+                self._session = None
+
+
+_transport: Optional[HTTPTransport] = None
+_transport_lock = threading.Lock()
+
+
+def _load_transport_settings() -> Dict:
+    """Read optional transport settings from the "http" section of config.json."""
+    try:
+        from nest.utils.config_util import load_config
+        settings = load_config().get("http", {})
+        return settings if isinstance(settings, dict) else {}
+    except Exception as e:
+        logger.debug(f"Using default HTTP transport settings: {e}")
+        return {}
+
+
+def get_transport() -> HTTPTransport:
+    """Get the process-wide HTTP transport, creating it on first use."""
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                settings = _load_transport_settings()
+                _transport = HTTPTransport(
+                    pool_connections=settings.get("pool_connections", DEFAULT_POOL_CONNECTIONS),
+                    pool_maxsize=settings.get("pool_maxsize", DEFAULT_POOL_MAXSIZE),
+                    connect_timeout=settings.get("connect_timeout", DEFAULT_CONNECT_TIMEOUT),
+                    read_timeout=settings.get("read_timeout", DEFAULT_READ_TIMEOUT),
+                    host_pool_sizes=settings.get("host_pool_sizes"),
+                )
+    return _transport
+
+
+def configure_transport(**settings) -> HTTPTransport:
+    """Replace the process-wide transport with one using the given settings.
+
+    Accepts the same keyword arguments as HTTPTransport. Existing pooled
+    connections are closed.
+    """
+    global _transport
+    with _transport_lock:
+        if _transport is not None:
+            _transport.close()
+        _transport = HTTPTransport(**settings)
+    return _transport
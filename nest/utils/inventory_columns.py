@@ -0,0 +1,205 @@
+"""
+Columnar filter and sort engine for inventory items.
+
+Filtering inventory used to lowercase every searchable field and re-parse
+quantity, price and threshold strings for every item on every keystroke.
+InventoryColumns converts the items once into NumPy columns:
+
+- one pre-lowered text column holding the searchable fields joined by a
+  separator, so a search term is a single vectorized substring test however
+  many fields are searched,
+- numeric columns parsed once (quantity, low-stock threshold, price, cost),
+- category and type codes, so those filters are integer comparisons.
+
+Sort orders are computed once per field as permutations and cached.
+Filtering applies the boolean mask to the cached permutation, so a filtered
+result comes out sorted without sorting again. Results are lightweight
+views that only build item lists for the slice actually displayed.
+
+Items loaded page by page are added with extend(), so the columns always
+match the items loaded so far.
+"""
+
+import logging
+from collections.abc import Sequence
+from typing import Dict, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+SEARCH_FIELDS = ('name', 'sku', 'barcode', 'notes')
+DEFAULT_LOW_STOCK_THRESHOLD = 5
+_FIELD_SEPARATOR = '\x1f'
+
+# Stock status filter values as shown in the inventory view
+STATUS_IN_STOCK = 'In Stock'
+STATUS_LOW_STOCK = 'Low Stock'
+STATUS_OUT_OF_STOCK = 'Out of Stock'
+
+
+def _to_number(value, default: float = 0.0) -> float:
+    try:
+        return float(value) if value not in (None, '') else default
+    except (TypeError, ValueError):
+        return default
+
+
+def _to_int(value, default: int = 0) -> int:
+    """Parse a count like int() does, using the default for missing or invalid values."""
+    try:
+        return int(value) if value not in (None, '') else default
+    except (TypeError, ValueError, OverflowError):
+        return default
+
+
+def _category_name(item: Dict) -> str:
+    category = item.get('category')
+    if isinstance(category, dict):
+        return category.get('name', '') or ''
+    return item.get('category_name', '') or ''
+
+
+class InventoryView(Sequence):
+    """Read-only sequence of inventory items selected by an index array."""
+
+    def __init__(self, items: List[Dict], indices: np.ndarray):
+        self._items = items
+        self.indices = indices
+
+    def __len__(self) -> int:
+        return len(self.indices)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._items[i] for i in self.indices[index]]
+        return self._items[self.indices[index]]
+
+    def __iter__(self):
+        return (self._items[i] for i in self.indices)
+
+    def copy(self) -> List[Dict]:
+        return list(self)
+
+
+class InventoryColumns:
+    """Inventory items stored column-wise for fast filtering and sorting."""
+
+    def __init__(self, items: List[Dict]):
+        """Parse the items into columns.
+
+        Args:
+            items: Raw inventory items from the API; kept by reference
+        """
+        self.items = items
+        self.search_text, self.quantity, self.threshold, self.price, self.cost, \
+            self._category_values, self.type_ids = self._parse(items)
+        self.categories, self.category_codes = np.unique(self._category_values, return_inverse=True)
+        self._orders: Dict[str, np.ndarray] = {}
+
+    @staticmethod
+    def _parse(items: List[Dict]) -> tuple:
+        """Parse items into column arrays.
+
+        Returns:
+            Tuple of (search text, quantity, threshold, price, cost, category, type) arrays
+        """
+        search_text = np.array([
+            _FIELD_SEPARATOR.join(str(item.get(field, '') or '') for field in SEARCH_FIELDS).lower()
+            for item in items
+        ], dtype=str)
+        quantity = np.array([_to_int(item.get('quantity')) for item in items], dtype=np.int64)
+        threshold = np.array([_to_int(item.get('low_stock_threshold'), DEFAULT_LOW_STOCK_THRESHOLD)
+                              for item in items], dtype=np.int64)
+        price = np.array([_to_number(item.get('price')) for item in items], dtype=np.float64)
+        cost = np.array([_to_number(item.get('cost_price')) for item in items], dtype=np.float64)
+        categories = np.array([_category_name(item) for item in items], dtype=str)
+        type_ids = np.array([str(item.get('type_id', '') or '') for item in items], dtype=str)
+        return search_text, quantity, threshold, price, cost, categories, type_ids
+
+    def extend(self, items: List[Dict]) -> None:
+        """Append newly loaded items to the item list and the columns.
+
+        Args:
+            items: Items to add; they are appended to the list passed at construction
+        """
+        if not items:
+            return
+        self.items.extend(items)
+        new_columns = self._parse(items)
+        (self.search_text, self.quantity, self.threshold, self.price, self.cost,
+         self._category_values, self.type_ids) = (
+            np.concatenate((old, new)) for old, new in zip(
+                (self.search_text, self.quantity, self.threshold, self.price, self.cost,
+                 self._category_values, self.type_ids), new_columns))
+        self.categories, self.category_codes = np.unique(self._category_values, return_inverse=True)
+        self._orders.clear()
+
+    def __len__(self) -> int:
+        return len(self.items)
+
+    def category_names(self) -> List[str]:
+        """Get the distinct non-empty category names, sorted."""
+        return [name for name in self.categories.tolist() if name]
+
+    def mask(self, search: str = '', category: Optional[str] = None, type_id: Optional[str] = None,
+             status: Optional[str] = None) -> np.ndarray:
+        """Get a boolean mask of the items matching all filters.
+
+        Args:
+            search: Substring matched case-insensitively against name, SKU, barcode and notes
+            category: Category name, or None for all
+            type_id: RepairDesk type ID ('1' product, '2' service), or None for all
+            status: One of the STATUS_* values, or None for all
+        """
+        selected = np.ones(len(self.items), dtype=bool)
+        if search:
+            selected &= np.char.find(self.search_text, search.lower()) >= 0
+        if category is not None:
+            code = np.searchsorted(self.categories, category)
+            if code >= len(self.categories) or self.categories[code] != category:
+                return np.zeros(len(self.items), dtype=bool)
+            selected &= self.category_codes == code
+        if type_id is not None:
+            selected &= self.type_ids == type_id
+        if status == STATUS_IN_STOCK:
+            selected &= (self.quantity > self.threshold) & (self.quantity > 0)
+        elif status == STATUS_LOW_STOCK:
+            selected &= (self.quantity <= self.threshold) & (self.quantity > 0)
+        elif status == STATUS_OUT_OF_STOCK:
+            selected &= self.quantity <= 0
+        return selected
+
+    def order(self, field: str) -> np.ndarray:
+        """Get the ascending sort permutation for a field, computing it on first use."""
+        order = self._orders.get(field)
+        if order is None:
+            if field == 'price':
+                column = self.price
+            elif field == 'cost':
+                column = self.cost
+            elif field == 'quantity':
+                column = self.quantity
+            else:
+                values = [str(item.get(field, '')).lower() for item in self.items]
+                column = np.array(values, dtype=str)
+            order = np.argsort(column, kind='stable')
+            self._orders[field] = order
+        return order
+
+    def query(self, sort_field: str = 'name', descending: bool = False, **filters) -> InventoryView:
+        """Filter and sort the items.
+
+        Args:
+            sort_field: Field to sort by (price, cost, quantity or a text field)
+            descending: Sort in descending order
+            **filters: Filters accepted by mask()
+
+        Returns:
+            View of the matching items in sort order
+        """
+        order = self.order(sort_field)
+        if descending:
+            order = order[::-1]
+        selected = self.mask(**filters)
+        return InventoryView(self.items, order[selected[order]])
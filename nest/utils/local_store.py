@@ -0,0 +1,510 @@
+"""
+Embedded SQLite store for locally cached RepairDesk data.
+
+Tickets, inventory, customers and report results are kept in indexed tables
+so modules can query the slice they need (a technician's tickets, one ticket
+by number, a page of inventory by SKU) instead of parsing a whole JSON cache
+file. Rows are upserted, so a delta sync only touches the rows that changed.
+
+Each row keeps the original API payload as JSON next to the indexed columns,
+so query results have the same shape as the JSON caches.
+"""
+
+import json
+import logging
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from nest.utils.ticket_record import ticket_updated_timestamp
+
+logger = logging.getLogger(__name__)
+
+SCHEMA_VERSION = 2
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tickets (
+    id INTEGER PRIMARY KEY,
+    order_id TEXT,
+    status TEXT,
+    assigned_to TEXT,
+    assigned_key TEXT,
+    customer_id TEXT,
+    created_date REAL,
+    last_updated REAL,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_tickets_order_id ON tickets(order_id);
+CREATE INDEX IF NOT EXISTS idx_tickets_status ON tickets(status);
+CREATE INDEX IF NOT EXISTS idx_tickets_assigned_key ON tickets(assigned_key);
+CREATE INDEX IF NOT EXISTS idx_tickets_customer_id ON tickets(customer_id);
+CREATE INDEX IF NOT EXISTS idx_tickets_created_date ON tickets(created_date);
+
+CREATE TABLE IF NOT EXISTS inventory (
+    id TEXT PRIMARY KEY,
+    sku TEXT,
+    name TEXT,
+    category TEXT,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_inventory_sku ON inventory(sku);
+CREATE INDEX IF NOT EXISTS idx_inventory_category ON inventory(category);
+
+CREATE TABLE IF NOT EXISTS customers (
+    id TEXT PRIMARY KEY,
+    name TEXT,
+    email TEXT,
+    mobile TEXT,
+    position INTEGER,
+    data TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_customers_name ON customers(name COLLATE NOCASE);
+
+CREATE TABLE IF NOT EXISTS reports (
+    report_type TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    end_date TEXT NOT NULL,
+    cached_at REAL NOT NULL,
+    data TEXT NOT NULL,
+    PRIMARY KEY (report_type, start_date, end_date)
+);
+
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def technician_key(name: Optional[str]) -> str:
+    """Normalize a technician name for matching.
+
+    Case, punctuation and repeated whitespace are ignored, so "Codey O'Connor"
+    and "codey  o connor" map to the same key.
+    """
+    if not name:
+        return ''
+    cleaned = re.sub(r"[^0-9a-z\s]", ' ', str(name).lower())
+    return ' '.join(cleaned.split())
+
+
+def _to_float(value) -> Optional[float]:
+    try:
+        return float(value) if value not in (None, '') else None
+    except (TypeError, ValueError):
+        return None
+
+
+def _ticket_columns(ticket: Dict) -> Optional[Tuple]:
+    """Extract the indexed columns of a raw RepairDesk ticket."""
+    summary = ticket.get('summary', {})
+    try:
+        ticket_id = int(summary.get('id'))
+    except (TypeError, ValueError):
+        return None
+
+    devices = ticket.get('devices') or []
+    first_device = devices[0] if devices and isinstance(devices[0], dict) else {}
+
+    status = summary.get('status')
+    for device in devices:
+        if not isinstance(device, dict):
+            continue
+        device_status = (device.get('status') or {}).get('name')
+        if device_status and device_status != 'Open':
+            status = device_status
+            break
+
+    # The first device's technician is who the views show; fall back to the summary
+    assigned = (first_device.get('assigned_to') or {}).get('fullname')
+    if not assigned:
+        assigned = summary.get('assigned_to')
+        if isinstance(assigned, dict):
+            assigned = assigned.get('fullname')
+
+    customer = summary.get('customer') or {}
+    customer_id = customer.get('cid') or customer.get('id')
+
+    return (
+        ticket_id,
+        summary.get('order_id'),
+        status,
+        assigned,
+        technician_key(assigned),
+        str(customer_id) if customer_id is not None else None,
+        _to_float(summary.get('created_date')),
+        ticket_updated_timestamp(ticket),
+    )
+
+
+def _dumps(value: Any) -> str:
+    return json.dumps(value, separators=(',', ':'), default=str)
+
+
+class LocalStore:
+    """Thread-safe SQLite store with one connection per thread."""
+
+    def __init__(self, db_path: str):
+        """Initialize the store and create the schema if needed.
+
+        Args:
+            db_path: Path of the SQLite database file
+        """
+        self.db_path = db_path
+        self._local = threading.local()
+        self._write_lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(db_path) or '.', exist_ok=True)
+        with self._connection() as conn:
+            conn.executescript(_SCHEMA)
+            self._migrate(conn)
+            conn.execute("INSERT OR REPLACE INTO meta(key, value) VALUES ('schema_version', ?)",
+                         (str(SCHEMA_VERSION),))
+
+    @staticmethod
+    def _migrate(conn: sqlite3.Connection) -> None:
+        """Bring tables created by older schema versions up to date."""
+        columns = {row['name'] for row in conn.execute("PRAGMA table_info(customers)")}
+        if 'position' not in columns:
+            # Version 1 listed customers by rowid, which INSERT OR REPLACE reshuffled
+            conn.execute("ALTER TABLE customers ADD COLUMN position INTEGER")
+            conn.execute("UPDATE customers SET position = rowid")
+        conn.execute("CREATE INDEX IF NOT EXISTS idx_customers_position ON customers(position)")
+
+    def _connection(self) -> sqlite3.Connection:
+        """Get this thread's connection, opening it on first use."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def _write(self, statements) -> None:
+        """Run write statements in one transaction.
+
+        Args:
+            statements: Callable receiving the connection
+        """
+        conn = self._connection()
+        with self._write_lock, conn:
+            statements(conn)
+
+    def _query(self, sql: str, params: Iterable = ()) -> List[sqlite3.Row]:
+        return self._connection().execute(sql, tuple(params)).fetchall()
+
+    def _set_synced(self, conn: sqlite3.Connection, table: str) -> None:
+        conn.execute("INSERT OR REPLACE INTO meta(key, value) VALUES (?, ?)",
+                     (f"{table}_synced_at", str(time.time())))
+
+    def last_synced(self, table: str) -> Optional[float]:
+        """Get the time a table was last written, as a Unix timestamp."""
+        rows = self._query("SELECT value FROM meta WHERE key = ?", (f"{table}_synced_at",))
+        return float(rows[0]['value']) if rows else None
+
+    # Tickets
+
+    def upsert_tickets(self, tickets: Iterable[Dict], replace: bool = False) -> int:
+        """Insert or update raw tickets.
+
+        Args:
+            tickets: Raw RepairDesk ticket dictionaries
+            replace: Drop all other tickets (the list is a full sync)
+
+        Returns:
+            Number of tickets written
+        """
+        rows = []
+        for ticket in tickets:
+            if not isinstance(ticket, dict):
+                continue
+            columns = _ticket_columns(ticket)
+            if columns:
+                rows.append(columns + (_dumps(ticket),))
+
+        def write(conn):
+            if replace:
+                conn.execute("DELETE FROM tickets")
+            conn.executemany(
+                "INSERT OR REPLACE INTO tickets(id, order_id, status, assigned_to, assigned_key, "
+                "customer_id, created_date, last_updated, data) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows)
+            self._set_synced(conn, 'tickets')
+
+        self._write(write)
+        logger.debug(f"Upserted {len(rows)} tickets into local store")
+        return len(rows)
+
+    def query_tickets(self, status: Optional[str] = None, assigned_to: Optional[str] = None,
+                      customer_id: Optional[str] = None, created_from: Optional[float] = None,
+                      created_to: Optional[float] = None, limit: Optional[int] = None,
+                      offset: int = 0, newest_first: bool = True) -> List[Dict]:
+        """Get raw tickets matching the given filters.
+
+        Args:
+            status: Exact ticket status (case-insensitive)
+            assigned_to: Technician name, matched via technician_key()
+            customer_id: Customer ID
+            created_from: Earliest created date as a Unix timestamp
+            created_to: Latest created date as a Unix timestamp
+            limit: Maximum number of tickets
+            offset: Number of matching tickets to skip
+            newest_first: Order by created date descending
+
+        Returns:
+            List of raw ticket dictionaries
+        """
+        where, params = self._ticket_filters(status, assigned_to, customer_id,
+                                             created_from, created_to)
+        order = 'DESC' if newest_first else 'ASC'
+        sql = f"SELECT data FROM tickets{where} ORDER BY created_date {order}"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        return [json.loads(row['data']) for row in self._query(sql, params)]
+
+    def count_tickets(self, status: Optional[str] = None, assigned_to: Optional[str] = None,
+                      customer_id: Optional[str] = None, created_from: Optional[float] = None,
+                      created_to: Optional[float] = None) -> int:
+        """Count tickets matching the given filters (see query_tickets)."""
+        where, params = self._ticket_filters(status, assigned_to, customer_id,
+                                             created_from, created_to)
+        return self._query(f"SELECT COUNT(*) AS n FROM tickets{where}", params)[0]['n']
+
+    @staticmethod
+    def _ticket_filters(status, assigned_to, customer_id, created_from,
+                        created_to) -> Tuple[str, List]:
+        clauses, params = [], []
+        if status:
+            clauses.append("status = ? COLLATE NOCASE")
+            params.append(status)
+        if assigned_to:
+            clauses.append("assigned_key = ?")
+            params.append(technician_key(assigned_to))
+        if customer_id is not None:
+            clauses.append("customer_id = ?")
+            params.append(str(customer_id))
+        if created_from is not None:
+            clauses.append("created_date >= ?")
+            params.append(created_from)
+        if created_to is not None:
+            clauses.append("created_date <= ?")
+            params.append(created_to)
+        return (" WHERE " + " AND ".join(clauses) if clauses else ""), params
+
+    def ticket_summaries(self, status: Optional[str] = None, assigned_to: Optional[str] = None,
+                         customer_id: Optional[str] = None, created_from: Optional[float] = None,
+                         created_to: Optional[float] = None,
+                         newest_first: bool = True) -> List[Dict]:
+        """Get the indexed columns of matching tickets without their payloads.
+
+        Takes the same filters as query_tickets. Each summary has id, order_id,
+        status, assigned_to, created_date and last_updated keys, which is enough
+        to list, sort and count tickets without parsing their bodies.
+        """
+        where, params = self._ticket_filters(status, assigned_to, customer_id,
+                                             created_from, created_to)
+        sql = (f"SELECT id, order_id, status, assigned_to, created_date, last_updated "
+               f"FROM tickets{where} ORDER BY created_date {'DESC' if newest_first else 'ASC'}")
+        return [dict(row) for row in self._query(sql, params)]
+
+    def get_tickets_by_id(self, ticket_ids: List[int]) -> Dict[int, Dict]:
+        """Get raw tickets for a list of internal IDs.
+
+        Returns:
+            Dictionary mapping each stored ID to its raw ticket; IDs that are
+            not stored are left out
+        """
+        tickets: Dict[int, Dict] = {}
+        # Stay well below SQLite's bound-parameter limit
+        for start in range(0, len(ticket_ids), 500):
+            chunk = ticket_ids[start:start + 500]
+            placeholders = ','.join('?' * len(chunk))
+            sql = f"SELECT id, data FROM tickets WHERE id IN ({placeholders})"
+            for row in self._query(sql, chunk):
+                tickets[row['id']] = json.loads(row['data'])
+        return tickets
+
+    def get_ticket(self, order_id: Optional[str] = None, ticket_id=None) -> Optional[Dict]:
+        """Get one raw ticket by ticket number (T-XXXXX) or internal ID."""
+        if order_id:
+            rows = self._query("SELECT data FROM tickets WHERE order_id = ? LIMIT 1", (order_id,))
+        elif ticket_id not in (None, ''):
+            try:
+                rows = self._query("SELECT data FROM tickets WHERE id = ?", (int(ticket_id),))
+            except (TypeError, ValueError):
+                return None
+        else:
+            return None
+        return json.loads(rows[0]['data']) if rows else None
+
+    # Inventory
+
+    def upsert_inventory(self, items: Iterable[Dict], replace: bool = False) -> int:
+        """Insert or update inventory items.
+
+        Args:
+            items: Raw inventory item dictionaries
+            replace: Drop all other items (the list is a full sync)
+
+        Returns:
+            Number of items written
+        """
+        rows = []
+        for item in items:
+            if not isinstance(item, dict):
+                continue
+            item_id = item.get('id') or item.get('sku')
+            if item_id in (None, ''):
+                continue
+            rows.append((str(item_id), item.get('sku'), item.get('name'),
+                         item.get('category'), _dumps(item)))
+
+        def write(conn):
+            if replace:
+                conn.execute("DELETE FROM inventory")
+            conn.executemany(
+                "INSERT OR REPLACE INTO inventory(id, sku, name, category, data) "
+                "VALUES (?, ?, ?, ?, ?)",
+                rows)
+            self._set_synced(conn, 'inventory')
+
+        self._write(write)
+        logger.debug(f"Upserted {len(rows)} inventory items into local store")
+        return len(rows)
+
+    def query_inventory(self, sku: Optional[str] = None, category: Optional[str] = None,
+                        name_contains: Optional[str] = None, limit: Optional[int] = None,
+                        offset: int = 0) -> List[Dict]:
+        """Get inventory items matching the given filters, ordered by name."""
+        clauses, params = [], []
+        if sku:
+            clauses.append("sku = ?")
+            params.append(sku)
+        if category:
+            clauses.append("category = ?")
+            params.append(category)
+        if name_contains:
+            clauses.append("name LIKE ? COLLATE NOCASE")
+            params.append(f"%{name_contains}%")
+        sql = "SELECT data FROM inventory"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY name"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        return [json.loads(row['data']) for row in self._query(sql, params)]
+
+    def get_inventory_item(self, item_id=None, sku: Optional[str] = None) -> Optional[Dict]:
+        """Get one inventory item by ID or SKU."""
+        if item_id not in (None, ''):
+            rows = self._query("SELECT data FROM inventory WHERE id = ?", (str(item_id),))
+        elif sku:
+            rows = self._query("SELECT data FROM inventory WHERE sku = ? LIMIT 1", (sku,))
+        else:
+            return None
+        return json.loads(rows[0]['data']) if rows else None
+
+    # Customers
+
+    def upsert_customers(self, customers: Iterable[Dict], replace: bool = False) -> int:
+        """Insert or update customers.
+
+        New customers are listed after the stored ones, in the given order;
+        updated customers keep their place.
+
+        Args:
+            customers: Raw customer dictionaries
+            replace: Drop all other customers (the list is a full sync)
+
+        Returns:
+            Number of customers written
+        """
+        rows = []
+        for customer in customers:
+            if not isinstance(customer, dict):
+                continue
+            customer_id = customer.get('cid') or customer.get('id')
+            if customer_id in (None, ''):
+                continue
+            rows.append((str(customer_id), customer.get('fullName') or customer.get('name'),
+                         customer.get('email'), customer.get('mobile'), _dumps(customer)))
+
+        def write(conn):
+            if replace:
+                conn.execute("DELETE FROM customers")
+            start = conn.execute(
+                "SELECT COALESCE(MAX(position) + 1, 0) FROM customers").fetchone()[0]
+            conn.executemany(
+                "INSERT INTO customers(id, name, email, mobile, data, position) "
+                "VALUES (?, ?, ?, ?, ?, ?) ON CONFLICT(id) DO UPDATE SET name = excluded.name, "
+                "email = excluded.email, mobile = excluded.mobile, data = excluded.data",
+                [row + (start + index,) for index, row in enumerate(rows)])
+            self._set_synced(conn, 'customers')
+
+        self._write(write)
+        logger.debug(f"Upserted {len(rows)} customers into local store")
+        return len(rows)
+
+    def query_customers(self, name_contains: Optional[str] = None, limit: Optional[int] = None,
+                        offset: int = 0) -> List[Dict]:
+        """Get customers in the order they were cached, optionally filtered by name."""
+        sql, params = "SELECT data FROM customers", []
+        if name_contains:
+            sql += " WHERE name LIKE ? COLLATE NOCASE"
+            params.append(f"%{name_contains}%")
+        sql += " ORDER BY position, id"
+        if limit is not None:
+            sql += " LIMIT ? OFFSET ?"
+            params += [limit, offset]
+        return [json.loads(row['data']) for row in self._query(sql, params)]
+
+    def get_customer(self, customer_id) -> Optional[Dict]:
+        """Get one customer by ID."""
+        rows = self._query("SELECT data FROM customers WHERE id = ?", (str(customer_id),))
+        return json.loads(rows[0]['data']) if rows else None
+
+    # Reports
+
+    def save_report(self, report_type: str, start_date: str, end_date: str, data: Any) -> None:
+        """Store the result of a report for a date range."""
+        payload = _dumps(data)
+
+        def write(conn):
+            conn.execute(
+                "INSERT OR REPLACE INTO reports"
+                "(report_type, start_date, end_date, cached_at, data) VALUES (?, ?, ?, ?, ?)",
+                (report_type, start_date, end_date, time.time(), payload))
+
+        self._write(write)
+
+    def load_report(self, report_type: str, start_date: str, end_date: str,
+                    max_age_seconds: Optional[float] = None) -> Optional[Tuple[Any, float]]:
+        """Get a stored report result.
+
+        Returns:
+            Tuple of (data, age in seconds), or None if missing or too old
+        """
+        rows = self._query(
+            "SELECT cached_at, data FROM reports "
+            "WHERE report_type = ? AND start_date = ? AND end_date = ?",
+            (report_type, start_date, end_date))
+        if not rows:
+            return None
+        age = time.time() - rows[0]['cached_at']
+        if max_age_seconds is not None and age > max_age_seconds:
+            return None
+        return json.loads(rows[0]['data']), age
+
+    def close(self) -> None:
+        """Close this thread's connection."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
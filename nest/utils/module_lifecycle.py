@@ -0,0 +1,253 @@
+"""
+Keep-alive lifecycle for the main window's modules.
+
+Navigating used to destroy the current module and build the next one from
+scratch, re-running imports, API client setup and data loads every time.
+ModuleLifecycleManager keeps modules alive instead:
+
+- Switching modules hides the current frame and shows the target one. A
+  module that implements suspend() and resume() has them called when it is
+  hidden and shown again, so it can stop and restart its refresh timers.
+  Modules that used to reload on every visit revalidate in resume() once
+  their data is older than RESUME_REVALIDATE_SECONDS.
+- Hidden modules are evicted least recently used first, once more than
+  keep_alive modules exist or the process exceeds a memory limit.
+- After each navigation, once the UI is idle, the module most likely to be
+  opened next is built in the background. Likely next modules are learned
+  from the navigation history, starting from a default guess.
+"""
+
+import logging
+from collections import Counter, OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_KEEP_ALIVE = 4
+DEFAULT_PRELOAD_DELAY_MS = 1500
+
+# Shown again after this long, a kept-alive module revalidates its data
+RESUME_REVALIDATE_SECONDS = 60
+
+# Modules cheap and safe enough to build before they are opened; device tools
+# start probing hardware when built, so they are only built on demand
+DEFAULT_PRELOADABLE = ("dashboard", "tickets", "customers", "inventory", "appointments")
+
+# Initial guess of the next module, until the navigation history says otherwise
+DEFAULT_NEXT_MODULES = {
+    "dashboard": ("tickets", "customers"),
+    "tickets": ("customers", "dashboard"),
+    "customers": ("tickets",),
+    "inventory": ("tickets",),
+    "appointments": ("customers",),
+}
+
+
+def _process_memory_mb() -> Optional[float]:
+    """Get the resident memory of this process in MB, or None if psutil is unavailable."""
+    try:
+        import psutil
+        return psutil.Process().memory_info().rss / (1024 * 1024)
+    except Exception:
+        return None
+
+
+class ModuleLifecycleManager:
+    """Shows, hides, evicts and preloads module frames inside a container."""
+
+    def __init__(self, root, factory: Callable[[str, Dict[str, Any]], Any],
+                 modules: Optional[Dict[str, Any]] = None, keep_alive: int = DEFAULT_KEEP_ALIVE,
+                 memory_limit_mb: Optional[float] = None, preload: bool = True,
+                 preload_delay_ms: int = DEFAULT_PRELOAD_DELAY_MS,
+                 preloadable: Iterable[str] = DEFAULT_PRELOADABLE,
+                 on_first_show: Optional[Callable[[str, Any], None]] = None):
+        """Initialize the manager.
+
+        Args:
+            root: Tk root used to schedule idle-time preloading
+            factory: Builds a module given its name and navigation arguments;
+                it must not pack the module
+            modules: Dictionary of live modules by name, shared with the caller
+            keep_alive: Maximum number of live modules, including the active one
+            memory_limit_mb: Evict hidden modules while the process uses more
+                memory than this; None disables the check
+            preload: Build likely next modules in idle time
+            preload_delay_ms: Time after a navigation before preloading starts
+            preloadable: Names of the modules that may be preloaded
+            on_first_show: Called with (name, module) the first time a module is shown
+        """
+        self.root = root
+        self.factory = factory
+        self.modules = modules if modules is not None else {}
+        self.keep_alive = max(1, keep_alive)
+        self.memory_limit_mb = memory_limit_mb
+        self.preload = preload
+        self.preload_delay_ms = preload_delay_ms
+        self.preloadable = set(preloadable)
+        self.on_first_show = on_first_show
+
+        self.active: Optional[str] = None
+        self._recent: "OrderedDict[str, None]" = OrderedDict()  # Least recently shown first
+        self._shown = set()
+        self._transitions: Dict[str, Counter] = {}
+        self._preload_id = None
+
+    def show(self, name: str, kwargs: Optional[Dict[str, Any]] = None, reload: bool = False):
+        """Show a module, reusing its live instance when possible.
+
+        Args:
+            name: Module name
+            kwargs: Navigation arguments such as a ticket action; a module opened
+                with arguments is rebuilt so it can act on them
+            reload: Rebuild the module even if it is alive
+
+        Returns:
+            The shown module
+        """
+        self._cancel_preload()
+        kwargs = {key: value for key, value in (kwargs or {}).items() if value is not None}
+
+        module = self.modules.get(name)
+        if module is not None and (reload or kwargs or not self._exists(module)):
+            self._destroy(name)
+            module = None
+
+        previous = self.active
+        if previous and previous != name:
+            self._hide(previous)
+            self._transitions.setdefault(previous, Counter())[name] += 1
+
+        if module is None:
+            module = self.factory(name, kwargs)
+            self.modules[name] = module
+            logger.info(f"Built module: {name}")
+        elif name != previous:
+            self._call(module, "resume")
+            logger.debug(f"Reusing live module: {name}")
+
+        self.active = name
+        self._recent.pop(name, None)
+        self._recent[name] = None
+        if hasattr(module, "pack"):
+            module.pack(expand=True, fill="both")
+        if name not in self._shown:
+            self._shown.add(name)
+            if self.on_first_show:
+                self.on_first_show(name, module)
+
+        self._evict()
+        self._schedule_preload()
+        return module
+
+    def clear(self) -> None:
+        """Destroy all modules, e.g. on logout."""
+        self._cancel_preload()
+        for name in list(self.modules):
+            self._destroy(name)
+        self.active = None
+
+    def likely_next(self, name: str) -> List[str]:
+        """Get the modules most likely to be opened after a module, most likely first."""
+        ranked = [target for target, _ in self._transitions.get(name, Counter()).most_common()]
+        ranked.extend(target for target in DEFAULT_NEXT_MODULES.get(name, ())
+                      if target not in ranked)
+        return ranked
+
+    @staticmethod
+    def _exists(module) -> bool:
+        try:
+            return not hasattr(module, "winfo_exists") or bool(module.winfo_exists())
+        except Exception:
+            return False
+
+    @staticmethod
+    def _call(module, method: str) -> None:
+        hook = getattr(module, method, None)
+        if callable(hook):
+            try:
+                hook()
+            except Exception as e:
+                logger.error(f"Error in module {method}(): {e}")
+
+    def _hide(self, name: str) -> None:
+        module = self.modules.get(name)
+        if module is None or not self._exists(module):
+            return
+        try:
+            module.pack_forget()
+        except Exception as e:
+            logger.debug(f"Could not hide module {name}: {e}")
+        self._call(module, "suspend")
+
+    def _destroy(self, name: str) -> None:
+        module = self.modules.pop(name, None)
+        self._recent.pop(name, None)
+        self._shown.discard(name)
+        if self.active == name:
+            self.active = None
+        if module is not None and hasattr(module, "destroy"):
+            try:
+                module.destroy()
+                logger.info(f"Destroyed module: {name}")
+            except Exception as e:
+                logger.error(f"Error destroying module {name}: {e}")
+
+    def _over_memory_limit(self) -> bool:
+        if not self.memory_limit_mb:
+            return False
+        used = _process_memory_mb()
+        return used is not None and used > self.memory_limit_mb
+
+    def _evict(self) -> None:
+        """Destroy hidden modules, least recently shown first, until within limits."""
+        while True:
+            hidden = [name for name in self._recent if name != self.active]
+            hidden.extend(name for name in self.modules
+                          if name != self.active and name not in self._recent)
+            if not hidden:
+                return
+            if len(self.modules) > self.keep_alive:
+                reason = "module limit"
+            elif self._over_memory_limit():
+                reason = "memory pressure"
+            else:
+                return
+            logger.info(f"Evicting module {hidden[0]} ({reason})")
+            self._destroy(hidden[0])
+
+    def _schedule_preload(self) -> None:
+        if not self.preload:
+            return
+        try:
+            self._preload_id = self.root.after(
+                self.preload_delay_ms, lambda: self.root.after_idle(self._preload_next))
+        except Exception as e:
+            logger.debug(f"Could not schedule module preload: {e}")
+
+    def _cancel_preload(self) -> None:
+        if self._preload_id is not None:
+            try:
+                self.root.after_cancel(self._preload_id)
+            except Exception:
+                pass
+            self._preload_id = None
+
+    def _preload_next(self) -> None:
+        """Build the most likely next module that is not alive yet, hidden and suspended."""
+        self._preload_id = None
+        if self.active is None or len(self.modules) >= self.keep_alive or self._over_memory_limit():
+            return
+        for name in self.likely_next(self.active):
+            if name in self.modules or name not in self.preloadable:
+                continue
+            try:
+                module = self.factory(name, {})
+            except Exception as e:
+                logger.warning(f"Preloading module {name} failed: {e}")
+                return
+            self.modules[name] = module
+            self._recent[name] = None
+            self._recent.move_to_end(name, last=False)  # Evict before anything the user opened
+            self._call(module, "suspend")
+            logger.info(f"Preloaded module: {name}")
+            return
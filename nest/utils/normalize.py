@@ -1,6 +1,7 @@
 import datetime
 import re
 from nest.utils.logger import log_message
+from nest.utils.ticket_record import TicketRecord, normalize_record
 
 
 def ordinal(n: int) -> str:
@@ -12,11 +13,11 @@ def ordinal(n: int) -> str:
 
 
 def format_date(timestamp: float) -> str:
-    dt = datetime.datetime.fromtimestamp(timestamp)
-    month = dt.strftime("%B")
-    day = ordinal(dt.day)
-    year = dt.strftime("%Y")
-    return f"{month} {day}, {year}"
+    return format_datetime(datetime.datetime.fromtimestamp(timestamp))
+
+
+def format_datetime(dt: datetime.datetime) -> str:
+    return f"{dt.strftime('%B')} {ordinal(dt.day)}, {dt.year}"
 
 
 def format_timestamp(ts) -> str:
@@ -40,62 +41,25 @@ def map_job_status(raw_status: str) -> str:
     return mapping.get(raw_status, raw_status)
 
 
-def normalize_ticket(ticket: dict) -> dict:
-    summary = ticket.get("summary", {})
-    devices = ticket.get("devices", [])
+def _summary_view(record: TicketRecord) -> dict:
+    days_open = record.days_open()
+    return {
+        "ticket_id": record.ticket_id or "N/A",
+        "customer_name": record.customer_name or "N/A",
+        "customer_mobile": record.customer_mobile or "N/A",
+        "job_status": map_job_status(record.status),
+        "quoted_price": record.total if record.total is not None else "N/A",
+        "booked_in": format_datetime(record.created) if record.created else "N/A",
+        "days_open": days_open if days_open is not None else "N/A",
+        "assigned_to": record.assigned_to or record.technician or "N/A",
+        "last_updated_ts": record.updated.timestamp() if record.updated else None,
+        "device": record.device or "N/A",
+    }
 
-    order_id = summary.get("order_id", "N/A")
-    if order_id != "N/A" and not str(order_id).startswith("T-"):
-        order_id = f"T-{order_id}"
 
-    created_ts_raw = summary.get("created_date")
-    try:
-        created_ts = float(created_ts_raw) if created_ts_raw else None
-    except Exception as e:
-        log_message(f"Error parsing created_date: {e}")
-        created_ts = None
-
-    raw_status = summary.get("status", "Open")
-    for d in devices:
-        d_status = d.get("status", {}).get("name", "")
-        if d_status and d_status != "Open":
-            raw_status = d_status
-            break
-    job_status = map_job_status(raw_status)
-    booked_in = format_timestamp(created_ts)
-    days_open = (
-        (datetime.datetime.now() - datetime.datetime.fromtimestamp(created_ts)).days
-        if created_ts
-        else "N/A"
-    )
-    quoted_price = summary.get("total", "N/A")
-    assigned_to = summary.get("assigned_to")
-    if not assigned_to and devices:
-        assigned_to = devices[0].get("assigned_to", {}).get("fullname", "N/A")
-    customer = summary.get("customer", {})
-    customer_name = customer.get("fullName", "N/A")
-    customer_mobile = customer.get("mobile", "N/A")
-    last_updated_raw = summary.get("last_updated")
-    try:
-        last_updated_ts = float(last_updated_raw) if last_updated_raw else None
-    except Exception:
-        last_updated_ts = None
-    device_name = "N/A"
-    if devices:
-        device_name = devices[0].get("device", {}).get("name", "N/A")
-    normalized = {
-        "ticket_id": order_id,
-        "customer_name": customer_name,
-        "customer_mobile": customer_mobile,
-        "job_status": job_status,
-        "quoted_price": quoted_price,
-        "booked_in": booked_in,
-        "days_open": days_open,
-        "assigned_to": assigned_to if assigned_to else "N/A",
-        "last_updated_ts": last_updated_ts,
-        "device": device_name,
-    }
-    return normalized
+def normalize_ticket(ticket: dict) -> dict:
+    # Memoized per ticket content; days_open is recomputed once a day
+    return normalize_record(ticket).view("summary", _summary_view, stamp=datetime.date.today())
 
 
 def normalize_store_name(store_name: str) -> str:
@@ -0,0 +1,346 @@
+"""
+Adaptive rate limiting and retry policy for Nest API clients.
+
+Every request sent through the shared HTTP transport takes a token from a
+per-host token bucket. The bucket slows down when the server answers 429 or
+advertises an exhausted quota, and speeds back up as requests succeed.
+Retries are jittered, honour Retry-After, and are capped by a retry budget
+per endpoint class so a struggling API is not hit with retry storms.
+
+Server-requested pauses are clamped to MAX_THROTTLE_SECONDS, and the Tk
+main thread never sleeps here: it sends right away and the request's token
+is paid back by later background requests. During a server-imposed pause
+main-thread requests fail fast with RateLimitExceeded, and retries are left
+to background callers.
+
+This only holds if the main thread never waits on a background request,
+which may be sleeping here. Request coalescing (nest.utils.single_flight)
+is where that could happen, so RepairDeskAPI.request never lets the main
+thread join another thread's in-flight GET; it sends its own request
+through the limiter instead.
+"""
+
+import logging
+import random
+import threading
+import time
+from email.utils import parsedate_to_datetime
+from typing import Callable, Dict, Optional
+from urllib.parse import urlparse
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+# Token bucket defaults (requests per second per host)
+DEFAULT_RATE = 5.0
+DEFAULT_BURST = 10
+MIN_RATE = 0.5
+
+# Longest pause a Retry-After or rate limit reset header can impose on a host
+MAX_THROTTLE_SECONDS = 60.0
+
+# Adaptive adjustment: halve the rate on throttling, creep back up on success
+THROTTLE_DECREASE_FACTOR = 0.5
+SUCCESS_INCREASE_STEP = 0.05
+
+# Status codes worth retrying
+THROTTLE_STATUS_CODES = (429,)
+RETRYABLE_STATUS_CODES = (429, 502, 503, 504)
+
+
+class RetryPolicy:
+    """Retry settings and budget for one class of endpoints.
+
+    The budget starts with ``reserve`` retry tokens. Each completed request
+    deposits ``ratio`` tokens and each retry withdraws one, so in the long run
+    retries stay below ``ratio`` of all requests for the class.
+    """
+
+    def __init__(self, max_retries: int, base_delay: float, max_delay: float,
+                 retry_on_errors: bool = True, reserve: float = 10.0, ratio: float = 0.2):
+        """Initialize the policy.
+
+        Args:
+            max_retries: Maximum retries for a single call
+            base_delay: Base delay in seconds for exponential backoff
+            max_delay: Longest single wait in seconds; longer Retry-After values give up
+            retry_on_errors: Whether to retry 5xx responses and connection errors
+                (non-idempotent writes only retry on explicit throttling)
+            reserve: Maximum number of banked retry tokens
+            ratio: Retry tokens earned per completed request
+        """
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_on_errors = retry_on_errors
+        self.reserve = reserve
+        self.ratio = ratio
+
+        self._tokens = reserve
+        self._lock = threading.Lock()
+
+    def record_request(self) -> None:
+        """Earn retry budget for a completed request."""
+        with self._lock:
+            self._tokens = min(self.reserve, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        """Withdraw one retry from the budget if any is left."""
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def backoff_delay(self, attempt: int) -> float:
+        """Get a full-jitter exponential backoff delay for the given attempt."""
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+# Retry budgets per endpoint class
+RETRY_POLICIES: Dict[str, RetryPolicy] = {
+    "list": RetryPolicy(max_retries=3, base_delay=1.0, max_delay=30.0),
+    "detail": RetryPolicy(max_retries=2, base_delay=0.5, max_delay=10.0),
+    "write": RetryPolicy(max_retries=2, base_delay=1.0, max_delay=15.0, retry_on_errors=False),
+}
+
+
+class RateLimitExceeded(requests.exceptions.RequestException):
+    """Raised instead of waiting when the main thread hits a server-imposed pause."""
+
+    def __init__(self, retry_after: float):
+        super().__init__(f"Rate limited by server, retry in {retry_after:.1f}s")
+        self.retry_after = retry_after
+
+
+def on_main_thread() -> bool:
+    """Check whether the caller is the main (UI) thread, which must never sleep."""
+    return threading.current_thread() is threading.main_thread()
+
+
+def classify_endpoint(method: str, params: Optional[Dict] = None) -> str:
+    """Get the endpoint class used to pick a retry policy.
+
+    Args:
+        method: HTTP method
+        params: Query parameters of the request
+
+    Returns:
+        'write' for mutations, 'list' for paginated GETs, 'detail' otherwise
+    """
+    if method.upper() != "GET":
+        return "write"
+    if params and "page" in params:
+        return "list"
+    return "detail"
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Parse a Retry-After header given in seconds or as an HTTP date.
+
+    Returns:
+        Seconds to wait, or None if the header is missing or invalid
+    """
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError, IndexError):
+        return None
+
+
+class RateLimiter:
+    """Thread-safe adaptive token bucket shared by all clients of one host."""
+
+    def __init__(self, rate: float = DEFAULT_RATE, burst: int = DEFAULT_BURST):
+        """Initialize the limiter.
+
+        Args:
+            rate: Maximum sustained requests per second
+            burst: Maximum number of requests that can be sent back to back
+        """
+        self.max_rate = rate
+        self.rate = rate
+        self.burst = burst
+
+        self._tokens = float(burst)
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float) -> None:
+        elapsed = now - self._last_refill
+        self._tokens = min(self.burst, self._tokens + elapsed * self.rate)
+        self._last_refill = now
+
+    def acquire(self, block: Optional[bool] = None) -> float:
+        """Wait until a request may be sent.
+
+        Args:
+            block: Whether to wait for a token. Defaults to waiting everywhere
+                except the main (UI) thread, which takes a token on credit
+                instead so the interface never freezes. Other threads may
+                sleep here for up to MAX_THROTTLE_SECONDS, so the main thread
+                must not wait on their requests either.
+
+        Returns:
+            Seconds spent waiting
+
+        Raises:
+            RateLimitExceeded: If not blocking and the server asked for a pause
+        """
+        if block is None:
+            block = not on_main_thread()
+
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._refill(now)
+                if not block:
+                    if now < self._blocked_until:
+                        raise RateLimitExceeded(self._blocked_until - now)
+                    # Go into debt; background requests wait until it is repaid
+                    self._tokens = max(self._tokens - 1, -float(self.burst))
+                    return waited
+                if now < self._blocked_until:
+                    delay = self._blocked_until - now
+                elif self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                else:
+                    delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
+
+    def throttle(self, seconds: float) -> None:
+        """Pause all requests through this limiter for up to MAX_THROTTLE_SECONDS."""
+        seconds = min(seconds, MAX_THROTTLE_SECONDS)
+        with self._lock:
+            self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def observe(self, response: requests.Response) -> Optional[float]:
+        """Adapt the rate to a response and honour server throttling headers.
+
+        Args:
+            response: The response just received
+
+        Returns:
+            Seconds the server asked us to wait, if any, clamped to MAX_THROTTLE_SECONDS
+        """
+        headers = response.headers
+        retry_after = parse_retry_after(headers.get("Retry-After"))
+
+        if response.status_code in THROTTLE_STATUS_CODES:
+            with self._lock:
+                self.rate = max(MIN_RATE, self.rate * THROTTLE_DECREASE_FACTOR)
+            logger.warning(f"Server throttled request, lowering rate to {self.rate:.2f}/s")
+            if retry_after is None:
+                retry_after = 1.0 / self.rate
+        elif response.ok:
+            with self._lock:
+                self.rate = min(self.max_rate, self.rate + SUCCESS_INCREASE_STEP)
+
+        # Respect an exhausted quota even on successful responses
+        remaining = headers.get("X-RateLimit-Remaining")
+        reset = headers.get("X-RateLimit-Reset")
+        if remaining is not None and reset is not None:
+            try:
+                if int(float(remaining)) <= 0:
+                    reset_value = float(reset)
+                    # Reset may be an epoch timestamp or a number of seconds
+                    wait = reset_value - time.time() if reset_value > 1e9 else reset_value
+                    if wait > 0:
+                        retry_after = max(retry_after or 0.0, wait)
+            except ValueError:
+                pass
+
+        if retry_after:
+            retry_after = min(retry_after, MAX_THROTTLE_SECONDS)
+            self.throttle(retry_after)
+        return retry_after
+
+
+_limiters: Dict[str, RateLimiter] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(url: str) -> RateLimiter:
+    """Get the shared rate limiter for the host of the given URL."""
+    host = urlparse(url).netloc
+    with _limiters_lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            limiter = _limiters[host] = RateLimiter()
+        return limiter
+
+
+def configure_rate_limiter(host: str, rate: float = DEFAULT_RATE,
+                           burst: int = DEFAULT_BURST) -> RateLimiter:
+    """Replace the rate limiter for a host with one using the given settings."""
+    with _limiters_lock:
+        limiter = _limiters[host] = RateLimiter(rate=rate, burst=burst)
+        return limiter
+
+
+def send_with_retries(send: Callable[[], requests.Response],
+                      endpoint_class: str = "detail") -> requests.Response:
+    """Send a request, retrying throttled and transient failures within budget.
+
+    Rate limiting itself happens in the shared transport; this adds jittered
+    retries that honour Retry-After, bounded by the endpoint class's policy
+    and retry budget. On the main thread the first result is returned (or
+    raised) as-is, since waiting to retry would freeze the UI.
+
+    Args:
+        send: Zero-argument callable that performs the request
+        endpoint_class: 'list', 'detail' or 'write' (see classify_endpoint)
+
+    Returns:
+        The final response (which may still be an error response)
+
+    Raises:
+        requests.exceptions.RequestException: If the last attempt failed to connect
+    """
+    policy = RETRY_POLICIES.get(endpoint_class, RETRY_POLICIES["detail"])
+    max_retries = 0 if on_main_thread() else policy.max_retries
+    attempt = 0
+
+    while True:
+        try:
+            response = send()
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+            if (policy.retry_on_errors and attempt < max_retries
+                    and policy.try_spend()):
+                delay = policy.backoff_delay(attempt)
+                logger.warning(f"Request failed ({e}), retrying in {delay:.1f}s "
+                               f"(attempt {attempt + 1}/{policy.max_retries})")
+                time.sleep(delay)
+                attempt += 1
+                continue
+            policy.record_request()
+            raise
+
+        status = response.status_code
+        retryable = status in THROTTLE_STATUS_CODES or (
+            policy.retry_on_errors and status in RETRYABLE_STATUS_CODES)
+
+        if retryable and attempt < max_retries:
+            retry_after = parse_retry_after(response.headers.get("Retry-After"))
+            delay = retry_after if retry_after is not None else policy.backoff_delay(attempt)
+
+            # Don't stall the caller on very long server-requested waits
+            if delay <= policy.max_delay and policy.try_spend():
+                logger.warning(f"HTTP {status}, retrying in {delay:.1f}s "
+                               f"(attempt {attempt + 1}/{policy.max_retries})")
+                time.sleep(delay)
+                attempt += 1
+                continue
+
+        policy.record_request()
+        return response
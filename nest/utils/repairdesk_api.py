@@ -2,21 +2,61 @@ import requests
 import json
 import logging
 import os
+import threading
 import time
-from typing import Dict, List, Optional, Any, Union, Tuple, BinaryIO
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Any, Union, Tuple, BinaryIO, Sequence
 from datetime import datetime, date
 
+from .cache_io import read_cache_file, write_cache_file
+from .cache_utils import get_local_store
+from .http_transport import get_transport
+from .rate_limiter import classify_endpoint, on_main_thread, send_with_retries
+from .response_cache import get_response_cache
+from .single_flight import SingleFlight
+from .ticket_cache_reader import LazyTicketList
+from .ticket_events import (
+    TICKET_ASSIGNED, TICKET_ATTACHMENT_ADDED, TICKET_NOTE_ADDED, TICKET_STATUS_CHANGED,
+    TICKET_UPDATED, publish_ticket_mutation
+)
+from .ticket_index import get_ticket_id_index, normalize_order_id
+from .ticket_record import ticket_updated_timestamp
+from .ticket_search import get_ticket_search_index
+
+
+# Prefix of the shared response cache keys written by RepairDeskAPI GET requests
+CACHE_KEY_PREFIX = 'GET:'
+
+# Maximum number of pages fetched in parallel by the paginated get_all_* methods
+DEFAULT_PAGE_WORKERS = 4
+
+# Delta ticket sync settings
+TICKET_SYNC_STATE_FILE = 'ticket_sync_state.json'
+TICKET_FULL_SYNC_INTERVAL_HOURS = 24  # Periodic full resync to pick up deleted tickets
+TICKET_SYNC_OVERLAP_SECONDS = 300  # Re-check a small window before the watermark for clock skew
+
+# Identical GETs in flight from any RepairDeskAPI instance share one network call
+_inflight_gets = SingleFlight()
+
+# Serializes read-modify-write of the shared ticket cache file (saves, patches and
+# delta merges) across RepairDeskAPI instances and threads
+_ticket_cache_lock = threading.RLock()
+
 
 class RepairDeskAPI:
     """Comprehensive client for interacting with RepairDesk's official API."""
     
-    def __init__(self, api_key: Optional[str] = None, store_slug: Optional[str] = None, cache_ttl: int = 3600):
+    def __init__(self, api_key: Optional[str] = None, store_slug: Optional[str] = None,
+                 cache_ttl: Optional[int] = None,
+                 page_workers: int = DEFAULT_PAGE_WORKERS):
         """Initialize API client with authentication details.
         
         Args:
             api_key: The RepairDesk API key for authentication
             store_slug: The RepairDesk store slug (for reference, not used in API calls)
-            cache_ttl: Time to live for cached data in seconds (default: 1 hour)
+            cache_ttl: Time to live for cached data in seconds (default: per-endpoint
+                policy of the shared response cache)
+            page_workers: Maximum number of pages fetched concurrently during full syncs
         """
         # Initialize logger first so it can be used in load_from_config
         self.logger = logging.getLogger(__name__)
@@ -25,7 +65,10 @@ class RepairDeskAPI:
         self.store_slug = store_slug
         self.base_url = "https://api.repairdesk.co/api/web/v1"
         self.cache_ttl = cache_ttl
-        self._cache = {}
+        self.page_workers = max(1, page_workers)
+        self._cache = get_response_cache()
+        # (file signature, tickets) of the ticket cache as last read or written by sync_tickets
+        self._synced_tickets: Optional[Tuple[Tuple[int, int, int], List[Dict]]] = None
         
         if not api_key:
             # Try to load from config
@@ -136,36 +179,32 @@ class RepairDeskAPI:
         Returns:
             Tuple of (found, data)
         """
-        if cache_key in self._cache:
-            entry = self._cache[cache_key]
-            if time.time() - entry["timestamp"] < self.cache_ttl:
-                return True, entry["data"]
-        return False, None
+        return self._cache.get(cache_key)
     
-    def _set_cache(self, cache_key: str, data: Any) -> None:
-        """Store data in cache with current timestamp.
+    def _set_cache(self, cache_key: str, data: Any, endpoint: Optional[str] = None) -> None:
+        """Store data in the shared response cache.
         
         Args:
             cache_key: Unique key for cached data
             data: Data to cache
+            endpoint: Endpoint used to pick the TTL policy
         """
-        self._cache[cache_key] = {
-            "timestamp": time.time(),
-            "data": data
-        }
+        self._cache.set(cache_key, data, endpoint=endpoint, ttl=self.cache_ttl)
     
     def _clear_cache(self, prefix: Optional[str] = None) -> None:
-        """Clear all cached data or items with specific prefix.
+        """Clear this client's cached responses or items with specific prefix.
+        
+        The response cache is shared with other clients, so clearing without
+        a prefix only drops entries cached by RepairDeskAPI requests.
         
         Args:
             prefix: Optional prefix to clear only matching cache entries
         """
-        if prefix:
-            keys_to_remove = [k for k in self._cache.keys() if k.startswith(prefix)]
-            for key in keys_to_remove:
-                del self._cache[key]
-        else:
-            self._cache.clear()
+        self._cache.clear(prefix or CACHE_KEY_PREFIX)
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Get size and hit/miss/eviction counters of the shared response cache."""
+        return self._cache.stats()
     
     def request(self, endpoint: str, method: str = "GET", params: Dict = None, 
                data: Dict = None, files: Dict = None, use_cache: bool = False,
@@ -199,14 +238,78 @@ class RepairDeskAPI:
         params['api_key'] = self.api_key
         
         # For GET requests with caching, check cache first
+        is_get = method.upper() == "GET"
+        request_key = None
         cache_key = None
-        if use_cache and method.upper() == "GET":
-            cache_key = f"{method}:{endpoint}:{json.dumps(params, sort_keys=True)}"
-            cache_hit, cached_data = self._get_from_cache(cache_key)
-            if cache_hit:
-                self.logger.debug(f"Cache hit for {url}")
-                return cached_data
+        if is_get:
+            request_key = f"{CACHE_KEY_PREFIX}{endpoint}:{json.dumps(params, sort_keys=True)}"
+            if use_cache:
+                cache_key = request_key
+                cache_hit, cached_data = self._get_from_cache(cache_key)
+                if cache_hit:
+                    self.logger.debug(f"Cache hit for {url}")
+                    return cached_data
+        
+        def send() -> Any:
+            return self._send_request(method, url, params, data, files, raw_response)
+        
+        if is_get and not files:
+            # Coalesce with an identical GET already in flight instead of repeating it.
+            # The main thread never waits on another thread's request, which may be
+            # sleeping in the rate limiter; it sends its own without blocking.
+            flight_key = (self.base_url, request_key, raw_response)
+            result, shared = _inflight_gets.do(flight_key, send, may_wait=not on_main_thread())
+            if shared:
+                self.logger.debug(f"Coalesced {method} {url} with in-flight request")
+        else:
+            result = send()
         
+        # Cache result for GET requests
+        if cache_key:
+            self._set_cache(cache_key, result, endpoint=endpoint)
+            
+        return result
+    
+    @staticmethod
+    def _file_positions(files: Optional[Dict]) -> List[Tuple[BinaryIO, int]]:
+        """Get the seekable file handles of a multipart upload and their start positions.
+        
+        Args:
+            files: Files argument of a request, mapping field names to file objects,
+                bytes or (name, content[, type]) tuples
+            
+        Returns:
+            List of (handle, position) pairs; bytes and unseekable streams are left out
+        """
+        positions = []
+        for value in (files or {}).values():
+            handle = value[1] if isinstance(value, tuple) and len(value) > 1 else value
+            if not hasattr(handle, 'seek') or not hasattr(handle, 'tell'):
+                continue
+            try:
+                positions.append((handle, handle.tell()))
+            except (OSError, ValueError):
+                pass
+        return positions
+    
+    def _send_request(self, method: str, url: str, params: Dict, data: Dict = None,
+                      files: Dict = None, raw_response: bool = False) -> Any:
+        """Send a single request over the shared transport and unwrap the response.
+        
+        Args:
+            method: HTTP method (GET, POST, PUT, DELETE)
+            url: Full request URL
+            params: Query parameters including the API key
+            data: Optional JSON data for request body
+            files: Optional files to upload
+            raw_response: Return raw response without extracting data field
+            
+        Returns:
+            Response data
+            
+        Raises:
+            Exception: If API request fails
+        """
         self.logger.debug(f"Making {method} request to {url}")
         
         try:
@@ -226,8 +329,16 @@ class RepairDeskAPI:
             elif data:
                 request_args["json"] = data
             
-            # Make the request
-            response = requests.request(**request_args)
+            # Uploads read their file handles; rewind them so a retry resends the whole file
+            file_positions = self._file_positions(files)
+            
+            def send():
+                for handle, position in file_positions:
+                    handle.seek(position)
+                return get_transport().request(**request_args)
+            
+            # Make the request, retrying throttled or transient failures within budget
+            response = send_with_retries(send, classify_endpoint(method, params))
             
             # Log response status
             self.logger.debug(f"API response: {response.status_code}")
@@ -256,10 +367,6 @@ class RepairDeskAPI:
                 # Return actual data or full response
                 if not raw_response and 'data' in response_data:
                     result = response_data['data']
-            
-            # Cache result for GET requests
-            if cache_key:
-                self._set_cache(cache_key, result)
                 
             return result
             
@@ -267,6 +374,97 @@ class RepairDeskAPI:
             self.logger.error(f"Request error: {e}")
             raise Exception(f"API request failed: {e}")
     
+    def _fetch_all_pages(self, fetch_page: Callable[[int], Dict], data_key: str,
+                        page_callback: Callable = None, label: str = "items") -> List[Dict]:
+        """Fetch every page of a paginated endpoint.
+        
+        The first page is fetched on the calling thread to learn ``total_pages``.
+        The remaining pages are then fetched by a bounded worker pool and put back
+        in page order. If the API does not report a page count, pages are walked
+        one at a time via ``next_page`` instead.
+        
+        Args:
+            fetch_page: Callable taking a page number and returning the API response
+            data_key: Response key holding the page's items (e.g. 'ticketData')
+            page_callback: Optional callback fired in page order with
+                (current_page_items, is_complete, total_items_so_far, pagination_info)
+            label: Name of the items being fetched, used for logging
+            
+        Returns:
+            List of items from all pages, in page order
+        """
+        items = []
+        
+        def emit(page: int, page_items: List[Dict], is_complete: bool, total_pages: int) -> None:
+            items.extend(page_items)
+            if page_callback:
+                pagination_info = {"current_page": page, "total_pages": total_pages}
+                page_callback(page_items, is_complete, len(items), pagination_info)
+        
+        response = fetch_page(1)
+        if not response or not isinstance(response, dict):
+            return items
+        
+        first_page = response.get(data_key, [])
+        if not first_page:
+            return items
+        
+        pagination = response.get("pagination", {}) or {}
+        has_next = bool(pagination.get("next_page_exist"))
+        try:
+            total_pages = int(pagination.get("total_pages") or 0)
+        except (TypeError, ValueError):
+            total_pages = 0
+        
+        if not has_next:
+            emit(1, first_page, True, max(total_pages, 1))
+            return items
+        
+        if total_pages <= 1:
+            # No page count available - walk next_page sequentially
+            page = 1
+            current_page = first_page
+            while True:
+                is_complete = not pagination.get("next_page_exist")
+                emit(page, current_page, is_complete, pagination.get("total_pages", 1))
+                if is_complete:
+                    break
+                
+                page = pagination.get("next_page")
+                self.logger.debug(f"Fetching {label} page {page}")
+                response = fetch_page(page)
+                if not response or not isinstance(response, dict):
+                    break
+                current_page = response.get(data_key, [])
+                if not current_page:
+                    break
+                pagination = response.get("pagination", {}) or {}
+            return items
+        
+        self.logger.debug(f"Fetching {label} pages 2-{total_pages} "
+                          f"with {self.page_workers} workers")
+        emit(1, first_page, False, total_pages)
+        
+        executor = ThreadPoolExecutor(max_workers=min(self.page_workers, total_pages - 1),
+                                      thread_name_prefix=f"repairdesk-{label}")
+        try:
+            futures = [executor.submit(fetch_page, page) for page in range(2, total_pages + 1)]
+            
+            # Consume results in page order so callbacks fire in order while later pages download
+            for page, future in enumerate(futures, start=2):
+                response = future.result()
+                current_page = response.get(data_key, []) if isinstance(response, dict) else []
+                if not current_page:
+                    self.logger.warning(f"Empty {label} page {page} of {total_pages}, stopping")
+                    if page_callback:
+                        emit(page, [], True, total_pages)
+                    break
+                emit(page, current_page, page == total_pages, total_pages)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+        
+        return items
+    
     def validate_credentials(self) -> bool:
         """Validate API key by checking if we can fetch employees list.
         
@@ -513,28 +711,7 @@ class RepairDeskAPI:
         # Customer caching is handled by the customers module, not here
         
         self.logger.info("Fetching all customers from RepairDesk (this may take some time)")
-        page = 1
-        customers = []
-        
-        while True:
-            response = self.get_customers(page)
-            
-            if not response or not isinstance(response, dict):
-                break
-                
-            current_page = response.get("customerData", [])
-            if not current_page:
-                break
-                
-            customers.extend(current_page)
-            
-            # Check pagination
-            pagination = response.get("pagination", {})
-            if pagination.get("next_page_exist"):
-                page = pagination.get("next_page")
-                self.logger.debug(f"Fetching customer page {page}")
-            else:
-                break
+        customers = self._fetch_all_pages(self.get_customers, "customerData", label="customers")
         
         # We still save a sanitized version with only IDs for debugging purposes
         # (The actual customer data with encryption is handled in the UI layer)
@@ -659,7 +836,8 @@ class RepairDeskAPI:
     def get_tickets(self, page: int = 1, limit: int = 1000, status: str = None, 
                    technician_id: Union[str, int] = None, 
                    date_from: Union[str, datetime, date] = None,
-                   date_to: Union[str, datetime, date] = None) -> Dict:
+                   date_to: Union[str, datetime, date] = None,
+                   sort_by: str = None, sort_order: str = None) -> Dict:
         """Fetch tickets with optional filtering and pagination.
         
         Args:
@@ -669,6 +847,8 @@ class RepairDeskAPI:
             technician_id: Optional technician ID to filter by
             date_from: Optional start date (format: YYYY-MM-DD)
             date_to: Optional end date (format: YYYY-MM-DD)
+            sort_by: Optional field to sort by (e.g., 'last_updated')
+            sort_order: Optional sort direction ('asc' or 'desc')
             
         Returns:
             Dictionary with ticket data and pagination info
@@ -695,6 +875,12 @@ class RepairDeskAPI:
                 params["date_to"] = date_to.strftime("%Y-%m-%d")
             else:
                 params["date_to"] = date_to
+                
+        if sort_by:
+            params["sort_by"] = sort_by
+            
+        if sort_order:
+            params["sort_order"] = sort_order
             
         return self.request("tickets", params=params)
     
@@ -732,8 +918,6 @@ class RepairDeskAPI:
         
         # If no valid cache or cache disabled, fetch from API
         self.logger.info("Fetching all tickets from RepairDesk (this may take some time)")
-        page = 1
-        tickets = []
         
         # Format dates if provided
         from_date_str = None
@@ -751,36 +935,17 @@ class RepairDeskAPI:
             else:
                 to_date_str = date_to
         
-        # Fetch tickets with pagination
-        while True:
-            response = self.get_tickets(
-                page=page, 
+        def fetch_page(page: int) -> Dict:
+            return self.get_tickets(
+                page=page,
                 status=status,
                 technician_id=technician_id,
                 date_from=from_date_str,
                 date_to=to_date_str
             )
-            
-            if response and isinstance(response, dict):
-                # RepairDesk API returns 'ticketData' not 'data.tickets'
-                current_page = response.get("ticketData", [])
-                
-                if current_page:
-                    tickets.extend(current_page)
-                else:
-                    break
-                    
-                # Pagination is at root level, not nested
-                pagination = response.get("pagination", {})
-                
-                # Check if there are more pages
-                if pagination.get("next_page_exist"):
-                    page = pagination.get("next_page")
-                    self.logger.debug(f"Fetching ticket page {page}")
-                else:
-                    break
-            else:
-                break
+        
+        # RepairDesk API returns 'ticketData' not 'data.tickets', with pagination at root level
+        tickets = self._fetch_all_pages(fetch_page, "ticketData", label="tickets")
         
         # Save results to cache file if no filters were applied
         if tickets and not skip_cache:
@@ -789,12 +954,195 @@ class RepairDeskAPI:
         self.logger.info(f"Fetched {len(tickets)} tickets from RepairDesk")
         return tickets
     
+    def get_ticket_sync_state_file(self) -> str:
+        """Get the full path to the ticket sync state (watermark) file.
+        
+        Returns:
+            str: Path to ticket sync state file
+        """
+        return os.path.join(self.get_cache_directory(), TICKET_SYNC_STATE_FILE)
+    
+    def _load_ticket_sync_state(self) -> Dict:
+        """Load the persisted delta-sync state for the current store.
+        
+        Returns:
+            Dictionary with 'watermark' and 'last_full_sync' keys (empty if none)
+        """
+        state_file = self.get_ticket_sync_state_file()
+        if not os.path.exists(state_file):
+            return {}
+        
+        try:
+            all_states = read_cache_file(state_file)
+            return all_states.get(self.store_slug or 'default', {})
+        except Exception as e:
+            self.logger.warning(f"Failed to load ticket sync state: {e}")
+            return {}
+    
+    def _save_ticket_sync_state(self, state: Dict) -> None:
+        """Persist the delta-sync state for the current store.
+        
+        Args:
+            state: Dictionary with 'watermark' and 'last_full_sync' keys
+        """
+        state_file = self.get_ticket_sync_state_file()
+        
+        try:
+            all_states = read_cache_file(state_file, default={})
+            
+            all_states[self.store_slug or 'default'] = state
+            
+            write_cache_file(state_file, all_states)
+        except Exception as e:
+            self.logger.error(f"Failed to save ticket sync state: {e}")
+    
+    def _ticket_cache_signature(self) -> Optional[Tuple[int, int, int]]:
+        """Get the (inode, mtime, size) of the ticket cache file, or None if it is missing."""
+        try:
+            stat = os.stat(self.get_ticket_cache_file())
+        except OSError:
+            return None
+        return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+    
+    def _load_synced_tickets(self) -> Optional[List[Dict]]:
+        """Get the cached tickets for a delta sync, parsing the file only if it changed.
+        
+        The list the last sync read or wrote is kept in memory, so polling with
+        no changes costs a stat() instead of parsing the whole cache file.
+        """
+        signature = self._ticket_cache_signature()
+        if signature is None:
+            return None
+        if self._synced_tickets is not None and self._synced_tickets[0] == signature:
+            return self._synced_tickets[1]
+        
+        tickets = self.load_ticket_cache(max_cache_age_minutes=None)
+        self._synced_tickets = (signature, tickets) if tickets is not None else None
+        return tickets
+    
+    def sync_tickets(self, full: bool = False) -> List[Dict]:
+        """Bring the local ticket cache up to date and return all cached tickets.
+        
+        Uses a per-store last-modified watermark so that only tickets changed
+        since the previous sync are downloaded. Tickets are requested sorted by
+        update time, newest first, and paging stops at the first ticket updated
+        before the watermark. The date_from filter is not used, since it matches
+        creation dates and would miss status changes on older tickets. Changed
+        tickets are then merged into the cached ticket list by ID, so unchanged
+        (e.g. closed) tickets are never re-downloaded. Tickets without an update
+        stamp are skipped here and picked up by the full sync, which runs when
+        there is no cache or watermark yet, when ``full`` is True, or every
+        TICKET_FULL_SYNC_INTERVAL_HOURS to pick up deleted tickets. Paging also
+        stops at the first page without a changed ticket, so unstamped tickets
+        never make the sync walk the whole list.
+        
+        The merged list is kept in memory and the cache file is only parsed
+        again if something else rewrote it, so a sync without changes does not
+        read or write the file. The returned list is shared and read-only.
+        
+        Args:
+            full: Force a full resync instead of a delta sync
+            
+        Returns:
+            List of all ticket dictionaries after the merge
+        """
+        state = self._load_ticket_sync_state()
+        watermark = state.get('watermark')
+        last_full_sync = state.get('last_full_sync', 0)
+        cached_tickets = self._load_synced_tickets()
+        
+        full_sync_due = time.time() - last_full_sync > TICKET_FULL_SYNC_INTERVAL_HOURS * 3600
+        if full or full_sync_due or watermark is None or cached_tickets is None:
+            self.logger.info("Running full ticket sync")
+            tickets = self.get_all_tickets(use_cache=False)
+            if tickets:
+                timestamps = [ts for ts in map(ticket_updated_timestamp, tickets) if ts]
+                self._save_ticket_sync_state({
+                    'watermark': max(timestamps) if timestamps else time.time(),
+                    'last_full_sync': time.time()
+                })
+            return tickets
+        
+        since = watermark - TICKET_SYNC_OVERLAP_SECONDS
+        self.logger.info(f"Running delta ticket sync for changes since "
+                         f"{datetime.fromtimestamp(since).isoformat()}")
+        
+        changed = []
+        page = 1
+        reached_watermark = False
+        while not reached_watermark:
+            response = self.get_tickets(page=page, sort_by='last_updated', sort_order='desc')
+            if not response or not isinstance(response, dict):
+                break
+            
+            page_changed = False
+            for ticket in response.get("ticketData", []):
+                updated_ts = ticket_updated_timestamp(ticket)
+                if updated_ts is None:
+                    # Unstamped tickets can't be compared; the full sync covers them
+                    continue
+                if updated_ts > since:
+                    changed.append(ticket)
+                    page_changed = True
+                else:
+                    # Results are newest first, so everything after this is unchanged
+                    reached_watermark = True
+                    break
+            
+            if not page_changed:
+                # Nothing on this page is newer than the watermark, so neither is the next
+                break
+            
+            pagination = response.get("pagination", {}) or {}
+            if not pagination.get("next_page_exist"):
+                break
+            page = pagination.get("next_page")
+        
+        if not changed:
+            self.logger.info("Delta ticket sync: no changes")
+            return cached_tickets
+        
+        with _ticket_cache_lock:
+            # A patch or another save may have replaced the cache while we were paging
+            current = self._load_synced_tickets()
+            if current is not None:
+                cached_tickets = current
+            
+            # Merge changed tickets into the cached list by internal ID
+            merged = list(cached_tickets)
+            positions = {}
+            for index, ticket in enumerate(merged):
+                ticket_id = ticket.get('summary', {}).get('id')
+                if ticket_id is not None:
+                    positions[str(ticket_id)] = index
+            
+            new_tickets = {}
+            for ticket in changed:
+                ticket_id = str(ticket.get('summary', {}).get('id'))
+                if ticket_id in positions:
+                    merged[positions[ticket_id]] = ticket
+                else:
+                    new_tickets[ticket_id] = ticket
+            merged = list(new_tickets.values()) + merged
+            
+            self.save_ticket_cache(merged, detail_items=changed)
+            signature = self._ticket_cache_signature()
+            self._synced_tickets = (signature, merged) if signature is not None else None
+        
+        timestamps = [ts for ts in map(ticket_updated_timestamp, changed) if ts]
+        state['watermark'] = max([watermark] + timestamps)
+        self._save_ticket_sync_state(state)
+        
+        self.logger.info(f"Delta ticket sync: {len(changed)} changed, {len(new_tickets)} new")
+        return merged
+    
     def get_numeric_ticket_id(self, ticket_number: Union[str, int]) -> Optional[int]:
         """Get the internal RepairDesk numeric ID from a ticket number.
         
         The RepairDesk API uses internal numeric IDs that are different from the
         visible ticket numbers (like T-12353). This method looks up the correct
-        internal ID by checking the local cache first, then falling back to API calls.
+        internal ID in the persistent ticket ID index first, then falls back to API
+        calls (which also update the index).
         
         Args:
             ticket_number: Ticket number, with or without T- prefix (e.g. T-12353 or 12353)
@@ -802,60 +1150,31 @@ class RepairDeskAPI:
         Returns:
             The internal RepairDesk numeric ID if found, None otherwise
         """
-        # Normalize the ticket number format
-        if isinstance(ticket_number, str):
-            ticket_str = ticket_number.strip()
-            if ticket_str.startswith('T-'):
-                display_number = ticket_str
-                numeric_part = ticket_str[2:]  # Remove 'T-' prefix
-            else:
-                numeric_part = ticket_str
-                display_number = f"T-{numeric_part}"
-        else:
-            numeric_part = str(ticket_number)
-            display_number = f"T-{numeric_part}"
+        index = get_ticket_id_index()
+        display_number = normalize_order_id(ticket_number)
+        if not display_number:
+            return None
         
-        self.logger.info(f"Looking up internal ID for ticket {display_number}")
+        # STEP 1: Constant-time lookup in the persistent ticket ID index
+        internal_id = index.lookup(display_number)
+        if internal_id:
+            self.logger.debug(f"Found internal ID {internal_id} for {display_number} in index")
+            return internal_id
         
-        # STEP 1: First try to find the ticket in the local cache
-        try:
-            # Try to find cache file in common locations
-            # Use the centralized cache directory
-            cache_path = self.get_ticket_cache_path()
-            cache_paths = [cache_path]  # Only use our centralized cache path now
-            
-            for cache_path in cache_paths:
-                if os.path.exists(cache_path):
-                    self.logger.info(f"Found ticket cache at {cache_path}")
-                    with open(cache_path, 'r') as f:
-                        tickets = json.load(f)
-                    
-                    # Look for matching ticket by order_id
-                    for ticket in tickets:
-                        if ticket.get('summary', {}).get('order_id') == display_number:
-                            internal_id = ticket.get('summary', {}).get('id')
-                            if internal_id:
-                                self.logger.info(f"Found internal ID {internal_id} for {display_number} in cache")
-                                return internal_id
-                    
-                    self.logger.info(f"Ticket {display_number} not found in cache")
-                    break  # Only check one cache file if found
-        except Exception as e:
-            self.logger.warning(f"Error checking ticket cache: {e}")
+        self.logger.info(f"Ticket {display_number} not indexed, looking it up via API")
         
-        # STEP 2: If not in cache, try direct API lookup first
+        # STEP 2: Check the newest tickets, which is where unindexed tickets usually are
         try:
             tickets_response = self.get_tickets(page=1)
-            
-            if 'data' in tickets_response and 'ticketData' in tickets_response['data']:
-                tickets = tickets_response['data']['ticketData']
-                
-                for ticket in tickets:
-                    if ticket.get('summary', {}).get('order_id') == display_number:
-                        internal_id = ticket.get('summary', {}).get('id')
-                        if internal_id:
-                            self.logger.info(f"Found internal ID {internal_id} for {display_number} via API")
-                            return internal_id
+            tickets = []
+            if isinstance(tickets_response, dict):
+                tickets = tickets_response.get('ticketData', [])
+            index.update(tickets)
+            
+            internal_id = index.lookup(display_number)
+            if internal_id:
+                self.logger.info(f"Found internal ID {internal_id} for {display_number} via API")
+                return internal_id
         except Exception as e:
             self.logger.warning(f"Error in API lookup: {e}")
         
@@ -863,16 +1182,13 @@ class RepairDeskAPI:
         try:
             all_tickets = self.get_all_tickets()
             if all_tickets:
-                for ticket in all_tickets:
-                    if ticket.get('summary', {}).get('order_id') == display_number:
-                        internal_id = ticket.get('summary', {}).get('id')
-                        if internal_id:
-                            self.logger.info(f"Found internal ID {internal_id} for {display_number} via get_all_tickets")
-                            
-                            # Save to cache for future use
-                            self._update_ticket_cache(all_tickets)
-                            
-                            return internal_id
+                index.update(all_tickets)
+                
+                internal_id = index.lookup(display_number)
+                if internal_id:
+                    self.logger.info(f"Found internal ID {internal_id} for {display_number} "
+                                     f"via get_all_tickets")
+                    return internal_id
         except Exception as e:
             self.logger.error(f"Error in get_all_tickets: {e}")
         
@@ -943,11 +1259,16 @@ class RepairDeskAPI:
             
         self.logger.info(f"Searching for ticket with order ID: {order_id}")
         
+        ticket_id = get_ticket_id_index().lookup(order_id)
+        if ticket_id:
+            return self.get_ticket(ticket_id)
+        
         # Get first page of tickets
         response = self.request("tickets", params={"page": 1, "limit": 100})
         
         # Search for matching ticket
         tickets = response.get("ticketData", [])
+        get_ticket_id_index().update(tickets)
         for ticket in tickets:
             if ticket.get("summary", {}).get("order_id") == order_id:
                 ticket_id = ticket.get("summary", {}).get("id")
@@ -1049,10 +1370,47 @@ class RepairDeskAPI:
                 raise ValueError(f"Could not find internal ID for ticket {ticket_id}")
             ticket_id = internal_id
             
+        return self._update_ticket(ticket_id, ticket_data, TICKET_UPDATED)
+    
+    def _update_ticket(self, ticket_id: Union[str, int], ticket_data: Dict, kind: str) -> Dict:
+        """Send a ticket update and publish it as a mutation of the given kind."""
         response = self.request(f"tickets/{ticket_id}", method="PUT", data=ticket_data)
-        self._clear_cache("GET:tickets")
+        self._after_ticket_mutation(kind, ticket_id, ticket_data)
         return response
     
+    def _after_ticket_mutation(self, kind: str, ticket_id: Union[str, int],
+                               changes: Optional[Dict] = None) -> None:
+        """Propagate a ticket mutation to every cache and view instead of forcing a resync.
+        
+        Fetches the updated ticket once, patches it into the ticket cache file
+        and publishes it on the ticket event bus. Subscribers drop cached
+        responses and stored details and patch the local store, NestBot and open
+        ticket views. If the fetch fails, the mutation is published without
+        the ticket and subscribers drop their copies instead.
+        
+        Args:
+            kind: Mutation kind (see nest.utils.ticket_events)
+            ticket_id: Internal ticket ID
+            changes: Fields sent to the API
+        """
+        ticket = None
+        try:
+            fresh = self.request(f"tickets/{ticket_id}")
+            if isinstance(fresh, dict) and isinstance(fresh.get('summary'), dict):
+                ticket = fresh
+                self.patch_ticket_cache(ticket)
+        except Exception as e:
+            self.logger.warning(f"Could not fetch ticket {ticket_id} after {kind}: {e}")
+        
+        try:
+            numeric_id = int(ticket_id)
+        except (TypeError, ValueError):
+            numeric_id = None
+        try:
+            publish_ticket_mutation(kind, ticket_id=numeric_id, changes=changes, ticket=ticket)
+        except Exception as e:
+            self.logger.error(f"Failed to publish ticket mutation for {ticket_id}: {e}")
+    
     def change_ticket_status(self, ticket_id: Union[str, int], status_id: Union[str, int]) -> Dict:
         """Change the status of a ticket.
         
@@ -1071,7 +1429,7 @@ class RepairDeskAPI:
             ticket_id = internal_id
             
         data = {"status_id": status_id}
-        return self.update_ticket(ticket_id, data)
+        return self._update_ticket(ticket_id, data, TICKET_STATUS_CHANGED)
     
     def assign_technician(self, ticket_id: Union[str, int], technician_id: Union[str, int]) -> Dict:
         """Assign a technician to a ticket.
@@ -1091,7 +1449,7 @@ class RepairDeskAPI:
             ticket_id = internal_id
             
         data = {"technician_id": technician_id}
-        return self.update_ticket(ticket_id, data)
+        return self._update_ticket(ticket_id, data, TICKET_ASSIGNED)
     
     def add_ticket_note(self, ticket_id: Union[str, int], note: str, is_private: bool = False) -> Dict:
         """Add a note to a ticket using the older endpoint (legacy support).
@@ -1115,7 +1473,9 @@ class RepairDeskAPI:
             "note": note,
             "is_private": is_private
         }
-        return self.request(f"tickets/{ticket_id}/notes", method="POST", data=data)
+        response = self.request(f"tickets/{ticket_id}/notes", method="POST", data=data)
+        self._after_ticket_mutation(TICKET_NOTE_ADDED, ticket_id)
+        return response
     
     def add_diagnostic_note(self, ticket_id: Union[str, int], note: str, is_flag: int = 0) -> Dict:
         """Add a diagnostic note to a ticket using the new official API endpoint.
@@ -1161,7 +1521,9 @@ class RepairDeskAPI:
         }
         
         self.logger.info(f"Adding diagnostic note to RepairDesk ticket ID: {numeric_id}")
-        return self.request("ticket/addnote", method="POST", data=data)
+        response = self.request("ticket/addnote", method="POST", data=data)
+        self._after_ticket_mutation(TICKET_NOTE_ADDED, numeric_id)
+        return response
     
     def add_attachment(self, ticket_id: Union[str, int], 
                      file_path: str = None, 
@@ -1204,7 +1566,9 @@ class RepairDeskAPI:
         else:
             raise ValueError("Either file_path or file_content must be provided")
             
-        return self.request(f"tickets/{ticket_id}/attachments", method="POST", files=files)
+        response = self.request(f"tickets/{ticket_id}/attachments", method="POST", files=files)
+        self._after_ticket_mutation(TICKET_ATTACHMENT_ADDED, ticket_id)
+        return response
     
     def get_ticket_attachments(self, ticket_id: Union[str, int]) -> List[Dict]:
         """Get all attachments for a ticket.
@@ -1374,10 +1738,12 @@ class RepairDeskAPI:
         }
         
         try:
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, indent=2)
+            write_cache_file(cache_file, cache_data)
             
             self.logger.info(f"Saved {len(items)} inventory items to cache file: {cache_file}")
+            
+            # Mirror into the indexed local store so modules can query by SKU or category
+            get_local_store().upsert_inventory(items, replace=True)
         except Exception as e:
             self.logger.error(f"Failed to save inventory cache: {e}")
             
@@ -1418,18 +1784,18 @@ class RepairDeskAPI:
                 'count': len(items)
             }
             
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, indent=2)
+            write_cache_file(cache_file, cache_data)
                 
             self.logger.info(f"Saved {len(items)} customer IDs (sanitized) to cache file")
         except Exception as e:
             self.logger.error(f"Failed to save sanitized customer cache: {e}")
             
-    def save_ticket_cache(self, items: List[Dict]) -> None:
+    def save_ticket_cache(self, items: List[Dict], detail_items: List[Dict] = None) -> None:
         """Save ticket data to cache file.
         
         Args:
             items: List of ticket items to cache
+            detail_items: Tickets to refresh detail files for (defaults to all items)
         """
         cache_file = self.get_ticket_cache_file()
         
@@ -1441,22 +1807,35 @@ class RepairDeskAPI:
         }
         
         try:
-            with open(cache_file, 'w', encoding='utf-8') as f:
-                json.dump(cache_data, f, indent=2)
+            with _ticket_cache_lock:
+                write_cache_file(cache_file, cache_data)
             
             self.logger.info(f"Saved {len(items)} tickets to cache file: {cache_file}")
             
+            # Keep ticket number lookups, search and the indexed local store in sync with
+            # the cache; a delta sync only upserts the tickets that changed
+            get_ticket_id_index().update(items)
+            get_ticket_search_index().update(items if detail_items is None else detail_items)
+            store = get_local_store()
+            if detail_items is None or store.last_synced('tickets') is None:
+                store.upsert_tickets(items, replace=True)
+            else:
+                store.upsert_tickets(detail_items)
+            
             # After successfully saving the cache, create individual ticket detail files
-            self._create_ticket_detail_files(items)
+            self._create_ticket_detail_files(items if detail_items is None else detail_items)
         except Exception as e:
             self.logger.error(f"Failed to save ticket cache: {e}")
             
     def _create_ticket_detail_files(self, tickets: List[Dict]) -> None:
-        """Create individual ticket detail JSON files for each ticket.
+        """Queue ticket details for background prefetch.
         
-        This function fetches detailed ticket information from the API for each ticket
-        and saves it to individual files named ticket_detail_T-XXXXX.json in the cache directory.
-        It uses the ticket ID instead of order_id for the API call.
+        Detailed ticket information and notes are fetched by the shared
+        TicketDetailPrefetcher worker pool and saved to the ticket detail
+        store under the ticket's T-XXXXX number. Tickets
+        assigned to the logged-in technician are fetched first, then the
+        newest. This returns immediately so the sync path never waits on
+        detail fetches or cache writes.
         
         Args:
             tickets: List of tickets to create detail files for
@@ -1469,88 +1848,25 @@ class RepairDeskAPI:
             self.logger.error("API key is missing, cannot create ticket detail files")
             return
         
-        # Create ticket data directory if it doesn't exist
-        from nest.utils.cache_utils import get_ticket_detail_directory
-        cache_dir = get_ticket_detail_directory()
-        
-        # Sort tickets by created_date (newest first) and limit to 50 most recent
+        from .ticket_prefetch import get_ticket_prefetcher
         try:
-            sorted_tickets = sorted(tickets, key=lambda x: int(x.get('summary', {}).get('created_date', 0) or 0), reverse=True)[:50]
-            self.logger.info(f"Creating ticket detail files for {len(sorted_tickets)} recent tickets")
+            get_ticket_prefetcher(self).schedule(tickets, technician=self._get_current_technician())
         except Exception as e:
-            self.logger.error(f"Error sorting tickets: {e}")
-            sorted_tickets = tickets[:50]  # Fallback to first 50 tickets without sorting
-        
-        success_count = 0
-        error_count = 0
-        
-        # Process each ticket and create its detail file
-        for ticket in sorted_tickets:
-            try:
-                # Extract the ticket ID and order ID
-                ticket_summary = ticket.get('summary', {})
-                ticket_id = ticket_summary.get('id')
-                order_id = ticket_summary.get('order_id')
-                
-                if not ticket_id or not order_id:
-                    self.logger.warning(f"Skipping ticket with missing ID or order_id: ID={ticket_id}, order_id={order_id}")
-                    error_count += 1
-                    continue
-                    
-                # Check if the detail file was updated in the last 24 hours
-                file_path = os.path.join(cache_dir, f"ticket_detail_{order_id}.json")
-                if os.path.exists(file_path):
-                    file_stat = os.stat(file_path)
-                    file_age_hours = (time.time() - file_stat.st_mtime) / 3600
-                    
-                    if file_age_hours < 24:
-                        self.logger.debug(f"Skipping recent ticket detail file: {order_id} (age: {file_age_hours:.1f} hours)")
-                        continue
-                
-                # Directly construct URL and make request rather than using self.request
-                # to ensure we have visibility into any errors
-                url = f"{self.base_url}/tickets/{ticket_id}?api_key={self.api_key}"
-                self.logger.debug(f"Fetching ticket details from URL: {url}")
-                
-                response = requests.get(url)
-                response.raise_for_status()  # Raise exception for non-200 responses
-                data = response.json()
-                
-                # Verify we got a valid response
-                if not data or not isinstance(data, dict) or data.get('success') is False:
-                    error_msg = data.get('message', 'Unknown error') if isinstance(data, dict) else 'Invalid response format'
-                    self.logger.warning(f"Failed to get details for ticket {order_id}: {error_msg}")
-                    error_count += 1
-                    continue
-                
-                # ENHANCEMENT: Also fetch ticket notes/comments for richer AI analysis
-                try:
-                    notes_data = self.get_ticket_notes(ticket_id)
-                    if notes_data:
-                        # Add the notes/comments to the ticket data
-                        data['notes'] = notes_data
-                        self.logger.debug(f"Added {len(notes_data)} notes/comments to ticket {order_id}")
-                    else:
-                        data['notes'] = []
-                except Exception as e:
-                    self.logger.warning(f"Could not fetch notes for ticket {order_id}: {e}")
-                    data['notes'] = []
-                
-                # Save the detailed information with notes to a file
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    json.dump(data, f, indent=2)
-                
-                success_count += 1
-                self.logger.debug(f"Successfully saved ticket detail file: {file_path}")
-                
-            except requests.exceptions.RequestException as e:
-                self.logger.error(f"API request error for ticket ID {ticket_id}: {e}")
-                error_count += 1
-            except Exception as e:
-                self.logger.error(f"Unexpected error creating ticket detail file for {ticket_id}: {e}")
-                error_count += 1
+            self.logger.error(f"Failed to schedule ticket detail prefetch: {e}")
+    
+    def _get_current_technician(self) -> Optional[str]:
+        """Get the full name of the logged-in technician from config, if any."""
+        config_path = self._find_config_file()
+        if not config_path or not os.path.exists(config_path):
+            return None
         
-        self.logger.info(f"Finished creating ticket detail files: {success_count} successes, {error_count} failures")
+        try:
+            with open(config_path, 'r') as f:
+                config = json.load(f)
+            return config.get('current_user', {}).get('name')
+        except Exception as e:
+            self.logger.debug(f"Could not read current technician from config: {e}")
+            return None
 
     
     def load_inventory_cache(self, max_cache_age_minutes: int = 15) -> Optional[List[Dict]]:
@@ -1569,8 +1885,7 @@ class RepairDeskAPI:
             return None
         
         try:
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                cache_data = json.load(f)
+            cache_data = read_cache_file(cache_file)
             
             # Parse timestamp and check cache age
             timestamp = datetime.fromisoformat(cache_data['timestamp'])
@@ -1611,8 +1926,7 @@ class RepairDeskAPI:
         cache_file = self.get_customer_cache_file()
         if os.path.exists(cache_file):
             try:
-                with open(cache_file, 'r', encoding='utf-8') as f:
-                    cache_data = json.load(f)
+                cache_data = read_cache_file(cache_file)
                 self.logger.info(f"Found sanitized customer cache with {cache_data.get('count', 0)} IDs")
             except Exception as e:
                 self.logger.error(f"Error checking sanitized customer cache: {e}")
@@ -1620,11 +1934,12 @@ class RepairDeskAPI:
         # Always return None to force API fetch for actual customer data
         return None
             
-    def load_ticket_cache(self, max_cache_age_minutes: int = 15) -> Optional[List[Dict]]:
+    def load_ticket_cache(self, max_cache_age_minutes: Optional[int] = 15) -> Optional[List[Dict]]:
         """Load ticket data from cache file if available and not expired.
         
         Args:
-            max_cache_age_minutes: Maximum age of cache in minutes before considered expired
+            max_cache_age_minutes: Maximum age of cache in minutes before considered expired,
+                or None to accept a cache of any age
             
         Returns:
             List of tickets if valid cache exists, None otherwise
@@ -1636,15 +1951,18 @@ class RepairDeskAPI:
             return None
         
         try:
-            with open(cache_file, 'r', encoding='utf-8') as f:
-                cache_data = json.load(f)
-            
-            # Parse timestamp and check cache age
-            timestamp = datetime.fromisoformat(cache_data['timestamp'])
-            cache_age = (datetime.now() - timestamp).total_seconds() / 60
+            cache_data = read_cache_file(cache_file)
             
-            if cache_age < max_cache_age_minutes:
+            # Older versions wrote the bare ticket list; use the file time for those
+            if isinstance(cache_data, list):
+                items = cache_data
+                cached_at = datetime.fromtimestamp(os.path.getmtime(cache_file))
+            else:
                 items = cache_data['items']
+                cached_at = datetime.fromisoformat(cache_data['timestamp'])
+            cache_age = (datetime.now() - cached_at).total_seconds() / 60
+            
+            if max_cache_age_minutes is None or cache_age < max_cache_age_minutes:
                 self.logger.info(f"Loaded {len(items)} tickets from cache ({cache_age:.1f} minutes old)")
                 return items
             else:
@@ -1655,6 +1973,87 @@ class RepairDeskAPI:
             self.logger.error(f"Failed to load ticket cache: {e}")
             return None
     
+    def patch_ticket_cache(self, ticket: Dict) -> bool:
+        """Replace one ticket in the ticket cache file, keeping the cache timestamp.
+        
+        Args:
+            ticket: Updated raw ticket
+            
+        Returns:
+            True if the cache file was updated
+        """
+        ticket_id = ticket.get('summary', {}).get('id')
+        cache_file = self.get_ticket_cache_file()
+        try:
+            # Hold the cache lock so an overlapping save or delta merge can't drop this patch
+            with _ticket_cache_lock:
+                cache_data = read_cache_file(cache_file)
+                items = cache_data.get('items') if isinstance(cache_data, dict) else cache_data
+                if not ticket_id or not isinstance(items, list):
+                    return False
+                
+                for index, item in enumerate(items):
+                    if isinstance(item, dict) and item.get('summary', {}).get('id') == ticket_id:
+                        items[index] = ticket
+                        break
+                else:
+                    items.insert(0, ticket)
+                write_cache_file(cache_file, cache_data)
+            return True
+        except Exception as e:
+            self.logger.warning(f"Could not patch ticket cache: {e}")
+            return False
+    
+    def load_ticket_cache_snapshot(self, lazy: bool = False,
+                                   **filters) -> Optional[Tuple[Sequence[Dict], float]]:
+        """Load the cached tickets regardless of age, for stale-while-revalidate views.
+        
+        Args:
+            lazy: Return a LazyTicketList read from the local store's summary
+                columns, so the first view only parses the ticket bodies it shows.
+                Falls back to the cache file if the store has not been synced yet.
+            **filters: Filters accepted by LocalStore.ticket_summaries (status,
+                assigned_to, ...). Only applied to the lazy view; the cache file
+                is returned whole.
+        
+        Returns:
+            Tuple of (tickets, cache age in seconds), or None if there is no cache
+        """
+        if lazy:
+            snapshot = self._load_lazy_ticket_snapshot(**filters)
+            if snapshot is not None:
+                return snapshot
+        
+        cache_file = self.get_ticket_cache_file()
+        try:
+            cache_data = read_cache_file(cache_file)
+            if cache_data is None:
+                return None
+            
+            # Some modules write the bare ticket list; use the file time for those
+            if isinstance(cache_data, dict):
+                items = cache_data.get('items') or []
+                cached_at = datetime.fromisoformat(cache_data['timestamp']).timestamp()
+            else:
+                items = cache_data
+                cached_at = os.path.getmtime(cache_file)
+            return items, max(0.0, time.time() - cached_at)
+        except Exception as e:
+            self.logger.warning(f"Could not read ticket cache snapshot: {e}")
+            return None
+    
+    def _load_lazy_ticket_snapshot(self, **filters) -> Optional[Tuple[LazyTicketList, float]]:
+        """Open a lazy view of the local ticket store with its age, if it has been synced."""
+        try:
+            store = get_local_store()
+            synced_at = store.last_synced('tickets')
+            if synced_at is None:
+                return None
+            return LazyTicketList.from_store(store, **filters), max(0.0, time.time() - synced_at)
+        except Exception as e:
+            self.logger.warning(f"Could not open local ticket store, using cache file: {e}")
+            return None
+    
     def get_all_inventory(self, use_cache=True, max_cache_age_minutes=15, page_callback=None) -> List[Dict]:
         """Fetch all inventory items using pagination.
         
@@ -1680,40 +2079,10 @@ class RepairDeskAPI:
         
         # If no valid cache or cache disabled, fetch from API
         self.logger.info("Fetching all inventory items from RepairDesk (this may take some time)")
-        page = 1
-        items = []
         
-        while True:
-            response = self.get_inventory(page)
-            
-            if not response or not isinstance(response, dict):
-                break
-            
-            # The API response key is 'inventoryListData' not 'inventoryData'    
-            current_page = response.get("inventoryListData", [])
-            if not current_page:
-                break
-                
-            items.extend(current_page)
-            
-            # Get pagination info
-            pagination = response.get("pagination", {})
-            is_complete = not pagination.get("next_page_exist", False)
-            
-            # Call the callback with the current page data if provided
-            if page_callback:
-                pagination_info = {
-                    "current_page": page,
-                    "total_pages": pagination.get("total_pages", 1) if pagination else 1
-                }
-                page_callback(current_page, is_complete, len(items), pagination_info)
-            
-            # Check if there are more pages
-            if is_complete:
-                break
-            else:
-                page = pagination.get("next_page")
-                self.logger.debug(f"Fetching inventory page {page}")
+        # The API response key is 'inventoryListData' not 'inventoryData'
+        items = self._fetch_all_pages(self.get_inventory, "inventoryListData",
+                                     page_callback=page_callback, label="inventory")
         
         # Save results to cache file
         if items:
@@ -1868,28 +2237,7 @@ class RepairDeskAPI:
             List of supplier dictionaries
         """
         self.logger.info("Fetching all suppliers from RepairDesk")
-        page = 1
-        suppliers = []
-        
-        while True:
-            response = self.get_suppliers(page)
-            
-            if not response or not isinstance(response, dict):
-                break
-                
-            current_page = response.get("supplierData", [])
-            if not current_page:
-                break
-                
-            suppliers.extend(current_page)
-            
-            # Check pagination
-            pagination = response.get("pagination", {})
-            if pagination.get("next_page_exist"):
-                page = pagination.get("next_page")
-                self.logger.debug(f"Fetching supplier page {page}")
-            else:
-                break
+        suppliers = self._fetch_all_pages(self.get_suppliers, "supplierData", label="suppliers")
                 
         self.logger.info(f"Fetched {len(suppliers)} suppliers from RepairDesk")
         return suppliers
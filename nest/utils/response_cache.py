@@ -0,0 +1,308 @@
+"""
+Bounded in-memory cache for API responses.
+
+Entries are kept in least-recently-used order and the cache is bounded by
+the approximate serialized size of the cached payloads, so long-running
+sessions cannot grow without limit. Each endpoint gets its own time to live:
+static reference data (repair statuses, device types, tax rates) is kept for
+hours while ticket pages expire after a few minutes. Expired entries are
+evicted when they are seen, not just skipped.
+
+The cache also registers with the global cache manager, which may evict its
+least recently used entries to keep all in-process caches within one budget.
+"""
+
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+from nest.utils.cache_manager import get_cache_manager, next_access_tick
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 32 * 1024 * 1024  # 32 MB of cached payloads
+DEFAULT_TTL = 300  # 5 minutes for endpoints without a policy
+
+STATIC_DATA_TTL = 6 * 3600  # Reference data that rarely changes
+EMPLOYEE_TTL = 3600  # 1 hour
+TICKET_LIST_TTL = 90  # 1.5 minutes for ticket pages
+TICKET_DETAIL_TTL = 180  # 3 minutes for single tickets
+
+# Time to live per endpoint in seconds. A policy applies to the endpoint itself
+# and to everything below it ("employees" also covers "employees/12"); the
+# longest matching policy wins.
+DEFAULT_TTL_POLICIES: Dict[str, float] = {
+    "store/info": STATIC_DATA_TTL,
+    "store/settings": STATIC_DATA_TTL,
+    "taxes": STATIC_DATA_TTL,
+    "roles": STATIC_DATA_TTL,
+    "repair/statuses": STATIC_DATA_TTL,
+    "repair/types": STATIC_DATA_TTL,
+    "devices": STATIC_DATA_TTL,
+    "inventory/categories": STATIC_DATA_TTL,
+    "inventory/types": STATIC_DATA_TTL,
+    "employees": EMPLOYEE_TTL,
+    "tickets": TICKET_LIST_TTL,
+    "tickets/": TICKET_DETAIL_TTL,
+}
+
+
+SIZE_SAMPLE_ITEMS = 16  # List items measured per list when estimating payload sizes
+
+
+def estimate_size(value: Any) -> int:
+    """Approximate the memory held by a cached payload in bytes.
+
+    Tracks the length of the payload's compact JSON encoding without building
+    it: long lists are estimated from an even sample of their items, so the
+    cost stays bounded for large pages of tickets or customers.
+    """
+    if isinstance(value, str):
+        return len(value) + 2
+    if isinstance(value, (bool, int, float)) or value is None:
+        return 8
+    if isinstance(value, dict):
+        return 2 + sum(len(str(key)) + 4 + estimate_size(item) for key, item in value.items())
+    if isinstance(value, (list, tuple)):
+        count = len(value)
+        if count <= SIZE_SAMPLE_ITEMS:
+            return 2 + sum(estimate_size(item) + 1 for item in value)
+        step = count / SIZE_SAMPLE_ITEMS
+        sample = sum(estimate_size(value[int(i * step)]) + 1 for i in range(SIZE_SAMPLE_ITEMS))
+        return 2 + sample * count // SIZE_SAMPLE_ITEMS
+    if isinstance(value, (bytes, bytearray)):
+        return len(value)
+    return sys.getsizeof(value)
+
+
+class ResponseCache:
+    """Thread-safe LRU cache bounded by approximate payload bytes."""
+
+    def __init__(self, max_bytes: int = DEFAULT_MAX_BYTES, default_ttl: float = DEFAULT_TTL,
+                 ttl_policies: Optional[Dict[str, float]] = None, name: str = "api_responses",
+                 manager=None):
+        """Initialize the cache.
+
+        Args:
+            max_bytes: Approximate upper bound for the size of all cached payloads
+            default_ttl: Time to live in seconds for endpoints without a policy
+            ttl_policies: Optional per-endpoint TTL overrides merged over the defaults
+            name: Name shown in cache manager statistics
+            manager: Cache manager to register with (defaults to the global one)
+        """
+        self.name = name
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self.ttl_policies = dict(DEFAULT_TTL_POLICIES)
+        if ttl_policies:
+            self.ttl_policies.update(ttl_policies)
+
+        # key -> (expires_at, size, value, last access tick), least recently used first
+        self._entries: "OrderedDict[str, Tuple[float, int, Any, int]]" = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        self._manager = manager or get_cache_manager()
+        self._manager.register(self)
+
+    def ttl_for(self, endpoint: Optional[str]) -> float:
+        """Get the time to live for an endpoint from the longest matching policy."""
+        if not endpoint:
+            return self.default_ttl
+        endpoint = endpoint.strip('/')
+        best = None
+        for prefix, ttl in self.ttl_policies.items():
+            boundary = prefix if prefix.endswith('/') else prefix + '/'
+            if endpoint == prefix or endpoint.startswith(boundary):
+                if best is None or len(prefix) > len(best[0]):
+                    best = (prefix, ttl)
+        return best[1] if best else self.default_ttl
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        """Get a cached value if present and not expired.
+
+        Returns:
+            Tuple of (found, value)
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+
+            expires_at, size, value, _ = entry
+            if time.time() >= expires_at:
+                self._remove(key)
+                self.expirations += 1
+                self.misses += 1
+                return False, None
+
+            self._entries[key] = (expires_at, size, value, next_access_tick())
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return True, value
+
+    def set(self, key: str, value: Any, endpoint: Optional[str] = None,
+            ttl: Optional[float] = None) -> bool:
+        """Cache a value.
+
+        Args:
+            key: Cache key
+            value: Value to cache (shared by reference with callers)
+            endpoint: Endpoint used to pick the TTL policy
+            ttl: Explicit time to live in seconds, overriding the policy
+
+        Returns:
+            False if the value is larger than the whole cache and was not stored
+        """
+        size = estimate_size(value)
+        if size > self.max_bytes:
+            logger.debug(f"Not caching {key}: {size} bytes exceeds cache size")
+            return False
+
+        expires_at = time.time() + (self.ttl_for(endpoint) if ttl is None else ttl)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (expires_at, size, value, next_access_tick())
+            self._bytes += size
+            if self._bytes > self.max_bytes:
+                self._evict()
+        self._manager.enforce_budget()
+        return True
+
+    def _remove(self, key: str) -> None:
+        """Drop an entry; the caller holds the lock."""
+        _, size, _, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def _evict(self) -> None:
+        """Evict expired entries, then least recently used ones, until under budget."""
+        now = time.time()
+        for key in [k for k, (expires_at, _, _, _) in self._entries.items() if now >= expires_at]:
+            self._remove(key)
+            self.expirations += 1
+
+        while self._bytes > self.max_bytes and self._entries:
+            key = next(iter(self._entries))
+            self._remove(key)
+            self.evictions += 1
+
+    def purge_expired(self) -> int:
+        """Evict all expired entries.
+
+        Returns:
+            Number of entries evicted
+        """
+        now = time.time()
+        with self._lock:
+            expired = [k for k, (expires_at, _, _, _) in self._entries.items() if now >= expires_at]
+            for key in expired:
+                self._remove(key)
+            self.expirations += len(expired)
+        return len(expired)
+
+    def delete(self, key: str) -> bool:
+        """Remove one entry.
+
+        Returns:
+            True if the entry was cached
+        """
+        with self._lock:
+            if key not in self._entries:
+                return False
+            self._remove(key)
+            return True
+
+    def clear(self, prefix: Optional[str] = None) -> int:
+        """Clear all entries or only those whose key starts with a prefix.
+
+        Returns:
+            Number of entries removed
+        """
+        with self._lock:
+            if prefix is None:
+                removed = len(self._entries)
+                self._entries.clear()
+                self._bytes = 0
+                return removed
+            keys = [k for k in self._entries if k.startswith(prefix)]
+            for key in keys:
+                self._remove(key)
+            return len(keys)
+
+    # Cache manager protocol
+
+    def size_bytes(self) -> int:
+        return self._bytes
+
+    def oldest_access(self) -> Optional[int]:
+        """Get the access tick of the least recently used entry, or None if empty."""
+        with self._lock:
+            if not self._entries:
+                return None
+            return next(iter(self._entries.values()))[3]
+
+    def evict_oldest(self) -> int:
+        """Evict the least recently used entry and return the bytes freed."""
+        with self._lock:
+            if not self._entries:
+                return 0
+            key = next(iter(self._entries))
+            size = self._entries[key][1]
+            self._remove(key)
+            self.evictions += 1
+            return size
+
+    def stats(self) -> Dict[str, Any]:
+        """Get hit/miss/eviction counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+            }
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+_response_cache: Optional[ResponseCache] = None
+_response_cache_lock = threading.Lock()
+
+
+def get_response_cache() -> ResponseCache:
+    """Get the process-wide response cache, creating it on first use.
+
+    Size and TTL policies can be set in the "response_cache" section of
+    config.json, e.g. {"max_bytes": 16777216, "ttl": {"tickets": 60}}.
+    """
+    global _response_cache
+    if _response_cache is None:
+        with _response_cache_lock:
+            if _response_cache is None:
+                try:
+                    from nest.utils.config_util import load_config
+                    settings = load_config().get("response_cache", {}) or {}
+                except Exception:
+                    settings = {}
+                _response_cache = ResponseCache(
+                    max_bytes=settings.get("max_bytes", DEFAULT_MAX_BYTES),
+                    default_ttl=settings.get("default_ttl", DEFAULT_TTL),
+                    ttl_policies=settings.get("ttl"),
+                )
+    return _response_cache
@@ -0,0 +1,91 @@
+"""
+Request coalescing for Nest API clients.
+
+When several threads ask for the same resource at the same moment (e.g. the
+dashboard, tickets module and NestBot all loading tickets right after login),
+only the first caller performs the work; the others wait for and share its
+result instead of issuing duplicate network calls.
+
+Callers that must not block, like the Tk main thread, pass may_wait=False:
+they still lead a new flight that others can join, but never wait on one
+started by another thread, whose request may be sleeping in the rate limiter.
+"""
+
+import logging
+import threading
+from typing import Any, Callable, Dict, Hashable, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class _Call:
+    """An in-flight call that waiting callers can block on."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share the same key.
+
+    Results are shared by reference between all callers of one flight, so
+    callers must treat them as read-only.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, func: Callable[[], Any],
+           may_wait: bool = True) -> Tuple[Any, bool]:
+        """Run func once for all concurrent callers using the same key.
+
+        Args:
+            key: Identifies identical calls (e.g. method, endpoint and params)
+            func: Zero-argument callable performing the actual work
+            may_wait: If False and another caller's flight is in progress, run
+                func directly instead of waiting for that flight
+
+        Returns:
+            Tuple of (result, shared) where shared is True if this caller
+            waited on another caller's flight instead of running func
+
+        Raises:
+            Whatever func raised, re-raised in every waiting caller
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader and not may_wait:
+            return func(), False
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result, True
+
+        try:
+            call.result = func()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+        return call.result, False
+
+    def in_flight(self) -> int:
+        """Get the number of calls currently in flight."""
+        with self._lock:
+            return len(self._calls)
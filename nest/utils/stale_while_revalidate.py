@@ -0,0 +1,236 @@
+"""
+Stale-while-revalidate loading with a circuit breaker.
+
+Views that show API data (the dashboard and the ticket list) render the
+cached copy as soon as it is read, with its age, and only then ask the API
+for fresh data. When fresh data arrives it is compared with what is shown
+and the view is told exactly which rows were added, changed or removed, so
+an unchanged refresh costs nothing.
+
+A circuit breaker shared per API stops the revalidation requests while the
+API is failing: after a number of consecutive failures the circuit opens and
+requests are skipped until a cool-down has passed, then a single trial
+request decides whether to close it again.
+"""
+
+import logging
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FAILURE_THRESHOLD = 3  # Consecutive failures before the circuit opens
+DEFAULT_RESET_TIMEOUT = 60  # Seconds before a trial request is let through
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(RuntimeError):
+    """Raised instead of calling an API whose circuit breaker is open."""
+
+
+class CircuitBreaker:
+    """Thread-safe consecutive-failure circuit breaker."""
+
+    def __init__(self, name: str, failure_threshold: int = DEFAULT_FAILURE_THRESHOLD,
+                 reset_timeout: float = DEFAULT_RESET_TIMEOUT):
+        """Initialize the breaker.
+
+        Args:
+            name: Name used in log messages
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds the circuit stays open before a trial request
+        """
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_timeout = reset_timeout
+
+        self._state = STATE_CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self._state == STATE_OPEN and time.time() - self._opened_at >= self.reset_timeout:
+                return STATE_HALF_OPEN
+            return self._state
+
+    def allow_request(self) -> bool:
+        """Check whether a request may be made now.
+
+        While open, returns False until the reset timeout has passed; then a
+        single trial request is allowed through.
+        """
+        with self._lock:
+            if self._state == STATE_CLOSED:
+                return True
+            if time.time() - self._opened_at < self.reset_timeout or self._trial_in_flight:
+                return False
+            self._state = STATE_HALF_OPEN
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != STATE_CLOSED:
+                logger.info(f"Circuit '{self.name}' closed, API is responding again")
+            self._state = STATE_CLOSED
+            self._failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self._failures += 1
+            self._trial_in_flight = False
+            if self._state == STATE_HALF_OPEN or self._failures >= self.failure_threshold:
+                if self._state != STATE_OPEN:
+                    logger.warning(f"Circuit '{self.name}' opened after {self._failures} failures; "
+                                   f"pausing requests for {self.reset_timeout}s")
+                self._state = STATE_OPEN
+                self._opened_at = time.time()
+
+    def seconds_until_retry(self) -> float:
+        """Get the seconds left before a trial request is allowed (0 if closed)."""
+        with self._lock:
+            if self._state == STATE_CLOSED:
+                return 0.0
+            return max(0.0, self.reset_timeout - (time.time() - self._opened_at))
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+_breakers_lock = threading.Lock()
+
+
+def get_circuit_breaker(name: str) -> CircuitBreaker:
+    """Get the shared circuit breaker for an API, creating it on first use.
+
+    Thresholds can be set in the "circuit_breaker" section of config.json,
+    e.g. {"failure_threshold": 5, "reset_timeout": 120}.
+    """
+    with _breakers_lock:
+        breaker = _breakers.get(name)
+        if breaker is None:
+            try:
+                from nest.utils.config_util import load_config
+                settings = load_config().get("circuit_breaker", {}) or {}
+            except Exception:
+                settings = {}
+            breaker = CircuitBreaker(
+                name,
+                failure_threshold=settings.get("failure_threshold", DEFAULT_FAILURE_THRESHOLD),
+                reset_timeout=settings.get("reset_timeout", DEFAULT_RESET_TIMEOUT),
+            )
+            _breakers[name] = breaker
+        return breaker
+
+
+class ItemDiff:
+    """Keys of the rows added, changed and removed between two lists."""
+
+    def __init__(self, added: List[Hashable], changed: List[Hashable], removed: List[Hashable]):
+        self.added = added
+        self.changed = changed
+        self.removed = removed
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.changed or self.removed)
+
+    def __repr__(self) -> str:
+        return f"<ItemDiff +{len(self.added)} ~{len(self.changed)} -{len(self.removed)}>"
+
+
+def diff_items(old: Sequence[Dict], new: Sequence[Dict],
+               key: Callable[[Dict], Hashable]) -> ItemDiff:
+    """Compare two lists of rows by key.
+
+    Args:
+        old: Rows currently shown
+        new: Freshly loaded rows
+        key: Function returning a row's identity (e.g. its ticket number)
+
+    Returns:
+        ItemDiff with the keys of added, changed and removed rows
+    """
+    old_by_key = {key(item): item for item in old}
+    new_by_key = {key(item): item for item in new}
+    added = [k for k in new_by_key if k not in old_by_key]
+    changed = [k for k, item in new_by_key.items() if k in old_by_key and old_by_key[k] != item]
+    removed = [k for k in old_by_key if k not in new_by_key]
+    return ItemDiff(added, changed, removed)
+
+
+def format_age(seconds: Optional[float]) -> str:
+    """Describe the age of cached data, e.g. 'just now' or '12 min ago'."""
+    if seconds is None:
+        return "unknown age"
+    if seconds < 60:
+        return "just now"
+    if seconds < 3600:
+        return f"{int(seconds // 60)} min ago"
+    if seconds < 86400:
+        return f"{seconds / 3600:.1f} h ago"
+    return f"{int(seconds // 86400)} days ago"
+
+
+class StaleWhileRevalidate:
+    """Serve cached data first, then revalidate it through a circuit breaker."""
+
+    def __init__(self, breaker: CircuitBreaker):
+        """Initialize the loader.
+
+        Args:
+            breaker: Circuit breaker guarding the fetch
+        """
+        self.breaker = breaker
+
+    def run(self, read_cached: Callable[[], Optional[Tuple[Any, float]]],
+            fetch: Callable[[], Any],
+            on_stale: Callable[[Any, float], None],
+            on_fresh: Callable[[Any], None],
+            on_error: Callable[[Exception, bool], None],
+            is_valid: Callable[[Any], bool] = bool) -> None:
+        """Serve cached data, then fetch fresh data. Call from a worker thread.
+
+        Args:
+            read_cached: Returns (data, age in seconds), or None if nothing is cached
+            fetch: Loads fresh data from the API
+            on_stale: Called with the cached data and its age before fetching
+            on_fresh: Called with the fresh data
+            on_error: Called with the error and whether stale data was served
+            is_valid: Checks fetched data; invalid data (by default an empty
+                result) counts as a failure when cached data exists, since
+                clients report API errors as empty results
+        """
+        served_stale = False
+        try:
+            snapshot = read_cached()
+        except Exception as e:
+            logger.warning(f"Could not read cached data: {e}")
+            snapshot = None
+        if snapshot is not None and snapshot[0]:
+            data, age = snapshot
+            on_stale(data, age)
+            served_stale = True
+
+        if not self.breaker.allow_request():
+            on_error(CircuitOpenError(f"{self.breaker.name} is unavailable, retrying in "
+                                      f"{self.breaker.seconds_until_retry():.0f}s"), served_stale)
+            return
+
+        try:
+            fresh = fetch()
+            if served_stale and not is_valid(fresh):
+                raise ValueError("API returned no data")
+        except Exception as e:
+            self.breaker.record_failure()
+            on_error(e, served_stale)
+            return
+
+        self.breaker.record_success()
+        on_fresh(fresh)
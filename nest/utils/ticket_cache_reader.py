@@ -0,0 +1,143 @@
+"""
+Lazy, paged view of the cached tickets.
+
+Loading the ticket cache used to mean parsing every cached ticket into a
+dictionary, even when only the first screen of tickets was shown.
+LazyTicketList instead loads the small indexed columns of the local store
+(id, order_id, status, technician and dates) up front and fetches full
+ticket bodies one page at a time as they are accessed. Only a bounded
+number of pages is held in memory, so startup time and resident memory stay
+flat as the ticket history grows.
+
+It behaves like a read-only list of raw tickets: len(), indexing, slicing
+and iteration all work, and to_list() materializes a plain list for code
+that needs to serialize or mutate it.
+"""
+
+import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Sequence
+from typing import Dict, Iterator, List, Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PAGE_SIZE = 50
+DEFAULT_MAX_PAGES = 8  # Pages of full ticket bodies kept in memory
+
+
+class LazyTicketList(Sequence):
+    """Read-only sequence of raw tickets hydrated from the local store on demand."""
+
+    def __init__(self, store, summaries: List[Dict], pinned: Optional[List[Dict]] = None,
+                 page_size: int = DEFAULT_PAGE_SIZE, max_pages: int = DEFAULT_MAX_PAGES):
+        """Initialize the list.
+
+        Args:
+            store: LocalStore the ticket bodies are read from
+            summaries: Ticket summaries from LocalStore.ticket_summaries(), in display order
+            pinned: Raw tickets shown before the stored ones (e.g. a specifically loaded ticket)
+            page_size: Number of ticket bodies fetched per query
+            max_pages: Number of fetched pages kept in memory
+        """
+        self.store = store
+        self.pinned = list(pinned or [])
+        self.page_size = max(1, page_size)
+        self.max_pages = max(1, max_pages)
+
+        pinned_ids = {self._pinned_id(ticket) for ticket in self.pinned} - {None}
+        if pinned_ids:
+            summaries = [s for s in summaries if s['id'] not in pinned_ids]
+        self.summaries = summaries
+
+        self._pages: "OrderedDict[int, List[Dict]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_store(cls, store, pinned: Optional[List[Dict]] = None,
+                   page_size: int = DEFAULT_PAGE_SIZE, max_pages: int = DEFAULT_MAX_PAGES,
+                   **filters) -> "LazyTicketList":
+        """Build a list of the stored tickets matching the given filters, newest first.
+
+        Args:
+            store: LocalStore to read from
+            pinned: Raw tickets shown before the stored ones
+            page_size: Number of ticket bodies fetched per query
+            max_pages: Number of fetched pages kept in memory
+            **filters: Filters accepted by LocalStore.ticket_summaries (status, assigned_to, ...)
+        """
+        return cls(store, store.ticket_summaries(**filters), pinned=pinned,
+                   page_size=page_size, max_pages=max_pages)
+
+    @staticmethod
+    def _pinned_id(ticket: Dict) -> Optional[int]:
+        """Get the internal ID of a pinned ticket, which may be a summary or detail payload."""
+        if not isinstance(ticket, dict):
+            return None
+        ticket_id = (ticket.get('summary') or {}).get('id') or ticket.get('id')
+        try:
+            return int(ticket_id)
+        except (TypeError, ValueError):
+            return None
+
+    def _page(self, page_number: int) -> List[Dict]:
+        """Get one page of full ticket bodies, fetching it if not held in memory."""
+        with self._lock:
+            page = self._pages.get(page_number)
+            if page is not None:
+                self._pages.move_to_end(page_number)
+                return page
+
+        start = page_number * self.page_size
+        summaries = self.summaries[start:start + self.page_size]
+        bodies = self.store.get_tickets_by_id([s['id'] for s in summaries])
+        # A ticket removed by a concurrent full sync keeps its place as a bare summary
+        page = [bodies.get(s['id']) or {'summary': dict(s)} for s in summaries]
+
+        with self._lock:
+            self._pages[page_number] = page
+            while len(self._pages) > self.max_pages:
+                self._pages.popitem(last=False)
+        return page
+
+    def page(self, page_number: int, page_size: Optional[int] = None) -> List[Dict]:
+        """Get a page of tickets, counting pinned tickets as part of the first page.
+
+        Args:
+            page_number: Zero-based page number
+            page_size: Tickets per page (defaults to the list's page size)
+        """
+        size = page_size or self.page_size
+        return self[page_number * size:(page_number + 1) * size]
+
+    def __len__(self) -> int:
+        return len(self.pinned) + len(self.summaries)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("ticket index out of range")
+
+        if index < len(self.pinned):
+            return self.pinned[index]
+        index -= len(self.pinned)
+        return self._page(index // self.page_size)[index % self.page_size]
+
+    def __iter__(self) -> Iterator[Dict]:
+        yield from self.pinned
+        for page_number in range(0, (len(self.summaries) + self.page_size - 1) // self.page_size):
+            yield from self._page(page_number)
+
+    def __bool__(self) -> bool:
+        return len(self) > 0
+
+    def to_list(self) -> List[Dict]:
+        """Hydrate every ticket into a plain list."""
+        return list(self)
+
+    def __repr__(self) -> str:
+        return f"<LazyTicketList {len(self)} tickets, {len(self._pages)} pages loaded>"
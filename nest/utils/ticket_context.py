@@ -21,6 +21,11 @@ except ImportError:
         from utils.repairdesk_api import RepairDeskAPI
     except ImportError:
         logging.error("Could not import RepairDeskAPI")
+
+try:
+    from nest.utils.ticket_index import get_ticket_id_index
+except ImportError:
+    from utils.ticket_index import get_ticket_id_index
         
 # Load config module for API key retrieval
 try:
@@ -127,7 +132,7 @@ class TicketContext:
             
             # First try to get the internal numeric ID (more reliable)
             try:
-                # Use the new get_numeric_ticket_id method to handle the conversion
+                # Resolved from the persistent ticket ID index, falling back to the API
                 numeric_id = self.client.get_numeric_ticket_id(ticket_id)
                 
                 if not numeric_id:
@@ -179,6 +184,8 @@ class TicketContext:
                 # The API documentation shows ticket data has 'summary' section
                 if 'summary' in ticket_content:
                     logging.info(f"Found summary data for ticket {display_id}")
+                    # Remember the ticket number so later lookups resolve from the index
+                    get_ticket_id_index().update([ticket_content])
                 elif isinstance(ticket_content, dict) and len(ticket_content) > 0:
                     # Data exists but not in expected format, try to use it anyway
                     logging.warning(f"Ticket data doesn't have expected structure but contains {len(ticket_content)} keys")
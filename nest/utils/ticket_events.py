@@ -0,0 +1,228 @@
+"""
+Event bus for ticket mutations.
+
+Status changes, notes and attachments change a ticket on the server, while
+several parts of Nest keep their own copy of it: the response cache, the
+local store and ticket cache file, the ticket detail store and search index,
+NestBot's ticket database and the open dashboard and ticket views. Instead
+of a full resync, every mutation publishes a TicketMutation carrying the
+affected ticket's IDs and, when it could be fetched, the updated ticket.
+Each subscriber then patches or drops exactly that ticket.
+
+Subscribers are held by weak reference when they are bound methods, so a
+destroyed view never keeps receiving events.
+"""
+
+import itertools
+import logging
+import threading
+import weakref
+from typing import Any, Callable, Dict, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Mutation kinds
+TICKET_UPDATED = "updated"
+TICKET_STATUS_CHANGED = "status_changed"
+TICKET_ASSIGNED = "assigned"
+TICKET_NOTE_ADDED = "note_added"
+TICKET_ATTACHMENT_ADDED = "attachment_added"
+
+
+class TicketMutation:
+    """A change made to one ticket on the server."""
+
+    def __init__(self, kind: str, ticket_id: Optional[int] = None, order_id: Optional[str] = None,
+                 changes: Optional[Dict] = None, ticket: Optional[Dict] = None):
+        """Initialize the event.
+
+        Args:
+            kind: One of the TICKET_* mutation kinds
+            ticket_id: Internal RepairDesk ID, if known
+            order_id: Ticket number (T-XXXXX), if known
+            changes: Fields sent to the API
+            ticket: The updated raw ticket, if it was fetched after the change;
+                subscribers should drop their copy when this is None
+        """
+        self.kind = kind
+        self.ticket_id = ticket_id
+        self.order_id = order_id
+        self.changes = changes or {}
+        self.ticket = ticket
+
+    def matches(self, ticket_ref: Union[str, int, None]) -> bool:
+        """Check whether a ticket number or internal ID refers to the mutated ticket."""
+        if ticket_ref in (None, ''):
+            return False
+        ref = str(ticket_ref).strip()
+        if self.ticket_id is not None and ref == str(self.ticket_id):
+            return True
+        if self.order_id:
+            number = self.order_id[2:] if self.order_id.upper().startswith('T-') else self.order_id
+            return ref.upper() in (self.order_id.upper(), number.upper(), f"T-{number}".upper())
+        return False
+
+    def __repr__(self) -> str:
+        return f"<TicketMutation {self.kind} {self.order_id or self.ticket_id}>"
+
+
+class _StrongRef:
+    """Callable reference that keeps a plain function alive, mirroring WeakMethod's interface."""
+
+    __slots__ = ('callback',)
+
+    def __init__(self, callback: Callable):
+        self.callback = callback
+
+    def __call__(self) -> Callable:
+        return self.callback
+
+
+class TicketEventBus:
+    """Thread-safe publish/subscribe hub for ticket mutations."""
+
+    def __init__(self):
+        self._subscribers: Dict[int, Callable[[], Optional[Callable]]] = {}
+        self._tokens = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def subscribe(self, callback: Callable[[TicketMutation], Any]) -> int:
+        """Subscribe to ticket mutations.
+
+        Bound methods are held by weak reference and dropped when their object
+        is garbage collected.
+
+        Returns:
+            Token for unsubscribe()
+        """
+        if hasattr(callback, '__self__') and hasattr(callback, '__func__'):
+            ref = weakref.WeakMethod(callback)
+        else:
+            ref = _StrongRef(callback)
+        with self._lock:
+            token = next(self._tokens)
+            self._subscribers[token] = ref
+        return token
+
+    def unsubscribe(self, token: int) -> None:
+        with self._lock:
+            self._subscribers.pop(token, None)
+
+    def publish(self, mutation: TicketMutation) -> None:
+        """Deliver a mutation to every subscriber on the calling thread.
+
+        A failing subscriber is logged and does not stop delivery to the others.
+        """
+        with self._lock:
+            subscribers = list(self._subscribers.items())
+
+        logger.debug(f"Publishing {mutation} to {len(subscribers)} subscribers")
+        for token, ref in subscribers:
+            callback = ref()
+            if callback is None:
+                self.unsubscribe(token)
+                continue
+            try:
+                callback(mutation)
+            except Exception as e:
+                logger.error(f"Ticket mutation subscriber failed for {mutation}: {e}")
+
+
+def _drop_cached_responses(mutation: TicketMutation) -> None:
+    """Drop cached API responses that contain the ticket: its detail and notes, and ticket pages."""
+    from nest.utils.response_cache import get_response_cache
+    cache = get_response_cache()
+    cache.clear("GET:tickets:")
+    cache.clear("client:tickets_")
+    for ref in {mutation.ticket_id, mutation.order_id} - {None}:
+        cache.clear(f"GET:tickets/{ref}:")
+        cache.clear(f"GET:tickets/{ref}/")
+        # An exact key: a prefix would also drop e.g. ticket 123's entry for ticket 12
+        cache.delete(f"client:ticket_details_{ref}")
+
+
+def _patch_local_store(mutation: TicketMutation) -> None:
+    """Write the updated ticket to the local store."""
+    if mutation.ticket is None:
+        return
+    from nest.utils.cache_utils import get_local_store
+    get_local_store().upsert_tickets([mutation.ticket])
+
+
+def _patch_ticket_index(mutation: TicketMutation) -> None:
+    if mutation.ticket is not None:
+        from nest.utils.ticket_index import get_ticket_id_index
+        get_ticket_id_index().update([mutation.ticket])
+
+
+def _patch_search_index(mutation: TicketMutation) -> None:
+    """Re-index the updated ticket; an added note is indexed once its details are fetched again."""
+    if mutation.ticket is not None:
+        from nest.utils.ticket_search import get_ticket_search_index
+        get_ticket_search_index().update([mutation.ticket])
+
+
+def _drop_stored_details(mutation: TicketMutation) -> None:
+    """Drop the ticket's stored details so they are fetched again on next use."""
+    if not mutation.order_id:
+        return
+    from nest.utils.detail_store import get_detail_store
+    get_detail_store().delete(mutation.order_id)
+
+
+_bus: Optional[TicketEventBus] = None
+_bus_lock = threading.Lock()
+
+
+def get_ticket_event_bus() -> TicketEventBus:
+    """Get the process-wide ticket event bus.
+
+    The bus comes with subscribers that keep the shared caches consistent:
+    cached API responses for the ticket and ticket pages are dropped, the
+    local store, ticket ID index and search index are patched with the updated
+    ticket and the ticket's stored details are dropped.
+    """
+    global _bus
+    if _bus is None:
+        with _bus_lock:
+            if _bus is None:
+                bus = TicketEventBus()
+                bus.subscribe(_drop_cached_responses)
+                bus.subscribe(_patch_local_store)
+                bus.subscribe(_patch_ticket_index)
+                bus.subscribe(_patch_search_index)
+                bus.subscribe(_drop_stored_details)
+                _bus = bus
+    return _bus
+
+
+def publish_ticket_mutation(kind: str, ticket_id: Optional[int] = None,
+                            order_id: Optional[str] = None, changes: Optional[Dict] = None,
+                            ticket: Optional[Dict] = None) -> TicketMutation:
+    """Publish a ticket mutation on the shared bus.
+
+    Missing IDs are filled in from the updated ticket or the local store.
+
+    Returns:
+        The published mutation
+    """
+    if ticket is not None:
+        summary = ticket.get('summary', {})
+        ticket_id = ticket_id or summary.get('id')
+        order_id = order_id or summary.get('order_id')
+    if ticket_id is not None and not order_id:
+        try:
+            from nest.utils.cache_utils import get_local_store
+            cached = get_local_store().get_ticket(ticket_id=ticket_id)
+            if cached:
+                order_id = cached.get('summary', {}).get('order_id')
+        except Exception as e:
+            logger.debug(f"Could not resolve ticket number for {ticket_id}: {e}")
+    if order_id:
+        from nest.utils.ticket_index import normalize_order_id
+        order_id = normalize_order_id(order_id)
+
+    mutation = TicketMutation(kind, ticket_id=ticket_id, order_id=order_id, changes=changes,
+                              ticket=ticket)
+    get_ticket_event_bus().publish(mutation)
+    return mutation
@@ -0,0 +1,213 @@
+"""
+Persistent ticket-number to internal-ID index.
+
+RepairDesk endpoints address tickets by an internal numeric ID, while users
+work with visible ticket numbers such as T-12353. This index keeps an
+order_id -> id mapping on disk next to the ticket cache so a ticket number
+can be resolved with a dictionary lookup instead of loading and scanning the
+whole ticket cache or paging through the API.
+
+The index is updated whenever tickets are cached and on every API fallback
+that sees ticket summaries.
+"""
+
+import logging
+import os
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, Optional, Union
+
+from nest.utils.cache_io import read_cache_file, write_cache_file
+
+logger = logging.getLogger(__name__)
+
+TICKET_INDEX_FILE = 'ticket_id_index.json'
+TICKET_INDEX_VERSION = 1
+
+
+def normalize_order_id(ticket_number: Union[str, int]) -> Optional[str]:
+    """Normalize a ticket number to the T-XXXXX order_id form.
+
+    Args:
+        ticket_number: Ticket number, with or without T- prefix (e.g. T-12353, '12353', 12353)
+
+    Returns:
+        The order_id string, or None if the value is empty
+    """
+    if ticket_number is None:
+        return None
+    ticket_str = str(ticket_number).strip()
+    if not ticket_str:
+        return None
+    if ticket_str[:2].upper() == 'T-':
+        ticket_str = ticket_str[2:]
+    return f"T-{ticket_str}"
+
+
+class TicketIdIndex:
+    """Thread-safe order_id -> internal ID mapping persisted as a cache file."""
+
+    def __init__(self, index_path: str, ticket_cache_path: Optional[str] = None):
+        """Initialize the index.
+
+        Args:
+            index_path: Path of the index file
+            ticket_cache_path: Ticket cache used to seed the index the first
+                time it is loaded, if no index file exists yet
+        """
+        self.index_path = index_path
+        self.ticket_cache_path = ticket_cache_path
+
+        self._ids: Optional[Dict[str, int]] = None
+        self._lock = threading.RLock()
+
+    def _ensure_loaded(self) -> Dict[str, int]:
+        """Load the index from disk on first use."""
+        if self._ids is None:
+            with self._lock:
+                if self._ids is None:
+                    self._ids = self._load()
+        return self._ids
+
+    def _load(self) -> Dict[str, int]:
+        """Read the index file, seeding it from the ticket cache if missing."""
+        if os.path.exists(self.index_path):
+            try:
+                data = read_cache_file(self.index_path)
+                if isinstance(data, dict) and data.get('version') == TICKET_INDEX_VERSION:
+                    return dict(data.get('ids') or {})
+                logger.info("Ticket ID index has an unknown format, rebuilding")
+            except Exception as e:
+                logger.warning(f"Could not read ticket ID index, rebuilding: {e}")
+
+        ids: Dict[str, int] = {}
+        if self.ticket_cache_path and os.path.exists(self.ticket_cache_path):
+            try:
+                cache_data = read_cache_file(self.ticket_cache_path)
+                if isinstance(cache_data, dict):
+                    tickets = cache_data.get('items', [])
+                else:
+                    tickets = cache_data
+                self._add_tickets(ids, tickets or [])
+                logger.info(f"Seeded ticket ID index with {len(ids)} tickets from cache")
+                self._save(ids)
+            except Exception as e:
+                logger.warning(f"Could not seed ticket ID index from cache: {e}")
+        return ids
+
+    def _save(self, ids: Dict[str, int]) -> None:
+        """Atomically write the index file."""
+        data = {
+            'version': TICKET_INDEX_VERSION,
+            'timestamp': datetime.now().isoformat(),
+            'ids': ids,
+        }
+        try:
+            write_cache_file(self.index_path, data)
+        except Exception as e:
+            logger.error(f"Failed to save ticket ID index: {e}")
+
+    @staticmethod
+    def _add_tickets(ids: Dict[str, int], tickets: Iterable[Dict]) -> int:
+        """Add the order_id -> id mappings of raw tickets to ``ids``.
+
+        Returns:
+            Number of mappings added or changed
+        """
+        changed = 0
+        for ticket in tickets:
+            if not isinstance(ticket, dict):
+                continue
+            summary = ticket.get('summary', {})
+            order_id = normalize_order_id(summary.get('order_id'))
+            internal_id = summary.get('id')
+            if not order_id or not internal_id:
+                continue
+            if ids.get(order_id) != internal_id:
+                ids[order_id] = internal_id
+                changed += 1
+        return changed
+
+    def lookup(self, ticket_number: Union[str, int]) -> Optional[int]:
+        """Get the internal ID for a ticket number.
+
+        Args:
+            ticket_number: Ticket number, with or without T- prefix
+
+        Returns:
+            The internal RepairDesk ID, or None if the ticket is not indexed
+        """
+        order_id = normalize_order_id(ticket_number)
+        if not order_id:
+            return None
+        return self._ensure_loaded().get(order_id)
+
+    def resolve(self, ticket_ref: Union[str, int]) -> Optional[int]:
+        """Get the internal ID for a value that may be a ticket number or an internal ID.
+
+        Indexed ticket numbers resolve to their internal ID. Otherwise only a
+        purely numeric value is taken as an internal ID; an unindexed T- number
+        or any other value resolves to None.
+
+        Args:
+            ticket_ref: Ticket number (with or without T- prefix) or internal ID
+
+        Returns:
+            The internal RepairDesk ID, or None if it can't be determined
+        """
+        internal_id = self.lookup(ticket_ref)
+        if internal_id:
+            return internal_id
+        value = str(ticket_ref).strip() if ticket_ref is not None else ''
+        return int(value) if value.isdigit() else None
+
+    def update(self, tickets: Iterable[Dict]) -> int:
+        """Index the ticket numbers of raw tickets and persist any changes.
+
+        Args:
+            tickets: Raw ticket dictionaries with a 'summary' section
+
+        Returns:
+            Number of mappings added or changed
+        """
+        with self._lock:
+            ids = self._ensure_loaded()
+            changed = self._add_tickets(ids, tickets)
+            if changed:
+                self._save(ids)
+                logger.debug(f"Updated {changed} entries in ticket ID index")
+            return changed
+
+    def add(self, ticket_number: Union[str, int], internal_id: int) -> None:
+        """Index a single ticket number."""
+        order_id = normalize_order_id(ticket_number)
+        if not order_id or not internal_id:
+            return
+        with self._lock:
+            ids = self._ensure_loaded()
+            if ids.get(order_id) != internal_id:
+                ids[order_id] = internal_id
+                self._save(ids)
+
+    def __len__(self) -> int:
+        return len(self._ensure_loaded())
+
+
+_index: Optional[TicketIdIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_ticket_id_index() -> TicketIdIndex:
+    """Get the process-wide ticket ID index stored in the cache directory."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                from nest.utils.platform_paths import PlatformPaths
+                platform_paths = PlatformPaths()
+                cache_dir = str(platform_paths.ensure_dir_exists(platform_paths.get_cache_dir()))
+                _index = TicketIdIndex(
+                    os.path.join(cache_dir, TICKET_INDEX_FILE),
+                    ticket_cache_path=os.path.join(cache_dir, 'ticket_cache.json'),
+                )
+    return _index
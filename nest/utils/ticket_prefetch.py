@@ -0,0 +1,260 @@
+"""
+Background prefetch pipeline for per-ticket details.
+
+After a ticket sync, the most relevant tickets (those assigned to the
+logged-in technician first, then the newest) are queued for detail prefetch.
+Ranking, opening the detail store and checking stored details all happen on
+a planner thread, and a small pool of worker threads fetches each ticket's
+details and notes and writes them to the detail store, so the sync path
+never waits on detail fetches or cache writes.
+"""
+
+import itertools
+import logging
+import queue
+import threading
+import time
+from typing import Dict, List, Optional
+
+from nest.utils.detail_store import get_detail_store
+from nest.utils.ticket_record import ticket_updated_timestamp
+from nest.utils.ticket_search import get_ticket_search_index
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_PREFETCH_WORKERS = 4
+DEFAULT_PREFETCH_DEPTH = 50  # Number of tickets considered per sync
+DEFAULT_MAX_DETAIL_AGE_HOURS = 24
+
+# Priority classes (lower runs first)
+PRIORITY_ASSIGNED = 0
+PRIORITY_RECENT = 1
+
+
+def _ticket_technician(ticket: Dict) -> str:
+    """Get the name of the technician a raw ticket is assigned to."""
+    summary = ticket.get('summary', {})
+    assigned = summary.get('assigned_to')
+    if isinstance(assigned, dict):
+        assigned = assigned.get('fullname')
+    if not assigned:
+        devices = ticket.get('devices') or []
+        if devices and isinstance(devices[0], dict):
+            assigned = (devices[0].get('assigned_to') or {}).get('fullname')
+    return str(assigned or '').strip().lower()
+
+
+def _ticket_number(value, default: float = 0.0) -> float:
+    """Parse a numeric ticket field such as created_date."""
+    try:
+        return float(value or default)
+    except (TypeError, ValueError):
+        return default
+
+
+class TicketDetailPrefetcher:
+    """Prioritized, bounded worker pool that keeps stored ticket details fresh."""
+
+    def __init__(self, api, workers: int = DEFAULT_PREFETCH_WORKERS,
+                 depth: int = DEFAULT_PREFETCH_DEPTH,
+                 max_age_hours: float = DEFAULT_MAX_DETAIL_AGE_HOURS):
+        """Initialize the prefetcher.
+
+        Args:
+            api: RepairDeskAPI instance used to fetch ticket details and notes
+            workers: Number of worker threads
+            depth: Maximum number of tickets queued per schedule() call
+            max_age_hours: Age after which stored details are refetched
+        """
+        self.api = api
+        self.workers = max(1, workers)
+        self.depth = depth
+        self.max_age_hours = max_age_hours
+
+        self._batches = queue.Queue()
+        self._queue = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._pending = set()
+        self._lock = threading.Lock()
+        self._planner: Optional[threading.Thread] = None
+        self._threads: List[threading.Thread] = []
+
+        self.success_count = 0
+        self.error_count = 0
+
+    def schedule(self, tickets: List[Dict], technician: Optional[str] = None,
+                 depth: Optional[int] = None) -> None:
+        """Queue detail prefetches for the most relevant tickets.
+
+        Tickets assigned to ``technician`` are fetched first, then the newest
+        tickets by created date. Tickets already queued or with fresh stored
+        details are skipped. Returns immediately; the tickets are ranked and
+        checked against the detail store on the planner thread.
+
+        Args:
+            tickets: Raw ticket dictionaries from the API
+            technician: Full name of the logged-in technician, if known
+            depth: Override for the number of tickets considered
+        """
+        if not tickets:
+            return
+
+        self._batches.put((list(tickets), technician, depth))
+        self._ensure_workers()
+
+    def _plan(self, tickets: List[Dict], technician: Optional[str],
+              depth: Optional[int]) -> int:
+        """Rank a batch of tickets and queue those whose stored details are stale.
+
+        Returns:
+            Number of tickets queued
+        """
+        store = get_detail_store()
+
+        technician = (technician or '').strip().lower()
+        depth = self.depth if depth is None else depth
+
+        def priority(ticket: Dict) -> tuple:
+            mine = technician and _ticket_technician(ticket) == technician
+            created = _ticket_number(ticket.get('summary', {}).get('created_date'))
+            return (PRIORITY_ASSIGNED if mine else PRIORITY_RECENT, -created)
+
+        queued = 0
+        for ticket in sorted(tickets, key=priority)[:depth]:
+            summary = ticket.get('summary', {})
+            ticket_id = summary.get('id')
+            order_id = summary.get('order_id')
+            if not ticket_id or not order_id:
+                continue
+
+            if self._is_fresh(store.written_at(order_id), ticket):
+                continue
+
+            with self._lock:
+                if order_id in self._pending:
+                    continue
+                self._pending.add(order_id)
+
+            self._queue.put((priority(ticket), next(self._sequence), ticket_id, order_id))
+            queued += 1
+
+        if queued:
+            logger.info(f"Queued {queued} ticket detail prefetches")
+        return queued
+
+    def _is_fresh(self, written_at: Optional[float], ticket: Dict) -> bool:
+        """Check whether stored details are recent and newer than the ticket's last update."""
+        if written_at is None or (time.time() - written_at) / 3600 >= self.max_age_hours:
+            return False
+
+        return (ticket_updated_timestamp(ticket) or 0.0) <= written_at
+
+    def _ensure_workers(self) -> None:
+        """Start the planner and worker threads on first use."""
+        with self._lock:
+            if self._planner is None or not self._planner.is_alive():
+                self._planner = threading.Thread(target=self._plan_worker, daemon=True,
+                                                 name="ticket-prefetch-planner")
+                self._planner.start()
+            self._threads = [t for t in self._threads if t.is_alive()]
+            for index in range(len(self._threads), self.workers):
+                thread = threading.Thread(target=self._worker, daemon=True,
+                                          name=f"ticket-prefetch-{index}")
+                thread.start()
+                self._threads.append(thread)
+
+    def _plan_worker(self) -> None:
+        """Turn scheduled ticket batches into prefetch jobs until the process exits."""
+        while True:
+            tickets, technician, depth = self._batches.get()
+            try:
+                self._plan(tickets, technician, depth)
+            except Exception as e:
+                logger.warning(f"Failed to plan ticket detail prefetches: {e}")
+            finally:
+                self._batches.task_done()
+
+    def _worker(self) -> None:
+        """Fetch queued ticket details until the process exits."""
+        while True:
+            _, _, ticket_id, order_id = self._queue.get()
+            succeeded = False
+            try:
+                self._prefetch(ticket_id, order_id)
+                succeeded = True
+            except Exception as e:
+                logger.warning(f"Failed to prefetch details for ticket {order_id}: {e}")
+            finally:
+                with self._lock:
+                    self._pending.discard(order_id)
+                    if succeeded:
+                        self.success_count += 1
+                    else:
+                        self.error_count += 1
+                self._queue.task_done()
+
+    def _prefetch(self, ticket_id, order_id: str) -> None:
+        """Fetch one ticket's details and notes and store them."""
+        response = self.api.request(f"tickets/{ticket_id}", raw_response=True)
+        if not isinstance(response, dict):
+            raise ValueError("Invalid response format")
+
+        # Copy before adding notes; the response may be shared with coalesced callers
+        data = dict(response)
+
+        # Also include ticket notes/comments for richer AI analysis
+        try:
+            data['notes'] = self.api.get_ticket_notes(ticket_id) or []
+        except Exception as e:
+            logger.warning(f"Could not fetch notes for ticket {order_id}: {e}")
+            data['notes'] = []
+
+        get_detail_store().put(order_id, data)
+        get_ticket_search_index().update_details(order_id, data)
+        logger.debug(f"Prefetched details for ticket {order_id}")
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Wait until the queue is drained.
+
+        Returns:
+            True if all queued prefetches finished within the timeout
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while self._batches.unfinished_tasks or self._queue.unfinished_tasks:
+            if deadline is not None and time.monotonic() >= deadline:
+                return False
+            time.sleep(0.05)
+        return True
+
+    def pending_count(self) -> int:
+        """Get the number of tickets queued or being fetched."""
+        with self._lock:
+            return len(self._pending)
+
+
+_prefetchers: Dict[str, TicketDetailPrefetcher] = {}
+_prefetchers_lock = threading.Lock()
+
+
+def get_ticket_prefetcher(api) -> TicketDetailPrefetcher:
+    """Get the shared prefetcher for an API key, creating it on first use.
+
+    Worker count, depth and max age can be set in the "ticket_prefetch"
+    section of config.json.
+    """
+    with _prefetchers_lock:
+        prefetcher = _prefetchers.get(api.api_key)
+        if prefetcher is None:
+            try:
+                from nest.utils.config_util import load_config
+                settings = load_config().get("ticket_prefetch", {}) or {}
+            except Exception:
+                settings = {}
+            prefetcher = TicketDetailPrefetcher(
+                api,
+                workers=settings.get("workers", DEFAULT_PREFETCH_WORKERS),
+                depth=settings.get("depth", DEFAULT_PREFETCH_DEPTH),
+                max_age_hours=settings.get("max_age_hours", DEFAULT_MAX_DETAIL_AGE_HOURS),
+            )
+            _prefetchers[api.api_key] = prefetcher
+        return prefetcher
@@ -0,0 +1,271 @@
+"""
+Shared, memoized normalization of RepairDesk tickets.
+
+The dashboard, the tickets view, NestBot and nest.utils.normalize each used
+to walk the nested summary/devices dicts and re-parse dates on every call.
+They now all start from one TicketRecord per ticket:
+
+- A record holds the extracted fields in slots, with dates already parsed
+  into datetime objects.
+- Records are memoized by ticket ID and a hash of the ticket's content.
+  Normalizing an unchanged ticket list again costs one hash per ticket.
+- Consumers keep their own output shape as a view of the record. A view is
+  built once and cached on the record until its stamp changes, e.g. once a
+  day for views showing how many days a ticket has been open. Callers get
+  a copy of the view's dicts and lists, so changing it never leaks into
+  later normalizations. The raw ticket is the one exception: views that
+  include it share it by reference, since copying the whole API payload
+  would cost far more than the hash check.
+"""
+
+import json
+import logging
+import marshal
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Any, Callable, Hashable, Iterable, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MAX_RECORDS = 20000
+
+# Summary keys holding a ticket's last-modified time, in order of preference
+UPDATED_KEYS = ('last_updated', 'updated_at', 'updated_date', 'modified_date')
+
+
+def _parse_datetime(value) -> Optional[datetime]:
+    """Parse a RepairDesk timestamp (epoch seconds or ISO 8601) into a datetime."""
+    if value in (None, '', 0, '0'):
+        return None
+    try:
+        return datetime.fromtimestamp(float(value))
+    except (TypeError, ValueError, OverflowError, OSError):
+        pass
+    try:
+        parsed = datetime.fromisoformat(str(value).replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    # Keep all dates naive local time so they compare with datetime.now()
+    return parsed.astimezone().replace(tzinfo=None) if parsed.tzinfo else parsed
+
+
+def ticket_updated_timestamp(ticket: dict) -> Optional[float]:
+    """Get a raw ticket's last-modified time as an epoch timestamp.
+
+    This is the one rule for a ticket's update time: the delta-sync
+    watermark, TicketRecord.updated and the local store's last_updated
+    column all use it. Returns None for tickets without a usable stamp.
+    """
+    summary = ticket.get('summary') if isinstance(ticket, dict) else None
+    if not isinstance(summary, dict):
+        return None
+    for key in UPDATED_KEYS:
+        value = summary.get(key)
+        if value in (None, '', 0, '0'):
+            continue
+        try:
+            return float(value)
+        except (TypeError, ValueError):
+            pass
+        parsed = _parse_datetime(value)
+        if parsed is not None:
+            return parsed.timestamp()
+    return None
+
+
+def _content_hash(ticket: dict) -> int:
+    """Hash a ticket's content; marshal is a fast exact dump of plain JSON data."""
+    try:
+        # Version 2 has no back-references, so the dump depends only on content
+        return hash(marshal.dumps(ticket, 2))
+    except ValueError:
+        return hash(json.dumps(ticket, sort_keys=True, default=str))
+
+
+def _copy_view(value: Any, shared: Any = None) -> Any:
+    """Copy the dicts and lists of a view; other values are immutable in practice.
+
+    Much cheaper than copy.deepcopy() for the flat dicts most views are.
+
+    Args:
+        value: The view to copy
+        shared: An object returned by reference wherever it appears (the raw ticket)
+    """
+    if value is shared:
+        return value
+    if isinstance(value, dict):
+        return {key: _copy_view(item, shared) if isinstance(item, (dict, list)) else item
+                for key, item in value.items()}
+    if isinstance(value, list):
+        return [_copy_view(item, shared) if isinstance(item, (dict, list)) else item
+                for item in value]
+    return value
+
+
+class TicketRecord:
+    """Normalized fields of one raw ticket; missing values are None."""
+
+    __slots__ = (
+        'order_id', 'api_id', 'customer_name', 'customer_mobile', 'customer_email',
+        'device', 'device_status', 'status', 'repair_type', 'repair_items',
+        'technician', 'technician_id', 'assigned_to', 'total', 'total_amount',
+        'created', 'updated', 'due', 'raw', 'digest', '_views',
+    )
+
+    def __init__(self, raw: dict, digest: int):
+        summary = raw.get('summary') or {}
+        devices = raw.get('devices') or []
+        device = devices[0] if isinstance(devices, list) and devices else {}
+        customer = summary.get('customer') or {}
+        device_info = device.get('device') or {}
+        assigned = device.get('assigned_to') or {}
+        repair_products = device.get('repairProdItems') or [{}]
+
+        self.order_id = summary.get('order_id')
+        self.api_id = summary.get('id')
+        self.customer_name = customer.get('fullName')
+        self.customer_mobile = customer.get('mobile')
+        self.customer_email = customer.get('email')
+        self.device = device_info.get('name')
+        self.device_status = (device.get('status') or {}).get('name')
+        self.repair_type = repair_products[0].get('name')
+        self.repair_items = tuple(item.get('name') for item in device.get('repair_items') or []
+                                  if item.get('name'))
+        self.technician = assigned.get('fullname')
+        self.technician_id = assigned.get('id')
+        self.assigned_to = summary.get('assigned_to')
+        self.total = summary.get('total')
+        self.total_amount = summary.get('total_amount')
+
+        # The ticket's status is the first device status other than "Open"
+        status = summary.get('status', 'Open')
+        for item in devices:
+            name = (item.get('status') or {}).get('name', '')
+            if name and name != 'Open':
+                status = name
+                break
+        self.status = status
+
+        self.created = _parse_datetime(summary.get('created_date'))
+        self.updated = _parse_datetime(ticket_updated_timestamp(raw))
+        self.due = _parse_datetime(device.get('due_on'))
+
+        self.raw = raw
+        self.digest = digest
+        self._views = None
+
+    @property
+    def ticket_id(self) -> Optional[str]:
+        """The order ID with a "T-" prefix, as shown to users."""
+        if self.order_id in (None, ''):
+            return None
+        order_id = str(self.order_id)
+        return order_id if order_id.startswith('T-') else f'T-{order_id}'
+
+    def days_open(self, now: Optional[datetime] = None) -> Optional[int]:
+        """Get the number of days since the ticket was created."""
+        if self.created is None:
+            return None
+        return ((now or datetime.now()) - self.created).days
+
+    def view(self, name: Hashable, build: Callable[['TicketRecord'], Any],
+             stamp: Hashable = None) -> Any:
+        """Get a consumer's view of the record, building it on first use.
+
+        Args:
+            name: Identifies the view
+            build: Builds the view from the record
+            stamp: The cached view is rebuilt when this changes
+
+        Returns:
+            A copy of the cached view, which the caller may change; the raw
+            ticket is not copied and must be treated as read-only
+        """
+        views = self._views
+        if views is None:
+            views = self._views = {}
+        cached = views.get(name)
+        if cached is None or cached[0] != stamp:
+            cached = (stamp, build(self))
+            views[name] = cached
+        return _copy_view(cached[1], self.raw)
+
+    def __repr__(self) -> str:
+        return f"<TicketRecord {self.ticket_id} {self.status!r}>"
+
+
+class TicketNormalizer:
+    """Thread-safe memo of TicketRecords keyed by ticket ID and content hash."""
+
+    def __init__(self, max_records: int = MAX_RECORDS):
+        self.max_records = max_records
+        self._records: "OrderedDict[Any, TicketRecord]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def normalize(self, ticket: dict) -> TicketRecord:
+        """Get the record of a raw ticket, reusing it if the ticket is unchanged."""
+        digest = _content_hash(ticket)
+        summary = ticket.get('summary') or {}
+        key = summary.get('id') or summary.get('order_id')
+        if key is None:
+            return TicketRecord(ticket, digest)
+
+        with self._lock:
+            record = self._records.get(key)
+            if record is not None and record.digest == digest:
+                self._records.move_to_end(key)
+                return record
+
+        record = TicketRecord(ticket, digest)
+        with self._lock:
+            self._records[key] = record
+            self._records.move_to_end(key)
+            while len(self._records) > self.max_records:
+                self._records.popitem(last=False)
+        return record
+
+    def normalize_all(self, tickets: Iterable[dict]) -> List[TicketRecord]:
+        """Get the records of raw tickets, skipping any that cannot be normalized."""
+        records = []
+        for ticket in tickets or []:
+            try:
+                records.append(self.normalize(ticket))
+            except Exception as e:
+                logger.error(f"Error normalizing ticket: {e}")
+        return records
+
+    def clear(self) -> None:
+        with self._lock:
+            self._records.clear()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._records)
+
+
+_normalizer: Optional[TicketNormalizer] = None
+_normalizer_lock = threading.Lock()
+
+
+def get_ticket_normalizer() -> TicketNormalizer:
+    """Get the shared ticket normalizer.
+
+    The memo size can be set in the "ticket_normalizer" section of
+    config.json, e.g. {"max_records": 50000}.
+    """
+    global _normalizer
+    with _normalizer_lock:
+        if _normalizer is None:
+            try:
+                from nest.utils.config_util import load_config
+                settings = load_config().get("ticket_normalizer", {}) or {}
+            except Exception:
+                settings = {}
+            _normalizer = TicketNormalizer(max_records=settings.get("max_records", MAX_RECORDS))
+        return _normalizer
+
+
+def normalize_record(ticket: dict) -> TicketRecord:
+    """Get the shared, memoized record of a raw ticket."""
+    return get_ticket_normalizer().normalize(ticket)
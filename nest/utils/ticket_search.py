@@ -0,0 +1,505 @@
+"""
+Full-text ticket search index.
+
+Ticket search used to substring-scan a few display fields of every ticket,
+and notes were not searchable at all. TicketSearchIndex is an inverted index
+over each ticket's number, customer, device and IMEI/serial, issue text,
+technician and notes. Results are ranked with BM25, with per-field weights
+so a hit on the ticket number or customer counts for more than a word
+somewhere in the notes.
+
+The index is kept up to date incrementally: tickets are re-indexed as they
+are synced or mutated, and only if their last-updated stamp changed. Notes
+come from the ticket details stored by the prefetcher and detail lookups.
+The index is persisted next to the ticket cache, so searching works right
+after startup without re-tokenizing every ticket.
+"""
+
+import bisect
+import logging
+import math
+import os
+import re
+import threading
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from nest.utils.cache_io import read_cache_file, write_cache_file
+from nest.utils.ticket_index import normalize_order_id
+from nest.utils.ticket_record import UPDATED_KEYS
+
+logger = logging.getLogger(__name__)
+
+TICKET_SEARCH_INDEX_FILE = 'ticket_search_index.json'
+TICKET_SEARCH_INDEX_VERSION = 1
+
+# Term frequencies are multiplied by the weight of the field they occur in
+FIELD_WEIGHTS = {
+    'number': 3.0,
+    'customer': 2.0,
+    'device': 1.5,
+    'issue': 1.5,
+    'technician': 1.0,
+    'notes': 1.0,
+}
+
+BM25_K1 = 1.2
+BM25_B = 0.75
+MAX_PREFIX_EXPANSIONS = 50
+SAVE_DELAY = 2.0  # Seconds to wait for more updates before writing the index file
+
+STOPWORDS = frozenset("""
+    a about all an and any are as at be by can could do does for from give has
+    have how i in is it list many me much my need of on or please show tell the
+    their them there these this to was what when which who with you ticket
+    tickets
+""".split())
+
+_TOKEN = re.compile(r"[a-z0-9]+")
+_NOTE_TEXT_KEYS = ('msg_text', 'text', 'comment', 'activity', 'note')
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into lowercase alphanumeric terms, dropping single characters."""
+    return [token for token in _TOKEN.findall(str(text).lower()) if len(token) > 1]
+
+
+def _unwrap(ticket: Dict) -> Dict:
+    """Get the ticket body from a raw ticket or a stored detail response."""
+    data = ticket.get('data')
+    if isinstance(data, dict) and 'summary' in data:
+        return data
+    return ticket
+
+
+def _note_texts(ticket: Dict) -> Optional[List[str]]:
+    """Get the text of a ticket's notes and comments, or None if it carries none."""
+    found = False
+    texts = []
+    for body in (ticket, ticket.get('data')):
+        if not isinstance(body, dict):
+            continue
+        for field in ('notes', 'comments', 'ticket_notes', 'activities'):
+            entries = body.get(field)
+            if not isinstance(entries, list):
+                continue
+            found = True
+            for entry in entries:
+                if isinstance(entry, dict):
+                    texts.extend(str(entry[key]) for key in _NOTE_TEXT_KEYS if entry.get(key))
+                elif entry:
+                    texts.append(str(entry))
+    return texts if found else None
+
+
+def extract_ticket_fields(ticket: Dict) -> Dict[str, str]:
+    """Collect the searchable text of a raw ticket by field.
+
+    The 'notes' field is only present if the ticket carries a notes or
+    comments section; ticket lists from the API do not.
+    """
+    body = _unwrap(ticket)
+    summary = body.get('summary') or {}
+    devices = [device for device in body.get('devices') or [] if isinstance(device, dict)]
+    customer = summary.get('customer') or {}
+
+    order_id = str(summary.get('order_id') or '')
+    number = [order_id, order_id.upper().replace('T-', '')]
+
+    technicians = []
+    assigned = summary.get('assigned_to')
+    if isinstance(assigned, dict):
+        assigned = assigned.get('fullname')
+    if assigned:
+        technicians.append(str(assigned))
+
+    device_text, issue_text = [], []
+    for device in devices:
+        info = device.get('device') or {}
+        if isinstance(info, dict):
+            device_text.extend(str(info.get(key) or '') for key in ('name', 'serial'))
+        device_text.extend(str(device.get(key) or '') for key in ('imei', 'serial'))
+        for items_key in ('repairProdItems', 'repair_items'):
+            for item in device.get(items_key) or []:
+                if isinstance(item, dict) and item.get('name'):
+                    issue_text.append(str(item['name']))
+        for key in ('problem', 'problem_description', 'description'):
+            if device.get(key):
+                issue_text.append(str(device[key]))
+        technician = (device.get('assigned_to') or {}).get('fullname')
+        if technician:
+            technicians.append(str(technician))
+
+    fields = {
+        'number': ' '.join(number),
+        'customer': ' '.join(str(customer.get(key) or '')
+                             for key in ('fullName', 'mobile', 'email', 'orgonization')),
+        'device': ' '.join(device_text),
+        'issue': ' '.join(issue_text),
+        'technician': ' '.join(technicians),
+    }
+    notes = _note_texts(ticket)
+    if notes is not None:
+        fields['notes'] = ' '.join(notes)
+    return fields
+
+
+def _ticket_stamp(ticket: Dict) -> Optional[str]:
+    """Get a raw ticket's last-updated stamp, used to skip unchanged tickets."""
+    summary = _unwrap(ticket).get('summary') or {}
+    for key in UPDATED_KEYS:
+        if summary.get(key):
+            return str(summary[key])
+    return None
+
+
+class TicketSearchIndex:
+    """Thread-safe BM25 index over raw tickets, persisted as a cache file."""
+
+    def __init__(self, index_path: str, ticket_cache_path: Optional[str] = None,
+                 seed_details: bool = True):
+        """Initialize the index.
+
+        Args:
+            index_path: Path of the index file
+            ticket_cache_path: Ticket cache used to seed the index the first
+                time it is loaded, if no index file exists yet
+            seed_details: Also index the notes of tickets in the detail store
+                when seeding
+        """
+        self.index_path = index_path
+        self.ticket_cache_path = ticket_cache_path
+        self.seed_details = seed_details
+
+        self._lock = threading.RLock()
+        self._loaded = False
+        self._save_timer: Optional[threading.Timer] = None
+
+        # order_id -> {'id': internal ID, 'stamp': last updated, 'fields': {field: {term: count}}}
+        self._docs: Dict[str, Dict[str, Any]] = {}
+        # term -> {order_id: weighted term frequency}
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._lengths: Dict[str, float] = {}
+        self._total_length = 0.0
+        self._vocabulary: Optional[List[str]] = None  # Sorted terms, rebuilt after changes
+
+    @property
+    def loaded(self) -> bool:
+        """Whether the index has been loaded; until then, methods block while loading."""
+        return self._loaded
+
+    def load_async(self) -> None:
+        """Load (or seed) the index on a background thread, so UI code never waits for it."""
+        if not self._loaded:
+            threading.Thread(target=self._ensure_loaded, name="TicketSearchIndexLoader",
+                             daemon=True).start()
+
+    def _ensure_loaded(self) -> None:
+        """Load the index from disk on first use."""
+        if not self._loaded:
+            with self._lock:
+                if not self._loaded:
+                    self._load()
+                    self._loaded = True
+
+    def _load(self) -> None:
+        """Read the index file, seeding it from the ticket cache if missing."""
+        if os.path.exists(self.index_path):
+            try:
+                data = read_cache_file(self.index_path)
+                if isinstance(data, dict) and data.get('version') == TICKET_SEARCH_INDEX_VERSION:
+                    for order_id, doc in (data.get('docs') or {}).items():
+                        self._insert(order_id, doc)
+                    logger.debug(f"Loaded ticket search index with {len(self._docs)} tickets")
+                    return
+                logger.info("Ticket search index has an unknown format, rebuilding")
+            except Exception as e:
+                logger.warning(f"Could not read ticket search index, rebuilding: {e}")
+
+        if self.ticket_cache_path and os.path.exists(self.ticket_cache_path):
+            try:
+                cache_data = read_cache_file(self.ticket_cache_path)
+                if isinstance(cache_data, dict):
+                    tickets = cache_data.get('items', [])
+                else:
+                    tickets = cache_data
+                for ticket in tickets or []:
+                    if isinstance(ticket, dict):
+                        self._index_ticket(ticket)
+                logger.info(f"Seeded ticket search index with {len(self._docs)} tickets from cache")
+            except Exception as e:
+                logger.warning(f"Could not seed ticket search index from cache: {e}")
+
+        if self.seed_details:
+            try:
+                from nest.utils.detail_store import get_detail_store
+                store = get_detail_store()
+                for key in store.keys():
+                    detail = store.get(key)
+                    if isinstance(detail, dict):
+                        self._index_ticket(detail, order_id=key)
+            except Exception as e:
+                logger.warning(f"Could not seed ticket search index from stored details: {e}")
+
+        if self._docs:
+            self._save()
+
+    def _save(self) -> None:
+        """Atomically write the index file."""
+        with self._lock:
+            self._save_timer = None
+            data = {
+                'version': TICKET_SEARCH_INDEX_VERSION,
+                'timestamp': datetime.now().isoformat(),
+                'docs': self._docs,
+            }
+            try:
+                write_cache_file(self.index_path, data)
+            except Exception as e:
+                logger.error(f"Failed to save ticket search index: {e}")
+
+    def _schedule_save(self) -> None:
+        """Write the index once no more updates arrive for SAVE_DELAY seconds."""
+        if self._save_timer is not None:
+            self._save_timer.cancel()
+        self._save_timer = threading.Timer(SAVE_DELAY, self._save)
+        self._save_timer.daemon = True
+        self._save_timer.start()
+
+    def flush(self) -> None:
+        """Write pending changes to disk now."""
+        with self._lock:
+            if self._save_timer is not None:
+                self._save_timer.cancel()
+                self._save()
+
+    def _insert(self, order_id: str, doc: Dict[str, Any]) -> None:
+        """Add a document's terms to the postings; the caller holds the lock."""
+        weighted = Counter()
+        for field, terms in doc['fields'].items():
+            weight = FIELD_WEIGHTS.get(field, 1.0)
+            for term, count in terms.items():
+                weighted[term] += weight * count
+        for term, frequency in weighted.items():
+            self._postings.setdefault(term, {})[order_id] = frequency
+        length = sum(weighted.values())
+        self._docs[order_id] = doc
+        self._lengths[order_id] = length
+        self._total_length += length
+        self._vocabulary = None
+
+    def _drop(self, order_id: str) -> Optional[Dict[str, Any]]:
+        """Remove a document's terms from the postings; the caller holds the lock."""
+        doc = self._docs.pop(order_id, None)
+        if doc is None:
+            return None
+        for terms in doc['fields'].values():
+            for term in terms:
+                posting = self._postings.get(term)
+                if posting is not None:
+                    posting.pop(order_id, None)
+                    if not posting:
+                        del self._postings[term]
+        self._total_length -= self._lengths.pop(order_id, 0.0)
+        self._vocabulary = None
+        return doc
+
+    def _index_ticket(self, ticket: Dict, order_id: Optional[str] = None) -> bool:
+        """Index or re-index one raw ticket; the caller holds the lock.
+
+        Returns:
+            True if the index changed
+        """
+        summary = _unwrap(ticket).get('summary') or {}
+        order_id = normalize_order_id(order_id or summary.get('order_id'))
+        if not order_id:
+            return False
+
+        fields = extract_ticket_fields(ticket)
+        stamp = _ticket_stamp(ticket)
+        previous = self._docs.get(order_id)
+        if previous is not None and 'notes' not in fields:
+            if stamp is not None and previous.get('stamp') == stamp:
+                return False
+            # Ticket lists carry no notes; keep the ones indexed from the details
+            notes = previous['fields'].get('notes')
+        else:
+            notes = None
+
+        doc = {
+            'id': summary.get('id') or (previous or {}).get('id'),
+            'stamp': stamp,
+            'fields': {field: dict(Counter(tokenize(text))) for field, text in fields.items()},
+        }
+        if notes:
+            doc['fields']['notes'] = notes
+        doc['fields'] = {field: terms for field, terms in doc['fields'].items() if terms}
+        if (previous is not None and previous['fields'] == doc['fields']
+                and previous.get('id') == doc['id']):
+            previous['stamp'] = stamp
+            return False
+
+        self._drop(order_id)
+        self._insert(order_id, doc)
+        return True
+
+    def update(self, tickets: Iterable[Dict]) -> int:
+        """Index raw tickets, skipping the ones that did not change, and persist any changes.
+
+        Args:
+            tickets: Raw tickets with a 'summary' section, or stored detail responses
+
+        Returns:
+            Number of tickets added or re-indexed
+        """
+        self._ensure_loaded()
+        with self._lock:
+            changed = sum(1 for ticket in tickets
+                          if isinstance(ticket, dict) and self._index_ticket(ticket))
+            if changed:
+                self._schedule_save()
+                logger.debug(f"Re-indexed {changed} tickets for search")
+            return changed
+
+    def update_details(self, order_id: str, detail: Dict) -> bool:
+        """Index a ticket's stored details, including its notes.
+
+        Args:
+            order_id: Ticket number the details belong to
+            detail: Raw ticket detail response
+
+        Returns:
+            True if the index changed
+        """
+        if not isinstance(detail, dict):
+            return False
+        self._ensure_loaded()
+        with self._lock:
+            changed = self._index_ticket(detail, order_id=order_id)
+            if changed:
+                self._schedule_save()
+            return changed
+
+    def remove(self, ticket_number: Any) -> bool:
+        """Remove a ticket from the index.
+
+        Returns:
+            True if the ticket was indexed
+        """
+        order_id = normalize_order_id(ticket_number)
+        if not order_id:
+            return False
+        self._ensure_loaded()
+        with self._lock:
+            if self._drop(order_id) is None:
+                return False
+            self._schedule_save()
+            return True
+
+    def ticket_id(self, ticket_number: Any) -> Optional[int]:
+        """Get the internal RepairDesk ID recorded for an indexed ticket."""
+        self._ensure_loaded()
+        doc = self._docs.get(normalize_order_id(ticket_number) or '')
+        return doc.get('id') if doc else None
+
+    def __contains__(self, ticket_number: Any) -> bool:
+        self._ensure_loaded()
+        return (normalize_order_id(ticket_number) or '') in self._docs
+
+    def __len__(self) -> int:
+        self._ensure_loaded()
+        return len(self._docs)
+
+    def search(self, query: str, limit: Optional[int] = 50,
+               match_all: bool = True) -> List[Tuple[str, float]]:
+        """Find tickets matching a query, best first.
+
+        The last query term also matches terms it is a prefix of, so results
+        follow the query as it is typed.
+
+        Args:
+            query: Free-text query; common words are ignored unless the query
+                consists of nothing else
+            limit: Maximum number of results, or None for all
+            match_all: Only return tickets containing every query term;
+                otherwise any term matches and more matching terms rank higher
+
+        Returns:
+            (order_id, score) pairs
+        """
+        terms = list(dict.fromkeys(tokenize(query)))
+        meaningful = [term for term in terms if term not in STOPWORDS]
+        terms = meaningful or terms
+        if not terms:
+            return []
+
+        self._ensure_loaded()
+        with self._lock:
+            if not self._docs:
+                return []
+            # Each query term matches one or more index terms
+            expansions = [[term] for term in terms[:-1]] + [self._expand(terms[-1])]
+
+            doc_count = len(self._docs)
+            average_length = self._total_length / doc_count or 1.0
+            scores: Dict[str, float] = {}
+            matched = Counter()
+            for group in expansions:
+                group_scores: Dict[str, float] = {}
+                for term in group:
+                    posting = self._postings.get(term)
+                    if not posting:
+                        continue
+                    idf = math.log(1 + (doc_count - len(posting) + 0.5) / (len(posting) + 0.5))
+                    for order_id, frequency in posting.items():
+                        relative_length = self._lengths[order_id] / average_length
+                        norm = BM25_K1 * (1 - BM25_B + BM25_B * relative_length)
+                        score = idf * frequency * (BM25_K1 + 1) / (frequency + norm)
+                        if score > group_scores.get(order_id, 0.0):
+                            group_scores[order_id] = score
+                if match_all and not group_scores:
+                    return []
+                for order_id, score in group_scores.items():
+                    scores[order_id] = scores.get(order_id, 0.0) + score
+                    matched[order_id] += 1
+
+        if match_all:
+            results = [(order_id, score) for order_id, score in scores.items()
+                       if matched[order_id] == len(expansions)]
+            results.sort(key=lambda result: -result[1])
+        else:
+            results = sorted(scores.items(), key=lambda result: (-matched[result[0]], -result[1]))
+        return results[:limit] if limit is not None else results
+
+    def _expand(self, prefix: str) -> List[str]:
+        """Get the indexed terms starting with a prefix; the caller holds the lock."""
+        if self._vocabulary is None:
+            self._vocabulary = sorted(self._postings)
+        start = bisect.bisect_left(self._vocabulary, prefix)
+        terms = []
+        for term in self._vocabulary[start:start + MAX_PREFIX_EXPANSIONS]:
+            if not term.startswith(prefix):
+                break
+            terms.append(term)
+        return terms or [prefix]
+
+
+_index: Optional[TicketSearchIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_ticket_search_index() -> TicketSearchIndex:
+    """Get the process-wide ticket search index stored in the cache directory."""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                from nest.utils.platform_paths import PlatformPaths
+                platform_paths = PlatformPaths()
+                cache_dir = str(platform_paths.ensure_dir_exists(platform_paths.get_cache_dir()))
+                _index = TicketSearchIndex(
+                    os.path.join(cache_dir, TICKET_SEARCH_INDEX_FILE),
+                    ticket_cache_path=os.path.join(cache_dir, 'ticket_cache.json'),
+                )
+    return _index
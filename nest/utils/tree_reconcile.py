@@ -0,0 +1,135 @@
+"""
+Keyed reconciliation of Treeview rows.
+
+Refreshing a Treeview by deleting every item and inserting the rows again
+flickers, loses the scroll position and selection, and costs one Tk call per
+row even when nothing changed. TreeReconciler instead keeps a shadow copy of
+the values and tags it last wrote for each row. On refresh it diffs the new
+rows against that copy by key and only issues insert, item(..., values=),
+move and delete calls for the rows that actually changed.
+
+Items are created with their row key as the item ID, so other code can
+address a row directly with tree.item(str(key)).
+
+Reconciling is idempotent, so a large change can be spread over several
+frames: pass max_calls and reconcile the same rows again while the result
+reports that work is pending.
+"""
+
+import logging
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class ReconcileResult:
+    """Number of widget calls made by one reconciliation."""
+
+    def __init__(self, inserted: int = 0, updated: int = 0, moved: int = 0, deleted: int = 0):
+        self.inserted = inserted
+        self.updated = updated
+        self.moved = moved
+        self.deleted = deleted
+        self.pending = False  # Stopped at max_calls before the tree matched the rows
+
+    @property
+    def calls(self) -> int:
+        return self.inserted + self.updated + self.moved + self.deleted
+
+    def __bool__(self) -> bool:
+        return bool(self.inserted or self.updated or self.moved or self.deleted)
+
+    def __repr__(self) -> str:
+        return (f"<ReconcileResult +{self.inserted} ~{self.updated} "
+                f"moved {self.moved} -{self.deleted}{' pending' if self.pending else ''}>")
+
+
+class TreeReconciler:
+    """Applies row lists to a plain Treeview with the minimum number of widget calls."""
+
+    def __init__(self, tree, key: Callable[[Any], Any], values: Callable[[Any], tuple],
+                 tags: Optional[Callable[[Any], tuple]] = None):
+        """Initialize the reconciler.
+
+        Args:
+            tree: Treeview whose top-level items are managed
+            key: Returns a row's identity; later rows with a duplicate key are skipped
+            values: Returns the column values for a row
+            tags: Returns the tags for a row
+        """
+        self.tree = tree
+        self.key = key
+        self.values = values
+        self.tags = tags or (lambda row: ())
+
+        # item ID -> (values, tags) last written to the widget
+        self._shadow: Dict[str, Tuple[tuple, tuple]] = {}
+
+    def reconcile(self, rows: Iterable[Any], max_calls: Optional[int] = None) -> ReconcileResult:
+        """Make the tree show exactly the given rows, in order.
+
+        Items the reconciler did not create (such as a "Loading..." placeholder)
+        are deleted.
+
+        Args:
+            rows: Rows to show
+            max_calls: Stop once this many items were changed; reconcile
+                the same rows again to continue
+
+        Returns:
+            Counts of the insert, update, move and delete calls made
+        """
+        result = ReconcileResult()
+        target = []
+        rendered = {}
+        for row in rows:
+            iid = str(self.key(row))
+            if iid in rendered:
+                continue  # Item IDs must be unique; keep the first row with a key
+            target.append(iid)
+            rendered[iid] = (tuple(self.values(row)), tuple(self.tags(row)))
+
+        current = list(self.tree.get_children(''))
+        stale = [iid for iid in current if iid not in rendered]
+        if stale:
+            self.tree.delete(*stale)
+            result.deleted = len(stale)
+            for iid in stale:
+                self._shadow.pop(iid, None)
+            stale_set = set(stale)
+            current = [iid for iid in current if iid not in stale_set]
+
+        # Track the widget's order in Python so positions need no Tk queries
+        order = current
+        existing = set(order)
+        for index, iid in enumerate(target):
+            if max_calls is not None and result.calls >= max_calls:
+                result.pending = True
+                break
+            values, tags = rendered[iid]
+            if iid not in existing:
+                self.tree.insert('', index, iid=iid, values=values, tags=tags)
+                self._shadow[iid] = (values, tags)
+                order.insert(index, iid)
+                existing.add(iid)
+                result.inserted += 1
+                continue
+
+            if self._shadow.get(iid) != (values, tags):
+                self.tree.item(iid, values=values, tags=tags)
+                self._shadow[iid] = (values, tags)
+                result.updated += 1
+
+            if order[index] != iid:
+                self.tree.move(iid, '', index)
+                order.remove(iid)
+                order.insert(index, iid)
+                result.moved += 1
+
+        if result:
+            logger.debug(f"Reconciled tree: {result}")
+        return result
+
+    def forget(self) -> None:
+        """Drop the shadow copy, e.g. after the tree was cleared by other code."""
+        self._shadow.clear()
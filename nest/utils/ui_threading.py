@@ -3,13 +3,168 @@ Thread-safe UI update utilities for Nest application.
 
 Provides standardized patterns for updating UI elements from background threads
 to ensure consistent behavior across all modules.
+
+Chatty producers (a log stream, progressive system info, paged loads) should
+use coalesced_update() or batched_update() instead of one safe_update() per
+item. Those go through a UIUpdateScheduler per Tk root, which keeps only the
+latest update per key (or collects items per key into one batch) and runs
+them once per frame within a time budget, so the event queue never fills up
+with thousands of pending callbacks.
 """
 
 import logging
-from typing import Callable, Any, Optional
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Callable, Any, Hashable, List, Optional
 
 logger = logging.getLogger(__name__)
 
+FRAME_INTERVAL_MS = 16
+FRAME_BUDGET_MS = 8
+
+
+def _tk_root(widget_or_app):
+    """Get the Tk root of a widget, or of an app holding one as 'root' or 'app'."""
+    for candidate in (widget_or_app, getattr(widget_or_app, 'root', None),
+                      getattr(widget_or_app, 'app', None)):
+        if candidate is not None and hasattr(candidate, '_root') and hasattr(candidate, 'after'):
+            return candidate._root()
+    return None
+
+
+class UIUpdateScheduler:
+    """Coalesces UI updates per key and runs them in frame-sized batches on the Tk thread."""
+    
+    def __init__(self, root, interval_ms: int = FRAME_INTERVAL_MS,
+                 budget_ms: int = FRAME_BUDGET_MS):
+        """
+        Initialize the scheduler.
+        
+        Args:
+            root: Tk root whose event loop runs the updates
+            interval_ms: Delay between flushes
+            budget_ms: Time a flush may spend before deferring the rest to the next frame
+        """
+        self.root = root
+        self.interval_ms = interval_ms
+        self.budget = budget_ms / 1000.0
+        
+        # key -> callback, or key -> (handler, items) for batches; insertion order is run order
+        self._pending: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._armed = False
+    
+    def submit(self, key: Hashable, callback: Callable[[], None]) -> None:
+        """
+        Queue an update, replacing any update still pending under the same key.
+        
+        The replacement moves to the back of the queue, so it still runs after
+        the updates submitted before it.
+        
+        Args:
+            key: Identifies what the update targets
+            callback: Function to execute on the main thread
+        """
+        with self._lock:
+            self._pending[key] = callback
+            self._pending.move_to_end(key)
+            self._arm()
+    
+    def submit_batch(self, key: Hashable, item: Any, handler: Callable[[List[Any]], None]) -> None:
+        """
+        Queue an item; all items pending under a key are passed to the handler in one call.
+        
+        Args:
+            key: Identifies the batch
+            item: Item to add to the batch
+            handler: Called on the main thread with the list of items, oldest first
+        """
+        with self._lock:
+            pending = self._pending.get(key)
+            if isinstance(pending, tuple):
+                pending[1].append(item)
+            else:
+                self._pending[key] = (handler, [item])
+            self._arm()
+    
+    def pending(self) -> int:
+        """Get the number of keys with updates waiting to run."""
+        with self._lock:
+            return len(self._pending)
+    
+    def _arm(self) -> None:
+        """Schedule a flush if none is scheduled; the caller holds the lock."""
+        if self._armed:
+            return
+        try:
+            self.root.after(self.interval_ms, self._flush)
+            self._armed = True
+        except Exception as e:
+            # The root was destroyed; nothing can be shown anymore
+            logger.debug(f"Dropping UI updates, scheduling failed: {e}")
+            self._pending.clear()
+    
+    def _flush(self) -> None:
+        """Run pending updates until the frame budget is used up."""
+        deadline = time.perf_counter() + self.budget
+        while True:
+            with self._lock:
+                if not self._pending:
+                    self._armed = False
+                    return
+                if time.perf_counter() >= deadline:
+                    # Let Tk handle input and redraw before continuing
+                    self._armed = False
+                    self._arm()
+                    return
+                _, update = self._pending.popitem(last=False)
+            
+            try:
+                if isinstance(update, tuple):
+                    handler, items = update
+                    handler(items)
+                else:
+                    update()
+            except Exception as e:
+                logger.error(f"Error in coalesced UI update: {e}")
+
+
+_schedulers: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_schedulers_lock = threading.Lock()
+
+
+def get_ui_scheduler(widget_or_app) -> Optional[UIUpdateScheduler]:
+    """
+    Get the update scheduler of a widget's Tk root.
+    
+    Frame pacing can be tuned in the "ui_updates" section of config.json,
+    e.g. {"frame_interval_ms": 33, "frame_budget_ms": 12}.
+    
+    Returns:
+        The scheduler, or None if the widget has no Tk root
+    """
+    root = _tk_root(widget_or_app)
+    if root is None:
+        return None
+    with _schedulers_lock:
+        scheduler = _schedulers.get(root)
+        if scheduler is None:
+            try:
+                from nest.utils.config_util import load_config
+                settings = load_config().get("ui_updates", {}) or {}
+            except Exception:
+                settings = {}
+            scheduler = UIUpdateScheduler(
+                root,
+                interval_ms=settings.get("frame_interval_ms", FRAME_INTERVAL_MS),
+                budget_ms=settings.get("frame_budget_ms", FRAME_BUDGET_MS),
+            )
+            _schedulers[root] = scheduler
+        return scheduler
+
+
 class ThreadSafeUIUpdater:
     """Utility class for thread-safe UI updates."""
     
@@ -74,4 +229,46 @@ class ThreadSafeUIUpdater:
             except Exception as e:
                 logging.error(f"Error updating progress indicators: {e}")
         
-        ThreadSafeUIUpdater.safe_update(widget_or_app, update_callback)
+        # Only the latest progress matters, so updates to the same indicators coalesce
+        ThreadSafeUIUpdater.coalesced_update(
+            widget_or_app, ('progress', id(progress_var), id(message_var)), update_callback
+        )
+    
+    @staticmethod
+    def coalesced_update(widget_or_app, key: Hashable, callback: Callable[[], None]) -> None:
+        """
+        Schedule a UI update that supersedes any pending update with the same key.
+        
+        Use this for updates where only the latest value matters, such as a
+        status label or progress value.
+        
+        Args:
+            widget_or_app: Widget or app instance; keys are scoped to it
+            key: Identifies what the update targets
+            callback: Function to execute on main thread
+        """
+        scheduler = get_ui_scheduler(widget_or_app)
+        if scheduler is None:
+            ThreadSafeUIUpdater.safe_update(widget_or_app, callback)
+            return
+        scheduler.submit((id(widget_or_app), key), callback)
+    
+    @staticmethod
+    def batched_update(widget_or_app, key: Hashable, item: Any,
+                       handler: Callable[[List[Any]], None]) -> None:
+        """
+        Queue an item for a UI update that handles all pending items at once.
+        
+        Use this for streams where every item matters, such as log lines.
+        
+        Args:
+            widget_or_app: Widget or app instance; keys are scoped to it
+            key: Identifies the batch
+            item: Item to add
+            handler: Function executed on main thread with the list of pending items
+        """
+        scheduler = get_ui_scheduler(widget_or_app)
+        if scheduler is None:
+            ThreadSafeUIUpdater.safe_update(widget_or_app, lambda: handler([item]))
+            return
+        scheduler.submit_batch((id(widget_or_app), key), item, handler)
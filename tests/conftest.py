@@ -0,0 +1,25 @@
+"""Shared fixtures for the Nest unit tests."""
+
+import os
+import tempfile
+
+import pytest
+
+# Keep config, cache and data directories out of the real home directory. This
+# runs before the test modules are imported, since some modules read the
+# config (and write a default one) at import time.
+_HOME = tempfile.mkdtemp(prefix="nest-tests-")
+os.environ["HOME"] = _HOME
+os.environ["APPDATA"] = os.path.join(_HOME, "AppData", "Roaming")
+os.environ["LOCALAPPDATA"] = os.path.join(_HOME, "AppData", "Local")
+
+from nest.utils import cache_io  # noqa: E402
+
+
+@pytest.fixture(autouse=True)
+def plain_cache_format(monkeypatch):
+    """Pin the cache file format so tests never depend on config.json."""
+    monkeypatch.setattr(cache_io, "_settings", {
+        'codec': cache_io.CODEC_JSON,
+        'compression': cache_io.COMPRESSION_NONE,
+    })
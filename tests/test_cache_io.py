@@ -0,0 +1,93 @@
+"""Tests for versioned, atomically written cache files."""
+
+import json
+import os
+
+import pytest
+
+from nest.utils import cache_io
+from nest.utils.cache_io import (
+    CACHE_FORMAT_VERSION,
+    CacheFormatError,
+    decode_cache_data,
+    encode_cache_data,
+    read_cache_file,
+    write_cache_file,
+)
+
+DATA = {'items': [{'id': 1, 'name': 'Pixel 7'}, {'id': 2, 'name': 'iPhone 13'}], 'count': 2}
+
+
+class TestEncoding:
+    @pytest.mark.parametrize('compression', [cache_io.COMPRESSION_NONE, cache_io.COMPRESSION_ZLIB])
+    def test_round_trip(self, compression):
+        raw = encode_cache_data(DATA, codec=cache_io.CODEC_JSON, compression=compression)
+
+        assert raw.startswith(f'NESTCACHE/{CACHE_FORMAT_VERSION} codec=json'.encode())
+        assert decode_cache_data(raw) == DATA
+
+    def test_reads_legacy_plain_json(self):
+        assert decode_cache_data(json.dumps(DATA, indent=2).encode('utf-8')) == DATA
+
+    def test_rejects_newer_version(self):
+        raw = encode_cache_data(DATA).replace(b'NESTCACHE/1', b'NESTCACHE/99', 1)
+
+        with pytest.raises(CacheFormatError, match='newer'):
+            decode_cache_data(raw)
+
+    @pytest.mark.parametrize('raw', [
+        b'NESTCACHE/1 codec=json compression=zlib\nnot zlib',
+        b'NESTCACHE/1 codec=json compression=none\n{"items": [',
+        b'NESTCACHE/1 codec=json',
+        b'{"truncated": ',
+    ])
+    def test_rejects_corrupt_data(self, raw):
+        with pytest.raises(CacheFormatError):
+            decode_cache_data(raw)
+
+    def test_rejects_unknown_compression(self):
+        with pytest.raises(ValueError):
+            encode_cache_data(DATA, compression='lz4')
+
+
+class TestCacheFiles:
+    def test_write_and_read(self, tmp_path):
+        path = str(tmp_path / 'nested' / 'cache.json')
+
+        write_cache_file(path, DATA)
+
+        assert read_cache_file(path) == DATA
+
+    def test_read_legacy_file(self, tmp_path):
+        path = tmp_path / 'ticket_cache.json'
+        path.write_text(json.dumps([{'id': 1}]))
+
+        assert read_cache_file(str(path)) == [{'id': 1}]
+
+    def test_missing_file_returns_default(self, tmp_path):
+        assert read_cache_file(str(tmp_path / 'missing.json')) is None
+        assert read_cache_file(str(tmp_path / 'missing.json'), default=[]) == []
+
+    def test_failed_write_keeps_previous_file(self, tmp_path, monkeypatch):
+        path = str(tmp_path / 'cache.json')
+        write_cache_file(path, DATA)
+
+        def fail(fd):
+            raise OSError('disk full')
+
+        monkeypatch.setattr(cache_io.os, 'fsync', fail)
+        with pytest.raises(OSError):
+            write_cache_file(path, {'items': []})
+
+        assert read_cache_file(path) == DATA
+        assert os.listdir(tmp_path) == ['cache.json']
+
+    def test_failed_encode_keeps_previous_file(self, tmp_path):
+        path = str(tmp_path / 'cache.json')
+        write_cache_file(path, DATA)
+
+        with pytest.raises(ValueError):
+            write_cache_file(path, {'items': []}, compression='lz4')
+
+        assert read_cache_file(path) == DATA
+        assert os.listdir(tmp_path) == ['cache.json']
@@ -0,0 +1,131 @@
+"""Tests for the LRU caches and the shared memory budget."""
+
+import pytest
+
+from nest.utils import cache_manager
+from nest.utils.cache_manager import CacheManager, ManagedCache
+
+
+def make_cache(manager, name='test', ttl=None):
+    # Every value counts as its length in bytes
+    return ManagedCache(name, sizer=len, ttl=ttl, manager=manager)
+
+
+@pytest.fixture
+def manager():
+    return CacheManager(max_bytes=100)
+
+
+class TestManagedCache:
+    def test_hits_and_misses(self, manager):
+        cache = make_cache(manager)
+        cache['a'] = 'xx'
+
+        assert cache['a'] == 'xx'
+        assert cache.get('b') is None
+        assert 'a' in cache
+        assert cache.stats()['hits'] == 1
+        assert cache.stats()['misses'] == 1
+        assert cache.stats()['hit_rate'] == 0.5
+
+    def test_size_accounting(self, manager):
+        cache = make_cache(manager)
+        cache['a'] = 'x' * 10
+        cache['b'] = 'x' * 20
+        cache['a'] = 'x' * 5
+        assert cache.size_bytes() == 25
+
+        del cache['b']
+        assert cache.size_bytes() == 5
+        cache.clear()
+        assert cache.size_bytes() == 0
+        assert len(cache) == 0
+
+    def test_evicts_least_recently_used(self, manager):
+        cache = make_cache(manager)
+        for key in 'abc':
+            cache[key] = 'x'
+        assert cache['a'] == 'x'  # Refreshes recency
+
+        cache.evict_oldest()
+
+        assert list(cache) == ['c', 'a']
+        assert cache.stats()['evictions'] == 1
+
+    def test_membership_does_not_refresh_recency(self, manager):
+        cache = make_cache(manager)
+        cache['a'] = 'x'
+        cache['b'] = 'x'
+        assert 'a' in cache
+
+        cache.evict_oldest()
+
+        assert list(cache) == ['b']
+
+    def test_ttl_expiry(self, manager, monkeypatch):
+        now = [1000.0]
+        monkeypatch.setattr(cache_manager.time, 'time', lambda: now[0])
+        cache = make_cache(manager, ttl=60)
+        cache['a'] = 'xx'
+        cache['b'] = 'xx'
+
+        now[0] += 60
+        assert 'a' not in cache
+        with pytest.raises(KeyError):
+            cache['a']
+        assert cache.size_bytes() == 2
+        assert cache.purge_expired() == 1
+        assert cache.size_bytes() == 0
+
+
+class TestCacheManager:
+    def test_budget_evicts_across_caches(self, manager):
+        first = make_cache(manager, 'first')
+        second = make_cache(manager, 'second')
+        first['old'] = 'x' * 40
+        second['a'] = 'x' * 40
+        first['recent'] = 'x' * 10
+        assert manager.total_bytes() == 90
+
+        second['b'] = 'x' * 40
+
+        # The oldest entry overall goes first, whichever cache holds it
+        assert list(first) == ['recent']
+        assert list(second) == ['a', 'b']
+        assert manager.total_bytes() == 90
+        assert manager.stats()['budget_evictions'] == 1
+
+    def test_oversized_entry_empties_caches(self, manager):
+        cache = make_cache(manager)
+        cache['a'] = 'x' * 10
+
+        cache['big'] = 'x' * 200
+
+        assert len(cache) == 0
+        assert manager.total_bytes() == 0
+
+    def test_stats(self, manager):
+        cache = make_cache(manager, 'responses')
+        cache['a'] = 'x' * 10
+        assert cache['a'] == 'x' * 10
+        cache.get('missing')
+
+        stats = manager.stats()
+
+        assert stats['caches']['responses']['entries'] == 1
+        assert stats['total_bytes'] == 10
+        assert stats['max_bytes'] == 100
+        assert stats['hit_rate'] == 0.5
+
+    def test_registers_each_cache_once(self, manager):
+        cache = make_cache(manager)
+        manager.register(cache)
+
+        assert manager.caches() == [cache]
+        manager.unregister(cache)
+        assert manager.caches() == []
+
+    def test_discarded_caches_drop_out(self, manager):
+        make_cache(manager)
+
+        assert manager.caches() == []
@@ -0,0 +1,110 @@
+"""Tests for the customer search index and the background search worker."""
+
+import threading
+
+import pytest
+
+from nest.utils.customer_search import CustomerSearchIndex, SearchWorker, normalize_phone
+
+
+def customer(cid, name, email='', mobile=''):
+    return {'cid': cid, 'fullName': name, 'email': email, 'mobile': mobile}
+
+
+@pytest.fixture
+def index():
+    index = CustomerSearchIndex()
+    index.build([
+        customer(1, 'Alice Johnson', 'alice@example.com', '(555) 123-4567'),
+        customer(2, 'Bob Alison', 'bob.alison@mail.net', '555 987 6543'),
+        customer(3, 'Carol Smith', 'carol@example.org', '+1 555-222-3333'),
+    ])
+    return index
+
+
+def cids(customers):
+    return [c['cid'] for c in customers]
+
+
+class TestCustomerSearchIndex:
+    def test_normalize_phone(self):
+        assert normalize_phone('(555) 123-4567') == '5551234567'
+        assert normalize_phone(None) == ''
+
+    def test_phone_lookup_ignores_formatting(self, index):
+        assert cids(index.search('555-123-4567')) == [1]
+        assert cids(index.search('987 65')) == [2]
+        assert cids(index.search('555')) == [1, 2, 3]
+
+    def test_short_queries_match_word_prefixes(self, index):
+        assert cids(index.search('al')) == [1, 2]
+        assert cids(index.search('sm')) == [3]
+        assert index.search('ic') == []
+
+    def test_substring_queries_use_trigrams(self, index):
+        assert cids(index.search('lison')) == [2]
+        assert cids(index.search('EXAMPLE')) == [1, 3]
+        assert cids(index.search('ali')) == [1, 2]
+
+    def test_fuzzy_fallback_ranks_by_shared_trigrams(self, index):
+        assert cids(index.search('johnsen')) == [1]
+        assert index.search('zzzzzz') == []
+
+    def test_updates_keep_load_order(self, index):
+        index.add([customer(1, 'Alice Carter', 'alice@example.com')])
+
+        assert cids(index.search('carter')) == [1]
+        assert index.search('johnson') == []
+        # The updated customer keeps its original position
+        assert cids(index.search('al')) == [1, 2]
+
+    def test_remove(self, index):
+        assert index.remove(2)
+        assert not index.remove(2)
+        assert cids(index.search('al')) == [1]
+        assert len(index) == 2
+
+
+class TestSearchWorker:
+    def test_discards_results_of_superseded_queries(self):
+        started = threading.Event()
+        release = threading.Event()
+        done = threading.Event()
+        results = []
+
+        def search(query):
+            if query == 'slow':
+                started.set()
+                release.wait(5)
+            return query.upper()
+
+        def on_result(generation, result):
+            results.append((generation, result))
+            if result == 'FAST':
+                done.set()
+
+        worker = SearchWorker(search)
+        try:
+            first = worker.submit('slow', on_result)
+            assert started.wait(5)
+            second = worker.submit('fast', on_result)
+            assert not worker.is_current(first) and worker.is_current(second)
+            release.set()
+
+            assert done.wait(5)
+            assert results == [(second, 'FAST')]
+        finally:
+            worker.stop(timeout=5)
+
+    def test_stop_ends_the_thread(self):
+        done = threading.Event()
+        worker = SearchWorker(lambda query: query)
+        worker.submit('a', lambda generation, result: done.set())
+        assert done.wait(5)
+        thread = worker._thread
+
+        worker.stop(timeout=5)
+
+        assert not thread.is_alive()
+        worker.submit('b', lambda generation, result: pytest.fail('worker was stopped'))
+        assert worker._thread is thread
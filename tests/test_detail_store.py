@@ -0,0 +1,147 @@
+"""Tests for the append-only ticket detail store."""
+
+import json
+import os
+
+import pytest
+
+from nest.utils.detail_store import DetailStore
+
+
+def detail(order_id, note='Screen replaced'):
+    return {'data': {'summary': {'order_id': order_id}, 'notes': [{'msg_text': note}]}}
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'ticket_details.seg')
+
+
+@pytest.fixture
+def store(path):
+    store = DetailStore(path)
+    yield store
+    store.close()
+
+
+class TestDetailStore:
+    def test_put_get_delete(self, store):
+        store.put('T-1', detail('T-1'))
+        store.put('T-2', detail('T-2'))
+        store.put('T-1', detail('T-1', 'Battery replaced'))
+
+        assert store.get('T-1') == detail('T-1', 'Battery replaced')
+        assert store.get('T-3') is None
+        assert store.written_at('T-2') is not None
+        assert sorted(store.keys()) == ['T-1', 'T-2']
+
+        assert store.delete('T-2')
+        assert not store.delete('T-2')
+        assert 'T-2' not in store
+        assert len(store) == 1
+
+    def test_reopen_keeps_latest_records(self, path, store):
+        store.put('T-1', detail('T-1'))
+        store.put('T-2', detail('T-2'))
+        store.put('T-1', detail('T-1', 'Battery replaced'))
+        store.delete('T-2')
+        store.close()
+
+        reopened = DetailStore(path)
+        try:
+            assert reopened.keys() == ['T-1']
+            assert reopened.get('T-1') == detail('T-1', 'Battery replaced')
+        finally:
+            reopened.close()
+
+    def test_reopen_drops_torn_tail(self, path, store):
+        store.put('T-1', detail('T-1'))
+        store.put('T-2', detail('T-2'))
+        store.close()
+        # Simulate a crash in the middle of the last append
+        size = os.path.getsize(path)
+        with open(path, 'r+b') as f:
+            f.truncate(size - 5)
+
+        reopened = DetailStore(path)
+        try:
+            assert reopened.keys() == ['T-1']
+            reopened.put('T-3', detail('T-3'))
+            assert reopened.get('T-3') == detail('T-3')
+        finally:
+            reopened.close()
+
+        reopened = DetailStore(path)
+        try:
+            assert sorted(reopened.keys()) == ['T-1', 'T-3']
+        finally:
+            reopened.close()
+
+    def test_reopen_skips_corrupt_record_in_the_middle(self, path, store):
+        store.put('T-1', detail('T-1'))
+        middle = store.size_bytes()
+        store.put('T-2', detail('T-2'))
+        store.put('T-3', detail('T-3'))
+        store.close()
+        with open(path, 'r+b') as f:
+            f.seek(middle)
+            f.write(b'XXXX')
+
+        reopened = DetailStore(path)
+        try:
+            assert sorted(reopened.keys()) == ['T-1', 'T-3']
+            assert reopened.get('T-3') == detail('T-3')
+            reopened.put('T-4', detail('T-4'))
+        finally:
+            reopened.close()
+
+        # The damaged bytes were compacted away, so a second open finds no corruption
+        reopened = DetailStore(path)
+        try:
+            assert sorted(reopened.keys()) == ['T-1', 'T-3', 'T-4']
+            assert reopened.get('T-1') == detail('T-1')
+        finally:
+            reopened.close()
+
+    def test_corrupt_record_is_dropped(self, path, store):
+        store.put('T-1', detail('T-1'))
+        with open(path, 'r+b') as f:
+            f.seek(-3, os.SEEK_END)
+            f.write(b'XXX')
+
+        assert store.get('T-1') is None
+        assert 'T-1' not in store
+
+    def test_compact_keeps_live_records(self, store):
+        for i in range(20):
+            store.put(f'T-{i % 4}', detail(f'T-{i % 4}', f'Note {i}'))
+        store.delete('T-3')
+        before = store.size_bytes()
+
+        store.compact()
+
+        assert store.size_bytes() < before
+        assert sorted(store.keys()) == ['T-0', 'T-1', 'T-2']
+        assert store.get('T-2') == detail('T-2', 'Note 18')
+        store.put('T-4', detail('T-4'))
+        assert store.get('T-4') == detail('T-4')
+
+    def test_compacts_automatically(self, path):
+        store = DetailStore(path, compact_ratio=0.5, compact_min_bytes=1)
+        try:
+            for i in range(10):
+                store.put('T-1', detail('T-1', f'Note {i}'))
+
+            # Without compaction the segment would hold all ten records
+            assert store.size_bytes() <= 2 * store._live_bytes
+            assert store.get('T-1') == detail('T-1', 'Note 9')
+        finally:
+            store.close()
+
+    def test_imports_legacy_files(self, tmp_path, store):
+        legacy = tmp_path / 'ticket_detail_T-7.json'
+        legacy.write_text(json.dumps(detail('T-7')))
+
+        assert store.import_files(str(tmp_path)) == 1
+        assert store.get('T-7') == detail('T-7')
+        assert not legacy.exists()
@@ -0,0 +1,164 @@
+"""Tests for the shared pooled HTTP transport."""
+
+import threading
+
+import pytest
+import requests
+
+from nest.utils import http_transport
+from nest.utils.http_transport import HTTPTransport
+
+
+class FakeSession:
+    """Records requests instead of sending them."""
+
+    instances = 0
+
+    def __init__(self):
+        FakeSession.instances += 1
+        self.calls = []
+        self.closed = False
+
+    def mount(self, prefix, adapter):
+        pass
+
+    def request(self, method, url, timeout=None, **kwargs):
+        self.calls.append((method, url, timeout, kwargs))
+        response = requests.Response()
+        response.status_code = 200
+        return response
+
+    def close(self):
+        self.closed = True
+
+
+class RecordingLimiter:
+    def __init__(self, events):
+        self.events = events
+
+    def acquire(self):
+        self.events.append('acquire')
+
+    def observe(self, response):
+        self.events.append(('observe', response.status_code))
+
+
+@pytest.fixture
+def fake_session(monkeypatch):
+    FakeSession.instances = 0
+    monkeypatch.setattr(http_transport.requests, 'Session', FakeSession)
+    return FakeSession
+
+
+@pytest.fixture
+def limited(monkeypatch):
+    """Route every host to one recording limiter."""
+    events = []
+    urls = []
+
+    def get_rate_limiter(url):
+        urls.append(url)
+        return RecordingLimiter(events)
+
+    monkeypatch.setattr(http_transport, 'get_rate_limiter', get_rate_limiter)
+    return events, urls
+
+
+class TestSession:
+    def test_one_session_is_shared_across_threads(self, fake_session):
+        transport = HTTPTransport()
+        sessions = []
+        start = threading.Barrier(8)
+
+        def use():
+            start.wait()
+            sessions.append(transport.session)
+
+        workers = [threading.Thread(target=use) for _ in range(8)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        assert fake_session.instances == 1
+        assert all(session is sessions[0] for session in sessions)
+
+    def test_requests_reuse_the_session(self, fake_session, limited):
+        transport = HTTPTransport()
+
+        transport.get('https://api.repairdesk.co/api/web/v1/tickets')
+        transport.post('https://api.repairdesk.co/api/web/v1/tickets/1/notes', json={'a': 1})
+
+        assert fake_session.instances == 1
+        assert [call[0] for call in transport.session.calls] == ['GET', 'POST']
+
+    def test_close_releases_the_session(self, fake_session):
+        transport = HTTPTransport()
+        session = transport.session
+
+        transport.close()
+
+        assert session.closed
+        assert transport.session is not session
+
+    def test_process_transport_is_shared(self, monkeypatch):
+        monkeypatch.setattr(http_transport, '_transport', None)
+        monkeypatch.setattr(http_transport, '_load_transport_settings', lambda: {})
+
+        assert http_transport.get_transport() is http_transport.get_transport()
+
+    def test_configure_transport_replaces_and_closes(self, fake_session, monkeypatch):
+        monkeypatch.setattr(http_transport, '_transport', None)
+        monkeypatch.setattr(http_transport, '_load_transport_settings', lambda: {})
+        old = http_transport.get_transport()
+        old_session = old.session
+
+        new = http_transport.configure_transport(read_timeout=5)
+
+        assert http_transport.get_transport() is new
+        assert old_session.closed
+        assert new.default_timeout() == (http_transport.DEFAULT_CONNECT_TIMEOUT, 5)
+
+
+class TestAdapters:
+    @pytest.mark.parametrize('url', ['https://api.repairdesk.co/api/web/v1/tickets',
+                                     'https://example.com/', 'http://example.com/'])
+    def test_adapters_never_retry(self, url):
+        adapter = HTTPTransport().session.get_adapter(url)
+
+        assert adapter.max_retries.total == 0
+
+    def test_pool_sizes_per_host(self):
+        transport = HTTPTransport(pool_maxsize=4, host_pool_sizes={'https://other.test/': 2})
+        session = transport.session
+
+        assert session.get_adapter('https://api.repairdesk.co/x')._pool_maxsize == 16
+        assert session.get_adapter('https://other.test/x')._pool_maxsize == 2
+        assert session.get_adapter('https://example.com/x')._pool_maxsize == 4
+
+
+class TestRateLimiting:
+    def test_limiter_hooks_surround_the_request(self, fake_session, limited, monkeypatch):
+        events, urls = limited
+        transport = HTTPTransport()
+        session = transport.session
+        send = session.request
+
+        def request(*args, **kwargs):
+            events.append('send')
+            return send(*args, **kwargs)
+
+        monkeypatch.setattr(session, 'request', request)
+
+        transport.get('https://api.repairdesk.co/api/web/v1/tickets')
+
+        assert events == ['acquire', 'send', ('observe', 200)]
+        assert urls == ['https://api.repairdesk.co/api/web/v1/tickets']
+
+    def test_default_and_explicit_timeouts(self, fake_session, limited):
+        transport = HTTPTransport(connect_timeout=2, read_timeout=9)
+
+        transport.get('https://api.repairdesk.co/a')
+        transport.get('https://api.repairdesk.co/b', timeout=1)
+
+        assert [call[2] for call in transport.session.calls] == [(2, 9), 1]
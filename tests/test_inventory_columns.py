@@ -0,0 +1,103 @@
+"""Tests for the columnar inventory filter and sort engine."""
+
+from nest.utils.inventory_columns import (
+    STATUS_IN_STOCK,
+    STATUS_LOW_STOCK,
+    STATUS_OUT_OF_STOCK,
+    InventoryColumns,
+)
+
+
+def item(item_id, name, quantity=10, threshold=None, price=0, category=None, type_id='1',
+         **fields):
+    result = {'id': item_id, 'name': name, 'quantity': quantity, 'price': price,
+              'type_id': type_id, **fields}
+    if threshold is not None:
+        result['low_stock_threshold'] = threshold
+    if category is not None:
+        result['category'] = {'name': category}
+    return result
+
+
+def ids(view):
+    return [entry['id'] for entry in view]
+
+
+class TestInventoryColumns:
+    def test_stock_status_boundaries(self):
+        columns = InventoryColumns([
+            item(1, 'Above', quantity=6),
+            item(2, 'At default threshold', quantity=5),
+            item(3, 'At custom threshold', quantity=2, threshold=2),
+            item(4, 'Empty', quantity=0),
+            item(5, 'Oversold', quantity=-1),
+            item(6, 'Unparseable', quantity='n/a'),
+            item(7, 'Zero threshold', quantity=1, threshold=0),
+        ])
+
+        def matching(status):
+            return [i + 1 for i, selected in enumerate(columns.mask(status=status)) if selected]
+
+        assert matching(STATUS_IN_STOCK) == [1, 7]
+        assert matching(STATUS_LOW_STOCK) == [2, 3]
+        assert matching(STATUS_OUT_OF_STOCK) == [4, 5, 6]
+        assert matching(None) == [1, 2, 3, 4, 5, 6, 7]
+
+    def test_category_filters(self):
+        columns = InventoryColumns([
+            item(1, 'Screen', category='Parts'),
+            item(2, 'Repair', category='Labour'),
+            item(3, 'Cable'),
+            item(4, 'Legacy', category_name='Parts'),
+        ])
+
+        assert columns.category_names() == ['Labour', 'Parts']
+        assert ids(columns.query(sort_field='id', category='Parts')) == [1, 4]
+        assert ids(columns.query(sort_field='id', category='')) == [3]
+        assert ids(columns.query(sort_field='id', category='Missing')) == []
+        assert ids(columns.query(sort_field='id', category='parts')) == []
+
+    def test_search_and_type_filters(self):
+        columns = InventoryColumns([
+            item(1, 'iPhone Screen', sku='IP-SCR'),
+            item(2, 'Battery', notes='Fits iPhone 12'),
+            item(3, 'Screen repair', type_id='2'),
+        ])
+
+        assert ids(columns.query(sort_field='id', search='IPHONE')) == [1, 2]
+        assert ids(columns.query(sort_field='id', search='screen', type_id='2')) == [3]
+        # Search terms never match across field boundaries
+        assert ids(columns.query(sort_field='id', search='screenip')) == []
+
+    def test_query_sorts_numerically_and_by_text(self):
+        columns = InventoryColumns([
+            item(1, 'banana', price='10'),
+            item(2, 'Apple', price='9.5'),
+            item(3, 'cherry', price=''),
+        ])
+
+        assert ids(columns.query(sort_field='price')) == [3, 2, 1]
+        assert ids(columns.query(sort_field='price', descending=True)) == [1, 2, 3]
+        assert ids(columns.query(sort_field='name')) == [2, 1, 3]
+
+    def test_view_slices_lazily(self):
+        columns = InventoryColumns([item(i, f'Item {i}') for i in range(5)])
+
+        view = columns.query(sort_field='id', descending=True)
+
+        assert len(view) == 5
+        assert [entry['id'] for entry in view[:2]] == [4, 3]
+        assert view[-1]['id'] == 0
+
+    def test_extend_invalidates_cached_orders(self):
+        items = [item(1, 'Cable', price=5), item(2, 'Adapter', price=20)]
+        columns = InventoryColumns(items)
+        assert ids(columns.query(sort_field='price')) == [1, 2]
+
+        columns.extend([item(3, 'Battery', price=1, category='Parts')])
+
+        assert len(items) == 3
+        assert ids(columns.query(sort_field='price')) == [3, 1, 2]
+        assert ids(columns.query(sort_field='name')) == [2, 3, 1]
+        assert columns.category_names() == ['Parts']
+        assert ids(columns.query(sort_field='id', category='Parts')) == [3]
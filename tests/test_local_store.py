@@ -0,0 +1,158 @@
+"""Tests for the SQLite store behind the local caches."""
+
+import json
+import sqlite3
+
+import pytest
+
+from nest.utils.local_store import SCHEMA_VERSION, LocalStore, technician_key
+
+
+def make_ticket(ticket_id, technician='Sam Lee', status='Open', created=None, updated=None):
+    summary = {'id': ticket_id, 'order_id': f'T-{ticket_id}', 'status': status,
+               'created_date': created if created is not None else ticket_id}
+    if updated is not None:
+        summary['last_updated'] = updated
+    return {'summary': summary, 'devices': [{'assigned_to': {'fullname': technician}}]}
+
+
+def make_customer(customer_id, name):
+    return {'cid': customer_id, 'fullName': name, 'email': f'{customer_id}@example.com'}
+
+
+@pytest.fixture
+def db_path(tmp_path):
+    return str(tmp_path / 'store' / 'local.db')
+
+
+@pytest.fixture
+def store(db_path):
+    store = LocalStore(db_path)
+    yield store
+    store.close()
+
+
+def order_ids(tickets):
+    return [ticket['summary']['order_id'] for ticket in tickets]
+
+
+class TestTechnicianKey:
+    @pytest.mark.parametrize('name', ["Codey O'Connor", 'codey  o connor', ' CODEY O-CONNOR '])
+    def test_ignores_case_punctuation_and_spacing(self, name):
+        assert technician_key(name) == 'codey o connor'
+
+    @pytest.mark.parametrize('name', [None, '', '  '])
+    def test_empty_names(self, name):
+        assert technician_key(name) == ''
+
+    def test_different_names_do_not_match(self):
+        assert technician_key('Sam Lee') != technician_key('Sam Leeds')
+
+
+class TestTickets:
+    def test_upsert_updates_in_place(self, store):
+        store.upsert_tickets([make_ticket(1), make_ticket(2)])
+
+        store.upsert_tickets([make_ticket(2, status='Repaired')])
+
+        assert store.count_tickets() == 2
+        assert store.get_ticket(order_id='T-2')['summary']['status'] == 'Repaired'
+        assert store.get_ticket(ticket_id='1')['summary']['status'] == 'Open'
+
+    def test_delta_keeps_tickets_that_did_not_change(self, store):
+        store.upsert_tickets([make_ticket(i) for i in range(1, 4)], replace=True)
+
+        assert store.upsert_tickets([make_ticket(4)]) == 1
+
+        assert order_ids(store.query_tickets(newest_first=False)) == ['T-1', 'T-2', 'T-3', 'T-4']
+
+    def test_replace_drops_other_tickets(self, store):
+        store.upsert_tickets([make_ticket(i) for i in range(1, 4)])
+
+        store.upsert_tickets([make_ticket(5)], replace=True)
+
+        assert order_ids(store.query_tickets()) == ['T-5']
+
+    def test_skips_tickets_without_an_id(self, store):
+        written = store.upsert_tickets([make_ticket(1), {'summary': {'order_id': 'T-x'}}, 'bad'])
+
+        assert written == 1
+        assert store.count_tickets() == 1
+
+    def test_records_sync_time(self, store):
+        assert store.last_synced('tickets') is None
+
+        store.upsert_tickets([make_ticket(1)])
+
+        assert store.last_synced('tickets') is not None
+
+    def test_filters_by_technician_key(self, store):
+        store.upsert_tickets([make_ticket(1, "Codey O'Connor"), make_ticket(2, 'Alex'),
+                              make_ticket(3, 'codey  o connor')])
+
+        assert order_ids(store.query_tickets(assigned_to='CODEY OCONNOR')) == []
+        assert order_ids(store.query_tickets(assigned_to="codey o'connor")) == ['T-3', 'T-1']
+        assert store.count_tickets(assigned_to='alex') == 1
+
+    def test_summaries_and_pages(self, store):
+        store.upsert_tickets([make_ticket(i, updated=f'2024-01-0{i}T00:00:00')
+                              for i in range(1, 6)])
+
+        summaries = store.ticket_summaries()
+        assert [summary['order_id'] for summary in summaries] == ['T-5', 'T-4', 'T-3', 'T-2', 'T-1']
+        assert summaries[0]['assigned_to'] == 'Sam Lee'
+        assert summaries[0]['last_updated'] > summaries[1]['last_updated']
+
+        page = store.query_tickets(limit=2, offset=2)
+        assert order_ids(page) == ['T-3', 'T-2']
+        assert sorted(store.get_tickets_by_id([1, 3, 99])) == [1, 3]
+
+
+class TestCustomers:
+    def test_updated_customers_keep_their_place(self, store):
+        store.upsert_customers([make_customer('a', 'Ann'), make_customer('b', 'Bob')])
+
+        store.upsert_customers([make_customer('c', 'Cat'), make_customer('a', 'Anna')])
+
+        assert [c['fullName'] for c in store.query_customers()] == ['Anna', 'Bob', 'Cat']
+        assert [c['cid'] for c in store.query_customers(name_contains='AN')] == ['a']
+
+
+class TestSchemaMigration:
+    def test_version_one_customers_keep_their_order(self, db_path, tmp_path):
+        # Version 1 had no position column and listed customers by rowid
+        (tmp_path / 'store').mkdir()
+        conn = sqlite3.connect(db_path)
+        conn.execute("CREATE TABLE customers (id TEXT PRIMARY KEY, name TEXT, email TEXT, "
+                     "mobile TEXT, data TEXT NOT NULL)")
+        conn.execute("CREATE TABLE meta (key TEXT PRIMARY KEY, value TEXT)")
+        conn.execute("INSERT INTO meta VALUES ('schema_version', '1')")
+        for customer in (make_customer('z', 'Zed'), make_customer('a', 'Ann')):
+            conn.execute("INSERT INTO customers VALUES (?, ?, ?, NULL, ?)",
+                         (customer['cid'], customer['fullName'], customer['email'],
+                          json.dumps(customer)))
+        conn.commit()
+        conn.close()
+
+        store = LocalStore(db_path)
+        try:
+            assert [c['cid'] for c in store.query_customers()] == ['z', 'a']
+            store.upsert_customers([make_customer('b', 'Bob')])
+            assert [c['cid'] for c in store.query_customers()] == ['z', 'a', 'b']
+            version = store._query("SELECT value FROM meta WHERE key = 'schema_version'")
+            assert version[0]['value'] == str(SCHEMA_VERSION)
+        finally:
+            store.close()
+
+    def test_reopening_a_current_store_keeps_its_data(self, db_path):
+        store = LocalStore(db_path)
+        store.upsert_tickets([make_ticket(1)])
+        store.upsert_customers([make_customer('a', 'Ann')])
+        store.close()
+
+        reopened = LocalStore(db_path)
+        try:
+            assert reopened.count_tickets() == 1
+            assert [c['cid'] for c in reopened.query_customers()] == ['a']
+        finally:
+            reopened.close()
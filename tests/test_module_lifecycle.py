@@ -0,0 +1,220 @@
+"""Tests for keeping module frames alive across navigation."""
+
+import pytest
+
+from nest.utils.module_lifecycle import ModuleLifecycleManager
+
+
+class FakeRoot:
+    """Records scheduled callbacks instead of running a Tk event loop."""
+
+    def __init__(self):
+        self.pending = {}
+        self._next_id = 0
+
+    def after(self, ms, func):
+        self._next_id += 1
+        self.pending[self._next_id] = func
+        return self._next_id
+
+    def after_idle(self, func):
+        return self.after(0, func)
+
+    def after_cancel(self, after_id):
+        self.pending.pop(after_id, None)
+
+    def run_pending(self):
+        while self.pending:
+            after_id = next(iter(self.pending))
+            self.pending.pop(after_id)()
+
+
+class FakeModule:
+    def __init__(self, name, kwargs):
+        self.name = name
+        self.kwargs = kwargs
+        self.events = []
+        self.alive = True
+
+    def pack(self, **options):
+        self.events.append('pack')
+
+    def pack_forget(self):
+        self.events.append('pack_forget')
+
+    def suspend(self):
+        self.events.append('suspend')
+
+    def resume(self):
+        self.events.append('resume')
+
+    def destroy(self):
+        self.alive = False
+        self.events.append('destroy')
+
+    def winfo_exists(self):
+        return self.alive
+
+
+@pytest.fixture
+def root():
+    return FakeRoot()
+
+
+@pytest.fixture
+def built():
+    return []
+
+
+def make_manager(root, built, **options):
+    def factory(name, kwargs):
+        module = FakeModule(name, kwargs)
+        built.append(module)
+        return module
+
+    options.setdefault('preload', False)
+    return ModuleLifecycleManager(root, factory, **options)
+
+
+class TestShowAndHide:
+    def test_switching_suspends_and_resumes(self, root, built):
+        manager = make_manager(root, built)
+        dashboard = manager.show('dashboard')
+        tickets = manager.show('tickets')
+
+        assert manager.show('dashboard') is dashboard
+        assert dashboard.events == ['pack', 'pack_forget', 'suspend', 'resume', 'pack']
+        assert tickets.events == ['pack', 'pack_forget', 'suspend']
+        assert [module.name for module in built] == ['dashboard', 'tickets']
+
+    def test_showing_the_active_module_does_not_resume_it(self, root, built):
+        manager = make_manager(root, built)
+        dashboard = manager.show('dashboard')
+
+        manager.show('dashboard')
+
+        assert dashboard.events == ['pack', 'pack']
+
+    def test_first_show_is_reported_once(self, root, built):
+        shown = []
+        manager = make_manager(root, built, on_first_show=lambda name, module: shown.append(name))
+
+        manager.show('dashboard')
+        manager.show('tickets')
+        manager.show('dashboard')
+
+        assert shown == ['dashboard', 'tickets']
+
+    def test_kwargs_rebuild_the_module(self, root, built):
+        manager = make_manager(root, built)
+        first = manager.show('tickets')
+        manager.show('dashboard')
+
+        second = manager.show('tickets', {'ticket_action': 'new', 'ticket_id': None})
+
+        assert second is not first
+        assert 'destroy' in first.events
+        # Arguments left unset do not count
+        assert second.kwargs == {'ticket_action': 'new'}
+        assert manager.show('dashboard') is manager.modules['dashboard']
+        assert manager.show('tickets', {'ticket_id': None}) is second
+
+    def test_destroyed_module_is_rebuilt(self, root, built):
+        manager = make_manager(root, built)
+        first = manager.show('tickets')
+        manager.show('dashboard')
+        first.alive = False
+
+        assert manager.show('tickets') is not first
+
+    def test_clear_destroys_every_module(self, root, built):
+        manager = make_manager(root, built)
+        manager.show('dashboard')
+        manager.show('tickets')
+
+        manager.clear()
+
+        assert manager.modules == {}
+        assert manager.active is None
+        assert all(not module.alive for module in built)
+
+
+class TestEviction:
+    def test_least_recently_shown_module_is_evicted_first(self, root, built):
+        manager = make_manager(root, built, keep_alive=3)
+        for name in ('dashboard', 'tickets', 'customers', 'dashboard', 'inventory'):
+            manager.show(name)
+
+        assert set(manager.modules) == {'customers', 'dashboard', 'inventory'}
+        assert [module.name for module in built if not module.alive] == ['tickets']
+
+    def test_active_module_is_never_evicted(self, root, built):
+        manager = make_manager(root, built, keep_alive=1)
+        manager.show('dashboard')
+        manager.show('tickets')
+
+        assert list(manager.modules) == ['tickets']
+
+    def test_memory_pressure_evicts_hidden_modules(self, root, built, monkeypatch):
+        monkeypatch.setattr('nest.utils.module_lifecycle._process_memory_mb', lambda: 500.0)
+        manager = make_manager(root, built, memory_limit_mb=400)
+        manager.show('dashboard')
+        manager.show('tickets')
+
+        assert list(manager.modules) == ['tickets']
+
+    def test_preloaded_module_is_evicted_before_opened_ones(self, root, built):
+        manager = make_manager(root, built, keep_alive=3, preload=True)
+        manager.show('customers')
+        manager.show('dashboard')
+        root.run_pending()
+        assert set(manager.modules) == {'customers', 'dashboard', 'tickets'}
+
+        manager.show('inventory')
+
+        # Customers was shown longer ago, but the user never opened tickets
+        assert set(manager.modules) == {'customers', 'dashboard', 'inventory'}
+
+
+class TestPreloading:
+    def test_preloads_the_default_next_module_suspended(self, root, built):
+        manager = make_manager(root, built, preload=True)
+        manager.show('dashboard')
+
+        root.run_pending()
+
+        preloaded = manager.modules['tickets']
+        assert preloaded.events == ['suspend']
+        assert manager.active == 'dashboard'
+
+    def test_navigation_cancels_a_pending_preload(self, root, built):
+        manager = make_manager(root, built, preload=True)
+        manager.show('dashboard')
+        manager.show('customers')
+        assert len(root.pending) == 1
+
+        root.run_pending()
+
+        assert set(manager.modules) == {'dashboard', 'customers', 'tickets'}
+        assert [module.name for module in built] == ['dashboard', 'customers', 'tickets']
+
+    def test_only_preloadable_modules_are_built(self, root, built):
+        manager = make_manager(root, built, preload=True, preloadable=('customers',))
+        manager.show('dashboard')
+
+        root.run_pending()
+
+        assert 'tickets' not in manager.modules
+        assert 'customers' in manager.modules
+
+    def test_likely_next_learns_from_transitions(self, root, built):
+        manager = make_manager(root, built)
+        assert manager.likely_next('dashboard') == ['tickets', 'customers']
+
+        for _ in range(2):
+            manager.show('dashboard')
+            manager.show('inventory')
+        manager.show('dashboard')
+        manager.show('customers')
+
+        assert manager.likely_next('dashboard') == ['inventory', 'customers', 'tickets']
@@ -0,0 +1,160 @@
+"""Tests for RepairDeskAPI's concurrent fetching of paginated endpoints."""
+
+import threading
+import time
+
+import pytest
+
+from nest.utils.repairdesk_api import RepairDeskAPI
+
+DATA_KEY = 'inventoryListData'
+
+
+class PagedEndpoint:
+    """Stands in for RepairDeskAPI.request, serving numbered pages of items."""
+
+    def __init__(self, total_pages, per_page=3, report_total=True):
+        self.total_pages = total_pages
+        self.per_page = per_page
+        self.report_total = report_total
+        self.delays = {}
+        self.empty_pages = set()
+        self.failing_pages = set()
+        self.requested = []
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def __call__(self, endpoint, params=None, **kwargs):
+        page = params['page']
+        with self._lock:
+            self.requested.append(page)
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        try:
+            time.sleep(self.delays.get(page, 0))
+            if page in self.failing_pages:
+                raise Exception(f"API request failed: page {page}")
+            items = [] if page in self.empty_pages else [
+                {'id': (page - 1) * self.per_page + n} for n in range(self.per_page)]
+            pagination = {'next_page_exist': page < self.total_pages, 'next_page': page + 1}
+            if self.report_total:
+                pagination['total_pages'] = self.total_pages
+            return {DATA_KEY: items, 'pagination': pagination}
+        finally:
+            with self._lock:
+                self.active -= 1
+
+
+@pytest.fixture
+def api():
+    return RepairDeskAPI(api_key='test-key', page_workers=3)
+
+
+def fetch(api, endpoint, callbacks=None):
+    api.request = endpoint
+    page_callback = None
+    if callbacks is not None:
+        def page_callback(items, is_complete, loaded, pagination_info):
+            callbacks.append(([item['id'] for item in items], is_complete, loaded,
+                              pagination_info['current_page']))
+    return api._fetch_all_pages(api.get_inventory, DATA_KEY, page_callback=page_callback,
+                                label='inventory')
+
+
+def ids(items):
+    return [item['id'] for item in items]
+
+
+class TestOrdering:
+    def test_pages_are_returned_in_order(self, api):
+        endpoint = PagedEndpoint(total_pages=6)
+        # Early pages finish last
+        endpoint.delays = {2: 0.15, 3: 0.1}
+
+        items = fetch(api, endpoint)
+
+        assert ids(items) == list(range(18))
+        assert sorted(endpoint.requested) == [1, 2, 3, 4, 5, 6]
+
+    def test_workers_are_bounded(self, api):
+        endpoint = PagedEndpoint(total_pages=10)
+        endpoint.delays = {page: 0.02 for page in range(2, 11)}
+
+        fetch(api, endpoint)
+
+        assert endpoint.max_active <= api.page_workers
+
+    def test_pages_are_walked_when_no_total_is_reported(self, api):
+        endpoint = PagedEndpoint(total_pages=3, report_total=False)
+
+        items = fetch(api, endpoint)
+
+        assert ids(items) == list(range(9))
+        assert endpoint.requested == [1, 2, 3]
+        assert endpoint.max_active == 1
+
+    def test_single_page(self, api):
+        callbacks = []
+
+        items = fetch(api, PagedEndpoint(total_pages=1), callbacks)
+
+        assert ids(items) == [0, 1, 2]
+        assert callbacks == [([0, 1, 2], True, 3, 1)]
+
+
+class TestPageCallback:
+    def test_fires_once_per_page_in_order(self, api):
+        endpoint = PagedEndpoint(total_pages=4, per_page=2)
+        endpoint.delays = {2: 0.1}
+        callbacks = []
+
+        fetch(api, endpoint, callbacks)
+
+        assert callbacks == [
+            ([0, 1], False, 2, 1),
+            ([2, 3], False, 4, 2),
+            ([4, 5], False, 6, 3),
+            ([6, 7], True, 8, 4),
+        ]
+
+    def test_fires_on_the_calling_thread(self, api):
+        threads = set()
+        endpoint = PagedEndpoint(total_pages=4)
+        api.request = endpoint
+
+        api._fetch_all_pages(api.get_inventory, DATA_KEY,
+                             page_callback=lambda *args: threads.add(threading.current_thread()))
+
+        assert threads == {threading.current_thread()}
+
+
+class TestPartialFailure:
+    def test_empty_page_stops_and_completes(self, api):
+        endpoint = PagedEndpoint(total_pages=5, per_page=2)
+        endpoint.empty_pages = {3}
+        callbacks = []
+
+        items = fetch(api, endpoint, callbacks)
+
+        assert ids(items) == [0, 1, 2, 3]
+        assert callbacks == [([0, 1], False, 2, 1), ([2, 3], False, 4, 2), ([], True, 4, 3)]
+
+    def test_failed_page_raises_after_earlier_pages(self, api):
+        endpoint = PagedEndpoint(total_pages=5, per_page=2)
+        endpoint.failing_pages = {3}
+        callbacks = []
+
+        with pytest.raises(Exception, match='page 3'):
+            fetch(api, endpoint, callbacks)
+
+        assert callbacks == [([0, 1], False, 2, 1), ([2, 3], False, 4, 2)]
+
+    def test_empty_first_page(self, api):
+        endpoint = PagedEndpoint(total_pages=3)
+        endpoint.empty_pages = {1}
+        callbacks = []
+
+        assert fetch(api, endpoint, callbacks) == []
+        assert endpoint.requested == [1]
+        assert callbacks == []
@@ -0,0 +1,295 @@
+"""Tests for the adaptive token bucket and budgeted retries."""
+
+import threading
+import time
+
+import pytest
+import requests
+
+from nest.utils import rate_limiter, repairdesk_api
+from nest.utils.http_transport import HTTPTransport
+from nest.utils.rate_limiter import (
+    MAX_THROTTLE_SECONDS,
+    MIN_RATE,
+    RateLimiter,
+    RateLimitExceeded,
+    RetryPolicy,
+    parse_retry_after,
+    send_with_retries,
+)
+from nest.utils.repairdesk_api import RepairDeskAPI
+
+
+class FakeClock:
+    """Stands in for time.monotonic/time.sleep so waits are instant and measurable."""
+
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def monotonic(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(rate_limiter.time, 'monotonic', fake.monotonic)
+    monkeypatch.setattr(rate_limiter.time, 'sleep', fake.sleep)
+    return fake
+
+
+def make_response(status=200, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.headers.update(headers or {})
+    return response
+
+
+def run_off_main_thread(func):
+    results = []
+    errors = []
+
+    def target():
+        try:
+            results.append(func())
+        except Exception as e:
+            errors.append(e)
+
+    worker = threading.Thread(target=target)
+    worker.start()
+    worker.join()
+    if errors:
+        raise errors[0]
+    return results[0]
+
+
+def acquire_off_main_thread(limiter):
+    return run_off_main_thread(limiter.acquire)
+
+
+class TestRateLimiter:
+    def test_burst_then_steady_rate(self, clock):
+        limiter = RateLimiter(rate=2.0, burst=3)
+
+        assert [limiter.acquire(block=True) for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert limiter.acquire(block=True) == pytest.approx(0.5)
+
+    def test_throttle_blocks_until_expiry(self, clock):
+        limiter = RateLimiter(rate=10.0, burst=10)
+        limiter.throttle(5)
+
+        assert limiter.acquire(block=True) == pytest.approx(5)
+
+    def test_throttle_is_clamped(self, clock):
+        limiter = RateLimiter()
+        limiter.throttle(MAX_THROTTLE_SECONDS * 10)
+
+        assert limiter.acquire(block=True) == pytest.approx(MAX_THROTTLE_SECONDS)
+
+    def test_main_thread_never_waits(self, clock):
+        limiter = RateLimiter(rate=1.0, burst=1)
+
+        assert threading.current_thread() is threading.main_thread()
+        assert [limiter.acquire() for _ in range(3)] == [0.0, 0.0, 0.0]
+        assert clock.slept == []
+
+    def test_main_thread_fails_fast_during_server_pause(self, clock):
+        limiter = RateLimiter(rate=1.0, burst=1)
+        limiter.throttle(30)
+
+        with pytest.raises(RateLimitExceeded) as excinfo:
+            limiter.acquire()
+
+        assert excinfo.value.retry_after == pytest.approx(30)
+        assert clock.slept == []
+        # No token was taken, so a background request only waits out the pause
+        assert acquire_off_main_thread(limiter) == pytest.approx(30)
+
+    def test_background_threads_repay_ui_debt(self, clock):
+        limiter = RateLimiter(rate=1.0, burst=1)
+        limiter.acquire()
+        limiter.acquire()
+
+        # Two tokens were taken on credit from a bucket of one
+        assert acquire_off_main_thread(limiter) == pytest.approx(2.0)
+
+    def test_observe_throttling_lowers_rate(self, clock):
+        limiter = RateLimiter(rate=4.0)
+
+        wait = limiter.observe(make_response(429, {'Retry-After': '3'}))
+
+        assert wait == 3
+        assert limiter.rate == 2.0
+        for _ in range(10):
+            limiter.observe(make_response(429))
+        assert limiter.rate == MIN_RATE
+
+    def test_observe_clamps_retry_after(self, clock):
+        limiter = RateLimiter()
+
+        assert limiter.observe(make_response(429, {'Retry-After': '86400'})) == MAX_THROTTLE_SECONDS
+
+    def test_observe_honours_exhausted_quota(self, clock):
+        limiter = RateLimiter()
+
+        wait = limiter.observe(make_response(200, {'X-RateLimit-Remaining': '0',
+                                                   'X-RateLimit-Reset': '7'}))
+
+        assert wait == 7
+
+    def test_success_recovers_rate(self, clock):
+        limiter = RateLimiter(rate=1.0)
+        limiter.rate = 0.5
+
+        limiter.observe(make_response(200))
+
+        assert limiter.rate > 0.5
+
+
+class TestRetries:
+    def test_parse_retry_after(self):
+        assert parse_retry_after('2.5') == 2.5
+        assert parse_retry_after('-1') == 0.0
+        assert parse_retry_after('soon') is None
+        assert parse_retry_after(None) is None
+
+    def test_retry_budget_is_spent_and_earned(self):
+        policy = RetryPolicy(max_retries=3, base_delay=1, max_delay=1, reserve=2, ratio=0.5)
+
+        assert policy.try_spend() and policy.try_spend()
+        assert not policy.try_spend()
+        policy.record_request()
+        policy.record_request()
+        assert policy.try_spend()
+
+    def test_send_with_retries_retries_throttling(self, clock, monkeypatch):
+        policy = RetryPolicy(max_retries=2, base_delay=0.1, max_delay=10)
+        monkeypatch.setitem(rate_limiter.RETRY_POLICIES, 'detail', policy)
+        responses = iter([make_response(429, {'Retry-After': '1'}), make_response(200)])
+
+        response = run_off_main_thread(lambda: send_with_retries(lambda: next(responses), 'detail'))
+
+        assert response.status_code == 200
+        assert clock.slept == [1.0]
+
+    def test_send_with_retries_does_not_sleep_on_main_thread(self, clock, monkeypatch):
+        policy = RetryPolicy(max_retries=2, base_delay=0.1, max_delay=10)
+        monkeypatch.setitem(rate_limiter.RETRY_POLICIES, 'detail', policy)
+        responses = iter([make_response(429, {'Retry-After': '1'}), make_response(200)])
+
+        response = send_with_retries(lambda: next(responses), 'detail')
+
+        assert response.status_code == 429
+        assert clock.slept == []
+
+    def test_send_with_retries_gives_up_on_long_waits(self, clock, monkeypatch):
+        policy = RetryPolicy(max_retries=2, base_delay=0.1, max_delay=10)
+        monkeypatch.setitem(rate_limiter.RETRY_POLICIES, 'detail', policy)
+
+        response = run_off_main_thread(
+            lambda: send_with_retries(lambda: make_response(429, {'Retry-After': '60'}), 'detail'))
+
+        assert response.status_code == 429
+        assert clock.slept == []
+
+    def test_writes_do_not_retry_server_errors(self, clock, monkeypatch):
+        calls = []
+
+        def send():
+            calls.append(1)
+            return make_response(503)
+
+        assert run_off_main_thread(lambda: send_with_retries(send, 'write')).status_code == 503
+        assert len(calls) == 1
+
+    def test_retry_with_backoff_earns_budget(self, clock, monkeypatch):
+        from nest.utils.api_client import retry_with_backoff
+        policy = RetryPolicy(max_retries=2, base_delay=0.1, max_delay=10, reserve=5, ratio=1.0)
+        policy._tokens = 0
+        monkeypatch.setitem(rate_limiter.RETRY_POLICIES, 'list', policy)
+        attempts = []
+
+        @retry_with_backoff()
+        def fetch():
+            attempts.append(1)
+            return 'ok'
+
+        assert fetch() == 'ok'
+        assert policy.try_spend()
+        assert len(attempts) == 1
+
+    def test_retry_with_backoff_retries_transient_errors(self, clock, monkeypatch):
+        from nest.utils.api_client import retry_with_backoff
+        policy = RetryPolicy(max_retries=2, base_delay=0.1, max_delay=10)
+        monkeypatch.setitem(rate_limiter.RETRY_POLICIES, 'list', policy)
+        errors = [requests.exceptions.ConnectionError('reset')]
+
+        @retry_with_backoff(max_retries=2)
+        def fetch():
+            if errors:
+                raise errors.pop()
+            return 'ok'
+
+        assert run_off_main_thread(fetch) == 'ok'
+
+    def test_retry_with_backoff_does_not_sleep_on_main_thread(self, clock, monkeypatch):
+        from nest.utils.api_client import retry_with_backoff
+        policy = RetryPolicy(max_retries=2, base_delay=0.1, max_delay=10)
+        monkeypatch.setitem(rate_limiter.RETRY_POLICIES, 'list', policy)
+        errors = [requests.exceptions.ConnectionError('reset')]
+
+        @retry_with_backoff(max_retries=2)
+        def fetch():
+            if errors:
+                raise errors.pop()
+            return 'ok'
+
+        with pytest.raises(requests.exceptions.ConnectionError):
+            fetch()
+        assert clock.slept == []
+
+
+class TestMainThreadWithCoalescing:
+    """The main thread must not block on a background request held up by the limiter."""
+
+    @pytest.fixture
+    def api(self, monkeypatch):
+        api = RepairDeskAPI(api_key='test-key')
+        limiter = RateLimiter()
+        sent = []
+
+        class FakeSession:
+            def request(self, method, url, timeout=None, **kwargs):
+                sent.append(threading.current_thread())
+                response = make_response(200)
+                response._content = b'{"success": true, "data": {"ok": 1}}'
+                return response
+
+        transport = HTTPTransport()
+        transport._session = FakeSession()
+        monkeypatch.setattr(repairdesk_api, 'get_transport', lambda: transport)
+        monkeypatch.setattr('nest.utils.http_transport.get_rate_limiter', lambda url: limiter)
+        api.limiter, api.sent = limiter, sent
+        return api
+
+    def test_main_thread_fails_fast_while_background_leader_is_throttled(self, api):
+        api.limiter.throttle(0.5)
+        results = []
+        leader = threading.Thread(target=lambda: results.append(api.request('tickets')))
+        leader.start()
+        while not repairdesk_api._inflight_gets.in_flight():
+            threading.Event().wait(0.01)
+
+        start = time.monotonic()
+        with pytest.raises(Exception, match='API request failed'):
+            api.request('tickets')
+
+        assert time.monotonic() - start < 0.25
+        leader.join(5)
+        assert results == [{'ok': 1}]
+        assert api.sent == [leader]
@@ -0,0 +1,156 @@
+"""Tests for the shared API response cache and how the API clients key into it."""
+
+import json
+
+import pytest
+
+from nest.utils import api_client, response_cache
+from nest.utils.cache_manager import CacheManager
+from nest.utils.repairdesk_api import RepairDeskAPI
+from nest.utils.response_cache import ResponseCache, estimate_size, get_response_cache
+from nest.utils.ticket_events import TicketMutation, _drop_cached_responses
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(response_cache.time, 'time', clock)
+    return clock
+
+
+def make_cache(max_bytes=1000, **options):
+    return ResponseCache(max_bytes=max_bytes, manager=CacheManager(max_bytes=10 ** 9), **options)
+
+
+@pytest.fixture
+def shared_cache(monkeypatch):
+    """Replace the process-wide cache so the clients under test share a fresh one."""
+    cache = make_cache(max_bytes=10 ** 6)
+    monkeypatch.setattr(response_cache, '_response_cache', cache)
+    return cache
+
+
+class TestLRUEviction:
+    def test_least_recently_used_entry_is_evicted(self):
+        value = 'x' * 38  # 40 bytes with quotes
+        cache = make_cache(max_bytes=estimate_size(value) * 3)
+        for key in 'abc':
+            cache.set(key, value)
+        cache.get('a')
+
+        cache.set('d', value)
+
+        assert cache.get('b') == (False, None)
+        assert [cache.get(key)[0] for key in 'acd'] == [True, True, True]
+        assert cache.stats()['evictions'] == 1
+
+    def test_size_accounting_replaces_entries(self):
+        cache = make_cache()
+        cache.set('a', 'x' * 98)
+        cache.set('a', 'x' * 48)
+
+        assert cache.size_bytes() == 50
+        assert len(cache) == 1
+
+    def test_value_larger_than_the_cache_is_not_stored(self):
+        cache = make_cache(max_bytes=10)
+
+        assert cache.set('a', 'x' * 20) is False
+        assert len(cache) == 0
+
+    def test_sampled_size_of_long_lists(self):
+        tickets = [{'id': i, 'name': 'x' * 20} for i in range(1000)]
+
+        encoded = len(json.dumps(tickets, separators=(',', ':')))
+
+        assert abs(estimate_size(tickets) - encoded) < encoded * 0.2
+
+
+class TestTTL:
+    def test_entries_expire_and_are_evicted(self, clock):
+        cache = make_cache()
+        cache.set('a', 'value', ttl=10)
+
+        clock.now += 9
+        assert cache.get('a') == (True, 'value')
+        clock.now += 1
+        assert cache.get('a') == (False, None)
+        assert len(cache) == 0
+        assert cache.stats()['expirations'] == 1
+
+    def test_endpoint_policies(self, clock):
+        cache = make_cache(default_ttl=5, ttl_policies={'tickets': 60})
+
+        assert cache.ttl_for('employees/12') == response_cache.EMPLOYEE_TTL
+        assert cache.ttl_for('/tickets') == 60
+        # The longest matching policy wins
+        assert cache.ttl_for('tickets/42') == response_cache.TICKET_DETAIL_TTL
+        assert cache.ttl_for('ticketsarchive') == 5
+        assert cache.ttl_for(None) == 5
+
+        cache.set('page', 'value', endpoint='tickets')
+        clock.now += 59
+        assert cache.get('page')[0]
+        clock.now += 1
+        assert not cache.get('page')[0]
+
+    def test_purge_expired(self, clock):
+        cache = make_cache()
+        cache.set('short', 'value', ttl=1)
+        cache.set('long', 'value', ttl=100)
+        clock.now += 2
+
+        assert cache.purge_expired() == 1
+        assert len(cache) == 1
+
+
+class TestClientKeys:
+    def test_clients_share_the_process_cache(self):
+        assert api_client.RESPONSE_CACHE is get_response_cache()
+        assert RepairDeskAPI(api_key='test-key')._cache is get_response_cache()
+
+    def test_repairdesk_api_caches_gets_under_its_prefix(self, shared_cache, monkeypatch):
+        api = RepairDeskAPI(api_key='test-key')
+        sent = []
+
+        def fake_send(method, url, params, data, files, raw_response):
+            sent.append(url)
+            return {'data': ['store']}
+
+        monkeypatch.setattr(api, '_send_request', fake_send)
+
+        assert api.request('store/info', use_cache=True) == {'data': ['store']}
+        assert api.request('store/info', use_cache=True) == {'data': ['store']}
+
+        assert len(sent) == 1
+        assert [key.split(':')[0] for key in shared_cache._entries] == ['GET']
+
+    def test_repairdesk_api_clear_keeps_the_other_clients_entries(self, shared_cache):
+        api = RepairDeskAPI(api_key='test-key')
+        shared_cache.set('GET:employees:{}', ['employee'])
+        shared_cache.set('client:employees', ['employee'])
+
+        api._clear_cache()
+
+        assert list(shared_cache._entries) == ['client:employees']
+
+    def test_ticket_mutation_drops_both_clients_ticket_entries(self, shared_cache):
+        for key in ('GET:tickets:{"page": 1}', 'GET:tickets/12:{}', 'GET:tickets/12/notes:{}',
+                    'GET:tickets/123:{}', 'GET:employees:{}',
+                    'client:tickets_status=None_page=1_limit=50', 'client:ticket_details_12',
+                    'client:ticket_details_123', 'client:employees'):
+            shared_cache.set(key, 'value')
+
+        _drop_cached_responses(TicketMutation('status_changed', ticket_id='12'))
+
+        assert sorted(shared_cache._entries) == [
+            'GET:employees:{}', 'GET:tickets/123:{}', 'client:employees',
+            'client:ticket_details_123']
@@ -0,0 +1,199 @@
+"""Tests for single-flight request coalescing."""
+
+import threading
+import time
+
+import pytest
+
+from nest.utils import repairdesk_api, single_flight
+from nest.utils.repairdesk_api import RepairDeskAPI
+from nest.utils.single_flight import SingleFlight
+
+
+class CountingEvent(threading.Event):
+    """Event that counts callers that started waiting on it."""
+
+    def __init__(self):
+        super().__init__()
+        self.waiters = 0
+        self._count_lock = threading.Lock()
+
+    def wait(self, timeout=None):
+        with self._count_lock:
+            self.waiters += 1
+        return super().wait(timeout)
+
+
+class CountingCall(single_flight._Call):
+    def __init__(self):
+        super().__init__()
+        self.done = CountingEvent()
+
+
+@pytest.fixture(autouse=True)
+def counting_calls(monkeypatch):
+    monkeypatch.setattr(single_flight, '_Call', CountingCall)
+
+
+def run_followers(flight, key, func, count):
+    """Start callers that join a flight and collect their (result, shared) or error."""
+    outcomes = []
+
+    def follower():
+        try:
+            outcomes.append(flight.do(key, func))
+        except Exception as e:
+            outcomes.append(e)
+
+    threads = [threading.Thread(target=follower) for _ in range(count)]
+    for thread in threads:
+        thread.start()
+    return threads, outcomes
+
+
+def wait_for_waiters(flight, key, count):
+    """Block until count callers have joined the flight for key."""
+    done = flight._calls[key].done
+    pause = threading.Event()
+    while done.waiters < count:
+        pause.wait(0.01)
+
+
+class TestSingleFlight:
+    def test_concurrent_callers_share_one_call(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            release.wait(5)
+            return {'tickets': 3}
+
+        leader, leader_outcome = run_followers(flight, 'tickets', fetch, 1)
+        while not calls:
+            release.wait(0.01)
+        followers, outcomes = run_followers(flight, 'tickets', fetch, 4)
+        wait_for_waiters(flight, 'tickets', 4)
+        assert flight.in_flight() == 1
+        release.set()
+        for thread in leader + followers:
+            thread.join(5)
+
+        assert len(calls) == 1
+        assert leader_outcome == [({'tickets': 3}, False)]
+        assert outcomes == [({'tickets': 3}, True)] * 4
+        assert outcomes[0][0] is leader_outcome[0][0]
+        assert flight.in_flight() == 0
+
+    def test_errors_reach_every_waiter(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        started = threading.Event()
+
+        def fail():
+            started.set()
+            release.wait(5)
+            raise ValueError('boom')
+
+        leader, leader_outcome = run_followers(flight, 'key', fail, 1)
+        assert started.wait(5)
+        followers, outcomes = run_followers(flight, 'key', fail, 2)
+        wait_for_waiters(flight, 'key', 2)
+        release.set()
+        for thread in leader + followers:
+            thread.join(5)
+
+        assert all(isinstance(outcome, ValueError) for outcome in leader_outcome + outcomes)
+        assert flight.in_flight() == 0
+
+    def test_finished_calls_are_not_cached(self):
+        flight = SingleFlight()
+        calls = []
+
+        def fetch():
+            calls.append(1)
+            return len(calls)
+
+        assert flight.do('key', fetch) == (1, False)
+        assert flight.do('key', fetch) == (2, False)
+        assert flight.do('other', fetch) == (3, False)
+
+    def test_leader_error_is_raised(self):
+        flight = SingleFlight()
+
+        with pytest.raises(KeyError):
+            flight.do('key', lambda: {}['missing'])
+        assert flight.in_flight() == 0
+
+    def test_caller_that_may_not_wait_runs_its_own_call(self):
+        flight = SingleFlight()
+        release = threading.Event()
+        started = threading.Event()
+
+        def slow_fetch():
+            started.set()
+            release.wait(5)
+            return 'leader'
+
+        leader, leader_outcome = run_followers(flight, 'key', slow_fetch, 1)
+        assert started.wait(5)
+
+        assert flight.do('key', lambda: 'own', may_wait=False) == ('own', False)
+        assert flight.in_flight() == 1
+        release.set()
+        leader[0].join(5)
+        assert leader_outcome == [('leader', False)]
+
+
+class TestRepairDeskAPICoalescing:
+    @pytest.fixture
+    def api(self, monkeypatch):
+        api = RepairDeskAPI(api_key='test-key')
+        release = threading.Event()
+        started = threading.Event()
+        sent = []
+
+        def send_request(method, url, params, data=None, files=None, raw_response=False):
+            sent.append(threading.current_thread())
+            if threading.current_thread() is not threading.main_thread():
+                # A background request held up by the rate limiter
+                started.set()
+                release.wait(5)
+            return {'sent_by': threading.current_thread().name}
+
+        monkeypatch.setattr(api, '_send_request', send_request)
+        api.release, api.started, api.sent = release, started, sent
+        yield api
+        release.set()
+
+    def test_main_thread_does_not_wait_on_slow_background_leader(self, api):
+        leader = threading.Thread(target=lambda: api.request('tickets'), name='loader')
+        leader.start()
+        assert api.started.wait(5)
+
+        start = time.monotonic()
+        result = api.request('tickets')
+
+        assert time.monotonic() - start < 1
+        assert result == {'sent_by': threading.main_thread().name}
+        assert api.sent == [leader, threading.main_thread()]
+        api.release.set()
+        leader.join(5)
+
+    def test_background_callers_still_coalesce(self, api):
+        leader = threading.Thread(target=lambda: api.request('tickets'), name='loader')
+        leader.start()
+        assert api.started.wait(5)
+        results = []
+        follower = threading.Thread(target=lambda: results.append(api.request('tickets')))
+        follower.start()
+        calls = repairdesk_api._inflight_gets._calls
+        while not any(call.done.waiters for call in list(calls.values())):
+            api.release.wait(0.01)
+        api.release.set()
+        for thread in (leader, follower):
+            thread.join(5)
+
+        assert api.sent == [leader]
+        assert results == [{'sent_by': 'loader'}]
@@ -0,0 +1,142 @@
+"""Tests for stale-while-revalidate loading and the circuit breaker."""
+
+import pytest
+
+from nest.utils import stale_while_revalidate
+from nest.utils.stale_while_revalidate import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+    CircuitOpenError,
+    StaleWhileRevalidate,
+    diff_items,
+    format_age,
+)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(stale_while_revalidate.time, 'time', fake.time)
+    return fake
+
+
+def open_breaker(threshold=2, reset_timeout=30):
+    breaker = CircuitBreaker('test', failure_threshold=threshold, reset_timeout=reset_timeout)
+    for _ in range(threshold):
+        breaker.record_failure()
+    return breaker
+
+
+class TestCircuitBreaker:
+    def test_opens_after_consecutive_failures(self, clock):
+        breaker = CircuitBreaker('test', failure_threshold=3, reset_timeout=30)
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.allow_request()
+
+        breaker.record_failure()
+
+        assert breaker.state == STATE_OPEN
+        assert not breaker.allow_request()
+        assert breaker.seconds_until_retry() == 30
+
+    def test_success_resets_the_failure_count(self, clock):
+        breaker = CircuitBreaker('test', failure_threshold=2)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+
+        assert breaker.state == STATE_CLOSED
+
+    def test_half_open_lets_a_single_trial_through(self, clock):
+        breaker = open_breaker()
+        clock.now += 30
+
+        assert breaker.state == STATE_HALF_OPEN
+        assert breaker.allow_request()
+        assert not breaker.allow_request()
+
+        breaker.record_success()
+        assert breaker.state == STATE_CLOSED
+        assert breaker.allow_request() and breaker.allow_request()
+
+    def test_failed_trial_reopens_the_circuit(self, clock):
+        breaker = open_breaker(threshold=5)
+        clock.now += 30
+        assert breaker.allow_request()
+
+        breaker.record_failure()
+
+        assert breaker.state == STATE_OPEN
+        assert not breaker.allow_request()
+        clock.now += 30
+        assert breaker.allow_request()
+
+
+class TestDiffItems:
+    def test_reports_added_changed_and_removed_keys(self):
+        old = [{'id': 1, 'status': 'Open'}, {'id': 2, 'status': 'Open'}, {'id': 3}]
+        new = [{'id': 2, 'status': 'Repaired'}, {'id': 3}, {'id': 4}]
+
+        diff = diff_items(old, new, key=lambda row: row['id'])
+
+        assert (diff.added, diff.changed, diff.removed) == ([4], [2], [1])
+
+    def test_unchanged_lists_are_falsy(self):
+        rows = [{'id': 1}, {'id': 2}]
+
+        assert not diff_items(rows, [dict(row) for row in reversed(rows)], lambda r: r['id'])
+
+    def test_format_age(self):
+        assert format_age(None) == 'unknown age'
+        assert format_age(59) == 'just now'
+        assert format_age(720) == '12 min ago'
+        assert format_age(5400) == '1.5 h ago'
+        assert format_age(3 * 86400) == '3 days ago'
+
+
+class TestStaleWhileRevalidate:
+    def run(self, breaker, cached, fetch):
+        events = []
+        StaleWhileRevalidate(breaker).run(
+            read_cached=lambda: cached,
+            fetch=fetch,
+            on_stale=lambda data, age: events.append(('stale', data, age)),
+            on_fresh=lambda data: events.append(('fresh', data)),
+            on_error=lambda error, served: events.append(('error', type(error), served)),
+        )
+        return events
+
+    def test_serves_cache_before_fresh_data(self, clock):
+        breaker = CircuitBreaker('test')
+
+        events = self.run(breaker, (['cached'], 90), lambda: ['fresh'])
+
+        assert events == [('stale', ['cached'], 90), ('fresh', ['fresh'])]
+
+    def test_empty_result_counts_as_failure_when_cache_was_served(self, clock):
+        breaker = CircuitBreaker('test', failure_threshold=1)
+
+        events = self.run(breaker, (['cached'], 90), lambda: [])
+
+        assert events[-1] == ('error', ValueError, True)
+        assert breaker.state == STATE_OPEN
+
+    def test_open_circuit_skips_the_fetch(self, clock):
+        breaker = open_breaker()
+        fetches = []
+
+        events = self.run(breaker, None, lambda: fetches.append(1))
+
+        assert fetches == []
+        assert events == [('error', CircuitOpenError, False)]
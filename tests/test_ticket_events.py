@@ -0,0 +1,167 @@
+"""Tests for the ticket mutation event bus."""
+
+import gc
+import threading
+
+import pytest
+
+from nest.utils import ticket_events
+from nest.utils.ticket_events import (
+    TICKET_NOTE_ADDED,
+    TICKET_STATUS_CHANGED,
+    TicketEventBus,
+    TicketMutation,
+)
+
+
+class View:
+    """Stands in for a widget that subscribes a bound method, like the dashboard."""
+
+    def __init__(self, bus):
+        self.received = []
+        self.bus = bus
+        self.token = bus.subscribe(self.on_mutation)
+
+    def on_mutation(self, mutation):
+        self.received.append(mutation)
+
+    def destroy(self):
+        self.bus.unsubscribe(self.token)
+
+
+@pytest.fixture
+def bus():
+    return TicketEventBus()
+
+
+class TestSubscribe:
+    def test_every_subscriber_receives_the_mutation(self, bus):
+        first, second = [], []
+        bus.subscribe(first.append)
+        bus.subscribe(second.append)
+        mutation = TicketMutation(TICKET_STATUS_CHANGED, ticket_id=12, order_id='T-100')
+
+        bus.publish(mutation)
+
+        assert first == [mutation]
+        assert second == [mutation]
+
+    def test_failing_subscriber_does_not_stop_delivery(self, bus):
+        received = []
+
+        def fail(mutation):
+            raise RuntimeError('boom')
+
+        bus.subscribe(fail)
+        bus.subscribe(received.append)
+
+        bus.publish(TicketMutation(TICKET_NOTE_ADDED, ticket_id=12))
+
+        assert len(received) == 1
+
+    def test_tokens_are_unique(self, bus):
+        assert len({bus.subscribe(lambda m: None) for _ in range(5)}) == 5
+
+
+class TestUnsubscribe:
+    def test_unsubscribed_callback_receives_nothing(self, bus):
+        received = []
+        token = bus.subscribe(received.append)
+
+        bus.unsubscribe(token)
+        bus.publish(TicketMutation(TICKET_STATUS_CHANGED, ticket_id=12))
+
+        assert received == []
+
+    def test_unknown_token_is_ignored(self, bus):
+        bus.unsubscribe(12345)
+
+    def test_destroyed_view_stops_receiving(self, bus):
+        view = View(bus)
+        bus.publish(TicketMutation(TICKET_STATUS_CHANGED, ticket_id=1))
+
+        view.destroy()
+        bus.publish(TicketMutation(TICKET_STATUS_CHANGED, ticket_id=2))
+
+        assert [mutation.ticket_id for mutation in view.received] == [1]
+
+    def test_bound_methods_are_held_weakly(self, bus):
+        received = []
+        view = View(bus)
+        view.received = received
+
+        del view
+        gc.collect()
+        bus.publish(TicketMutation(TICKET_STATUS_CHANGED, ticket_id=1))
+
+        assert received == []
+        assert bus._subscribers == {}
+
+
+class TestDelivery:
+    def test_delivered_on_the_publishing_thread(self, bus):
+        threads = []
+        bus.subscribe(lambda mutation: threads.append(threading.current_thread()))
+
+        publisher = threading.Thread(
+            target=bus.publish, args=(TicketMutation(TICKET_STATUS_CHANGED, ticket_id=1),))
+        publisher.start()
+        publisher.join()
+
+        assert threads == [publisher]
+
+    def test_concurrent_publishers_and_subscribers(self, bus):
+        received = []
+        lock = threading.Lock()
+
+        def record(mutation):
+            with lock:
+                received.append(mutation.ticket_id)
+
+        bus.subscribe(record)
+        start = threading.Barrier(8)
+
+        def publish(offset):
+            start.wait()
+            for ticket_id in range(offset, offset + 100):
+                bus.publish(TicketMutation(TICKET_STATUS_CHANGED, ticket_id=ticket_id))
+
+        def churn():
+            start.wait()
+            for _ in range(100):
+                bus.unsubscribe(bus.subscribe(lambda mutation: None))
+
+        workers = [threading.Thread(target=publish, args=(n * 100,)) for n in range(4)]
+        workers += [threading.Thread(target=churn) for _ in range(4)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        assert sorted(received) == list(range(400))
+        assert len(bus._subscribers) == 1
+
+
+class TestMutation:
+    @pytest.fixture
+    def mutation(self):
+        return TicketMutation(TICKET_STATUS_CHANGED, ticket_id=12, order_id='T-100')
+
+    @pytest.mark.parametrize('ref', [12, '12', 'T-100', 't-100', '100'])
+    def test_matches_ticket_references(self, mutation, ref):
+        assert mutation.matches(ref)
+
+    @pytest.mark.parametrize('ref', [None, '', 120, 'T-1000'])
+    def test_does_not_match_other_tickets(self, mutation, ref):
+        assert not mutation.matches(ref)
+
+    def test_publish_fills_ids_from_the_ticket(self, monkeypatch):
+        bus = TicketEventBus()
+        received = []
+        bus.subscribe(received.append)
+        monkeypatch.setattr(ticket_events, 'get_ticket_event_bus', lambda: bus)
+
+        ticket_events.publish_ticket_mutation(
+            TICKET_STATUS_CHANGED, ticket={'summary': {'id': 12, 'order_id': 'T-100'}})
+
+        assert (received[0].ticket_id, received[0].order_id) == (12, 'T-100')
@@ -0,0 +1,34 @@
+"""Tests for the persistent ticket-number to internal-ID index."""
+
+from nest.utils.ticket_index import TicketIdIndex, normalize_order_id
+
+
+def make_ticket(ticket_id, order_id):
+    return {'summary': {'id': ticket_id, 'order_id': order_id}}
+
+
+class TestTicketIdIndex:
+    def test_normalize_order_id(self):
+        assert normalize_order_id('t-12353') == 'T-12353'
+        assert normalize_order_id(12353) == 'T-12353'
+        assert normalize_order_id('  ') is None
+
+    def test_lookup_survives_reload(self, tmp_path):
+        path = str(tmp_path / 'ticket_id_index.json')
+        TicketIdIndex(path).update([make_ticket(901, 'T-12353')])
+
+        index = TicketIdIndex(path)
+
+        assert index.lookup('12353') == 901
+        assert index.lookup('T-12353') == 901
+        assert index.lookup('T-1') is None
+
+    def test_resolve_only_takes_bare_numbers_as_internal_ids(self, tmp_path):
+        index = TicketIdIndex(str(tmp_path / 'ticket_id_index.json'))
+        index.update([make_ticket(901, 'T-12353')])
+
+        assert index.resolve('12353') == 901
+        assert index.resolve('T-12353') == 901
+        assert index.resolve('777') == 777
+        assert index.resolve('T-777') is None
+        assert index.resolve('abc') is None
@@ -0,0 +1,189 @@
+"""Tests for the tickets view's background loader and its queue messages."""
+
+import queue
+
+import pytest
+
+from nest.ui import tickets as tickets_module
+from nest.ui.tickets import TicketsModule, normalize_tickets
+from nest.utils.stale_while_revalidate import CircuitBreaker
+
+
+def raw_ticket(ticket_id, status='In Progress'):
+    return {
+        'summary': {'id': ticket_id, 'order_id': f'T-{ticket_id}', 'created_date': 1700000000},
+        'devices': [{'status': {'name': status}}],
+    }
+
+
+class FakeSyncAPI:
+    def __init__(self):
+        self.snapshot = None
+        self.saved = []
+
+    def load_ticket_cache_snapshot(self, lazy=False, **filters):
+        return self.snapshot
+
+    def save_ticket_cache(self, tickets):
+        self.saved.append(tickets)
+
+
+class FakeClient:
+    def __init__(self):
+        self.pages = []
+        self.error = None
+
+    def get_all_tickets(self, force_refresh=False, page_callback=None):
+        if self.error:
+            raise self.error
+        tickets = []
+        for number, page in enumerate(self.pages, 1):
+            tickets.extend(page)
+            if page_callback:
+                page_callback(page, number == len(self.pages), len(tickets),
+                              {'current_page': number, 'total_items': None})
+        return tickets
+
+
+class LoaderHarness(TicketsModule):
+    """The loader and queue handling of the tickets view, without any widgets."""
+
+    def __init__(self):
+        self.ticket_queue = queue.Queue()
+        self.ticket_data = []
+        self.sync_api = FakeSyncAPI()
+        self.client = FakeClient()
+        self.applied = []
+        self.appended = []
+        self.status_texts = []
+        self.status_label = type('Label', (), {
+            'config': lambda label, text: self.status_texts.append(text)})()
+
+    def __del__(self):
+        pass
+
+    def load(self, **kwargs):
+        self._load_tickets_thread(**kwargs)
+        messages = []
+        while not self.ticket_queue.empty():
+            messages.append(self.ticket_queue.get())
+        return messages
+
+    def handle(self, messages):
+        """Feed messages through the UI thread's queue handler."""
+        for message in messages:
+            self.ticket_queue.put(message)
+        while not self.ticket_queue.empty():
+            self._check_ticket_queue()
+
+    # Stand-ins for the widget side of the queue handler
+
+    def after(self, ms, func):
+        return None
+
+    def _schedule_ticket_refresh(self):
+        pass
+
+    def _apply_ticket_data(self, ticket_data):
+        self.applied.append(len(ticket_data))
+        self.ticket_data = list(ticket_data)
+        return len(ticket_data)
+
+    def _append_ticket_page(self, rows, loaded, total):
+        self.appended.append((len(rows), loaded, total))
+        self.ticket_data.extend(rows)
+
+
+@pytest.fixture
+def loader(monkeypatch):
+    monkeypatch.setattr(tickets_module, 'get_circuit_breaker', lambda name: CircuitBreaker(name))
+    monkeypatch.setattr(TicketsModule, 'PAGE_SIZE', 2)
+    return LoaderHarness()
+
+
+def ids(rows):
+    return [row['id'] for row in rows]
+
+
+class TestFreshTickets:
+    def test_fresh_tickets_are_sent_in_pages(self, loader):
+        # Something is already shown, so the API result is not streamed
+        loader.ticket_data = normalize_tickets([raw_ticket(9)])
+        loader.client.pages = [[raw_ticket(i) for i in range(1, 6)]]
+
+        messages = loader.load(is_refresh=True)
+
+        assert [status for status, _ in messages] == ['replace', 'page', 'page', 'success']
+        assert ids(messages[0][1][0]) == ['T-1', 'T-2']
+        assert messages[0][1][1] == 5
+        assert [(ids(rows), loaded, total) for rows, loaded, total in
+                (data for _, data in messages[1:3])] == [
+            (['T-3', 'T-4'], 4, 5), (['T-5'], 5, 5)]
+        assert messages[-1] == ('success', 5)
+
+    def test_pages_rebuild_the_list_on_the_ui_thread(self, loader):
+        loader.ticket_data = normalize_tickets([raw_ticket(9)])
+        loader.client.pages = [[raw_ticket(i) for i in range(1, 6)]]
+
+        loader.handle(loader.load(is_refresh=True))
+
+        assert loader.applied == [2]
+        assert loader.appended == [(2, 4, 5), (1, 5, 5)]
+        assert ids(loader.ticket_data) == ['T-1', 'T-2', 'T-3', 'T-4', 'T-5']
+        assert loader.status_texts[-1] == 'Loaded 5 tickets from API'
+
+    def test_unchanged_refresh_sends_only_the_count(self, loader):
+        raw = [raw_ticket(i) for i in range(1, 4)]
+        loader.ticket_data = normalize_tickets(raw)
+        loader.client.pages = [raw]
+
+        assert loader.load(is_refresh=True) == [('success', 3)]
+
+
+class TestEmptyResults:
+    def test_empty_refresh_keeps_the_shown_tickets(self, loader):
+        loader.ticket_data = normalize_tickets([raw_ticket(1), raw_ticket(2)])
+        loader.client.pages = []
+
+        messages = loader.load(is_refresh=True)
+        assert messages == [('stale_error', 'Refresh failed – showing cached tickets')]
+
+        loader.handle(messages)
+        assert loader.applied == []
+        assert ids(loader.ticket_data) == ['T-1', 'T-2']
+
+    def test_empty_first_load_shows_no_tickets(self, loader):
+        loader.client.pages = []
+
+        assert loader.load() == [('replace', ([], 0)), ('success', 0)]
+
+
+class TestStreaming:
+    def test_pages_are_streamed_in_order(self, loader):
+        loader.client.pages = [[raw_ticket(1), raw_ticket(2)], [raw_ticket(3)]]
+
+        messages = loader.load()
+
+        assert [status for status, _ in messages] == ['page', 'page', 'streamed']
+        assert [ids(rows) for _, (rows, _, _) in messages[:2]] == [['T-1', 'T-2'], ['T-3']]
+        assert [loaded for _, (_, loaded, _) in messages[:2]] == [2, 3]
+        assert messages[-1] == ('streamed', 3)
+        assert loader.sync_api.saved == [[raw_ticket(i) for i in range(1, 4)]]
+
+    def test_streamed_does_not_reapply_the_list(self, loader):
+        loader.client.pages = [[raw_ticket(1), raw_ticket(2)], [raw_ticket(3)]]
+
+        loader.handle(loader.load())
+
+        assert loader.applied == []
+        assert loader.appended == [(2, 2, None), (1, 3, None)]
+        assert ids(loader.ticket_data) == ['T-1', 'T-2', 'T-3']
+        assert loader.status_texts[-1] == 'Loaded 3 tickets from API'
+
+    def test_cached_tickets_turn_streaming_off(self, loader):
+        loader.sync_api.snapshot = ([raw_ticket(1)], 60.0)
+        loader.client.pages = [[raw_ticket(1)], [raw_ticket(2)]]
+
+        messages = loader.load()
+
+        assert [status for status, _ in messages] == ['stale', 'replace', 'success']
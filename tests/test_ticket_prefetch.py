@@ -0,0 +1,69 @@
+"""Tests for the prioritized ticket detail prefetch pipeline."""
+
+import threading
+
+import pytest
+
+from nest.utils import ticket_prefetch
+from nest.utils.detail_store import DetailStore
+from nest.utils.ticket_prefetch import TicketDetailPrefetcher
+
+
+def ticket(ticket_id, created, technician='Sam'):
+    return {'summary': {'id': ticket_id, 'order_id': f'T-{ticket_id}', 'created_date': created,
+                        'assigned_to': {'fullname': technician}}}
+
+
+class FakeAPI:
+    api_key = 'test'
+
+    def __init__(self):
+        self.fetched = []
+
+    def request(self, endpoint, raw_response=False):
+        self.fetched.append(endpoint)
+        return {'data': {'summary': {}}}
+
+    def get_ticket_notes(self, ticket_id):
+        return []
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = DetailStore(str(tmp_path / 'ticket_details.seg'))
+    opened_on = []
+
+    def get_detail_store():
+        opened_on.append(threading.current_thread())
+        return store
+
+    monkeypatch.setattr(ticket_prefetch, 'get_detail_store', get_detail_store)
+    monkeypatch.setattr(ticket_prefetch, 'get_ticket_search_index',
+                        lambda: type('Index', (), {'update_details': lambda *args: None})())
+    store.opened_on = opened_on
+    yield store
+    store.close()
+
+
+class TestTicketDetailPrefetcher:
+    def test_schedule_leaves_store_work_to_background_threads(self, store):
+        api = FakeAPI()
+        prefetcher = TicketDetailPrefetcher(api, workers=1)
+
+        prefetcher.schedule([ticket(1, 100), ticket(2, 200)])
+
+        assert prefetcher.wait(timeout=5)
+        assert sorted(api.fetched) == ['tickets/1', 'tickets/2']
+        assert store.opened_on
+        assert threading.current_thread() not in store.opened_on
+
+    def test_assigned_tickets_first_and_fresh_details_skipped(self, store):
+        api = FakeAPI()
+        prefetcher = TicketDetailPrefetcher(api, workers=1)
+        store.put('T-3', {'data': {}})
+
+        prefetcher.schedule([ticket(1, 100), ticket(2, 50, technician='Alex'),
+                             ticket(3, 300)], technician='alex')
+
+        assert prefetcher.wait(timeout=5)
+        assert api.fetched == ['tickets/2', 'tickets/1']
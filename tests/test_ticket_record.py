@@ -0,0 +1,246 @@
+"""Tests for memoized ticket normalization and its views."""
+
+import copy
+import time
+from datetime import datetime
+
+from nest.utils.local_store import LocalStore
+from nest.utils.normalize import normalize_ticket
+from nest.utils.ticket_record import (
+    TicketNormalizer,
+    TicketRecord,
+    _content_hash,
+    _parse_datetime,
+    ticket_updated_timestamp,
+)
+
+CREATED = datetime(2024, 3, 1, 9, 30)
+
+
+def make_ticket(ticket_id=1, status='Open', device_status='In Progress'):
+    return {
+        'summary': {
+            'id': ticket_id,
+            'order_id': f'T-{ticket_id}',
+            'status': status,
+            'created_date': CREATED.timestamp(),
+            'customer': {'fullName': 'Jane Doe', 'mobile': '0400 000 000'},
+            'total': 129.0,
+        },
+        'devices': [{
+            'device': {'name': 'iPhone 13'},
+            'status': {'name': device_status},
+            'assigned_to': {'id': 7, 'fullname': 'Sam Tech'},
+            'repairProdItems': [{'name': 'Screen replacement'}],
+        }],
+    }
+
+
+def summary_view(record):
+    return {'ticket_id': record.ticket_id, 'status': record.status, 'tags': []}
+
+
+class TestParseDatetime:
+    def test_epoch_seconds(self):
+        assert _parse_datetime(CREATED.timestamp()) == CREATED
+        assert _parse_datetime(str(CREATED.timestamp())) == CREATED
+
+    def test_iso_8601(self):
+        assert _parse_datetime('2024-03-01T09:30:00') == CREATED
+        utc = _parse_datetime('2024-03-01T09:30:00Z')
+        assert utc.tzinfo is None
+        assert utc == datetime.fromtimestamp(datetime.fromisoformat(
+            '2024-03-01T09:30:00+00:00').timestamp())
+
+    def test_missing_or_invalid(self):
+        for value in (None, '', 0, '0', 'not a date'):
+            assert _parse_datetime(value) is None
+
+
+class TestTicketUpdatedTimestamp:
+    def test_prefers_last_updated(self):
+        ticket = {'summary': {'last_updated': 200, 'updated_at': 100}}
+
+        assert ticket_updated_timestamp(ticket) == 200.0
+
+    def test_falls_back_through_every_update_key(self):
+        iso = '2024-03-01T09:30:00'
+        assert ticket_updated_timestamp({'summary': {'updated_at': iso}}) == CREATED.timestamp()
+        assert ticket_updated_timestamp({'summary': {'updated_date': '150'}}) == 150.0
+        assert ticket_updated_timestamp({'summary': {'modified_date': 175}}) == 175.0
+
+    def test_skips_unusable_stamps(self):
+        ticket = {'summary': {'last_updated': 'never', 'updated_date': 0, 'modified_date': 90}}
+
+        assert ticket_updated_timestamp(ticket) == 90.0
+        assert ticket_updated_timestamp({'summary': {}}) is None
+        assert ticket_updated_timestamp({'summary': 'bad'}) is None
+
+    def test_record_and_store_column_agree(self, tmp_path):
+        ticket = make_ticket()
+        ticket['summary']['updated_at'] = '2024-03-01T09:30:00'
+        store = LocalStore(str(tmp_path / 'local.db'))
+        store.upsert_tickets([ticket])
+
+        assert TicketRecord(ticket, digest=0).updated == CREATED
+        assert store.ticket_summaries()[0]['last_updated'] == CREATED.timestamp()
+        store.close()
+
+
+class TestTicketRecord:
+    def test_extracts_fields(self):
+        record = TicketRecord(make_ticket(), digest=0)
+
+        assert record.ticket_id == 'T-1'
+        assert record.customer_name == 'Jane Doe'
+        assert record.device == 'iPhone 13'
+        assert record.status == 'In Progress'
+        assert record.repair_type == 'Screen replacement'
+        assert record.technician == 'Sam Tech'
+        assert record.created == CREATED
+
+    def test_open_devices_keep_summary_status(self):
+        record = TicketRecord(make_ticket(status='Waiting', device_status='Open'), digest=0)
+
+        assert record.status == 'Waiting'
+
+    def test_days_open(self):
+        record = TicketRecord(make_ticket(), digest=0)
+
+        assert record.days_open(now=datetime(2024, 3, 11, 8, 0)) == 9
+        assert TicketRecord({'summary': {}}, digest=0).days_open() is None
+
+
+class TestTicketNormalizer:
+    def test_reuses_record_for_unchanged_ticket(self):
+        normalizer = TicketNormalizer()
+
+        first = normalizer.normalize(make_ticket())
+
+        assert normalizer.normalize(copy.deepcopy(make_ticket())) is first
+        assert len(normalizer) == 1
+
+    def test_rebuilds_record_for_changed_ticket(self):
+        normalizer = TicketNormalizer()
+        first = normalizer.normalize(make_ticket())
+
+        second = normalizer.normalize(make_ticket(device_status='Repaired'))
+
+        assert second is not first
+        assert second.status == 'Repaired'
+        assert len(normalizer) == 1
+
+    def test_evicts_least_recently_used(self):
+        normalizer = TicketNormalizer(max_records=2)
+        first = normalizer.normalize(make_ticket(1))
+        normalizer.normalize(make_ticket(2))
+        normalizer.normalize(make_ticket(1))
+
+        normalizer.normalize(make_ticket(3))
+
+        assert len(normalizer) == 2
+        assert normalizer.normalize(make_ticket(1)) is first
+
+    def test_skips_tickets_that_fail(self):
+        records = TicketNormalizer().normalize_all([make_ticket(1), {'summary': 'bad'}])
+
+        assert [record.ticket_id for record in records] == ['T-1']
+
+
+class TestViews:
+    def test_view_is_built_once(self):
+        record = TicketNormalizer().normalize(make_ticket())
+        builds = []
+
+        def build(record):
+            builds.append(record)
+            return summary_view(record)
+
+        assert record.view('summary', build) == record.view('summary', build)
+        assert len(builds) == 1
+
+    def test_mutating_a_view_does_not_leak(self):
+        normalizer = TicketNormalizer()
+        view = normalizer.normalize(make_ticket()).view('summary', summary_view)
+
+        view['status'] = 'Collected'
+        view['extra'] = True
+
+        again = normalizer.normalize(make_ticket()).view('summary', summary_view)
+        assert again == {'ticket_id': 'T-1', 'status': 'In Progress', 'tags': []}
+
+    def test_mutating_nested_values_does_not_leak(self):
+        record = TicketNormalizer().normalize(make_ticket())
+
+        def build(record):
+            return {'customer': {'name': record.customer_name}, 'tags': [{'name': 'screen'}]}
+
+        view = record.view('nested', build)
+        view['customer']['name'] = 'Someone Else'
+        view['tags'][0]['name'] = 'battery'
+        view['tags'].append({'name': 'urgent'})
+
+        assert record.view('nested', build) == {
+            'customer': {'name': 'Jane Doe'}, 'tags': [{'name': 'screen'}]}
+
+    def test_new_stamp_rebuilds_view(self):
+        record = TicketNormalizer().normalize(make_ticket())
+        builds = []
+
+        def build(record):
+            builds.append(record)
+            return {'built': len(builds)}
+
+        assert record.view('daily', build, stamp='2024-03-01') == {'built': 1}
+        assert record.view('daily', build, stamp='2024-03-01') == {'built': 1}
+        assert record.view('daily', build, stamp='2024-03-02') == {'built': 2}
+
+    def test_normalize_ticket_returns_independent_dicts(self):
+        first = normalize_ticket(make_ticket(42))
+        first['job_status'] = 'Collected'
+
+        second = normalize_ticket(make_ticket(42))
+
+        assert second is not first
+        assert second['job_status'] == 'In Progress'
+        assert second['device'] == 'iPhone 13'
+
+    def test_raw_ticket_is_shared_not_copied(self):
+        ticket = make_ticket()
+        record = TicketNormalizer().normalize(ticket)
+
+        def build(record):
+            return {'ticket_id': record.ticket_id, 'raw_data': record.raw}
+
+        assert record.view('raw', build)['raw_data'] is ticket
+        assert record.view('raw', build)['raw_data'] is ticket
+
+
+class TestRepeatNormalizeCost:
+    def test_repeat_normalize_is_a_hash_check(self):
+        # Views carrying the raw payload must not copy it, or a memoized
+        # normalize costs several times the hash it is meant to be
+        def raw_view(record):
+            return {'ticket_id': record.ticket_id, 'raw_data': record.raw}
+
+        tickets = []
+        for ticket_id in range(1000):
+            ticket = make_ticket(ticket_id)
+            ticket['notes'] = [{'id': n, 'text': 'Customer called about repair', 'meta': {'by': n}}
+                               for n in range(100)]
+            tickets.append(ticket)
+        normalizer = TicketNormalizer()
+        for ticket in tickets:
+            normalizer.normalize(ticket).view('raw', raw_view)
+
+        start = time.perf_counter()
+        for ticket in tickets:
+            _content_hash(ticket)
+        hash_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        views = [normalizer.normalize(ticket).view('raw', raw_view) for ticket in tickets]
+        repeat_time = time.perf_counter() - start
+
+        assert all(view['raw_data'] is ticket for view, ticket in zip(views, tickets))
+        assert repeat_time < hash_time * 3 + 0.05
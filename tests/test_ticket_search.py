@@ -0,0 +1,134 @@
+"""Tests for the BM25 ticket search index."""
+
+import pytest
+
+from nest.utils.ticket_search import TicketSearchIndex, extract_ticket_fields, tokenize
+
+
+def make_ticket(number, customer='Jane Doe', device='iPhone 13', notes=None, updated='1'):
+    ticket = {
+        'summary': {
+            'id': number,
+            'order_id': f'T-{number}',
+            'last_updated': updated,
+            'customer': {'fullName': customer},
+        },
+        'devices': [{'device': {'name': device}}],
+    }
+    if notes is not None:
+        ticket['notes'] = [{'msg_text': note} for note in notes]
+    return ticket
+
+
+@pytest.fixture
+def index(tmp_path):
+    index = TicketSearchIndex(str(tmp_path / 'idx.json'), seed_details=False)
+    yield index
+    index.flush()
+
+
+def numbers(results):
+    return [order_id for order_id, _ in results]
+
+
+class TestTokenize:
+    def test_drops_single_characters_and_punctuation(self):
+        assert tokenize('iPhone 13 - A screen, cracked!') == ['iphone', '13', 'screen', 'cracked']
+
+    def test_extracts_notes_only_when_present(self):
+        assert 'notes' not in extract_ticket_fields(make_ticket(1))
+        assert extract_ticket_fields(make_ticket(1, notes=['Water damage']))['notes'] == (
+            'Water damage')
+
+
+class TestSearch:
+    @pytest.mark.parametrize('query', ['', 'a', '!!', '  - '])
+    def test_query_without_terms_returns_nothing(self, index, query):
+        index.update([make_ticket(1)])
+
+        assert index.search(query) == []
+
+    def test_empty_index(self, index):
+        assert index.search('iphone') == []
+
+    def test_field_weights_rank_customer_above_notes(self, index):
+        index.update([
+            make_ticket(1, customer='Alex Smith', notes=['Call Morgan when ready']),
+            make_ticket(2, customer='Morgan Lee', notes=['Screen replaced']),
+        ])
+
+        assert numbers(index.search('morgan')) == ['T-2', 'T-1']
+
+    def test_more_occurrences_rank_higher(self, index):
+        index.update([
+            make_ticket(1, notes=['Battery swollen']),
+            make_ticket(2, notes=['Battery swollen, battery replaced, battery tested']),
+            make_ticket(3, notes=['Screen replaced']),
+        ])
+
+        assert numbers(index.search('battery')) == ['T-2', 'T-1']
+
+    def test_last_term_matches_prefixes(self, index):
+        index.update([make_ticket(1, device='Samsung Galaxy S21'), make_ticket(2)])
+
+        assert numbers(index.search('gal')) == ['T-1']
+        assert numbers(index.search('galaxy s2')) == ['T-1']
+        assert index.search('gal samsung') == []
+
+    def test_match_all_and_match_any(self, index):
+        index.update([
+            make_ticket(1, device='iPhone 13', notes=['Cracked screen']),
+            make_ticket(2, device='iPhone 12', notes=['Battery']),
+        ])
+
+        assert numbers(index.search('iphone cracked')) == ['T-1']
+        assert sorted(numbers(index.search('cracked battery', match_all=False))) == ['T-1', 'T-2']
+        assert index.search('cracked battery') == []
+
+    def test_stopword_only_query_falls_back_to_stopwords(self, index):
+        index.update([make_ticket(1, notes=['Please show the customer']), make_ticket(2)])
+
+        # Common words are ignored next to other terms, but searched on their own
+        assert sorted(numbers(index.search('show the iphone'))) == ['T-1', 'T-2']
+        assert numbers(index.search('please show')) == ['T-1']
+
+    def test_ticket_number(self, index):
+        index.update([make_ticket(1001), make_ticket(1002)])
+
+        assert numbers(index.search('T-1002'))[0] == 'T-1002'
+        assert index.ticket_id('1002') == 1002
+
+
+class TestUpdates:
+    def test_unchanged_tickets_are_skipped(self, index):
+        assert index.update([make_ticket(1)]) == 1
+        assert index.update([make_ticket(1)]) == 0
+        assert index.update([make_ticket(1, device='Pixel 7', updated='2')]) == 1
+
+        assert numbers(index.search('pixel')) == ['T-1']
+        assert index.search('iphone') == []
+
+    def test_list_updates_keep_indexed_notes(self, index):
+        index.update_details('T-1', {'data': make_ticket(1, notes=['Water damage'])})
+
+        index.update([make_ticket(1, device='Pixel 7', updated='2')])
+
+        assert numbers(index.search('water')) == ['T-1']
+        assert numbers(index.search('pixel')) == ['T-1']
+
+    def test_remove(self, index):
+        index.update([make_ticket(1), make_ticket(2)])
+
+        assert index.remove('T-1')
+        assert not index.remove('T-1')
+        assert 'T-1' not in index
+        assert numbers(index.search('iphone')) == ['T-2']
+
+    def test_persists_across_instances(self, tmp_path, index):
+        index.update([make_ticket(1, device='Pixel 7')])
+        index.flush()
+
+        reloaded = TicketSearchIndex(str(tmp_path / 'idx.json'), seed_details=False)
+
+        assert len(reloaded) == 1
+        assert numbers(reloaded.search('pixel')) == ['T-1']
@@ -0,0 +1,323 @@
+"""Tests for the ticket cache and watermark-based delta sync in RepairDeskAPI."""
+
+import json
+import os
+import threading
+import time
+
+import pytest
+
+from nest.utils import repairdesk_api
+from nest.utils.cache_io import write_cache_file
+from nest.utils.local_store import LocalStore
+from nest.utils.repairdesk_api import TICKET_SYNC_OVERLAP_SECONDS, RepairDeskAPI
+
+
+def make_ticket(ticket_id, updated=None, status='Open'):
+    summary = {'id': ticket_id, 'order_id': f'T-{ticket_id}', 'status': status}
+    if updated is not None:
+        summary['last_updated'] = updated
+    return {'summary': summary, 'devices': []}
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    client = RepairDeskAPI(api_key='test-key')
+    cache_file = str(tmp_path / 'ticket_cache.json')
+    monkeypatch.setattr(client, 'get_ticket_cache_file', lambda: cache_file)
+    return client
+
+
+class TestLoadTicketCache:
+    def test_reads_current_format(self, api):
+        tickets = [make_ticket(1), make_ticket(2)]
+        write_cache_file(api.get_ticket_cache_file(), {
+            'timestamp': '2099-01-01T00:00:00', 'items': tickets, 'count': 2})
+        assert api.load_ticket_cache(max_cache_age_minutes=None) == tickets
+
+    def test_reads_legacy_bare_list(self, api):
+        # Older versions wrote the ticket list as plain JSON without a header or timestamp
+        tickets = [make_ticket(1), make_ticket(2)]
+        with open(api.get_ticket_cache_file(), 'w') as f:
+            json.dump(tickets, f)
+
+        assert api.load_ticket_cache() == tickets
+        snapshot, age = api.load_ticket_cache_snapshot()
+        assert snapshot == tickets
+        assert age < 60
+
+    def test_legacy_list_expires_by_file_time(self, api):
+        path = api.get_ticket_cache_file()
+        with open(path, 'w') as f:
+            json.dump([make_ticket(1)], f)
+        old = time.time() - 3600
+        os.utime(path, (old, old))
+
+        assert api.load_ticket_cache(max_cache_age_minutes=15) is None
+        assert api.load_ticket_cache(max_cache_age_minutes=None) == [make_ticket(1)]
+
+    def test_missing_cache(self, api):
+        assert api.load_ticket_cache() is None
+        assert api.load_ticket_cache_snapshot() is None
+
+
+class TestLazyTicketCache:
+    @pytest.fixture
+    def store(self, tmp_path, monkeypatch):
+        store = LocalStore(str(tmp_path / 'local.db'))
+        monkeypatch.setattr(repairdesk_api, 'get_local_store', lambda: store)
+        yield store
+        store.close()
+
+    @staticmethod
+    def assigned_ticket(ticket_id, technician):
+        ticket = make_ticket(ticket_id)
+        ticket['summary']['created_date'] = ticket_id
+        ticket['devices'] = [{'assigned_to': {'fullname': technician}}]
+        return ticket
+
+    def test_snapshot_only_hydrates_the_pages_read(self, api, store, monkeypatch):
+        store.upsert_tickets([make_ticket(i) for i in range(1, 121)], replace=True)
+        hydrated = []
+        get_tickets_by_id = store.get_tickets_by_id
+
+        def recording_get_tickets_by_id(ticket_ids):
+            hydrated.extend(ticket_ids)
+            return get_tickets_by_id(ticket_ids)
+
+        monkeypatch.setattr(store, 'get_tickets_by_id', recording_get_tickets_by_id)
+
+        tickets, age = api.load_ticket_cache_snapshot(lazy=True)
+
+        assert len(tickets) == 120
+        assert age < 60
+        assert hydrated == []
+        assert tickets[:50][0]['summary']['id'] in hydrated
+        assert len(hydrated) == 50
+
+    def test_snapshot_filters_by_technician(self, api, store):
+        store.upsert_tickets([self.assigned_ticket(1, 'Sam Lee'), self.assigned_ticket(2, 'Alex'),
+                              self.assigned_ticket(3, 'sam  lee')], replace=True)
+
+        tickets, _ = api.load_ticket_cache_snapshot(lazy=True, assigned_to='Sam Lee')
+
+        assert [t['summary']['id'] for t in tickets] == [3, 1]
+
+    def test_dashboard_picks_the_same_tickets_as_the_store_filter(self, api, store):
+        from nest.ui.dashboard import DashboardModule, normalize_ticket
+
+        raw = [self.assigned_ticket(1, "Codey O'Connor"), self.assigned_ticket(2, 'Alex'),
+               self.assigned_ticket(3, 'codey  o connor')]
+        store.upsert_tickets(raw, replace=True)
+        dashboard = DashboardModule.__new__(DashboardModule)
+        dashboard.current_user = {'fullname': "Codey O'Connor "}
+
+        _, tech_tickets, _, _ = dashboard._index_tickets([normalize_ticket(t) for t in raw])
+        snapshot, _ = api.load_ticket_cache_snapshot(lazy=True, assigned_to="Codey O'Connor")
+
+        assert sorted(t['ticket_id'] for t in tech_tickets) == ['T-1', 'T-3']
+        assert sorted(t['summary']['order_id'] for t in snapshot) == ['T-1', 'T-3']
+
+    def test_falls_back_to_cache_file_until_store_is_synced(self, api, store):
+        tickets = [make_ticket(1), make_ticket(2)]
+        write_cache_file(api.get_ticket_cache_file(), {
+            'timestamp': '2099-01-01T00:00:00', 'items': tickets, 'count': 2})
+
+        assert api.load_ticket_cache_snapshot(lazy=True)[0] == tickets
+
+    def test_snapshot_age_comes_from_store_sync_time(self, api, store, monkeypatch):
+        store.upsert_tickets([make_ticket(1)], replace=True)
+        monkeypatch.setattr(store, 'last_synced', lambda table: time.time() - 3600)
+
+        tickets, age = api.load_ticket_cache_snapshot(lazy=True)
+
+        assert len(tickets) == 1
+        assert 3600 <= age < 3660
+
+
+class TestDeltaSync:
+    @pytest.fixture
+    def sync(self, api, monkeypatch):
+        """Wire the API to an in-memory cache, sync state and changed-ticket pages."""
+        env = {
+            'cached': [make_ticket(1, updated=1000), make_ticket(2, updated=1000)],
+            'state': {'watermark': 1000.0, 'last_full_sync': time.time()},
+            'pages': [],
+            'saved': None,
+        }
+
+        def get_tickets(page=1, **filters):
+            pages = env['pages']
+            return {
+                'ticketData': pages[page - 1] if page <= len(pages) else [],
+                'pagination': {'next_page_exist': page < len(pages), 'next_page': page + 1},
+            }
+
+        def save_ticket_cache(items, detail_items=None):
+            env['saved'] = (items, detail_items)
+
+        monkeypatch.setattr(api, '_load_synced_tickets', lambda: env['cached'])
+        monkeypatch.setattr(api, '_load_ticket_sync_state', lambda: dict(env['state']))
+        monkeypatch.setattr(api, '_save_ticket_sync_state', lambda state: env.update(state=state))
+        monkeypatch.setattr(api, 'get_tickets', get_tickets)
+        monkeypatch.setattr(api, 'save_ticket_cache', save_ticket_cache)
+        return env
+
+    def test_merges_changes_and_advances_watermark(self, api, sync):
+        changed = make_ticket(2, updated=2000, status='Repaired')
+        new = make_ticket(3, updated=1500)
+        sync['pages'] = [[changed, new]]
+
+        merged = api.sync_tickets()
+
+        # New tickets go first; changed ones are replaced in place
+        assert merged == [new, make_ticket(1, updated=1000), changed]
+        assert sync['saved'] == (merged, [changed, new])
+        assert sync['state']['watermark'] == 2000
+
+    def test_no_changes_keeps_cache(self, api, sync):
+        stale = make_ticket(1, updated=1000 - TICKET_SYNC_OVERLAP_SECONDS - 1)
+        sync['pages'] = [[stale]]
+
+        assert api.sync_tickets() == sync['cached']
+        assert sync['saved'] is None
+        assert sync['state']['watermark'] == 1000.0
+
+    def test_skips_tickets_without_update_stamp(self, api, sync):
+        sync['pages'] = [[make_ticket(4)]]
+
+        assert api.sync_tickets() == sync['cached']
+        assert sync['saved'] is None
+        assert sync['state']['watermark'] == 1000.0
+
+    def test_pages_until_the_watermark_without_a_date_filter(self, api, sync, monkeypatch):
+        changed = make_ticket(2, updated=2000)
+        stale = make_ticket(1, updated=1000 - TICKET_SYNC_OVERLAP_SECONDS - 1)
+        sync['pages'] = [[make_ticket(4), changed], [make_ticket(5), stale], [make_ticket(6)]]
+        get_tickets = api.get_tickets
+        requests = []
+
+        def recording_get_tickets(page=1, **filters):
+            requests.append((page, filters))
+            return get_tickets(page=page, **filters)
+
+        monkeypatch.setattr(api, 'get_tickets', recording_get_tickets)
+
+        merged = api.sync_tickets()
+
+        assert merged == [make_ticket(1, updated=1000), changed]
+        assert [page for page, _ in requests] == [1, 2]
+        assert all('date_from' not in filters for _, filters in requests)
+
+    def test_stops_at_first_page_without_changes(self, api, sync, monkeypatch):
+        # Unstamped tickets never reach the watermark, but a page without changes ends paging
+        sync['pages'] = [[make_ticket(4)], [make_ticket(5)], [make_ticket(6)]]
+        get_tickets = api.get_tickets
+        pages = []
+
+        def recording_get_tickets(page=1, **filters):
+            pages.append(page)
+            return get_tickets(page=page, **filters)
+
+        monkeypatch.setattr(api, 'get_tickets', recording_get_tickets)
+
+        assert api.sync_tickets() == sync['cached']
+        assert pages == [1]
+
+    def test_runs_full_sync_without_watermark(self, api, sync, monkeypatch):
+        sync['state'] = {}
+        fresh = [make_ticket(5, updated=3000), make_ticket(6)]
+        monkeypatch.setattr(api, 'get_all_tickets', lambda use_cache=False: fresh)
+
+        assert api.sync_tickets() == fresh
+        assert sync['state']['watermark'] == 3000
+
+
+class TestTicketCacheLock:
+    @pytest.fixture
+    def cache(self, api, monkeypatch):
+        """Write a real cache file, with the indexes and prefetch around it stubbed out."""
+        index = type('Index', (), {'update': lambda self, items: None})()
+        store = type('Store', (), {'last_synced': lambda self, table: time.time(),
+                                   'upsert_tickets': lambda self, items, replace=False: 0})()
+        monkeypatch.setattr(repairdesk_api, 'get_ticket_id_index', lambda: index)
+        monkeypatch.setattr(repairdesk_api, 'get_ticket_search_index', lambda: index)
+        monkeypatch.setattr(repairdesk_api, 'get_local_store', lambda: store)
+        monkeypatch.setattr(api, '_create_ticket_detail_files', lambda tickets: None)
+        monkeypatch.setattr(api, '_load_ticket_sync_state',
+                            lambda: {'watermark': 1000.0, 'last_full_sync': time.time()})
+        monkeypatch.setattr(api, '_save_ticket_sync_state', lambda state: None)
+        api.save_ticket_cache([make_ticket(1, updated=1000), make_ticket(2, updated=1000)])
+
+    def cached_tickets(self, api):
+        return api.load_ticket_cache(max_cache_age_minutes=None)
+
+    def test_patch_during_delta_sync_is_kept(self, api, cache, monkeypatch):
+        patched = make_ticket(1, updated=1000, status='Collected')
+        changed = make_ticket(2, updated=2000, status='Repaired')
+
+        def get_tickets(page=1, **filters):
+            # A ticket is edited while the sync is still paging
+            api.patch_ticket_cache(patched)
+            return {'ticketData': [changed], 'pagination': {'next_page_exist': False}}
+
+        monkeypatch.setattr(api, 'get_tickets', get_tickets)
+
+        merged = api.sync_tickets()
+
+        assert merged == [patched, changed]
+        assert self.cached_tickets(api) == [patched, changed]
+
+    def test_polls_without_changes_do_not_parse_the_cache(self, api, cache, monkeypatch):
+        changed = make_ticket(2, updated=2000)
+        monkeypatch.setattr(api, 'get_tickets', lambda page=1, **filters: {
+            'ticketData': [changed], 'pagination': {'next_page_exist': False}})
+        merged = api.sync_tickets()
+        reads = []
+        load_ticket_cache = api.load_ticket_cache
+
+        def counting_load(*args, **kwargs):
+            reads.append(1)
+            return load_ticket_cache(*args, **kwargs)
+
+        monkeypatch.setattr(api, 'load_ticket_cache', counting_load)
+        monkeypatch.setattr(api, 'get_tickets', lambda page=1, **filters: {
+            'ticketData': [make_ticket(1, updated=10)], 'pagination': {}})
+
+        assert api.sync_tickets() is merged
+        assert api.sync_tickets() is merged
+        assert reads == []
+
+        # A write from elsewhere is picked up on the next poll
+        patched = make_ticket(1, updated=1000, status='Collected')
+        api.patch_ticket_cache(patched)
+        assert api.sync_tickets() == [patched, changed]
+        assert reads == [1]
+
+    def test_patch_waits_for_an_overlapping_save(self, api, cache, monkeypatch):
+        saving = threading.Event()
+        release = threading.Event()
+        write_cache_file = repairdesk_api.write_cache_file
+
+        def slow_write(path, data):
+            if isinstance(data, dict) and data.get('count') == 3:
+                saving.set()
+                release.wait(5)
+            write_cache_file(path, data)
+
+        monkeypatch.setattr(repairdesk_api, 'write_cache_file', slow_write)
+        saver = threading.Thread(target=lambda: api.save_ticket_cache(
+            [make_ticket(1), make_ticket(2), make_ticket(3)]))
+        saver.start()
+        assert saving.wait(5)
+        patcher = threading.Thread(target=lambda: api.patch_ticket_cache(
+            make_ticket(3, status='Collected')))
+        patcher.start()
+        patcher.join(0.2)
+        assert patcher.is_alive()
+        release.set()
+        for thread in (saver, patcher):
+            thread.join(5)
+
+        assert self.cached_tickets(api) == [
+            make_ticket(1), make_ticket(2), make_ticket(3, status='Collected')]
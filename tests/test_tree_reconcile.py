@@ -0,0 +1,131 @@
+"""Tests for keyed Treeview reconciliation."""
+
+import pytest
+
+from nest.utils.tree_reconcile import TreeReconciler
+
+
+class FakeTree:
+    """Minimal top-level Treeview that records every widget call."""
+
+    def __init__(self):
+        self.order = []
+        self.items = {}
+        self.calls = []
+
+    def get_children(self, parent=''):
+        return tuple(self.order)
+
+    def insert(self, parent, index, iid=None, values=(), tags=()):
+        self.calls.append(('insert', iid))
+        self.order.insert(index, iid)
+        self.items[iid] = (tuple(values), tuple(tags))
+        return iid
+
+    def item(self, iid, values=(), tags=()):
+        self.calls.append(('item', iid))
+        self.items[iid] = (tuple(values), tuple(tags))
+
+    def move(self, iid, parent, index):
+        self.calls.append(('move', iid))
+        self.order.remove(iid)
+        self.order.insert(index, iid)
+
+    def delete(self, *iids):
+        for iid in iids:
+            self.calls.append(('delete', iid))
+            self.order.remove(iid)
+            del self.items[iid]
+
+    def rows(self):
+        return [(iid, self.items[iid][0]) for iid in self.order]
+
+
+def ticket(ticket_id, status='Open'):
+    return {'id': ticket_id, 'status': status}
+
+
+@pytest.fixture
+def tree():
+    return FakeTree()
+
+
+@pytest.fixture
+def reconciler(tree):
+    return TreeReconciler(tree, key=lambda t: t['id'], values=lambda t: (t['id'], t['status']),
+                          tags=lambda t: (t['status'].lower(),))
+
+
+class TestTreeReconciler:
+    def test_first_reconcile_inserts_rows_in_order(self, tree, reconciler):
+        result = reconciler.reconcile([ticket(1), ticket(2), ticket(3)])
+
+        assert (result.inserted, result.updated, result.moved, result.deleted) == (3, 0, 0, 0)
+        assert tree.rows() == [('1', (1, 'Open')), ('2', (2, 'Open')), ('3', (3, 'Open'))]
+
+    def test_unchanged_rows_make_no_calls(self, tree, reconciler):
+        rows = [ticket(i) for i in range(5)]
+        reconciler.reconcile(rows)
+        tree.calls.clear()
+
+        result = reconciler.reconcile(rows)
+
+        assert not result
+        assert tree.calls == []
+
+    def test_three_changed_tickets_make_three_widget_updates(self, tree, reconciler):
+        rows = [ticket(i) for i in range(100)]
+        reconciler.reconcile(rows)
+        tree.calls.clear()
+        for i in (7, 42, 99):
+            rows[i] = ticket(i, 'Repaired')
+
+        result = reconciler.reconcile(rows)
+
+        assert result.updated == 3 and result.calls == 3
+        assert tree.calls == [('item', '7'), ('item', '42'), ('item', '99')]
+        assert tree.items['42'] == ((42, 'Repaired'), ('repaired',))
+
+    def test_moves_and_deletes(self, tree, reconciler):
+        reconciler.reconcile([ticket(1), ticket(2), ticket(3), ticket(4)])
+
+        result = reconciler.reconcile([ticket(3), ticket(1), ticket(2), ticket(5)])
+
+        assert result.deleted == 1 and result.inserted == 1
+        assert result.moved == 1 and result.updated == 0
+        assert [iid for iid, _ in tree.rows()] == ['3', '1', '2', '5']
+
+    def test_foreign_items_are_removed(self, tree, reconciler):
+        tree.insert('', 0, iid='loading', values=('Loading...',))
+
+        result = reconciler.reconcile([ticket(1)])
+
+        assert result.deleted == 1
+        assert [iid for iid, _ in tree.rows()] == ['1']
+
+    def test_duplicate_keys_keep_the_first_row(self, tree, reconciler):
+        reconciler.reconcile([ticket(1), ticket(1, 'Closed'), ticket(2)])
+
+        assert tree.rows() == [('1', (1, 'Open')), ('2', (2, 'Open'))]
+
+    def test_max_calls_resumes_where_it_stopped(self, tree, reconciler):
+        rows = [ticket(i) for i in range(10)]
+
+        first = reconciler.reconcile(rows, max_calls=4)
+        assert first.pending and first.inserted == 4
+
+        second = reconciler.reconcile(rows, max_calls=4)
+        assert second.pending and second.inserted == 4
+
+        third = reconciler.reconcile(rows, max_calls=4)
+        assert not third.pending and third.inserted == 2
+        assert [iid for iid, _ in tree.rows()] == [str(i) for i in range(10)]
+        assert not reconciler.reconcile(rows, max_calls=4)
+
+    def test_forget_rewrites_values(self, tree, reconciler):
+        reconciler.reconcile([ticket(1)])
+        reconciler.forget()
+
+        result = reconciler.reconcile([ticket(1)])
+
+        assert result.updated == 1
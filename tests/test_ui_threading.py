@@ -0,0 +1,55 @@
+"""Tests for the frame-paced UI update scheduler."""
+
+from nest.utils.ui_threading import UIUpdateScheduler
+
+
+class FakeRoot:
+    """Collects after() callbacks so the test decides when a frame runs."""
+
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, delay_ms, callback):
+        self.scheduled.append(callback)
+
+    def run_frame(self):
+        callbacks, self.scheduled = self.scheduled, []
+        for callback in callbacks:
+            callback()
+
+
+class TestUIUpdateScheduler:
+    def test_coalesces_updates_per_key(self):
+        root = FakeRoot()
+        scheduler = UIUpdateScheduler(root, budget_ms=1000)
+        ran = []
+
+        for i in range(3):
+            scheduler.submit('status', lambda i=i: ran.append(('status', i)))
+
+        assert scheduler.pending() == 1
+        root.run_frame()
+        assert ran == [('status', 2)]
+
+    def test_replaced_update_runs_after_earlier_keys(self):
+        root = FakeRoot()
+        scheduler = UIUpdateScheduler(root, budget_ms=1000)
+        ran = []
+
+        scheduler.submit('status', lambda: ran.append('loading'))
+        scheduler.submit('drives', lambda: ran.append('drives'))
+        scheduler.submit('status', lambda: ran.append('loaded'))
+        root.run_frame()
+
+        assert ran == ['drives', 'loaded']
+
+    def test_batches_collect_items_in_order(self):
+        root = FakeRoot()
+        scheduler = UIUpdateScheduler(root, budget_ms=1000)
+        batches = []
+
+        for page in range(3):
+            scheduler.submit_batch('pages', page, batches.append)
+        root.run_frame()
+
+        assert batches == [[0, 1, 2]]
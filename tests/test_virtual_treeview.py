@@ -0,0 +1,146 @@
+"""Tests for the pooled, virtualized Treeview."""
+
+import tkinter as tk
+
+import pytest
+
+from nest.main import VirtualTreeview
+
+VISIBLE = 5
+BUFFER = 2
+
+
+@pytest.fixture(scope='module')
+def root():
+    try:
+        root = tk.Tk()
+    except tk.TclError:
+        pytest.skip('no display available')
+    root.withdraw()
+    yield root
+    root.destroy()
+
+
+@pytest.fixture
+def tree(root):
+    # Left unmapped, so the visible row count comes from the height option
+    tree = VirtualTreeview(root, columns=('id', 'name'), show='headings',
+                           height=VISIBLE, buffer_rows=BUFFER)
+    yield tree
+    tree.destroy()
+
+
+def make_rows(count):
+    return [(f'T-{index}', f'Customer {index}') for index in range(count)]
+
+
+def shown_ids(tree):
+    return [tree.item(iid, 'values')[0] for iid in tree.get_children()]
+
+
+class TestRows:
+    def test_set_rows_only_materializes_the_visible_window(self, tree):
+        tree.set_rows(make_rows(100))
+
+        assert len(tree.rows) == 100
+        assert len(tree.get_children()) == VISIBLE + BUFFER
+        assert shown_ids(tree) == [f'T-{index}' for index in range(VISIBLE + BUFFER)]
+
+    def test_pool_shrinks_with_the_rows(self, tree):
+        tree.set_rows(make_rows(100))
+        tree.set_rows(make_rows(3))
+
+        assert shown_ids(tree) == ['T-0', 'T-1', 'T-2']
+
+    def test_row_for_item(self, tree):
+        rows = make_rows(20)
+        tree.set_rows(rows)
+        tree.yview('scroll', 4, 'units')
+
+        assert tree.row_for_item(tree.get_children()[0]) == rows[4]
+
+    def test_sort_survives_set_rows(self, tree):
+        tree.set_rows(make_rows(12))
+        tree.sort_by_column('id', reverse=True)
+
+        tree.set_rows(make_rows(12))
+
+        # Natural sort puts T-11 before T-9
+        assert shown_ids(tree)[:3] == ['T-11', 'T-10', 'T-9']
+
+
+class TestScrolling:
+    def test_scroll_moves_the_window(self, tree):
+        tree.set_rows(make_rows(100))
+
+        tree.yview('scroll', 10, 'units')
+
+        assert shown_ids(tree)[0] == 'T-10'
+        assert tree.yview() == (0.1, 0.15)
+
+    def test_page_scroll(self, tree):
+        tree.set_rows(make_rows(100))
+
+        tree.yview_scroll(1, 'pages')
+
+        assert shown_ids(tree)[0] == f'T-{VISIBLE - 1}'
+
+    def test_moveto_is_clamped_to_the_last_full_page(self, tree):
+        tree.set_rows(make_rows(100))
+
+        tree.yview_moveto(0.5)
+        assert shown_ids(tree)[0] == 'T-50'
+
+        tree.yview_moveto(1.0)
+        assert shown_ids(tree)[0] == f'T-{100 - VISIBLE}'
+        assert tree.yview() == (0.95, 1.0)
+
+    def test_scrollbar_follows_the_virtual_position(self, tree):
+        positions = []
+        tree.configure(yscrollcommand=lambda first, last: positions.append((first, last)))
+        tree.set_rows(make_rows(50))
+
+        tree.yview('scroll', 5, 'units')
+
+        assert positions[-1] == (0.1, 0.2)
+
+
+class TestSelection:
+    def test_selection_is_kept_while_scrolled_out_of_view(self, tree):
+        rows = make_rows(100)
+        tree.set_rows(rows)
+        tree.select_key('T-3')
+
+        tree.yview('scroll', 50, 'units')
+        assert tree.selection() == ()
+        assert tree.selected_rows() == [rows[3]]
+
+        tree.yview_moveto(0)
+        assert [tree.item(iid, 'values')[0] for iid in tree.selection()] == ['T-3']
+
+    def test_selection_is_kept_across_set_rows(self, tree):
+        tree.set_rows(make_rows(10))
+        tree.select_key('T-3')
+
+        tree.set_rows(list(reversed(make_rows(10))))
+
+        assert tree.selected_rows() == [('T-3', 'Customer 3')]
+        assert [tree.item(iid, 'values')[0] for iid in tree.selection()] == ['T-3']
+
+    def test_scrolling_does_not_repeat_select_events(self, root, tree):
+        events = []
+        tree.bind('<<TreeviewSelect>>', lambda e: events.append(tree.selection()))
+        tree.set_rows(make_rows(100))
+        tree.select_key('T-3')
+        root.update()
+        assert len(events) == 1
+
+        # The selected row moves to other pooled items and then out of view
+        for _ in range(6):
+            tree.yview('scroll', 1, 'units')
+            root.update()
+        assert len(events) == 1
+
+        tree.select_key('T-20')
+        root.update()
+        assert len(events) == 2